@@ -0,0 +1,368 @@
+# core/metrics.py
+"""
+Registro de métricas no formato Prometheus, sem dependências externas.
+
+- ``Counter``, ``Gauge`` e ``Histogram`` com labels
+- cada processo (workers do gunicorn, crons de ingestão) guarda os valores
+  em memória e grava periodicamente um snapshot na tabela ``MetricsSnapshot``
+- o endpoint ``/metrics`` soma os snapshots de todos os processos e devolve
+  o texto no formato de exposição do Prometheus
+
+Usar o banco como área comum permite agregar processos que rodam em
+máquinas diferentes (web e crons do Render compartilham o DATABASE_URL).
+"""
+from __future__ import annotations
+
+import atexit
+import functools
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from bisect import bisect_left
+from datetime import timedelta
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+INGEST_BUCKETS = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+
+# Algo foi registrado desde o último snapshot gravado (sem isso, nada a gravar)
+_dirty = False
+
+
+def _mark_dirty():
+    global _dirty
+    _dirty = True
+
+
+def _label_key(labelnames, labels) -> str:
+    return json.dumps([str(labels.get(name, "")) for name in labelnames], ensure_ascii=False)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labelnames, values, extra=None) -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(labelnames, values)]
+    if extra:
+        pairs.extend(f'{n}="{_escape(v)}"' for n, v in extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    kind = ""
+
+    def __init__(self, name, documentation, labelnames=(), registry=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        (registry or REGISTRY).register(self)
+
+    def describe(self) -> dict:
+        return {"type": self.kind, "help": self.documentation, "labelnames": list(self.labelnames)}
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            data = self.describe()
+            data["samples"] = json.loads(json.dumps(self._values))
+        return data
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount=1.0, **labels):
+        key = _label_key(self.labelnames, labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+        _mark_dirty()
+
+
+class Gauge(Metric):
+    """Gauge; ``merge`` define como combinar processos: sum, max ou last."""
+
+    kind = "gauge"
+
+    def __init__(self, name, documentation, labelnames=(), registry=None, merge="sum"):
+        self.merge = merge
+        super().__init__(name, documentation, labelnames, registry)
+
+    def describe(self) -> dict:
+        data = super().describe()
+        data["merge"] = self.merge
+        return data
+
+    def set(self, value, **labels):
+        key = _label_key(self.labelnames, labels)
+        with self._lock:
+            self._values[key] = float(value)
+        _mark_dirty()
+
+    def inc(self, amount=1.0, **labels):
+        key = _label_key(self.labelnames, labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+        _mark_dirty()
+
+    def dec(self, amount=1.0, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), registry=None, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def describe(self) -> dict:
+        data = super().describe()
+        data["buckets"] = list(self.buckets)
+        return data
+
+    def observe(self, value, **labels):
+        key = _label_key(self.labelnames, labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            sample = self._values.get(key)
+            if sample is None:
+                sample = self._values[key] = {"counts": [0] * (len(self.buckets) + 1), "sum": 0.0}
+            # contagens por faixa (não cumulativas); o último slot é +Inf
+            sample["counts"][index] += 1
+            sample["sum"] += value
+        _mark_dirty()
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+
+    def register(self, metric: Metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Métrica duplicada: {metric.name}")
+        self._metrics[metric.name] = metric
+
+    def snapshot(self) -> dict:
+        return {name: metric.snapshot() for name, metric in self._metrics.items()}
+
+
+REGISTRY = Registry()
+
+
+# ----------------------- Agregação entre processos -----------------------
+
+def merge_snapshots(snapshots) -> dict:
+    """Combina snapshots de vários processos (lista de (timestamp, dados))."""
+    merged = {}
+    for updated_at, data in sorted(snapshots, key=lambda item: item[0]):
+        for name, metric in data.items():
+            target = merged.setdefault(name, {**{k: v for k, v in metric.items() if k != "samples"}, "samples": {}})
+            samples = target["samples"]
+            for key, value in metric.get("samples", {}).items():
+                if metric["type"] == "histogram":
+                    current = samples.get(key)
+                    if current is None or len(current["counts"]) != len(value["counts"]):
+                        samples[key] = {"counts": list(value["counts"]), "sum": value["sum"]}
+                    else:
+                        current["counts"] = [a + b for a, b in zip(current["counts"], value["counts"])]
+                        current["sum"] += value["sum"]
+                elif metric["type"] == "gauge" and metric.get("merge") == "max":
+                    samples[key] = max(samples.get(key, value), value)
+                elif metric["type"] == "gauge" and metric.get("merge") == "last":
+                    samples[key] = value  # ordenado por timestamp: o mais recente vence
+                else:
+                    samples[key] = samples.get(key, 0.0) + value
+    return merged
+
+
+def render_text(merged: dict) -> str:
+    """Formato de exposição texto do Prometheus (version 0.0.4)."""
+    lines = []
+    for name in sorted(merged):
+        metric = merged[name]
+        labelnames = metric.get("labelnames", [])
+        exposed = name
+        if metric["type"] == "counter" and not name.endswith("_total"):
+            exposed = f"{name}_total"
+        lines.append(f"# HELP {exposed} {metric.get('help', '')}")
+        lines.append(f"# TYPE {exposed} {metric['type']}")
+        for key in sorted(metric["samples"]):
+            values = json.loads(key)
+            sample = metric["samples"][key]
+            if metric["type"] == "histogram":
+                cumulative = 0
+                bounds = list(metric["buckets"]) + [float("inf")]
+                for bound, count in zip(bounds, sample["counts"]):
+                    cumulative += count
+                    labels = _format_labels(labelnames, values, [("le", _format_value(float(bound)))])
+                    lines.append(f"{name}_bucket{labels} {cumulative}")
+                labels = _format_labels(labelnames, values)
+                lines.append(f"{name}_sum{labels} {_format_value(float(sample['sum']))}")
+                lines.append(f"{name}_count{labels} {cumulative}")
+            else:
+                lines.append(f"{exposed}{_format_labels(labelnames, values)} {_format_value(float(sample))}")
+    return "\n".join(lines) + "\n"
+
+
+# ----------------------- Persistência dos snapshots -----------------------
+
+_flush_lock = threading.Lock()
+_last_flush = 0.0
+_process = None
+
+
+def process_id() -> str:
+    """
+    host:pid:início do processo. Só host:pid se repete (PID reaproveitado em
+    contêineres e crons) e o processo novo sobrescreveria o snapshot do antigo.
+    """
+    global _process
+    pid = os.getpid()
+    # Recalculado após fork (workers do gunicorn herdam o módulo já importado)
+    if _process is None or _process[0] != pid:
+        _process = (pid, f"{socket.gethostname()}:{pid}:{time.time_ns() // 1000:x}")
+    return _process[1]
+
+
+def flush(force: bool = False):
+    """
+    Grava o snapshot deste processo (no máximo a cada METRICS_FLUSH_INTERVAL).
+    Processo que não registrou nada desde o último snapshot não toca no banco.
+    """
+    global _last_flush, _dirty
+    if not _dirty or not getattr(settings, "METRICS_ENABLED", True):
+        return
+    now = time.time()
+    if not force and now - _last_flush < getattr(settings, "METRICS_FLUSH_INTERVAL", 15):
+        return
+    if not _flush_lock.acquire(blocking=False):
+        return
+    try:
+        from django.apps import apps
+        MetricsSnapshot = apps.get_model("rb_ingestor", "MetricsSnapshot")
+        # Limpa antes do snapshot: o que for registrado durante a gravação fica para a próxima
+        _dirty = False
+        MetricsSnapshot.objects.update_or_create(
+            processo=process_id(), defaults={"dados": REGISTRY.snapshot()}
+        )
+        _last_flush = now
+    except Exception as e:
+        _dirty = True
+        logger.warning(f"Falha ao gravar snapshot de métricas: {e}")
+    finally:
+        _flush_lock.release()
+
+
+def collect() -> dict:
+    """Snapshot agregado de todos os processos (inclui o atual, recém-gravado)."""
+    from django.apps import apps
+    from django.utils import timezone
+
+    MetricsSnapshot = apps.get_model("rb_ingestor", "MetricsSnapshot")
+    flush(force=True)
+    retention = getattr(settings, "METRICS_SNAPSHOT_RETENTION_DAYS", 7)
+    MetricsSnapshot.objects.filter(atualizado_em__lt=timezone.now() - timedelta(days=retention)).delete()
+    rows = MetricsSnapshot.objects.values_list("atualizado_em", "dados")
+    merged = merge_snapshots([(row[0].timestamp(), row[1]) for row in rows])
+    # Garante que métricas ainda sem amostras apareçam com HELP/TYPE
+    for name, metric in REGISTRY.snapshot().items():
+        merged.setdefault(name, {**metric, "samples": {}})
+    _add_derived(merged)
+    return merged
+
+
+def _add_derived(merged: dict):
+    """Métricas calculadas na coleta a partir das demais."""
+    hits = sum(merged.get("radarbr_cache_hits", {}).get("samples", {}).values())
+    misses = sum(merged.get("radarbr_cache_misses", {}).get("samples", {}).values())
+    merged["radarbr_cache_hit_ratio"] = {
+        "type": "gauge",
+        "help": "Fração de leituras de cache atendidas (todas as views)",
+        "labelnames": [],
+        "samples": {"[]": round(hits / (hits + misses), 4) if hits + misses else 0.0},
+    }
+
+
+atexit.register(flush, force=True)
+
+
+# ----------------------- Métricas do RadarBR -----------------------
+
+REQUEST_LATENCY = Histogram(
+    "radarbr_request_duration_seconds", "Latência das requisições por view",
+    ["view", "method"],
+)
+REQUESTS = Counter(
+    "radarbr_requests", "Requisições por view e status", ["view", "status"],
+)
+CACHE_HITS = Counter("radarbr_cache_hits", "Leituras de cache com acerto", ["view"])
+CACHE_MISSES = Counter("radarbr_cache_misses", "Leituras de cache sem acerto", ["view"])
+ENGAGEMENT_UPDATES = Counter(
+    "radarbr_engagement_updates", "Atualizações de engajamento gravadas (views, clicks, shares)", ["kind"],
+)
+INGEST_STAGE_LATENCY = Histogram(
+    "radarbr_ingest_stage_duration_seconds", "Duração das etapas da ingestão",
+    ["command", "stage"], buckets=INGEST_BUCKETS,
+)
+INGEST_STAGE_FAILURES = Counter(
+    "radarbr_ingest_stage_failures", "Falhas (exceção ou resultado vazio) por etapa da ingestão",
+    ["command", "stage"],
+)
+INGEST_HTTP_REQUESTS = Counter(
+    "radarbr_ingest_http_requests", "Requisições HTTP da ingestão por conexão nova ou reaproveitada",
+    ["connection"],
+)
+
+LLM_REQUESTS = Counter(
+    "radarbr_llm_requests", "Chamadas à API de chat por resultado (ok, rate_limited, timeout...)", ["outcome"],
+)
+LLM_LATENCY = Histogram(
+    "radarbr_llm_duration_seconds", "Duração das chamadas bem-sucedidas à API de chat", buckets=INGEST_BUCKETS,
+)
+
+LLM_CACHE = Counter(
+    "radarbr_llm_cache", "Consultas ao cache de respostas da IA (hit, miss, bypass)", ["result"],
+)
+LLM_CACHE_SAVED = Counter(
+    "radarbr_llm_cache_saved_usd", "Custo estimado (USD) das chamadas à IA evitadas pelo cache",
+)
+
+
+def ingest_stage(stage: str, empty_is_failure: bool = True):
+    """Decorator para métodos dos comandos de ingestão: mede a duração da
+    etapa e conta falha quando ela levanta exceção ou não devolve nada."""
+    def decorator(func):
+        command = func.__module__.rsplit(".", 1)[-1]
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            failed = True
+            try:
+                result = func(*args, **kwargs)
+                failed = empty_is_failure and not result
+                return result
+            finally:
+                INGEST_STAGE_LATENCY.observe(time.perf_counter() - start, command=command, stage=stage)
+                if failed:
+                    INGEST_STAGE_FAILURES.inc(command=command, stage=stage)
+                flush()
+        return wrapper
+    return decorator
@@ -0,0 +1,228 @@
+# core/performance.py
+"""
+Instrumentação de performance por requisição.
+
+Mede, para cada request do portal:
+- quantidade e tempo das queries SQL (via connection.execute_wrapper)
+- tempo de renderização de templates
+- hits/misses de cache
+
+Os números são enviados no header ``Server-Timing`` e registrados como
+uma linha JSON no logger ``radarbr.perf`` (agregada pelo comando
+``perf_report``).
+"""
+from __future__ import annotations
+
+import json
+import logging
+import time
+from contextlib import ExitStack
+from contextvars import ContextVar
+from typing import Optional
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from core import metrics as radar_metrics
+from core.slow_queries import current_call_site
+
+logger = logging.getLogger("radarbr.perf")
+
+_MISSING = object()
+
+
+class RequestMetrics:
+    """Acumulador das métricas de uma única requisição."""
+
+    __slots__ = (
+        "started", "sql_count", "sql_time", "template_time",
+        "cache_hits", "cache_misses",
+    )
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.template_time = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+
+# Métricas da requisição corrente (None fora de um request instrumentado)
+current_metrics: ContextVar[Optional[RequestMetrics]] = ContextVar(
+    "radarbr_request_metrics", default=None
+)
+
+
+def sql_wrapper(execute, sql, params, many, context):
+    """execute_wrapper que conta e cronometra as queries do request atual."""
+    metrics = current_metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.sql_count += 1
+        metrics.sql_time += time.perf_counter() - start
+
+
+# ----------------------- Hooks de template e cache -----------------------
+
+_hooks_installed = False
+
+
+def _install_template_hook():
+    """Cronometra Template.render do backend Django (apenas o template raiz)."""
+    from django.template.backends.django import Template
+
+    original_render = Template.render
+
+    def render(self, context=None, request=None):
+        metrics = current_metrics.get()
+        if metrics is None:
+            return original_render(self, context, request)
+        start = time.perf_counter()
+        try:
+            return original_render(self, context, request)
+        finally:
+            metrics.template_time += time.perf_counter() - start
+
+    Template.render = render
+
+
+def _install_cache_hooks():
+    """Conta hits/misses em get/get_many dos backends de cache configurados."""
+    from django.core.cache import caches
+    from django.core.cache.backends.base import BaseCache
+
+    patched = set()
+    for alias in getattr(settings, "CACHES", {}):
+        backend_cls = type(caches[alias])
+        if backend_cls in patched:
+            continue
+        patched.add(backend_cls)
+
+        original_get = backend_cls.get
+        original_get_many = backend_cls.get_many
+
+        def get(self, key, default=None, version=None, _orig=original_get):
+            metrics = current_metrics.get()
+            if metrics is None:
+                return _orig(self, key, default, version=version)
+            value = _orig(self, key, _MISSING, version=version)
+            if value is _MISSING:
+                metrics.cache_misses += 1
+                return default
+            metrics.cache_hits += 1
+            return value
+
+        def get_many(self, keys, version=None, _orig=original_get_many):
+            keys = list(keys)
+            found = _orig(self, keys, version=version)
+            metrics = current_metrics.get()
+            if metrics is not None:
+                metrics.cache_hits += len(found)
+                metrics.cache_misses += len(keys) - len(found)
+            return found
+
+        backend_cls.get = get
+        # O get_many do BaseCache (LocMemCache, FileBasedCache) chama self.get,
+        # que já conta cada chave: só conta aqui quem tem get_many próprio
+        if original_get_many is not BaseCache.get_many:
+            backend_cls.get_many = get_many
+
+
+def install_hooks():
+    global _hooks_installed
+    if _hooks_installed:
+        return
+    _install_template_hook()
+    _install_cache_hooks()
+    _hooks_installed = True
+
+
+# ----------------------- Middleware -----------------------
+
+def resolve_view_name(request) -> str:
+    """Nome da URL resolvida (home, noticia, categoria...) ou o path."""
+    match = getattr(request, "resolver_match", None)
+    if match is not None:
+        if match.url_name:
+            return match.view_name
+        return match._func_path
+    return "unresolved"
+
+
+def server_timing_header(metrics: RequestMetrics, total: float) -> str:
+    parts = [
+        f'db;dur={metrics.sql_time * 1000:.1f};desc="SQL ({metrics.sql_count} queries)"',
+        f'tpl;dur={metrics.template_time * 1000:.1f};desc="Templates"',
+        f'cache;desc="hits={metrics.cache_hits} misses={metrics.cache_misses}"',
+        f'total;dur={total * 1000:.1f}',
+    ]
+    return ", ".join(parts)
+
+
+class PerformanceMiddleware:
+    """Mede SQL, templates e cache por requisição e publica os resultados."""
+
+    def __init__(self, get_response):
+        if not getattr(settings, "PERF_INSTRUMENTATION", True):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.emit_header = getattr(settings, "PERF_SERVER_TIMING", True)
+        install_hooks()
+
+    def __call__(self, request):
+        metrics = RequestMetrics()
+        token = current_metrics.set(metrics)
+        site_token = current_call_site.set(f"path:{request.path}")
+        try:
+            with ExitStack() as stack:
+                for conn in connections.all():
+                    stack.enter_context(conn.execute_wrapper(sql_wrapper))
+                response = self.get_response(request)
+        finally:
+            current_call_site.reset(site_token)
+            current_metrics.reset(token)
+
+        total = metrics.elapsed
+        view_name = resolve_view_name(request)
+
+        if self.emit_header:
+            response["Server-Timing"] = server_timing_header(metrics, total)
+
+        logger.info(json.dumps({
+            "event": "request",
+            "view": view_name,
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "total_ms": round(total * 1000, 2),
+            "db_ms": round(metrics.sql_time * 1000, 2),
+            "db_queries": metrics.sql_count,
+            "tpl_ms": round(metrics.template_time * 1000, 2),
+            "cache_hits": metrics.cache_hits,
+            "cache_misses": metrics.cache_misses,
+            "ts": time.time(),
+        }))
+
+        radar_metrics.REQUEST_LATENCY.observe(total, view=view_name, method=request.method)
+        radar_metrics.REQUESTS.inc(view=view_name, status=response.status_code)
+        if metrics.cache_hits:
+            radar_metrics.CACHE_HITS.inc(metrics.cache_hits, view=view_name)
+        if metrics.cache_misses:
+            radar_metrics.CACHE_MISSES.inc(metrics.cache_misses, view=view_name)
+        radar_metrics.flush()
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        # A partir daqui a URL já foi resolvida: queries lentas saem com o nome da view
+        current_call_site.set(f"view:{resolve_view_name(request)}")
+        return None
@@ -0,0 +1,142 @@
+# core/profiling.py
+"""
+Profiling sob demanda para requisições de staff.
+
+Uma requisição só é perfilada quando:
+- o usuário está autenticado e é staff
+- a query string traz ``?_profile=<token>``, onde o token é assinado
+  (``make_profile_token``) para esse usuário e ainda não expirou
+
+Nesse caso a view roda sob ``cProfile`` e o resultado (top funções por
+tempo acumulado, árvore de chamadas, lista de SQL e o ``.prof`` bruto)
+vai para a tabela ``ProfileRun``, de onde pode ser baixado pelo admin.
+Para as demais requisições o middleware só olha a query string.
+"""
+from __future__ import annotations
+
+import cProfile
+import io
+import logging
+import marshal
+import pstats
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core import signing
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+SALT = "radarbr.profiling"
+
+
+def make_profile_token(user) -> str:
+    """Token assinado que habilita o profiling para este usuário."""
+    return signing.TimestampSigner(salt=SALT).sign(str(user.pk))
+
+
+def _token_is_valid(token: str, user) -> bool:
+    max_age = getattr(settings, "PROFILE_TOKEN_MAX_AGE", 3600)
+    try:
+        value = signing.TimestampSigner(salt=SALT).unsign(token, max_age=max_age)
+    except signing.BadSignature:
+        return False
+    return value == str(user.pk)
+
+
+class _SqlRecorder:
+    """execute_wrapper que guarda cada query executada durante o profiling."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append({
+                "db": context["connection"].alias,
+                "sql": sql,
+                "params": repr(params)[:500],
+                "ms": round((time.perf_counter() - start) * 1000, 3),
+            })
+
+
+def build_report(profiler: cProfile.Profile, limit: int = 40) -> str:
+    """Top funções por tempo acumulado + quem cada uma chama (árvore)."""
+    stream = io.StringIO()
+    stats = pstats.Stats(profiler, stream=stream)
+    stats.strip_dirs().sort_stats("cumulative")
+    stream.write("=== TOP FUNÇÕES (tempo acumulado) ===\n")
+    stats.print_stats(limit)
+    stream.write("\n=== ÁRVORE DE CHAMADAS (callees) ===\n")
+    stats.print_callees(limit // 2)
+    return stream.getvalue()
+
+
+class ProfilingMiddleware:
+    """Perfila a requisição quando staff envia um ``_profile`` assinado válido."""
+
+    def __init__(self, get_response):
+        if not getattr(settings, "PROFILING_ENABLED", True):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.param = getattr(settings, "PROFILE_PARAM", "_profile")
+        self.marker = f"{self.param}="
+
+    def __call__(self, request):
+        # Caminho normal: só uma busca de substring na query string
+        if self.marker not in request.META.get("QUERY_STRING", ""):
+            return self.get_response(request)
+
+        user = getattr(request, "user", None)
+        token = request.GET.get(self.param, "")
+        if not (user and user.is_authenticated and user.is_staff and _token_is_valid(token, user)):
+            return self.get_response(request)
+
+        return self._profile(request, user)
+
+    def _profile(self, request, user):
+        recorder = _SqlRecorder()
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for conn in connections.all():
+                stack.enter_context(conn.execute_wrapper(recorder))
+            profiler.enable()
+            try:
+                response = self.get_response(request)
+            finally:
+                profiler.disable()
+        duration_ms = (time.perf_counter() - started) * 1000
+
+        run = self._store(request, user, profiler, recorder.queries, duration_ms, response.status_code)
+        if run is not None:
+            response["X-Profile-Id"] = str(run.pk)
+        return response
+
+    def _store(self, request, user, profiler, queries, duration_ms, status):
+        from django.apps import apps
+        from core.performance import resolve_view_name
+
+        ProfileRun = apps.get_model("rb_ingestor", "ProfileRun")
+        stats = pstats.Stats(profiler)
+        try:
+            return ProfileRun.objects.create(
+                path=request.get_full_path()[:500],
+                view=resolve_view_name(request)[:200],
+                usuario=user.get_username()[:150],
+                status_code=status,
+                duracao_ms=round(duration_ms, 2),
+                num_queries=len(queries),
+                sql_ms=round(sum(q["ms"] for q in queries), 2),
+                relatorio=build_report(profiler),
+                queries=queries,
+                pstats_data=marshal.dumps(stats.stats),
+            )
+        except Exception as e:
+            logger.warning(f"Falha ao gravar profile de {request.path}: {e}")
+            return None
@@ -49,14 +49,42 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
+    "core.performance.PerformanceMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "core.profiling.ProfilingMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# --- INSTRUMENTAÇÃO DE PERFORMANCE ---
+# Métricas por requisição (SQL, templates, cache) em Server-Timing + log JSON
+PERF_INSTRUMENTATION = os.getenv("PERF_INSTRUMENTATION", "True") == "True"
+PERF_SERVER_TIMING = os.getenv("PERF_SERVER_TIMING", "True") == "True"
+# Arquivo opcional onde as linhas do logger "radarbr.perf" são gravadas (lido por perf_report)
+PERF_LOG_FILE = os.getenv("PERF_LOG_FILE", "")
+
+# Log de queries lentas (tabela SlowQuery no admin + logger "radarbr.slowquery")
+SLOW_QUERY_LOG = os.getenv("SLOW_QUERY_LOG", "True") == "True"
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+SLOW_QUERY_EXPLAIN = os.getenv("SLOW_QUERY_EXPLAIN", "True") == "True"
+SLOW_QUERY_EXPLAIN_INTERVAL = int(os.getenv("SLOW_QUERY_EXPLAIN_INTERVAL", "3600"))
+SLOW_QUERY_PERSIST = os.getenv("SLOW_QUERY_PERSIST", "True") == "True"
+SLOW_QUERY_LOG_FILE = os.getenv("SLOW_QUERY_LOG_FILE", "")
+
+# Métricas Prometheus em /metrics (snapshots por processo na tabela MetricsSnapshot)
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "True") == "True"
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+METRICS_FLUSH_INTERVAL = int(os.getenv("METRICS_FLUSH_INTERVAL", "15"))
+METRICS_SNAPSHOT_RETENTION_DAYS = int(os.getenv("METRICS_SNAPSHOT_RETENTION_DAYS", "7"))
+
+# Profiling sob demanda: staff + ?_profile=<token assinado> (ver admin "Profiles de requisições")
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "True") == "True"
+PROFILE_PARAM = os.getenv("PROFILE_PARAM", "_profile")
+PROFILE_TOKEN_MAX_AGE = int(os.getenv("PROFILE_TOKEN_MAX_AGE", "3600"))
+
 ROOT_URLCONF = "core.urls"
 
 TEMPLATES = [
@@ -189,4 +217,40 @@ CLOUDINARY_STORAGE = {
 # Configurar Cloudinary como storage padrão para mídia
 DEFAULT_FILE_STORAGE = 'cloudinary_storage.storage.MediaCloudinaryStorage'
 
-DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
\ No newline at end of file
+DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+# --- LOGGING ---
+_perf_handlers = ["console"]
+_slowquery_handlers = ["console"]
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "perf": {"format": "%(asctime)s %(name)s %(message)s"},
+    },
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "radarbr.perf": {"handlers": _perf_handlers, "level": "INFO", "propagate": False},
+        "radarbr.slowquery": {"handlers": _slowquery_handlers, "level": "WARNING", "propagate": False},
+    },
+}
+if PERF_LOG_FILE:
+    LOGGING["handlers"]["perf_file"] = {
+        "class": "logging.handlers.RotatingFileHandler",
+        "filename": PERF_LOG_FILE,
+        "maxBytes": 10 * 1024 * 1024,
+        "backupCount": 5,
+        "formatter": "perf",
+    }
+    _perf_handlers.append("perf_file")
+if SLOW_QUERY_LOG_FILE:
+    LOGGING["handlers"]["slowquery_file"] = {
+        "class": "logging.handlers.RotatingFileHandler",
+        "filename": SLOW_QUERY_LOG_FILE,
+        "maxBytes": 10 * 1024 * 1024,
+        "backupCount": 5,
+        "formatter": "perf",
+    }
+    _slowquery_handlers.append("slowquery_file")
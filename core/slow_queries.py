@@ -0,0 +1,255 @@
+# core/slow_queries.py
+"""
+Log de queries lentas com plano de execução (EXPLAIN).
+
+Toda query acima de ``SLOW_QUERY_MS`` é registrada com:
+- SQL normalizado (literais trocados por ``?``) e fingerprint md5
+- origem: view do portal (``view:home``) ou comando (``command:automacao_render``)
+- saída do ``EXPLAIN`` do backend atual
+
+Os registros são agregados por fingerprint na tabela ``SlowQuery``
+(contagem, tempo total e máximo) e também emitidos no logger
+``radarbr.slowquery`` (que pode gravar em arquivo rotativo).
+"""
+from __future__ import annotations
+
+import atexit
+import hashlib
+import json
+import logging
+import re
+import sys
+import threading
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from django.conf import settings
+from django.db import connections
+from django.core.signals import request_finished
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger("radarbr.slowquery")
+
+# Origem da query corrente ("view:home", "command:publish_topic"...)
+current_call_site: ContextVar[Optional[str]] = ContextVar(
+    "radarbr_call_site", default=None
+)
+
+# Evita recursão: o EXPLAIN e a gravação do registro também passam pelo wrapper
+_capturing: ContextVar[bool] = ContextVar("radarbr_slowquery_capturing", default=False)
+
+# fingerprint -> último EXPLAIN feito neste processo
+_explained_at = {}
+
+# Conexões auxiliares por thread: o EXPLAIN e a gravação não podem rodar na
+# conexão original (cursor ainda aberto / transação do chamador)
+_local = threading.local()
+
+_RE_STRING = re.compile(r"'(?:[^']|'')*'")
+_RE_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_RE_PLACEHOLDER = re.compile(r"%s|%\([^)]+\)s|\?")
+_RE_IN_LIST = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_RE_SPACES = re.compile(r"\s+")
+
+
+def normalize_sql(sql: str) -> str:
+    """Remove literais e parâmetros para agrupar queries equivalentes."""
+    normalized = _RE_STRING.sub("?", sql)
+    normalized = _RE_PLACEHOLDER.sub("?", normalized)
+    normalized = _RE_NUMBER.sub("?", normalized)
+    normalized = _RE_IN_LIST.sub("IN (...)", normalized)
+    return _RE_SPACES.sub(" ", normalized).strip()
+
+
+def fingerprint(normalized_sql: str) -> str:
+    return hashlib.md5(normalized_sql.encode("utf-8")).hexdigest()
+
+
+def get_call_site() -> str:
+    """Origem da query: contexto do request ou nome do comando em execução."""
+    site = current_call_site.get()
+    if site:
+        return site
+    argv = sys.argv or []
+    if len(argv) > 1 and argv[0].endswith("manage.py"):
+        return f"command:{argv[1]}"
+    if argv:
+        return f"process:{argv[0].rsplit('/', 1)[-1]}"
+    return "unknown"
+
+
+def _side_alias(alias: str) -> str:
+    """Alias de uma conexão separada para o mesmo banco (uma por thread)."""
+    side_alias = f"{alias}__slowquery"
+    registered = getattr(_local, "aliases", None)
+    if registered is None:
+        registered = _local.aliases = set()
+    if side_alias not in registered:
+        connections[side_alias] = connections.create_connection(alias)
+        registered.add(side_alias)
+    connections[side_alias].close_if_unusable_or_obsolete()
+    return side_alias
+
+
+def close_side_connections():
+    """
+    Fecha as conexões auxiliares desta thread. Elas não estão em
+    settings.DATABASES, então o Django nunca as fecha sozinho (no Postgres
+    cada thread ficaria com uma conexão a mais aberta).
+    """
+    for side_alias in getattr(_local, "aliases", ()):
+        try:
+            connections[side_alias].close()
+        except Exception as e:
+            logger.debug(f"Falha ao fechar conexão {side_alias}: {e}")
+
+
+def _explain(side_alias, sql, params) -> str:
+    """Executa EXPLAIN (sem ANALYZE) para a query no mesmo banco."""
+    connection = connections[side_alias]
+    prefix = connection.ops.explain_query_prefix()
+    with connection.cursor() as cursor:
+        cursor.execute(f"{prefix} {sql}", params)
+        rows = cursor.fetchall()
+    return "\n".join(" ".join(str(col) for col in row) for row in rows)
+
+
+def _should_explain(fp: str) -> bool:
+    if not getattr(settings, "SLOW_QUERY_EXPLAIN", True):
+        return False
+    interval = getattr(settings, "SLOW_QUERY_EXPLAIN_INTERVAL", 3600)
+    last = _explained_at.get(fp)
+    return last is None or time.time() - last > interval
+
+
+def record_slow_query(connection, sql, params, many, duration_ms):
+    """Registra a query lenta no log e na tabela SlowQuery (deduplicada)."""
+    normalized = normalize_sql(sql)
+    fp = fingerprint(normalized)
+    site = get_call_site()
+    side_alias = _side_alias(connection.alias)
+
+    plan = ""
+    if not many and sql.lstrip()[:6].upper() in ("SELECT", "UPDATE", "DELETE", "INSERT") and _should_explain(fp):
+        try:
+            plan = _explain(side_alias, sql, params)
+            _explained_at[fp] = time.time()
+        except Exception as e:
+            plan = f"EXPLAIN indisponível: {e}"
+
+    logger.warning(json.dumps({
+        "event": "slow_query",
+        "fingerprint": fp,
+        "call_site": site,
+        "db": connection.alias,
+        "duration_ms": round(duration_ms, 2),
+        "sql": normalized[:2000],
+    }, ensure_ascii=False))
+
+    if getattr(settings, "SLOW_QUERY_PERSIST", True):
+        entry = (side_alias, connection.alias, fp, normalized, sql, site, plan, duration_ms)
+        if connection.vendor == "sqlite":
+            # No SQLite qualquer cursor aberto na conexão original bloqueia a
+            # escrita da conexão auxiliar: grava no fim do request/comando
+            _pending().append(entry)
+        else:
+            _persist_safely(entry)
+
+
+def _pending() -> list:
+    pending = getattr(_local, "pending", None)
+    if pending is None:
+        pending = _local.pending = []
+    return pending
+
+
+def _persist_safely(entry):
+    try:
+        _persist(*entry)
+    except Exception as e:
+        logger.debug(f"Falha ao gravar SlowQuery {entry[2]}: {e}")
+
+
+def flush_pending(**kwargs):
+    """Grava os registros adiados (SQLite). Chamado em request_finished e no exit."""
+    pending = _pending()
+    if not pending:
+        return
+    token = _capturing.set(True)
+    try:
+        while pending:
+            _persist_safely(pending.pop(0))
+    finally:
+        close_side_connections()
+        _capturing.reset(token)
+
+
+def _persist(side_alias, alias, fp, normalized, sql, site, plan, duration_ms):
+    from django.apps import apps
+    from django.db.models import F
+    from django.db.models.functions import Greatest
+    from django.utils import timezone
+
+    SlowQuery = apps.get_model("rb_ingestor", "SlowQuery")
+    now = timezone.now()
+    updates = {
+        "ocorrencias": F("ocorrencias") + 1,
+        "tempo_total_ms": F("tempo_total_ms") + duration_ms,
+        "tempo_max_ms": Greatest(F("tempo_max_ms"), duration_ms),
+        "origem": site[:200],
+        "ultima_vez": now,
+    }
+    if plan:
+        updates["plano"] = plan
+        updates["sql_exemplo"] = sql
+    updated = SlowQuery.objects.using(side_alias).filter(fingerprint=fp).update(**updates)
+    if not updated:
+        SlowQuery.objects.using(side_alias).create(
+            fingerprint=fp,
+            sql_normalizado=normalized,
+            sql_exemplo=sql,
+            origem=site[:200],
+            banco=alias,
+            plano=plan,
+            ocorrencias=1,
+            tempo_total_ms=duration_ms,
+            tempo_max_ms=duration_ms,
+            ultima_vez=now,
+        )
+
+
+def slow_query_wrapper(execute, sql, params, many, context):
+    """execute_wrapper permanente que detecta queries acima do limite."""
+    if _capturing.get():
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    result = execute(sql, params, many, context)
+    duration_ms = (time.perf_counter() - start) * 1000
+    if duration_ms >= getattr(settings, "SLOW_QUERY_MS", 200):
+        token = _capturing.set(True)
+        try:
+            record_slow_query(context["connection"], sql, params, many, duration_ms)
+        except Exception as e:
+            logger.debug(f"Falha ao registrar query lenta: {e}")
+        finally:
+            # Query lenta é rara: reabrir a conexão auxiliar custa menos que deixá-la aberta
+            close_side_connections()
+            _capturing.reset(token)
+    return result
+
+
+def _attach(connection, **kwargs):
+    if slow_query_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(slow_query_wrapper)
+
+
+def install():
+    """Conecta o wrapper a todas as conexões (web e management commands)."""
+    if not getattr(settings, "SLOW_QUERY_LOG", True):
+        return
+    connection_created.connect(_attach, dispatch_uid="radarbr_slow_query_log")
+    request_finished.connect(flush_pending, dispatch_uid="radarbr_slow_query_flush")
+    atexit.register(flush_pending)
+    for conn in connections.all(initialized_only=True):
+        _attach(conn)
@@ -8,7 +8,7 @@ from django.contrib.sitemaps.views import sitemap
 
 # Importe as views do rb_portal e outras ferramentas
 from rb_portal import views as portal_views
-from core.views import robots_txt
+from core.views import robots_txt, metrics
 from rb_noticias.sitemaps import NoticiasSitemap, CategoriaSitemap, StaticViewsSitemap
 from rb_noticias.feeds import UltimasNoticiasFeed
 from rb_ingestor.management.commands.automacao_webhook import automacao_webhook_view
@@ -38,6 +38,7 @@ urlpatterns = [
     # Sitemaps, Feeds, etc.
     path("sitemap.xml", sitemap, {"sitemaps": sitemaps}, name="sitemap"),
     path("robots.txt", robots_txt, name="robots_txt"),
+    path("metrics", metrics, name="metrics"),
     path("feed/", UltimasNoticiasFeed(), name="rss_feed"),
     path("ads.txt", TemplateView.as_view(template_name="ads.txt", content_type="text/plain")),
 
@@ -1,6 +1,11 @@
 # core/views.py
-from django.http import HttpResponse
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
 from django.urls import reverse
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.cache import never_cache
+
+from core import metrics as radar_metrics
 
 def robots_txt(request):
     lines = [
@@ -11,3 +16,15 @@ def robots_txt(request):
         f"Sitemap: {request.build_absolute_uri(reverse('sitemap'))}",
     ]
     return HttpResponse("\n".join(lines), content_type="text/plain")
+
+
+@never_cache
+def metrics(request):
+    """Métricas no formato Prometheus (token Bearer ou usuário staff)."""
+    token = getattr(settings, "METRICS_TOKEN", "")
+    auth = request.headers.get("Authorization", "")
+    authorized = bool(token) and constant_time_compare(auth, f"Bearer {token}")
+    if not authorized and not (request.user.is_authenticated and request.user.is_staff):
+        return HttpResponseForbidden("forbidden")
+    body = radar_metrics.render_text(radar_metrics.collect())
+    return HttpResponse(body, content_type="text/plain; version=0.0.4; charset=utf-8")
@@ -1,3 +1,233 @@
+import json
+
 from django.contrib import admin
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import path, reverse
+from django.utils.html import format_html
+
+from .models import SlowQuery, ProfileRun, DomainFetchStats, ResolvedLink, IngestJob
+
+
+@admin.register(SlowQuery)
+class SlowQueryAdmin(admin.ModelAdmin):
+    list_display = ['fingerprint_curto', 'origem', 'ocorrencias', 'tempo_medio', 'tempo_max_ms', 'ultima_vez']
+    list_filter = ['banco', 'origem']
+    search_fields = ['sql_normalizado', 'origem', 'fingerprint']
+    date_hierarchy = 'ultima_vez'
+    readonly_fields = [
+        'fingerprint', 'sql_normalizado', 'sql_exemplo', 'origem', 'banco', 'plano',
+        'ocorrencias', 'tempo_total_ms', 'tempo_max_ms', 'primeira_vez', 'ultima_vez',
+    ]
+
+    fieldsets = (
+        ('Query', {
+            'fields': ('fingerprint', 'sql_normalizado', 'origem', 'banco')
+        }),
+        ('Tempos', {
+            'fields': ('ocorrencias', 'tempo_total_ms', 'tempo_max_ms', 'primeira_vez', 'ultima_vez')
+        }),
+        ('Plano de execução', {
+            'fields': ('plano', 'sql_exemplo'),
+        }),
+    )
+
+    @admin.display(description='Fingerprint', ordering='fingerprint')
+    def fingerprint_curto(self, obj):
+        return obj.fingerprint[:12]
+
+    @admin.display(description='Média (ms)')
+    def tempo_medio(self, obj):
+        return f"{obj.tempo_medio_ms:.1f}"
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(ProfileRun)
+class ProfileRunAdmin(admin.ModelAdmin):
+    list_display = ['path', 'view', 'usuario', 'status_code', 'duracao_ms', 'num_queries', 'sql_ms', 'criado_em', 'downloads']
+    list_filter = ['view', 'usuario']
+    search_fields = ['path', 'view']
+    date_hierarchy = 'criado_em'
+    readonly_fields = [
+        'path', 'view', 'usuario', 'status_code', 'duracao_ms', 'num_queries', 'sql_ms',
+        'criado_em', 'downloads', 'relatorio', 'queries_formatadas',
+    ]
+    exclude = ['queries', 'pstats_data']
+
+    fieldsets = (
+        ('Requisição', {
+            'fields': ('path', 'view', 'usuario', 'status_code', 'criado_em', 'downloads')
+        }),
+        ('Tempos', {
+            'fields': ('duracao_ms', 'num_queries', 'sql_ms')
+        }),
+        ('Profile', {
+            'fields': ('relatorio', 'queries_formatadas'),
+        }),
+    )
+
+    def get_urls(self):
+        urls = super().get_urls()
+        custom_urls = [
+            path('token/', self.admin_site.admin_view(self.token_view), name='profilerun_token'),
+            path('<int:pk>/download/<str:kind>/', self.admin_site.admin_view(self.download_view), name='profilerun_download'),
+        ]
+        return custom_urls + urls
+
+    def token_view(self, request):
+        """Token para usar em ?_profile=<token> (válido por PROFILE_TOKEN_MAX_AGE)."""
+        from django.conf import settings
+        from core.profiling import make_profile_token
+        token = make_profile_token(request.user)
+        param = getattr(settings, 'PROFILE_PARAM', '_profile')
+        return HttpResponse(f"{param}={token}\n", content_type="text/plain")
+
+    def download_view(self, request, pk, kind):
+        run = get_object_or_404(ProfileRun, pk=pk)
+        if kind == 'prof':
+            response = HttpResponse(bytes(run.pstats_data), content_type='application/octet-stream')
+            filename = f'profile_{run.pk}.prof'
+        elif kind == 'sql':
+            response = HttpResponse(json.dumps(run.queries, indent=2, ensure_ascii=False), content_type='application/json')
+            filename = f'profile_{run.pk}_sql.json'
+        else:
+            response = HttpResponse(run.relatorio, content_type='text/plain; charset=utf-8')
+            filename = f'profile_{run.pk}.txt'
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+    @admin.display(description='Downloads')
+    def downloads(self, obj):
+        if not obj.pk:
+            return '-'
+        links = [
+            (reverse('admin:profilerun_download', args=[obj.pk, kind]), label)
+            for kind, label in (('prof', '.prof'), ('txt', 'relatório'), ('sql', 'SQL'))
+        ]
+        return format_html(' | '.join('<a href="{}">{}</a>' for _ in links), *[part for link in links for part in link])
+
+    @admin.display(description='Queries SQL')
+    def queries_formatadas(self, obj):
+        lines = [f"[{q.get('ms', 0):.1f}ms] {q.get('sql', '')}" for q in (obj.queries or [])]
+        return format_html('<pre style="white-space: pre-wrap">{}</pre>', '\n'.join(lines))
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(DomainFetchStats)
+class DomainFetchStatsAdmin(admin.ModelAdmin):
+    list_display = ['dominio', 'tier_preferido', 'http_resumo', 'browser_resumo', 'atualizado_em']
+    list_filter = ['tier_preferido']
+    search_fields = ['dominio']
+    readonly_fields = [
+        'dominio', 'http_sucessos', 'http_falhas', 'http_tempo_ms',
+        'browser_sucessos', 'browser_falhas', 'browser_tempo_ms', 'atualizado_em',
+    ]
+    actions = ['zerar_estatisticas']
+
+    fieldsets = (
+        ('Domínio', {
+            'fields': ('dominio', 'tier_preferido', 'atualizado_em')
+        }),
+        ('HTTP simples', {
+            'fields': ('http_sucessos', 'http_falhas', 'http_tempo_ms')
+        }),
+        ('Navegador', {
+            'fields': ('browser_sucessos', 'browser_falhas', 'browser_tempo_ms')
+        }),
+    )
+
+    def _resumo(self, taxa, media_ms):
+        if taxa is None:
+            return '-'
+        return f"{taxa:.0%} em {media_ms:.0f}ms"
+
+    @admin.display(description='HTTP')
+    def http_resumo(self, obj):
+        return self._resumo(obj.http_taxa, obj.http_media_ms)
+
+    @admin.display(description='Navegador')
+    def browser_resumo(self, obj):
+        return self._resumo(obj.browser_taxa, obj.browser_media_ms)
+
+    @admin.action(description='Zerar estatísticas (reaprender o nível)')
+    def zerar_estatisticas(self, request, queryset):
+        updated = queryset.update(
+            http_sucessos=0, http_falhas=0, http_tempo_ms=0,
+            browser_sucessos=0, browser_falhas=0, browser_tempo_ms=0,
+            tier_preferido='http',
+        )
+        self.message_user(request, f"{updated} domínio(s) zerado(s)")
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(ResolvedLink)
+class ResolvedLinkAdmin(admin.ModelAdmin):
+    list_display = ['gn_id_curto', 'url_original', 'metodo', 'usos', 'resolvido_em', 'ultimo_uso']
+    list_filter = ['metodo']
+    search_fields = ['gn_id', 'url_original']
+    date_hierarchy = 'resolvido_em'
+    readonly_fields = ['gn_id', 'gn_url', 'url_original', 'metodo', 'usos', 'resolvido_em', 'ultimo_uso']
+
+    @admin.display(description='ID Google News', ordering='gn_id')
+    def gn_id_curto(self, obj):
+        return obj.gn_id[:24]
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(IngestJob)
+class IngestJobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'origem', 'titulo_curto', 'etapa', 'status', 'tentativas', 'lease_dono', 'noticia', 'atualizado_em']
+    list_filter = ['status', 'etapa', 'origem']
+    search_fields = ['titulo', 'url', 'erro', 'chave']
+    date_hierarchy = 'criado_em'
+    readonly_fields = [
+        'origem', 'titulo', 'url', 'chave', 'etapa', 'status', 'tentativas', 'erro', 'noticia',
+        'lease_dono', 'lease_expira', 'criado_em', 'atualizado_em', 'tempos_formatados', 'artefatos_formatados',
+    ]
+    exclude = ['artefatos', 'tempos']
+    actions = ['reprocessar']
+
+    fieldsets = (
+        ('Job', {
+            'fields': ('origem', 'titulo', 'url', 'chave', 'noticia')
+        }),
+        ('Estado', {
+            'fields': ('etapa', 'status', 'tentativas', 'erro', 'criado_em', 'atualizado_em', 'tempos_formatados')
+        }),
+        ('Lease', {
+            'fields': ('lease_dono', 'lease_expira'),
+        }),
+        ('Artefatos', {
+            'fields': ('artefatos_formatados',),
+        }),
+    )
+
+    @admin.display(description='Título', ordering='titulo')
+    def titulo_curto(self, obj):
+        return obj.titulo[:60]
+
+    @admin.display(description='Tempos por etapa')
+    def tempos_formatados(self, obj):
+        return ', '.join(f"{etapa} {ms}ms" for etapa, ms in (obj.tempos or {}).items()) or '-'
+
+    @admin.display(description='Artefatos')
+    def artefatos_formatados(self, obj):
+        return format_html('<pre style="white-space: pre-wrap">{}</pre>', json.dumps(obj.artefatos, indent=2, ensure_ascii=False))
+
+    @admin.action(description='Reprocessar a partir da etapa atual')
+    def reprocessar(self, request, queryset):
+        updated = queryset.filter(status__in=['falhou', 'descartado']).update(
+            status='pendente', tentativas=0, erro='', lease_dono='', lease_expira=None
+        )
+        self.message_user(request, f"{updated} job(s) voltaram para a fila (rode ingest_pipeline --run)")
 
-# Register your models here.
+    def has_add_permission(self, request):
+        return False
@@ -7,16 +7,12 @@ Gera artigo SEO em PT-BR a partir de um tópico:
 - Integração com sistema de busca de imagens
 """
 from __future__ import annotations
-import os
 import json
 import re
 from typing import Dict
 from html import unescape
 
-try:
-    from openai import OpenAI
-except Exception:
-    OpenAI = None  # o caller deve tratar se a lib não estiver instalada
+from . import llm_client
 
 # Importar sistema de busca de imagens
 try:
@@ -27,7 +23,7 @@ except ImportError:
     image_cache = None
 
 
-MODEL_DEFAULT = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+MODEL_DEFAULT = llm_client.MODEL_DEFAULT
 
 
 def _first_json_blob(text: str) -> str | None:
@@ -115,6 +111,12 @@ def _sanitize_generated_html(raw_html: str) -> str:
     return html.strip()
 
 
+def _usable_article_json(content: str) -> bool:
+    """JSON que parseia e tem seções <h2> (o que generate_article aproveita sem fallback)."""
+    data = json.loads(_first_json_blob(content) or "")
+    return "<h2" in _sanitize_generated_html((data.get("html") or "").strip())
+
+
 def generate_article(topic: str, *, model: str | None = None, min_words: int = 700) -> Dict[str, str]:
     """
     Gera um artigo otimizado para SEO (PT-BR).
@@ -125,10 +127,9 @@ def generate_article(topic: str, *, model: str | None = None, min_words: int = 7
     if not topic or not isinstance(topic, str):
         return _fallback_article(topic or "Assunto")
 
-    if OpenAI is None:
+    if not llm_client.available():
         return _fallback_article(topic)
 
-    client = OpenAI()  # sem proxies; pega OPENAI_API_KEY do ambiente
     model = model or MODEL_DEFAULT
 
     system = (
@@ -177,7 +178,8 @@ DIRETRIZES:
 """
 
     try:
-        resp = client.chat.completions.create(
+        # Cliente compartilhado: limite de concorrência, timeout e backoff em 429 (llm_client.py)
+        content = llm_client.chat(
             model=model,
             messages=[
                 {"role": "system", "content": system},
@@ -188,8 +190,9 @@ DIRETRIZES:
             top_p=0.9,       # Diversidade de vocabulário
             frequency_penalty=0.3,  # Penaliza repetições
             presence_penalty=0.2,   # Incentiva novos tópicos
+            # Resposta que cairia no fallback não vai para o cache (o retry pede de novo)
+            validate=_usable_article_json,
         )
-        content = resp.choices[0].message.content or ""
     except Exception:
         return _fallback_article(topic)
 
@@ -3,27 +3,36 @@
 Sistema de IA melhorado para geração de conteúdo específico e relevante
 """
 from __future__ import annotations
-import os
 import json
 import re
 from typing import Dict, Optional
 from html import unescape
 
-try:
-    from openai import OpenAI
-except Exception:
-    OpenAI = None
+from rb_ingestor import llm_client
 
-MODEL_DEFAULT = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+MODEL_DEFAULT = llm_client.MODEL_DEFAULT
 
-def generate_enhanced_article(topic: str, news_context: Optional[Dict] = None, min_words: int = 800, writing_style: str = None) -> Dict:
+
+class GenerationAborted(Exception):
+    """Levantada por ``on_field`` para interromper a geração em streaming (ex.: título duplicado)."""
+
+
+def generate_enhanced_article(topic: str, news_context: Optional[Dict] = None, min_words: int = 800, writing_style: str = None,
+                              on_field=None) -> Dict:
     """
     Gera artigo melhorado baseado em contexto específico
+
+    Com ``on_field`` a resposta vem em streaming e cada campo do JSON é
+    repassado assim que chega: ``on_field(campo, texto, False)`` para cada
+    trecho e ``on_field(campo, valor, True)`` quando o campo fecha (title,
+    depois dek, depois html). Se ``on_field`` levantar ``GenerationAborted``
+    a conexão é fechada (a IA para de gerar) e a exceção sobe.
     """
-    if not OpenAI:
+    if not llm_client.available():
         return None
     
-    client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    # Sem chave a exceção sobe (o pipeline marca a etapa como falha e retoma depois)
+    llm_client.get_client()
     
     # Selecionar estilo de escrita aleatório se não especificado
     if not writing_style:
@@ -37,7 +46,7 @@ def generate_enhanced_article(topic: str, news_context: Optional[Dict] = None, m
         prompt = create_topic_specific_prompt(topic, min_words, writing_style)
     
     try:
-        response = client.chat.completions.create(
+        request = dict(
             model=MODEL_DEFAULT,
             messages=[
                 {
@@ -62,18 +71,37 @@ REGRAS FUNDAMENTAIS:
             max_tokens=4000,
             top_p=0.95,  # Mais diversidade
             frequency_penalty=0.5,  # Penaliza repetições (evita padrões)
-            presence_penalty=0.3  # Incentiva novos tópicos e variações
+            presence_penalty=0.3,  # Incentiva novos tópicos e variações
+            # Só a resposta aproveitável vai para o cache (curta ou JSON quebrado: o retry pede de novo)
+            validate=lambda text: process_enhanced_response(text, topic, news_context) is not None,
         )
-        
-        content = response.choices[0].message.content
+        content = _stream_fields(request, on_field) if on_field else llm_client.chat(**request)
         
         # Processar resposta
         return process_enhanced_response(content, topic, news_context)
         
+    except GenerationAborted:
+        raise
     except Exception as e:
         print(f"Erro na IA melhorada: {e}")
         return None
 
+def _stream_fields(request: Dict, on_field) -> str:
+    """Consome ``llm_client.chat_stream`` repassando os campos do JSON; devolve a resposta completa."""
+    from rb_ingestor.json_stream import JsonFieldStream
+
+    parser = JsonFieldStream()
+    parts = []
+    stream = llm_client.chat_stream(**request)
+    try:
+        for delta in stream:
+            parts.append(delta)
+            for event, field, value in parser.feed(delta):
+                on_field(field, value, event == "done")
+    finally:
+        stream.close()
+    return "".join(parts)
+
 def create_news_specific_prompt(topic: str, news_context: Dict, min_words: int, writing_style: str = None) -> str:
     """Cria prompt específico baseado em notícia real"""
     
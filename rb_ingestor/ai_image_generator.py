@@ -182,23 +182,19 @@ class AIImageGenerator:
     def _generate_with_dalle(self, prompt: str) -> Optional[str]:
         """Gera imagem usando DALL-E API"""
         try:
-            from openai import OpenAI
-            
-            client = OpenAI(api_key=self.openai_api_key)
+            from rb_ingestor import llm_client
             
             # Limitar tamanho do prompt
             if len(prompt) > 1000:
                 prompt = prompt[:1000]
             
-            response = client.images.generate(
+            # Cache curto (a URL da OpenAI expira): retry do mesmo prompt não gera outra imagem
+            image_url = llm_client.generate_image(
+                prompt,
                 model=self.dalle_model,
-                prompt=prompt,
                 size="1024x1024",
                 quality="standard",
-                n=1
             )
-            
-            image_url = response.data[0].url
             logger.info(f"✅ Imagem gerada com sucesso: {image_url}")
             
             return image_url
@@ -0,0 +1,216 @@
+# rb_ingestor/ai_structured.py
+"""
+Geração estruturada: título, linha fina, corpo, categoria e figuras públicas
+numa única chamada à IA.
+
+O fluxo antigo do publish_topic fazia várias idas à API por matéria:
+reescrita do título (title_styles), corpo (generate_enhanced_article, cujo
+título era descartado) e, na busca de imagem, a análise de figuras públicas
+(SmartPublicFigureDetector._ai_analysis); a categoria ainda era recalculada
+sobre o texto gerado. Aqui o modelo devolve tudo num JSON validado contra
+``article_schema``:
+
+- ``category`` restrita aos slugs de ``Categoria`` (enum do schema)
+- ``figures`` com nome, papel e confiança, usadas pelo detector no lugar
+  da chamada extra
+- a API recebe o schema em ``response_format`` (structured outputs,
+  ``strict``); a resposta é validada de novo aqui (``validate``), então
+  servidores compatíveis sem suporte a schema também funcionam
+
+Desligar: LLM_STRUCTURED=False (volta ao fluxo de várias chamadas).
+Comparação dos dois fluxos: ``manage.py bench_llm --structured``.
+"""
+from __future__ import annotations
+
+import json
+import os
+from typing import Dict, List, Optional
+
+from slugify import slugify
+
+from rb_ingestor import llm_client
+from rb_ingestor.ai_enhanced import (
+    GenerationAborted, _stream_fields, calculate_quality_score, clean_html, clean_text, create_news_specific_prompt,
+    create_topic_specific_prompt, extract_json_from_response,
+)
+
+ENABLED = os.getenv("LLM_STRUCTURED", "True") == "True"
+MIN_WORDS = 500  # mesmo corte do process_enhanced_response
+FIGURE_ROLES = ("politician", "celebrity", "athlete", "businessman", "journalist", "presenter", "other")
+CONFIDENCES = ("high", "medium", "low")
+
+
+class SchemaError(ValueError):
+    """Resposta da IA fora do schema (lista de problemas em ``errors``)."""
+
+    def __init__(self, errors: List[str]):
+        super().__init__("; ".join(errors[:5]))
+        self.errors = errors
+
+
+def category_slugs() -> List[str]:
+    """Slugs de Categoria aceitos na resposta (ou os do SmartCategorizer, com o banco vazio)."""
+    try:
+        from django.apps import apps
+        Categoria = apps.get_model("rb_noticias", "Categoria")
+        slugs = sorted(s for s in Categoria.objects.values_list("slug", flat=True) if s)
+    except Exception:
+        slugs = []
+    if slugs:
+        return slugs
+    from rb_ingestor.smart_categorizer import SmartCategorizer
+    return sorted({slugify(name) for name in SmartCategorizer().category_patterns})
+
+
+def article_schema(categories: List[str]) -> Dict:
+    """JSON Schema da resposta (subconjunto aceito pelo modo ``strict`` da API)."""
+    return {
+        "type": "object",
+        "properties": {
+            # Ordem dos campos = ordem de geração: o título chega primeiro em streaming
+            "title": {"type": "string"},
+            "dek": {"type": "string"},
+            "html": {"type": "string"},
+            "category": {"type": "string", "enum": list(categories)},
+            "figures": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "name": {"type": "string"},
+                        "role": {"type": "string", "enum": list(FIGURE_ROLES)},
+                        "confidence": {"type": "string", "enum": list(CONFIDENCES)},
+                    },
+                    "required": ["name", "role", "confidence"],
+                    "additionalProperties": False,
+                },
+            },
+        },
+        "required": ["title", "dek", "html", "category", "figures"],
+        "additionalProperties": False,
+    }
+
+
+_TYPES = {"object": dict, "array": list, "string": str, "number": (int, float), "integer": int, "boolean": bool}
+
+
+def validate(value, schema: Dict, path: str = "$") -> List[str]:
+    """Problemas de ``value`` frente ao schema (type, enum, required, additionalProperties, items)."""
+    expected = schema.get("type")
+    if expected and (not isinstance(value, _TYPES[expected]) or (expected != "boolean" and isinstance(value, bool))):
+        return [f"{path}: esperado {expected}, veio {type(value).__name__}"]
+    errors = []
+    if "enum" in schema and value not in schema["enum"]:
+        errors.append(f"{path}: {value!r} fora de {schema['enum'][:8]}")
+    if expected == "object":
+        properties = schema.get("properties", {})
+        for name in schema.get("required", []):
+            if name not in value:
+                errors.append(f"{path}.{name}: obrigatório")
+        for name, item in value.items():
+            if name in properties:
+                errors += validate(item, properties[name], f"{path}.{name}")
+            elif schema.get("additionalProperties") is False:
+                errors.append(f"{path}.{name}: campo não previsto")
+    elif expected == "array" and "items" in schema:
+        for i, item in enumerate(value):
+            errors += validate(item, schema["items"], f"{path}[{i}]")
+    return errors
+
+
+def _parse(content: str, schema: Dict) -> Dict:
+    """JSON da resposta conferido pelo schema (SchemaError se não bater)."""
+    data = json.loads(extract_json_from_response(content) or content)
+    errors = validate(data, schema)
+    if errors:
+        raise SchemaError(errors)
+    return data
+
+
+def _word_count(html: str) -> int:
+    return len(clean_html(html).replace('<', ' <').split())
+
+
+def create_structured_prompt(topic: str, news_context: Optional[Dict], min_words: int, writing_style: str,
+                             categories: List[str]) -> str:
+    base = (
+        create_news_specific_prompt(topic, news_context, min_words, writing_style)
+        if news_context else create_topic_specific_prompt(topic, min_words, writing_style)
+    )
+    original_title = (news_context or {}).get("title", "")
+    return f"""{base}
+CAMPOS ADICIONAIS (no mesmo objeto JSON, depois de "html"):
+    "category": editoria do artigo, EXATAMENTE um destes slugs: {", ".join(categories)}
+    "figures": figuras públicas citadas no artigo (lista vazia se nenhuma), cada uma como
+        {{"name": "Nome Completo", "role": um de {"/".join(FIGURE_ROLES)}, "confidence": "high/medium/low"}}
+
+TÍTULO:
+- Inclua a palavra-chave "{topic}"
+- Até 120 caracteres, capitalização editorial, sem nome de portal ou colunista
+{f'- NÃO repita o título original ("{original_title}"): troque palavras por sinônimos e reorganize' if original_title else ''}
+"""
+
+
+def generate_structured_article(topic: str, news_context: Optional[Dict] = None, min_words: int = 800,
+                                writing_style: str = None, categories: List[str] = None, on_field=None) -> Optional[Dict]:
+    """
+    Artigo completo numa chamada: title, dek, html, category (slug), figures,
+    word_count e quality_score. ``None`` se a IA falhar, a resposta sair do
+    schema ou o texto for curto demais (o chamador volta ao fluxo antigo).
+    ``on_field`` funciona como em ``generate_enhanced_article``.
+    """
+    if not llm_client.available():
+        return None
+    llm_client.get_client()
+
+    if not writing_style:
+        from rb_ingestor.writing_styles import writing_style_manager
+        writing_style = writing_style_manager.get_random_style()
+    categories = categories or category_slugs()
+    schema = article_schema(categories)
+
+    try:
+        request = dict(
+            model=llm_client.MODEL_DEFAULT,
+            messages=[
+                {
+                    "role": "system",
+                    "content": "Você é um jornalista brasileiro escrevendo para um portal de notícias real. "
+                               "Escreva como uma pessoa real, com estrutura única e linguagem natural. "
+                               "Responda somente com o objeto JSON pedido.",
+                },
+                {"role": "user", "content": create_structured_prompt(topic, news_context, min_words, writing_style, categories)},
+            ],
+            temperature=0.9,
+            max_tokens=4500,
+            top_p=0.95,
+            frequency_penalty=0.5,
+            presence_penalty=0.3,
+            response_format={
+                "type": "json_schema",
+                "json_schema": {"name": "radarbr_article", "strict": True, "schema": schema},
+            },
+            # Só a resposta aproveitável vai para o cache (fora do schema ou curta: o retry pede de novo)
+            validate=lambda text: _word_count(_parse(text, schema)["html"]) >= MIN_WORDS,
+        )
+        content = _stream_fields(request, on_field) if on_field else llm_client.chat(**request)
+        data = _parse(content, schema)
+    except GenerationAborted:
+        raise
+    except Exception as e:
+        print(f"Erro na geração estruturada: {e}")
+        return None
+
+    html = clean_html(data["html"])
+    word_count = _word_count(data["html"])
+    if word_count < MIN_WORDS:
+        return None
+    return {
+        "title": clean_text(data["title"])[:200],
+        "dek": clean_text(data["dek"])[:220],
+        "html": html,
+        "category": data["category"],
+        "figures": [figure for figure in data["figures"] if figure["name"].strip()],
+        "word_count": word_count,
+        "quality_score": calculate_quality_score(html, topic, news_context),
+    }
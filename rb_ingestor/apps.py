@@ -4,3 +4,13 @@ from django.apps import AppConfig
 class RbIngestorConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'rb_ingestor'
+
+    def ready(self):
+        # Log de queries lentas vale para o portal e para os comandos de ingestão
+        from core.slow_queries import install
+        install()
+
+        # Assinatura MinHash de cada notícia gravada (índice de quase-duplicatas)
+        from django.db.models.signals import post_save
+        from rb_ingestor.minhash import on_noticia_saved
+        post_save.connect(on_noticia_saved, sender="rb_noticias.Noticia", dispatch_uid="rb_ingestor.minhash")
@@ -0,0 +1,126 @@
+# rb_ingestor/article_document.py
+"""
+Página de notícia baixada e parseada uma única vez.
+
+Antes, a mesma matéria era baixada e parseada por cada extrator
+(conteúdo, categoria do site, imagens, imagem principal). Agora o
+``NewsContentExtractor`` registra o ``ArticleDocument`` que produziu e os
+demais extratores recebem o documento (``doc=``) ou o pegam do registro
+pela URL, então uma notícia custa um download e um parse.
+
+- ``tree`` (lxml.html, ver html_engine.py) é construída sob demanda, uma
+  vez; é o único parse do documento
+- a árvore é compartilhada: os extratores só leem, nunca removem nós
+  (para ignorar menus, scripts etc. use ``html_engine.visible_text`` /
+  ``html_engine.in_noise``)
+- o registro é um LRU pequeno em memória (ARTICLE_DOCUMENT_CACHE_SIZE,
+  ARTICLE_DOCUMENT_TTL) indexado pela URL pedida e pela URL final
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+from urllib.parse import urlparse
+
+from rb_ingestor import http_client
+
+CACHE_SIZE = int(os.getenv("ARTICLE_DOCUMENT_CACHE_SIZE", "16"))
+TTL = int(os.getenv("ARTICLE_DOCUMENT_TTL", "900"))
+
+# Regiões que não fazem parte do texto da matéria
+NOISE_TAGS = frozenset({"script", "style", "noscript", "nav", "header", "footer", "aside", "advertisement", "ad"})
+
+
+class ArticleDocument:
+    """Bytes baixados de uma página + árvore parseada (lazy, uma vez só)."""
+
+    def __init__(self, url: str, content, requested_url: str = None, tier: str = "http"):
+        self.url = url
+        self.requested_url = requested_url or url
+        self.content = content
+        self.tier = tier
+        self.fetched_at = time.time()
+        self._tree = None
+        self._lock = threading.Lock()
+
+    @property
+    def domain(self) -> str:
+        return urlparse(self.url).netloc.lower()
+
+    @property
+    def tree(self):
+        """Raiz lxml.html (None se a página estiver vazia)."""
+        with self._lock:
+            if self._tree is None:
+                from rb_ingestor.html_engine import parse_html
+                self._tree = parse_html(self.content)
+            return self._tree
+
+    @property
+    def expired(self) -> bool:
+        return time.time() - self.fetched_at > TTL
+
+
+class _DocumentRegistry:
+    def __init__(self, size: int = CACHE_SIZE):
+        self.size = size
+        self._docs = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "fetches": 0}
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return (url or "").split("#", 1)[0]
+
+    def get(self, url: str) -> Optional[ArticleDocument]:
+        key = self._key(url)
+        with self._lock:
+            doc = self._docs.get(key)
+            if doc is None:
+                return None
+            if doc.expired:
+                del self._docs[key]
+                return None
+            self._docs.move_to_end(key)
+            self.stats["hits"] += 1
+            return doc
+
+    def put(self, doc: ArticleDocument, *aliases: str):
+        with self._lock:
+            for url in {doc.url, doc.requested_url, *aliases}:
+                if url:
+                    self._docs[self._key(url)] = doc
+                    self._docs.move_to_end(self._key(url))
+            while len(self._docs) > self.size:
+                self._docs.popitem(last=False)
+
+    def count_fetch(self):
+        with self._lock:
+            self.stats["fetches"] += 1
+
+
+registry = _DocumentRegistry()
+
+
+def register(doc: ArticleDocument, *aliases: str) -> ArticleDocument:
+    registry.put(doc, *aliases)
+    return doc
+
+
+def get(url: str) -> Optional[ArticleDocument]:
+    return registry.get(url)
+
+
+def load(url: str, timeout: float = 15) -> ArticleDocument:
+    """Documento já baixado nesta execução ou GET pela sessão compartilhada.
+
+    Erros de rede/HTTP são propagados para o extrator tratar como antes.
+    """
+    doc = registry.get(url)
+    if doc is not None:
+        return doc
+    response = http_client.get(url, timeout=timeout, allow_redirects=True)
+    response.raise_for_status()
+    registry.count_fetch()
+    return register(ArticleDocument(response.url, response.content, requested_url=url))
@@ -0,0 +1,355 @@
+# rb_ingestor/browser_pool.py
+"""
+Pool persistente de navegador (Playwright/Chromium) para a ingestão.
+
+Em vez de subir um Chromium novo a cada link, o processo mantém um único
+navegador com poucos contextos reutilizáveis e empresta páginas:
+
+    html = get_browser_pool().run(lambda page: (page.goto(url), page.content())[1])
+
+- contextos são reciclados depois de N páginas
+- o navegador é reiniciado depois de N páginas no total, se cair
+  (health check) ou se o RSS dos processos do Chromium passar do limite
+- tudo é fechado no fim do processo (``threading._register_atexit``, antes
+  de o ``concurrent.futures`` encerrar a thread do navegador)
+
+``fetch_rendered`` é o modo enxuto de carregamento: bloqueia imagens,
+mídia, fontes e domínios de anúncios/rastreadores e termina assim que o
+corpo do artigo aparece e para de crescer, sem esperas fixas.
+
+A API síncrona do Playwright só pode ser usada na thread que a iniciou
+e, enquanto está ativa, deixa um event loop asyncio rodando nessa thread
+(o que faz o ORM do Django recusar queries). Por isso o navegador vive numa
+thread própria: ``run`` executa a função lá e devolve o resultado.
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Optional
+
+DEFAULT_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+
+LAUNCH_ARGS = ["--disable-dev-shm-usage", "--disable-gpu", "--no-first-run", "--mute-audio"]
+
+ARTICLE_SELECTOR = (
+    'article, main, [itemprop="articleBody"], .post-content, .entry-content, '
+    '.article-body, .news-content'
+)
+
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font"}
+
+AD_TRACKER_DOMAINS = (
+    "doubleclick.net", "googlesyndication.com", "googletagservices.com",
+    "googletagmanager.com", "google-analytics.com", "googleadservices.com",
+    "adservice.google.com", "amazon-adsystem.com", "facebook.net",
+    "facebook.com/tr", "scorecardresearch.com", "chartbeat.com",
+    "chartbeat.net", "taboola.com", "outbrain.com", "hotjar.com",
+    "criteo.com", "criteo.net", "adnxs.com", "rubiconproject.com",
+    "pubmatic.com", "openx.net", "quantserve.com", "newrelic.com",
+    "nr-data.net", "onesignal.com", "tiktok.com/i18n/pixel", "clarity.ms",
+)
+
+CONSENT_SELECTORS = [
+    'text=Aceitar', 'text=Concordo', 'text=Accept', 'text=Accept all', 'text=I agree',
+    'button[aria-label="Aceitar tudo"]', 'button[aria-label="Accept all"]'
+]
+
+# Pronto quando o corpo do artigo existe e o tamanho do texto se repete
+# por ``polls`` verificações seguidas
+_READY_JS = """
+([selector, minChars, polls]) => {
+    const el = document.querySelector(selector);
+    if (!el) return false;
+    const len = (el.innerText || "").length;
+    const st = window.__rbReady || (window.__rbReady = {len: -1, hits: 0});
+    if (len >= minChars && len === st.len) { st.hits += 1; } else { st.len = len; st.hits = 0; }
+    return st.hits >= polls;
+}
+"""
+
+
+def _descendant_rss_mb() -> Optional[float]:
+    """Soma o RSS dos processos filhos (Chromium) deste processo, via /proc."""
+    if not os.path.isdir("/proc"):
+        return None
+    parents = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "r") as f:
+                # o nome do processo pode ter espaços: o ppid vem depois do ")"
+                fields = f.read().rsplit(")", 1)[1].split()
+            parents[int(entry)] = int(fields[1])
+        except (OSError, IndexError, ValueError):
+            continue
+
+    root = os.getpid()
+    descendants, frontier = set(), {root}
+    while frontier:
+        frontier = {pid for pid, ppid in parents.items() if ppid in frontier} - descendants
+        descendants |= frontier
+
+    total_kb = 0
+    for pid in descendants:
+        try:
+            with open(f"/proc/{pid}/status", "r") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total_kb += int(line.split()[1])
+                        break
+        except (OSError, ValueError):
+            continue
+    return total_kb / 1024.0
+
+
+class _PooledContext:
+    def __init__(self, context):
+        self.context = context
+        self.pages_served = 0
+        self.in_use = False
+        self.broken = False
+
+
+class BrowserPool:
+    """Navegador único com contextos reutilizáveis e reciclagem automática."""
+
+    def __init__(self, max_contexts: int = None, pages_per_context: int = None,
+                 max_browser_pages: int = None, memory_limit_mb: float = None,
+                 user_agent: str = DEFAULT_USER_AGENT):
+        self.max_contexts = max_contexts or int(os.getenv("BROWSER_POOL_CONTEXTS", "2"))
+        self.pages_per_context = pages_per_context or int(os.getenv("BROWSER_PAGES_PER_CONTEXT", "25"))
+        self.max_browser_pages = max_browser_pages or int(os.getenv("BROWSER_MAX_PAGES", "150"))
+        self.memory_limit_mb = memory_limit_mb or float(os.getenv("BROWSER_MEMORY_LIMIT_MB", "350"))
+        self.user_agent = user_agent
+
+        self._playwright = None
+        self._browser = None
+        self._contexts = []
+        self._browser_pages = 0
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="browser-pool")
+        self.stats = {"launches": 0, "pages": 0, "context_recycles": 0, "browser_recycles": 0, "errors": 0}
+
+    # ----------------------- ciclo de vida -----------------------
+
+    def _launch(self):
+        if self._playwright is None:
+            from playwright.sync_api import sync_playwright
+            self._playwright = sync_playwright().start()
+        chromium = self._playwright.chromium
+        try:
+            self._browser = chromium.launch(headless=True, channel="chromium-headless-shell", args=LAUNCH_ARGS)
+        except Exception:
+            self._browser = chromium.launch(headless=True, args=LAUNCH_ARGS)
+        self._browser_pages = 0
+        self.stats["launches"] += 1
+        print(f"🧭 Navegador do pool iniciado (launch #{self.stats['launches']})")
+
+    def _close_browser(self):
+        for pooled in self._contexts:
+            try:
+                pooled.context.close()
+            except Exception:
+                pass
+        self._contexts = []
+        if self._browser is not None:
+            try:
+                self._browser.close()
+            except Exception:
+                pass
+        self._browser = None
+
+    def close(self):
+        """Fecha navegador e Playwright (chamado automaticamente no exit)."""
+        try:
+            self._executor.submit(self._close).result(timeout=30)
+        except Exception:
+            pass
+        self._executor.shutdown(wait=False)
+
+    def _close(self):
+        self._close_browser()
+        if self._playwright is not None:
+            try:
+                self._playwright.stop()
+            except Exception:
+                pass
+        self._playwright = None
+
+    def is_healthy(self) -> bool:
+        return self._browser is not None and self._browser.is_connected()
+
+    def _ensure_browser(self):
+        if self.is_healthy():
+            return
+        if self._browser is not None:
+            print("⚠ Navegador do pool desconectado - reiniciando")
+            self.stats["browser_recycles"] += 1
+            self._close_browser()
+        self._launch()
+
+    def _maybe_recycle_browser(self):
+        reason = None
+        if self._browser_pages >= self.max_browser_pages:
+            reason = f"{self._browser_pages} páginas"
+        else:
+            rss = _descendant_rss_mb()
+            if rss is not None and rss > self.memory_limit_mb:
+                reason = f"memória {rss:.0f}MB > {self.memory_limit_mb:.0f}MB"
+        if reason and not any(p.in_use for p in self._contexts):
+            print(f"♻ Reciclando navegador do pool ({reason})")
+            self.stats["browser_recycles"] += 1
+            self._close_browser()
+
+    # ----------------------- contextos e páginas -----------------------
+
+    def _acquire_context(self) -> _PooledContext:
+        self._ensure_browser()
+        idle = [p for p in self._contexts if not p.in_use and not p.broken]
+        if idle:
+            pooled = min(idle, key=lambda p: p.pages_served)
+        else:
+            # Uma página por vez na thread do navegador: sem contexto livre, o pool ainda não está cheio
+            context = self._browser.new_context(
+                user_agent=self.user_agent,
+                locale="pt-BR",
+                java_script_enabled=True,
+                viewport={"width": 1280, "height": 900},
+            )
+            pooled = _PooledContext(context)
+            self._contexts.append(pooled)
+        pooled.in_use = True
+        return pooled
+
+    def _release_context(self, pooled: _PooledContext):
+        pooled.in_use = False
+        pooled.pages_served += 1
+        if pooled.broken or pooled.pages_served >= self.pages_per_context:
+            try:
+                pooled.context.close()
+            except Exception:
+                pass
+            if pooled in self._contexts:
+                self._contexts.remove(pooled)
+            self.stats["context_recycles"] += 1
+
+    def run(self, fn, *args, **kwargs):
+        """Executa ``fn(page, *args, **kwargs)`` na thread do navegador e devolve o resultado."""
+        def job():
+            with self.page() as page:
+                return fn(page, *args, **kwargs)
+        return self._executor.submit(job).result()
+
+    @contextmanager
+    def page(self):
+        """Empresta uma página nova de um contexto do pool (só na thread do pool, ver ``run``)."""
+        pooled = self._acquire_context()
+        page = None
+        try:
+            page = pooled.context.new_page()
+            yield page
+        except Exception:
+            self.stats["errors"] += 1
+            if not self.is_healthy():
+                pooled.broken = True
+            raise
+        finally:
+            if page is not None:
+                try:
+                    page.close()
+                except Exception:
+                    pooled.broken = True
+            self._browser_pages += 1
+            self.stats["pages"] += 1
+            self._release_context(pooled)
+            self._maybe_recycle_browser()
+
+
+# ----------------------- carregamento enxuto -----------------------
+
+def _is_blocked_url(url: str) -> bool:
+    lowered = url.lower()
+    return any(domain in lowered for domain in AD_TRACKER_DOMAINS)
+
+
+def _route_handler(route):
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or _is_blocked_url(request.url):
+        return route.abort()
+    return route.continue_()
+
+
+def block_heavy_resources(page):
+    """Aborta imagens, mídia, fontes e requisições de anúncios/rastreadores."""
+    page.route("**/*", _route_handler)
+
+
+def wait_for_stable_article(page, selector: str = ARTICLE_SELECTOR, timeout_ms: int = 8000,
+                            min_chars: int = 200, polls: int = 2) -> bool:
+    """Espera o corpo do artigo aparecer e estabilizar; False se estourar o tempo."""
+    try:
+        page.wait_for_function(_READY_JS, arg=[selector, min_chars, polls], polling=250, timeout=timeout_ms)
+        return True
+    except Exception:
+        return False
+
+
+def _click_consent(page) -> bool:
+    for sel in CONSENT_SELECTORS:
+        try:
+            btn = page.locator(sel)
+            if btn.count() > 0 and btn.first.is_visible():
+                btn.first.click(timeout=1000)
+                return True
+        except Exception:
+            continue
+    return False
+
+
+def _load_lean(page, url: str, timeout_ms: int, ready_timeout_ms: int):
+    block_heavy_resources(page)
+    page.goto(url, timeout=timeout_ms, wait_until="domcontentloaded")
+    if "news.google." in url:
+        # Links do Google News redirecionam via JS para o veículo
+        try:
+            page.wait_for_url(lambda u: "news.google." not in u, timeout=10000, wait_until="domcontentloaded")
+        except Exception:
+            pass
+    if not wait_for_stable_article(page, timeout_ms=ready_timeout_ms):
+        # Banner de consentimento pode estar cobrindo/bloqueando o conteúdo
+        if _click_consent(page):
+            wait_for_stable_article(page, timeout_ms=2000)
+    return page.url, page.content()
+
+
+def fetch_rendered(url: str, timeout_ms: int = 30000, ready_timeout_ms: int = 8000):
+    """Carrega ``url`` no modo enxuto e devolve (url_final, html)."""
+    return get_browser_pool().run(_load_lean, url, timeout_ms, ready_timeout_ms)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool() -> BrowserPool:
+    """Pool do processo (criado sob demanda)."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool()
+        return _pool
+
+
+def _close_pool():
+    if _pool is not None:
+        _pool.close()
+
+
+# Um atexit comum roda depois de o concurrent.futures recusar novas tarefas
+# (o submit do close falharia e o Chromium ficaria aberto); os ganchos do
+# threading rodam antes, em ordem inversa de registro
+threading._register_atexit(_close_pool)
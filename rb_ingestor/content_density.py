@@ -0,0 +1,148 @@
+# rb_ingestor/content_density.py
+"""
+Extração do corpo da matéria por densidade de texto (estilo Readability).
+
+Para layouts sem seletor conhecido, em vez de juntar todos os ``<p>`` da
+página, os blocos são pontuados numa única passada pela árvore lxml:
+
+- cada parágrafo (``p``, ``pre``, ``blockquote`` ou ``div`` sem blocos
+  filhos) com texto suficiente soma pontos pelo tamanho e pelas vírgulas
+  ao pai (peso 1) e ao avô (peso 1/2)
+- classes/ids de matéria (article, content, materia, corpo...) somam e os
+  de comentários, relacionadas, anúncios, menus etc. descartam o bloco
+- a pontuação final de cada candidato é multiplicada por
+  ``1 - densidade de links``: listas de links perdem para texto corrido
+- o melhor candidato e os irmãos com pontuação próxima formam o corpo
+
+``extract`` devolve os parágrafos separados por linha em branco.
+"""
+import re
+from typing import Dict, List, Optional
+
+from lxml import etree
+
+from rb_ingestor.article_document import NOISE_TAGS
+
+MIN_PARAGRAPH_CHARS = 25
+SIBLING_RATIO = 0.2
+
+PARAGRAPH_TAGS = frozenset({"p", "pre", "blockquote"})
+BLOCK_TAGS = frozenset({
+    "p", "div", "section", "article", "main", "table", "ul", "ol", "pre", "blockquote",
+    "h1", "h2", "h3", "h4", "h5", "h6", "figure", "form",
+})
+
+_TOKEN_RE = re.compile(r"[\s_\-]+")
+POSITIVE_TOKENS = frozenset({
+    "article", "articlebody", "body", "content", "conteudo", "corpo", "entry", "main", "materia",
+    "noticia", "post", "story", "text", "texto",
+})
+UNLIKELY_TOKENS = frozenset({
+    "ad", "ads", "adsbygoogle", "advertising", "advertisement", "banner", "breadcrumb", "comment",
+    "comments", "comentario", "comentarios", "footer", "lidas", "menu", "newsletter", "outbrain",
+    "paywall", "promo", "publicidade", "recomendadas", "related", "relacionadas", "rodape", "share",
+    "sidebar", "social", "taboola", "tambem", "widget",
+})
+
+_TEXT = etree.XPath(".//text()[not(ancestor::script or ancestor::style or ancestor::noscript)]")
+_LINK_TEXT = etree.XPath(".//a//text()")
+
+
+def _tokens(element) -> set:
+    attrs = f"{element.get('class', '')} {element.get('id', '')}".lower()
+    return set(_TOKEN_RE.split(attrs)) - {""}
+
+
+def _text(element) -> str:
+    return re.sub(r"\s+", " ", "".join(_TEXT(element))).strip()
+
+
+def _class_weight(element) -> int:
+    tokens = _tokens(element)
+    if tokens & POSITIVE_TOKENS:
+        return 25
+    return 0
+
+
+def _is_paragraph(element) -> bool:
+    if element.tag == "p":
+        return True
+    # blockquote/pre/div/section sem blocos dentro (sites que usam <br>)
+    return element.tag in PARAGRAPH_TAGS | {"div", "section"} and not any(
+        isinstance(child.tag, str) and child.tag in BLOCK_TAGS for child in element
+    )
+
+
+def score_blocks(tree):
+    """Uma passada pela árvore: (pontuação por candidato, parágrafos em ordem)."""
+    scores: Dict[etree._Element, float] = {}
+    paragraphs: List[tuple] = []
+    skipped = []  # pilha de elementos descartados (ruído/unlikely) abertos
+    for event, element in etree.iterwalk(tree, events=("start", "end")):
+        tag = element.tag
+        if not isinstance(tag, str):
+            continue
+        if event == "start":
+            if not skipped and (tag in NOISE_TAGS or (_tokens(element) & UNLIKELY_TOKENS
+                                                      and not _tokens(element) & POSITIVE_TOKENS
+                                                      and tag not in ("body", "html", "main", "article"))):
+                skipped.append(element)
+            continue
+        if skipped:
+            if skipped[-1] is element:
+                skipped.pop()
+            continue
+        if not _is_paragraph(element):
+            continue
+        value = _text(element)
+        if len(value) < MIN_PARAGRAPH_CHARS:
+            continue
+        paragraphs.append((element, value))
+        points = 1 + value.count(",") + min(len(value) // 100, 3)
+        parent = element.getparent()
+        for ancestor, weight in ((parent, 1.0), (parent.getparent() if parent is not None else None, 0.5)):
+            if ancestor is None or not isinstance(ancestor.tag, str):
+                continue
+            if ancestor not in scores:
+                scores[ancestor] = float(_class_weight(ancestor))
+            scores[ancestor] += points * weight
+    return scores, paragraphs
+
+
+def _link_density(element) -> float:
+    total = len(_text(element))
+    if not total:
+        return 1.0
+    links = len(re.sub(r"\s+", " ", "".join(_LINK_TEXT(element))).strip())
+    return min(links / total, 1.0)
+
+
+def best_candidate(tree) -> Optional[tuple]:
+    """(elemento, pontuação, parágrafos, pontuações finais de todos os blocos) do bloco com mais texto corrido."""
+    scores, paragraphs = score_blocks(tree)
+    if not scores:
+        return None
+    final = {el: score * (1 - _link_density(el)) for el, score in scores.items()}
+    top = max(final, key=final.get)
+    return top, final[top], paragraphs, final
+
+
+def extract(tree) -> str:
+    """Corpo da matéria por densidade de texto ('' se nada parecer um artigo)."""
+    if tree is None:
+        return ""
+    found = best_candidate(tree)
+    if not found:
+        return ""
+    top, top_score, paragraphs, final = found
+    # Irmãos com pontuação próxima (matérias quebradas em vários blocos)
+    parent = top.getparent()
+    containers = {top}
+    if parent is not None:
+        threshold = max(10.0, top_score * SIBLING_RATIO)
+        containers.update(sib for sib in parent if sib is not top and final.get(sib, 0) >= threshold)
+    parts = []
+    for element, value in paragraphs:
+        if element in containers or any(a in containers for a in element.iterancestors()):
+            parts.append(value)
+    return "\n\n".join(parts)
@@ -0,0 +1,219 @@
+# rb_ingestor/dedup.py
+"""
+Barreira de duplicatas antes das etapas caras do pipeline (etapa ``gate``).
+
+As verificações de duplicata dos comandos rodavam tarde: smart_automation
+só comparava depois de a IA gerar o artigo inteiro, publish_topic depois
+do RSS e da extração com navegador, automacao_render depois da geração.
+Todo esse trabalho ia fora quando a matéria era repetida.
+
+Agora a primeira etapa de cada job compara o que o produtor já sabe
+(título do RSS, URL de origem, tópico) com um índice em memória das
+notícias recentes, carregado uma vez (e recarregado a cada
+DEDUP_REFRESH_SECONDS nos workers contínuos):
+
+- URL: ``pipeline.normalize_url`` das ``fonte_url`` das notícias e das URLs
+  de entrada dos jobs que publicaram (links do Google News inclusive)
+- título: Jaccard das palavras significativas (sem acento e sem
+  stopwords) com um título das últimas DEDUP_HOURS a partir de
+  DEDUP_TITLE_THRESHOLD (índice invertido por palavra), desde que um não
+  troque número ou nome próprio do outro ("Flamengo vence Botafogo" x
+  "Flamengo vence Palmeiras", "cai 1%" x "sobe 2%", ver ``distinct``).
+  Só barra o quase certo; o caso duvidoso segue para o MinHash
+  (minhash.py), que compara também o corpo já gerado
+- tópico: todas as palavras do tópico num título das últimas
+  DEDUP_TOPIC_HOURS
+
+Cada notícia gravada entra no índice na hora (``remember``), então dois
+jobs da mesma execução também se barram. ``stats()`` e
+``pipeline.summary()`` mostram quantos jobs pararam aqui e quanto tempo
+de etapas isso evitou.
+"""
+import os
+import re
+import threading
+import time
+import unicodedata
+from collections import Counter
+from datetime import timedelta
+from typing import Iterable, Optional
+
+HOURS = int(os.getenv("DEDUP_HOURS", "24"))
+TOPIC_HOURS = int(os.getenv("DEDUP_TOPIC_HOURS", "6"))
+TITLE_THRESHOLD = float(os.getenv("DEDUP_TITLE_THRESHOLD", "0.8"))
+REFRESH_SECONDS = int(os.getenv("DEDUP_REFRESH_SECONDS", "300"))
+# Títulos com menos palavras significativas que isso não são comparados (falso positivo demais)
+MIN_TITLE_WORDS = 3
+
+STOPWORDS = frozenset("""
+a ao aos as com como da das de do dos e em entre era foi for ja mais mas na nas no nos o os ou para pela pelas pelo
+pelos por que se sem ser sao sobre sua suas seu seus tem ter um uma umas uns ate apos durante desde nao muito
+ainda tambem so cada todo toda todos todas qual quando onde porque isso esta este essa esse ela ele elas eles
+hoje agora diz dizem veja saiba entenda analise completa tendencias brasil
+""".split())
+
+
+def tokens(text: str) -> list:
+    """Palavras significativas em ordem: minúsculas, sem acento, 3+ letras, sem stopwords."""
+    text = unicodedata.normalize("NFKD", (text or "").lower())
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return [w for w in re.findall(r"\w+", text) if len(w) > 2 and w not in STOPWORDS]
+
+
+def words(text: str) -> frozenset:
+    return frozenset(tokens(text))
+
+
+# " - Veículo" no fim dos títulos do Google News (não é nome próprio da notícia)
+_SOURCE_SUFFIX = re.compile(r"\s+-\s+[^-]{1,40}$")
+
+
+def markers(title: str) -> frozenset:
+    """Números e nomes próprios (palavras com maiúscula fora do início) do título."""
+    text = _SOURCE_SUFFIX.sub("", title or "")
+    found = set(re.findall(r"\d+(?:[.,]\d+)*", text))
+    for position, word in enumerate(re.findall(r"[^\W\d_]+", text)):
+        if position and word[0].isupper():
+            found.update(tokens(word))
+    return frozenset(found)
+
+
+def distinct(title: str, other: str) -> bool:
+    """Cada título tem número ou nome próprio que o outro não tem: matérias diferentes."""
+    a, b = markers(title), markers(other)
+    return bool(a - b) and bool(b - a)
+
+
+def url_key(url: str) -> str:
+    """URL normalizada (http/https) ou o valor como veio (fonte_url sintética: 'smart_trend:...')."""
+    from rb_ingestor.pipeline import normalize_url
+    url = (url or "").strip()
+    if not url:
+        return ""
+    return normalize_url(url) if url.startswith(("http://", "https://")) else url.lower()
+
+
+class RecentIndex:
+    """Títulos e URLs das notícias recentes, com índice invertido por palavra."""
+
+    def __init__(self):
+        self.urls = set()
+        self.titles = []  # (palavras, título, criado_em em epoch)
+        self.by_word = {}
+        self.loaded_at = time.time()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, hours: int = None) -> "RecentIndex":
+        from django.apps import apps
+        from django.utils import timezone
+
+        since = timezone.now() - timedelta(hours=hours or HOURS)
+        index = cls()
+        Noticia = apps.get_model("rb_noticias", "Noticia")
+        for titulo, fonte_url, criado_em in Noticia.objects.filter(criado_em__gte=since).values_list(
+            "titulo", "fonte_url", "criado_em"
+        ).iterator():
+            index.add(titulo, [fonte_url], criado_em.timestamp())
+        # Links de entrada (Google News, RSS) que já viraram notícia
+        IngestJob = apps.get_model("rb_ingestor", "IngestJob")
+        for url in IngestJob.objects.filter(noticia__isnull=False, atualizado_em__gte=since).exclude(url="").values_list(
+            "url", flat=True
+        ).iterator():
+            index.add(None, [url])
+        return index
+
+    def __len__(self):
+        return len(self.titles)
+
+    def add(self, title: Optional[str], urls: Iterable[str] = (), created: float = None):
+        with self._lock:
+            self.urls.update(key for key in map(url_key, urls) if key)
+            tokens = words(title)
+            if tokens:
+                position = len(self.titles)
+                self.titles.append((tokens, title, created or time.time()))
+                for word in tokens:
+                    self.by_word.setdefault(word, []).append(position)
+
+    def check(self, title: str = None, urls: Iterable[str] = (), topic: str = None) -> Optional[str]:
+        """Motivo da duplicata ('url', 'título: ...', 'tópico: ...') ou None."""
+        for key in map(url_key, urls):
+            if key and key in self.urls:
+                return "url"
+
+        tokens = words(title)
+        if len(tokens) >= MIN_TITLE_WORDS:
+            overlap = Counter(pos for word in tokens for pos in self.by_word.get(word, ()))
+            for pos, common in overlap.most_common(5):
+                other, other_title, _created = self.titles[pos]
+                if (len(other) >= MIN_TITLE_WORDS
+                        and common / (len(tokens) + len(other) - common) >= TITLE_THRESHOLD
+                        and not distinct(title, other_title)):
+                    return f"título: {other_title}"
+
+        tokens = words(topic)
+        if tokens:
+            since = time.time() - TOPIC_HOURS * 3600
+            # Só os títulos que têm a palavra mais rara do tópico
+            rarest = min(tokens, key=lambda word: len(self.by_word.get(word, ())))
+            for pos in self.by_word.get(rarest, ()):
+                other, other_title, created = self.titles[pos]
+                if created >= since and tokens <= other:
+                    return f"tópico: {other_title}"
+        return None
+
+
+_index = None
+_index_lock = threading.Lock()
+_stats_lock = threading.Lock()
+_stats = Counter()
+_REASON_STATS = {"url": "rejected_url", "título": "rejected_titulo", "tópico": "rejected_topico"}
+
+
+def recent() -> RecentIndex:
+    """Índice do processo; carregado na primeira consulta e recarregado a cada REFRESH_SECONDS."""
+    global _index
+    with _index_lock:
+        if _index is None or time.time() - _index.loaded_at > REFRESH_SECONDS:
+            start = time.perf_counter()
+            _index = RecentIndex.load()
+            with _stats_lock:
+                _stats["loads"] += 1
+                _stats["load_ms"] += round((time.perf_counter() - start) * 1000)
+        return _index
+
+
+def reset():
+    global _index
+    with _index_lock:
+        _index = None
+
+
+def gate(title: str = None, urls: Iterable[str] = (), topic: str = None) -> Optional[str]:
+    """Motivo para barrar a matéria antes de qualquer etapa cara, ou None para seguir."""
+    reason = recent().check(title=title, urls=[u for u in urls if u], topic=topic)
+    with _stats_lock:
+        _stats["checked"] += 1
+        if reason:
+            _stats["rejected"] += 1
+            _stats[_REASON_STATS[reason.split(":")[0]]] += 1
+    return reason
+
+
+def remember(title: str, urls: Iterable[str] = ()):
+    """Notícia acabou de ser gravada: entra no índice já carregado (os próximos jobs a veem)."""
+    with _index_lock:
+        index = _index
+    if index is not None:
+        index.add(title, urls)
+
+
+def stats() -> dict:
+    with _stats_lock:
+        data = {"checked": 0, "rejected": 0, "rejected_url": 0, "rejected_titulo": 0, "rejected_topico": 0,
+                "loads": 0, "load_ms": 0, **_stats}
+    with _index_lock:
+        data["indexed_titles"] = len(_index) if _index is not None else 0
+        data["indexed_urls"] = len(_index.urls) if _index is not None else 0
+    return data
@@ -2,7 +2,7 @@
 """
 Sistema aprimorado para buscar temas em ascensão de múltiplas fontes
 """
-import requests
+from rb_ingestor import http_client
 import json
 import re
 from datetime import datetime, timedelta
@@ -14,10 +14,7 @@ class EnhancedTrendingSources:
     """Sistema aprimorado para buscar temas em ascensão"""
     
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        })
+        self.session = http_client.get_session()
     
     def get_google_trends_real(self) -> List[Dict]:
         """Busca trending topics reais do Google Trends Brasil"""
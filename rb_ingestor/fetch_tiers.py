@@ -0,0 +1,115 @@
+# rb_ingestor/fetch_tiers.py
+"""
+Escolha do nível (tier) de download por domínio.
+
+Níveis, do mais barato para o mais caro:
+
+- ``http``: GET simples pela sessão pooled do extrator
+- ``browser``: Chromium headless do pool (ver browser_pool.py)
+
+Cada tentativa grava sucesso/falha e latência em ``DomainFetchStats``.
+Um domínio cujo HTTP simples falha com frequência (JS obrigatório,
+paywall, anti-bot) passa a ir direto para o navegador; de tempos em
+tempos o HTTP é testado de novo para o caso de o site ter mudado.
+"""
+import os
+import threading
+
+TIER_HTTP = "http"
+TIER_BROWSER = "browser"
+TIERS = (TIER_HTTP, TIER_BROWSER)
+
+MIN_SAMPLES = int(os.getenv("FETCH_TIER_MIN_SAMPLES", "3"))
+MIN_SUCCESS_RATE = float(os.getenv("FETCH_TIER_MIN_SUCCESS", "0.5"))
+REPROBE_EVERY = int(os.getenv("FETCH_TIER_REPROBE_EVERY", "20"))
+
+
+class DomainStatsStore:
+    """Cache em memória dos ``DomainFetchStats`` com gravação incremental no banco."""
+
+    def __init__(self):
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def _model(self):
+        from django.apps import apps
+        return apps.get_model("rb_ingestor", "DomainFetchStats")
+
+    def get(self, domain: str) -> dict:
+        with self._lock:
+            if domain in self._cache:
+                return self._cache[domain]
+        stats = {tier: {"ok": 0, "fail": 0, "ms": 0.0} for tier in TIERS}
+        try:
+            row = self._model().objects.filter(dominio=domain).first()
+            if row is not None:
+                for tier in TIERS:
+                    stats[tier] = {
+                        "ok": getattr(row, f"{tier}_sucessos"),
+                        "fail": getattr(row, f"{tier}_falhas"),
+                        "ms": getattr(row, f"{tier}_tempo_ms"),
+                    }
+        except Exception as e:
+            print(f"⚠ Estatísticas de {domain} indisponíveis: {e}")
+        with self._lock:
+            return self._cache.setdefault(domain, stats)
+
+    def tier_order(self, domain: str) -> list:
+        """Níveis a tentar para o domínio, do preferido para o fallback."""
+        stats = self.get(domain)
+        http, browser = stats[TIER_HTTP], stats[TIER_BROWSER]
+        http_attempts = http["ok"] + http["fail"]
+        if http_attempts < MIN_SAMPLES or http["ok"] / http_attempts >= MIN_SUCCESS_RATE:
+            browser_attempts = browser["ok"] + browser["fail"]
+            # Os dois funcionam: fica com o mais rápido em média
+            if (browser_attempts >= MIN_SAMPLES and http["ok"] and browser["ok"]
+                    and browser["ok"] / browser_attempts >= MIN_SUCCESS_RATE
+                    and browser["ms"] / browser_attempts < http["ms"] / http_attempts):
+                return [TIER_BROWSER, TIER_HTTP]
+            return [TIER_HTTP, TIER_BROWSER]
+        # HTTP não funciona neste domínio: navegador direto, com reteste periódico
+        total = http_attempts + browser["ok"] + browser["fail"]
+        if REPROBE_EVERY and total % REPROBE_EVERY == 0:
+            return [TIER_HTTP, TIER_BROWSER]
+        return [TIER_BROWSER]
+
+    def record(self, domain: str, tier: str, ok: bool, elapsed_ms: float):
+        if not domain:
+            return
+        stats = self.get(domain)
+        with self._lock:
+            stats[tier]["ok" if ok else "fail"] += 1
+            stats[tier]["ms"] += elapsed_ms
+            preferred = self._preferred(stats)
+        try:
+            self._persist(domain, tier, ok, elapsed_ms, preferred)
+        except Exception as e:
+            print(f"⚠ Falha ao gravar estatísticas de {domain}: {e}")
+
+    def _preferred(self, stats: dict) -> str:
+        http = stats[TIER_HTTP]
+        attempts = http["ok"] + http["fail"]
+        if attempts >= MIN_SAMPLES and http["ok"] / attempts < MIN_SUCCESS_RATE:
+            return TIER_BROWSER
+        return TIER_HTTP
+
+    def _persist(self, domain, tier, ok, elapsed_ms, preferred):
+        from django.db.models import F
+
+        DomainFetchStats = self._model()
+        counter = f"{tier}_sucessos" if ok else f"{tier}_falhas"
+        updated = DomainFetchStats.objects.filter(dominio=domain).update(**{
+            counter: F(counter) + 1,
+            f"{tier}_tempo_ms": F(f"{tier}_tempo_ms") + elapsed_ms,
+            "tier_preferido": preferred,
+        })
+        if not updated:
+            DomainFetchStats.objects.create(**{
+                "dominio": domain,
+                counter: 1,
+                f"{tier}_tempo_ms": elapsed_ms,
+                "tier_preferido": preferred,
+            })
+
+
+domain_stats = DomainStatsStore()
@@ -0,0 +1,321 @@
+# rb_ingestor/gn_resolver.py
+"""
+Resolução de links do Google News (news.google.com/rss/articles/...) para
+a URL do veículo original.
+
+Ordem, da mais barata para a mais cara:
+
+1. cache (memória do processo e tabela ``ResolvedLink``)
+2. parâmetro ``url=`` na query string
+3. decodificação offline do ID do artigo (protobuf em base64 dos links
+   antigos, que trazem a URL embutida)
+4. rede: endpoint ``batchexecute`` do Google News (IDs novos "AU_yqL..."),
+   seguido de redirect/HTML da própria página do artigo
+5. navegador headless, só se o chamador permitir
+
+Toda resolução (inclusive a falha, por algumas horas) vai para
+``ResolvedLink``, chaveada pelo ID do artigo: a mesma matéria vista em
+vários feeds ou execuções nunca é resolvida duas vezes.
+"""
+import base64
+import binascii
+import json
+import os
+import re
+import threading
+from datetime import timedelta
+from typing import Optional
+from urllib.parse import parse_qs, urljoin, urlparse
+
+from bs4 import BeautifulSoup
+
+from rb_ingestor import http_client
+
+BATCHEXECUTE_URL = "https://news.google.com/_/DotsSplashUi/data/batchexecute"
+FAILURE_TTL_HOURS = int(os.getenv("GN_RESOLVER_FAILURE_TTL_HOURS", "6"))
+
+_ARTICLE_ID_RE = re.compile(r"/(?:rss/)?(?:articles|read)/([A-Za-z0-9_\-]+)")
+
+METHOD_QUERY = "query"
+METHOD_OFFLINE = "offline"
+METHOD_BATCHEXECUTE = "batchexecute"
+METHOD_REDIRECT = "redirect"
+METHOD_HTML = "html"
+METHOD_BROWSER = "browser"
+METHOD_FAILED = "falha"
+
+
+def is_google_news_url(url: str) -> bool:
+    if not url:
+        return False
+    host = urlparse(url).netloc.lower()
+    return host.startswith("news.google.")
+
+
+def article_id(url: str) -> Optional[str]:
+    """ID do artigo no link do Google News (ignora ?oc=5, hl, gl...)."""
+    match = _ARTICLE_ID_RE.search(urlparse(url).path)
+    return match.group(1) if match else None
+
+
+def cache_key(url: str) -> str:
+    return article_id(url) or url.split("#", 1)[0]
+
+
+# ----------------------- decodificação offline -----------------------
+
+def _read_varint(data: bytes, pos: int):
+    result, shift = 0, 0
+    while pos < len(data):
+        byte = data[pos]
+        result |= (byte & 0x7F) << shift
+        pos += 1
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+    raise ValueError("varint truncado")
+
+
+def decode_offline(gn_id: str) -> Optional[str]:
+    """Extrai a URL embutida no ID (formato antigo "CBMi...").
+
+    O ID é um protobuf em base64url: campo 4 (0x22) com a URL. IDs novos
+    trazem só uma referência opaca ("AU_yqL...") e devolvem None.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(gn_id + "=" * (-len(gn_id) % 4))
+    except (binascii.Error, ValueError):
+        return None
+    prefix, suffix = b"\x08\x13\x22", b"\xd2\x01\x00"
+    if raw.startswith(prefix):
+        raw = raw[len(prefix):]
+    if raw.endswith(suffix):
+        raw = raw[:-len(suffix)]
+    try:
+        length, pos = _read_varint(raw, 0)
+    except ValueError:
+        return None
+    text = raw[pos:pos + length].decode("utf-8", errors="ignore")
+    if text.startswith("http") and not is_google_news_url(text):
+        return text
+    return None
+
+
+# ----------------------- resolução pela rede -----------------------
+
+def publisher_url_from_html(html, base_url: str) -> Optional[str]:
+    """Procura a URL do publisher no HTML de uma página do Google News."""
+    try:
+        soup = BeautifulSoup(html, "html.parser")
+        # 1) Meta refresh
+        meta_refresh = soup.find("meta", attrs={"http-equiv": re.compile("refresh", re.I)})
+        if meta_refresh and meta_refresh.get("content"):
+            m = re.search(r"url=([^;]+)$", meta_refresh.get("content"), re.I)
+            if m:
+                href = m.group(1).strip().strip('"').strip("'")
+                if href.startswith("./"):
+                    href = urljoin(base_url, href)
+                if href.startswith("http") and "news.google.com" not in href:
+                    return href
+
+        # 2) Link canonical
+        link_canonical = soup.find("link", rel=lambda x: x and "canonical" in x)
+        if link_canonical and link_canonical.get("href"):
+            href = link_canonical.get("href")
+            if href.startswith("http") and "news.google.com" not in href:
+                return href
+
+        # 3) Primeiro link externo http(s)
+        for a in soup.find_all("a", href=True):
+            href = a.get("href")
+            if href.startswith("./"):
+                href = urljoin(base_url, href)
+            if href.startswith("http") and "news.google.com" not in href and "google.com" not in href:
+                return href
+    except Exception as e:
+        print(f"⚠ Erro ao extrair publisher URL do HTML: {e}")
+    return None
+
+
+def _batchexecute(session, gn_id: str, html: str) -> Optional[str]:
+    """Decodifica IDs novos com a assinatura/timestamp da página do artigo."""
+    sg = re.search(r'data-n-a-sg="([^"]+)"', html)
+    ts = re.search(r'data-n-a-ts="([^"]+)"', html)
+    if not (sg and ts):
+        return None
+    request = [
+        "garturlreq",
+        [["X", "X", ["X", "X"], None, None, 1, 1, "US:en", None, 1, None, None, None, None, None, 0, 1],
+         "X", "X", 1, [1, 1, 1], 1, 1, None, 0, 0, None, 0],
+        gn_id, int(ts.group(1)), sg.group(1),
+    ]
+    payload = [[["Fbv4je", json.dumps(request), None, "generic"]]]
+    resp = session.post(
+        BATCHEXECUTE_URL,
+        data={"f.req": json.dumps(payload)},
+        headers={"Content-Type": "application/x-www-form-urlencoded;charset=UTF-8"},
+        timeout=15,
+    )
+    resp.raise_for_status()
+    # Resposta: prefixo anti-XSSI ")]}'" e blocos separados por linha em branco
+    body = json.loads(resp.text.split("\n\n")[1])
+    url = json.loads(body[0][2])[1]
+    return url if url and url.startswith("http") else None
+
+
+def _resolve_network(session, url: str, gn_id: Optional[str]):
+    """(url_original, método) usando a página do artigo e o batchexecute."""
+    target = f"https://news.google.com/rss/articles/{gn_id}" if gn_id else url
+    resp = session.get(target, timeout=15, allow_redirects=True)
+    if resp.url and not is_google_news_url(resp.url):
+        return resp.url, METHOD_REDIRECT
+    html = resp.text
+    if gn_id:
+        try:
+            found = _batchexecute(session, gn_id, html)
+            if found:
+                return found, METHOD_BATCHEXECUTE
+        except Exception as e:
+            print(f"⚠ batchexecute falhou para {gn_id[:20]}...: {e}")
+    found = publisher_url_from_html(html, target)
+    if found:
+        return found, METHOD_HTML
+    return None, METHOD_FAILED
+
+
+def _resolve_browser(url: str) -> Optional[str]:
+    from rb_ingestor.browser_pool import fetch_rendered
+    final_url, _ = fetch_rendered(url, ready_timeout_ms=1000)
+    return final_url if final_url and not is_google_news_url(final_url) else None
+
+
+# ----------------------- cache -----------------------
+
+class GoogleNewsResolver:
+    """Resolve links do Google News com cache em memória + ``ResolvedLink``."""
+
+    def __init__(self, session=None):
+        self.session = session or http_client.get_session()
+        self._memory = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.stats = {"memory": 0, "db": 0, "offline": 0, "network": 0, "browser": 0, "failed": 0}
+
+    def _model(self):
+        from django.apps import apps
+        return apps.get_model("rb_ingestor", "ResolvedLink")
+
+    def _lookup(self, key: str):
+        """(encontrado, url) do cache; falhas recentes contam como encontradas."""
+        with self._lock:
+            if key in self._memory:
+                self.stats["memory"] += 1
+                return True, self._memory[key]
+        try:
+            from django.db.models import F
+            from django.utils import timezone
+
+            ResolvedLink = self._model()
+            row = ResolvedLink.objects.filter(gn_id=key).first()
+            if row is None:
+                return False, None
+            if row.metodo == METHOD_FAILED and row.resolvido_em < timezone.now() - timedelta(hours=FAILURE_TTL_HOURS):
+                return False, None
+            ResolvedLink.objects.filter(pk=row.pk).update(usos=F("usos") + 1, ultimo_uso=timezone.now())
+            self.stats["db"] += 1
+            with self._lock:
+                self._memory[key] = row.url_original or None
+            return True, row.url_original or None
+        except Exception as e:
+            print(f"⚠ Cache de links indisponível: {e}")
+            return False, None
+
+    def remember(self, gn_url: str, original_url: Optional[str], method: str):
+        """Grava a resolução (usado também por quem resolveu pelo navegador)."""
+        if not is_google_news_url(gn_url):
+            return
+        key = cache_key(gn_url)
+        with self._lock:
+            self._memory[key] = original_url
+        try:
+            from django.utils import timezone
+            self._model().objects.update_or_create(
+                gn_id=key,
+                defaults={
+                    "gn_url": gn_url,
+                    "url_original": original_url or "",
+                    "metodo": method if original_url else METHOD_FAILED,
+                    "resolvido_em": timezone.now(),
+                },
+            )
+        except Exception as e:
+            print(f"⚠ Falha ao gravar link resolvido: {e}")
+
+    def resolve(self, url: str, allow_network: bool = True, allow_browser: bool = False) -> Optional[str]:
+        """URL do veículo original, ou None. URLs que não são do Google News voltam iguais."""
+        self._local.network = False
+        if not url or not is_google_news_url(url):
+            return url or None
+
+        # parâmetro url= (links de redirecionamento antigos)
+        candidate = (parse_qs(urlparse(url).query).get("url") or [None])[0]
+        if candidate and candidate.startswith("http") and not is_google_news_url(candidate):
+            return candidate
+
+        key = cache_key(url)
+        found, cached = self._lookup(key)
+        if found and (cached or not allow_browser):
+            return cached
+
+        gn_id = article_id(url)
+        original = decode_offline(gn_id) if gn_id else None
+        if original:
+            self.stats["offline"] += 1
+            self.remember(url, original, METHOD_OFFLINE)
+            return original
+
+        method = METHOD_FAILED
+        if allow_network and not found:
+            self._local.network = True
+            try:
+                original, method = _resolve_network(self.session, url, gn_id)
+            except Exception as e:
+                print(f"⚠ Falha ao resolver link do Google News: {e}")
+            if original:
+                self.stats["network"] += 1
+
+        if not original and allow_browser:
+            try:
+                original = _resolve_browser(url)
+                method = METHOD_BROWSER
+            except Exception as e:
+                print(f"⚠ Falha ao resolver link pelo navegador: {e}")
+            if original:
+                self.stats["browser"] += 1
+
+        if not original:
+            self.stats["failed"] += 1
+        if allow_network or original:
+            self.remember(url, original, method)
+        return original
+
+    def used_network(self) -> bool:
+        """Se o último ``resolve`` desta thread fez requisição ao Google News (não veio do cache nem offline)."""
+        return getattr(self._local, "network", False)
+
+
+_resolver = None
+_resolver_lock = threading.Lock()
+
+
+def get_resolver() -> GoogleNewsResolver:
+    """Resolver compartilhado do processo."""
+    global _resolver
+    with _resolver_lock:
+        if _resolver is None:
+            _resolver = GoogleNewsResolver()
+        return _resolver
+
+
+def resolve(url: str, allow_network: bool = True, allow_browser: bool = False) -> Optional[str]:
+    return get_resolver().resolve(url, allow_network=allow_network, allow_browser=allow_browser)
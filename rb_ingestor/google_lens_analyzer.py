@@ -3,7 +3,7 @@
 Sistema de análise de imagem usando Google Lens e busca de imagens similares
 """
 import os
-import requests
+from rb_ingestor import http_client
 import base64
 from typing import Dict, Optional, List
 from urllib.parse import urljoin, urlparse
@@ -15,10 +15,7 @@ class GoogleLensAnalyzer:
     """Analisa imagens usando Google Lens e busca similares"""
     
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
+        self.session = http_client.get_session()
     
     def analyze_with_google_lens(self, image_url: str) -> Optional[Dict]:
         """Analisa imagem usando Google Lens (simulação de busca visual)"""
@@ -136,7 +133,7 @@ class GoogleLensAnalyzer:
                 'Authorization': f'Client-ID {os.getenv("UNSPLASH_API_KEY")}'
             }
             
-            response = requests.get(url, params=params, headers=headers, timeout=10)
+            response = http_client.get(url, params=params, headers=headers, timeout=10)
             response.raise_for_status()
             
             data = response.json()
@@ -174,7 +171,7 @@ class GoogleLensAnalyzer:
                 'Authorization': os.getenv("PEXELS_API_KEY")
             }
             
-            response = requests.get(url, params=params, headers=headers, timeout=10)
+            response = http_client.get(url, params=params, headers=headers, timeout=10)
             response.raise_for_status()
             
             data = response.json()
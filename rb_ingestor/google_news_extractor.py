@@ -2,69 +2,25 @@
 """
 Extrator de URLs originais do Google News
 """
-import requests
 from bs4 import BeautifulSoup
 import re
 from urllib.parse import urljoin, urlparse
 from typing import Optional, Dict
 
+from rb_ingestor import http_client
+
 class GoogleNewsExtractor:
     """Extrai URLs originais das notícias do Google News"""
     
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
+        self.session = http_client.get_session()
     
     def extract_original_url(self, google_news_url: str) -> Optional[str]:
         """Extrai o URL original de uma notícia do Google News"""
         try:
-            # Fazer requisição para o Google News
-            response = self.session.get(google_news_url, timeout=10)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Procurar por links que levam ao site original
-            # Google News geralmente tem um link "Ver notícia completa" ou similar
-            original_links = []
-            
-            # Procurar por links com texto indicativo
-            link_texts = [
-                'ver notícia completa', 'ler mais', 'continue lendo', 
-                'read more', 'continue reading', 'full article',
-                'ver matéria completa', 'ler matéria'
-            ]
-            
-            for text in link_texts:
-                links = soup.find_all('a', string=re.compile(text, re.IGNORECASE))
-                original_links.extend([link.get('href') for link in links if link.get('href')])
-            
-            # Procurar por links que não sejam do Google News
-            all_links = soup.find_all('a', href=True)
-            for link in all_links:
-                href = link.get('href')
-                if href and not self._is_google_news_url(href):
-                    # Verificar se parece ser um link de notícia
-                    if self._looks_like_news_url(href):
-                        original_links.append(href)
-            
-            # Procurar por meta tags que podem conter o URL original
-            meta_tags = soup.find_all('meta')
-            for meta in meta_tags:
-                if meta.get('property') == 'og:url' or meta.get('name') == 'original-url':
-                    url = meta.get('content')
-                    if url and not self._is_google_news_url(url):
-                        original_links.append(url)
-            
-            # Retornar o primeiro URL válido encontrado
-            for url in original_links:
-                if url and self._is_valid_news_url(url):
-                    return url
-            
-            return None
-            
+            from rb_ingestor.gn_resolver import resolve
+            # Cache ResolvedLink -> decodificação offline -> rede
+            return resolve(google_news_url)
         except Exception as e:
             print(f"Erro ao extrair URL original: {e}")
             return None
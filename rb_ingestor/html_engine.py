@@ -0,0 +1,354 @@
+# rb_ingestor/html_engine.py
+"""
+Motor de extração de artigos sobre lxml.
+
+Substitui o caminho BeautifulSoup + html.parser do NewsContentExtractor:
+
+- parse em C (lxml.html), uma vez por página (ver ArticleDocument.tree)
+- seletores escritos em CSS simples e compilados uma única vez para
+  ``etree.XPath`` (``css()`` guarda o compilado); não depende do pacote
+  cssselect
+- tabelas de seletores por domínio conhecido (g1, Folha, Estadão, UOL,
+  O Globo, CNN Brasil...) testadas antes dos seletores genéricos
+- leitura sem alterar a árvore: menus, scripts, rodapés etc. são
+  filtrados na própria XPath
+- corpo da matéria: seletores do veículo, depois pontuação por densidade
+  de texto (content_density.py) e, por último, os seletores genéricos
+
+Os campos devolvidos por ``extract_article`` são os mesmos do extrator
+antigo; ``manage.py bench_extraction`` mede velocidade e paridade com ele
+usando as páginas de rb_ingestor/fixtures/pages.
+"""
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urljoin, urlparse
+
+import lxml.html
+from lxml import etree
+
+from rb_ingestor import content_density
+from rb_ingestor.article_document import NOISE_TAGS
+
+# ----------------------- parse -----------------------
+
+_CHARSET_RE = re.compile(rb"""<meta[^>]+charset=["']?([A-Za-z0-9_\-]+)""", re.I)
+
+
+def _decode(content: bytes) -> str:
+    """Decodifica pelo BOM ou pelo <meta charset> (padrão UTF-8)."""
+    if content.startswith(b"\xef\xbb\xbf"):
+        return content[3:].decode("utf-8", errors="replace")
+    match = _CHARSET_RE.search(content[:4096])
+    encoding = match.group(1).decode("ascii") if match else "utf-8"
+    try:
+        return content.decode(encoding, errors="replace")
+    except LookupError:
+        return content.decode("utf-8", errors="replace")
+
+
+def parse_html(content):
+    """Raiz lxml do documento (bytes ou str); None se a página estiver vazia."""
+    if isinstance(content, bytes):
+        content = _decode(content)
+    if not content or not content.strip():
+        return None
+    try:
+        return lxml.html.document_fromstring(content)
+    except (etree.ParserError, ValueError):
+        return None
+
+
+# ----------------------- seletores -----------------------
+
+_STEP_RE = re.compile(r"""
+    (?P<tag>[a-zA-Z][\w-]*|\*)?
+    (?P<rest>(?:\.[\w-]+|\[[^\]]+\])*)
+""", re.X)
+_PART_RE = re.compile(r"""\.(?P<cls>[\w-]+)|\[(?P<attr>[\w:-]+)(?:(?P<op>[*^$]?=)["']?(?P<val>[^"'\]]*)["']?)?\]""")
+
+
+def _literal(value: str) -> str:
+    if "'" not in value:
+        return f"'{value}'"
+    if '"' not in value:
+        return f'"{value}"'
+    return "concat('" + value.replace("'", "', \"'\", '") + "')"
+
+
+def _step(step: str) -> str:
+    match = _STEP_RE.fullmatch(step)
+    if not match or not step:
+        raise ValueError(f"seletor CSS não suportado: {step!r}")
+    predicates = []
+    for part in _PART_RE.finditer(match.group("rest")):
+        if part.group("cls"):
+            predicates.append(f"contains(concat(' ', normalize-space(@class), ' '), ' {part.group('cls')} ')")
+            continue
+        attr, op, value = part.group("attr"), part.group("op"), part.group("val")
+        if not op:
+            predicates.append(f"@{attr}")
+        elif op == "=":
+            predicates.append(f"@{attr}={_literal(value)}")
+        elif op == "*=":
+            predicates.append(f"contains(@{attr}, {_literal(value)})")
+        elif op == "^=":
+            predicates.append(f"starts-with(@{attr}, {_literal(value)})")
+        else:
+            predicates.append(f"substring(@{attr}, string-length(@{attr}) - {len(value) - 1})={_literal(value)}")
+    return (match.group("tag") or "*") + "".join(f"[{p}]" for p in predicates)
+
+
+def css_to_xpath(selector: str) -> str:
+    """Traduz o subconjunto de CSS usado nos extratores (tag, .classe, [atributo],
+    descendente e ``>``) para XPath."""
+    xpath, axis = "descendant-or-self::", None
+    for token in re.findall(r">|[^\s>]+", selector.strip()):
+        if token == ">":
+            axis = "/"
+            continue
+        if xpath.endswith("::"):
+            xpath += _step(token)
+        else:
+            xpath += ("/" if axis else "//") + _step(token)
+        axis = None
+    return xpath
+
+
+@lru_cache(maxsize=None)
+def css(selector: str) -> etree.XPath:
+    """XPath compilada (e guardada) para o seletor CSS."""
+    return etree.XPath(css_to_xpath(selector))
+
+
+_NOISE_PREDICATE = " or ".join(f"self::{tag}" for tag in sorted(NOISE_TAGS))
+_IN_NOISE = etree.XPath(f"boolean(ancestor-or-self::*[{_NOISE_PREDICATE}])")
+_VISIBLE_TEXT = etree.XPath(f".//text()[not(ancestor::*[{_NOISE_PREDICATE}])]")
+_ALL_TEXT = etree.XPath(".//text()")
+_META = etree.XPath("//meta[@*[name()=$attr]=$value]/@content")
+_IMAGES = etree.XPath("//img")
+_LINKS = etree.XPath("//a/@href")
+
+
+def in_noise(element) -> bool:
+    return _IN_NOISE(element)
+
+
+def text(element) -> str:
+    return "".join(_ALL_TEXT(element))
+
+
+def visible_text(element) -> str:
+    """Texto sem scripts, menus, anúncios, cabeçalho e rodapé."""
+    return "".join(_VISIBLE_TEXT(element))
+
+
+def meta(tree, attr: str, value: str) -> str:
+    found = _META(tree, attr=attr, value=value)
+    return found[0].strip() if found and found[0] else ""
+
+
+class SelectorSet:
+    """Listas de seletores por campo, compiladas: as do domínio vêm antes das genéricas."""
+
+    def __init__(self, rules: Dict[str, List[str]], base: Optional["SelectorSet"] = None):
+        self.fields = {}
+        # Só os seletores próprios (do veículo); vazio no conjunto genérico
+        self.own = {field: [css(s) for s in selectors] for field, selectors in rules.items()} if base else {}
+        for field in set(rules) | set(base.fields if base else {}):
+            own = [css(s) for s in rules.get(field, [])]
+            inherited = base.fields.get(field, []) if base else []
+            self.fields[field] = own + [x for x in inherited if x not in own]
+
+    def __getitem__(self, field: str) -> List[etree.XPath]:
+        return self.fields.get(field, [])
+
+
+GENERIC_RULES = {
+    "title": [
+        "h1", ".titulo", ".title", ".headline", ".noticia-titulo", ".materia-titulo", ".artigo-titulo",
+        ".post-title", ".entry-title", '[data-testid="headline"]', ".content-head__title",
+    ],
+    "description": [
+        ".subtitulo", ".resumo", ".lead", ".summary", ".noticia-resumo", ".materia-resumo", ".artigo-resumo",
+        ".post-excerpt", ".entry-summary", ".content-head__subtitle",
+    ],
+    "content": [
+        ".conteudo", ".noticia-conteudo", ".materia-conteudo", ".artigo-conteudo", ".texto", ".content",
+        "article", ".post-content", ".entry-content", ".article-body", ".story-body", ".news-content",
+        '[data-testid="article-body"]', '[itemprop="articleBody"]', "main", ".post-content__body",
+        ".single-content", ".c-entry-content", ".sg-text", ".article__content", ".article-content",
+    ],
+    "author": [".autor", ".author", ".byline", ".escritor", ".writer", '[data-testid="author"]', ".content-head__author"],
+    "date": [".data", ".date", ".published", ".timestamp", "time", '[data-testid="timestamp"]', ".content-head__date"],
+    "breadcrumb": [".breadcrumb a", ".breadcrumbs a", "nav.breadcrumb a", "ol.breadcrumb li a", "ul.breadcrumb li a"],
+    "tags": [".tags a", ".label a", ".categoria a", ".category a"],
+}
+
+# Seletores próprios de cada veículo (estrutura real das páginas de matéria)
+DOMAIN_RULES = {
+    "g1.globo.com": {
+        "content": [".mc-article-body", '[itemprop="articleBody"]'],
+        "author": [".content-publication-data__from .author", ".content-publication-data__from a"],
+    },
+    "oglobo.globo.com": {
+        "content": [".article__content-container", ".article__content", '[itemprop="articleBody"]'],
+        "author": [".article__author-name", ".article__author"],
+        "date": [".article__date", "time"],
+    },
+    "folha.uol.com.br": {
+        "content": [".c-news__body"],
+        "author": [".c-signature__author"],
+        "breadcrumb": [".c-breadcrumb a"],
+    },
+    "estadao.com.br": {
+        "content": [".news-body", '[data-testid="content"]'],
+        "author": [".authors-names", ".author-name"],
+        "date": [".principal-dates time", "time"],
+    },
+    "uol.com.br": {
+        "content": [".text", ".jupiter-paragraph-fragment"],
+        "author": [".solar-author-names", ".author"],
+        "date": [".solar-date time", "time"],
+    },
+    "cnnbrasil.com.br": {
+        "content": [".single-content", ".post__content"],
+        "author": [".author__name", ".post__author"],
+        "date": [".post__data", "time"],
+    },
+}
+
+GENERIC = SelectorSet(GENERIC_RULES)
+
+
+@lru_cache(maxsize=256)
+def selectors_for(domain: str) -> SelectorSet:
+    """SelectorSet do domínio (``www.``/subdomínios caem na regra do domínio pai)."""
+    domain = (domain or "").lower()
+    for known, rules in DOMAIN_RULES.items():
+        if domain == known or domain.endswith("." + known):
+            return SelectorSet(rules, base=GENERIC)
+    return GENERIC
+
+
+# ----------------------- campos -----------------------
+
+def first(tree, selectors: List[etree.XPath], min_len: int = 1, skip_noise: bool = False, visible: bool = False) -> str:
+    """Texto do primeiro elemento de cada seletor, devolvendo o primeiro com ``min_len``."""
+    for selector in selectors:
+        for element in selector(tree):
+            if skip_noise and in_noise(element):
+                continue
+            value = (visible_text(element) if visible else text(element)).strip()
+            if value and len(value) >= min_len:
+                return value
+            break
+    return ""
+
+
+def _clean(value: str) -> str:
+    return re.sub(r"\s+", " ", value).strip()
+
+
+def extract_title(tree, rules: SelectorSet = GENERIC) -> str:
+    return meta(tree, "property", "og:title") or meta(tree, "name", "title") or first(tree, rules["title"], min_len=11)
+
+
+def extract_description(tree, rules: SelectorSet = GENERIC) -> str:
+    return (meta(tree, "property", "og:description") or meta(tree, "name", "description")
+            or first(tree, rules["description"], min_len=21))
+
+
+# Corpo por densidade só vale se tiver ao menos isso (senão tenta os seletores genéricos)
+MIN_DENSITY_CHARS = 200
+
+
+def extract_main_content(tree, rules: SelectorSet = GENERIC, density: bool = True) -> str:
+    """Corpo da matéria: seletores do veículo -> densidade de texto -> seletores genéricos."""
+    for selector in rules.own.get("content", []):
+        element = next((el for el in selector(tree) if not in_noise(el)), None)
+        if element is not None:
+            content = _clean(visible_text(element))
+            if len(content) > 100:
+                return content
+    if density:
+        content = content_density.extract(tree)
+        if len(content) >= MIN_DENSITY_CHARS:
+            return content
+    return selector_content(tree, rules)
+
+
+def selector_content(tree, rules: SelectorSet = GENERIC) -> str:
+    """Estratégia antiga: primeiro seletor de conteúdo com texto, senão todos os <p>."""
+    for selector in rules["content"]:
+        element = next((el for el in selector(tree) if not in_noise(el)), None)
+        if element is not None:
+            content = _clean(visible_text(element))
+            if len(content) > 100:
+                return content
+    # Fallback: parágrafos fora de menus/rodapés
+    parts = []
+    for p in css("p")(tree):
+        if in_noise(p):
+            continue
+        value = visible_text(p).strip()
+        if len(value) > 20:
+            parts.append(value)
+    return "\n\n".join(parts)
+
+
+def extract_category(tree, rules: SelectorSet = GENERIC) -> str:
+    value = meta(tree, "property", "article:section") or meta(tree, "name", "section")
+    if value:
+        return value
+    for selector in rules["breadcrumb"]:
+        found = selector(tree)
+        if found:
+            # último item frequentemente é a seção
+            value = text(found[-1]).strip()
+            if len(value) > 2:
+                return value
+    return first(tree, rules["tags"])
+
+
+def extract_images(tree, limit: int = 5) -> List[Dict]:
+    images = []
+    for img in _IMAGES(tree):
+        src = img.get("src") or img.get("data-src")
+        if not src:
+            continue
+        if src.startswith("//"):
+            src = "https:" + src
+        images.append({"src": src, "alt": img.get("alt", "")})
+        if len(images) >= limit:
+            break
+    return images
+
+
+def extract_article(tree, url: str, rules: SelectorSet = None, density: bool = True) -> Dict:
+    """Campos do artigo (mesmo formato do NewsContentExtractor)."""
+    rules = rules or selectors_for(urlparse(url).netloc)
+    return {
+        "title": extract_title(tree, rules),
+        "description": extract_description(tree, rules),
+        "content": extract_main_content(tree, rules, density=density),
+        "category": extract_category(tree, rules),
+        "author": first(tree, rules["author"]),
+        "date": first(tree, rules["date"]),
+        "images": extract_images(tree),
+    }
+
+
+def external_links(tree, base_url: str) -> List[str]:
+    """Links externos (publishers) na ordem da página, decodificando ``google.com/url?url=``."""
+    links, seen = [], set()
+    for href in _LINKS(tree):
+        if href.startswith("./"):
+            href = urljoin(base_url, href)
+        parsed = urlparse(href)
+        if "google.com" in parsed.netloc and ("url=" in parsed.query or parsed.path.startswith("/url")):
+            href = (parse_qs(parsed.query).get("url") or [href])[0]
+        if href.startswith("http") and "google.com" not in href and href not in seen:
+            seen.add(href)
+            links.append(href)
+    return links
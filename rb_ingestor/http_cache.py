@@ -0,0 +1,263 @@
+# rb_ingestor/http_cache.py
+"""
+Cache HTTP em disco para a ingestão (SQLite, fora do banco do Django).
+
+- respostas 200 de GET ficam guardadas com o corpo comprimido (zlib)
+- dentro do TTL da fonte a resposta sai do disco, sem rede
+- vencido o TTL, a requisição vai com ``If-None-Match`` /
+  ``If-Modified-Since``; um 304 só renova a validade da cópia guardada
+- TTL longo só para páginas de matéria e APIs de imagens livres; o resto
+  (tendências, buscas, capas de portais, feeds) tem TTL 0: guarda e
+  revalida a cada requisição (se a resposta tiver ETag/Last-Modified)
+- ``Cache-Control: no-store`` na resposta é respeitado; ``no-cache`` na
+  requisição força a revalidação
+- o arquivo tem tamanho máximo (HTTP_CACHE_MAX_MB), com despejo LRU
+
+Usado pelo adapter do http_client.py (requests) e pela coleta de RSS
+(rss_collector.py, httpx). Manutenção: ``manage.py http_cache``.
+"""
+import json
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+import zlib
+from typing import Optional
+from urllib.parse import urlparse
+
+ENABLED = os.getenv("HTTP_CACHE_ENABLED", "True") == "True"
+CACHE_PATH = os.getenv("HTTP_CACHE_PATH", os.path.join(tempfile.gettempdir(), "radarbr_http_cache.sqlite3"))
+MAX_BYTES = int(float(os.getenv("HTTP_CACHE_MAX_MB", "200")) * 1024 * 1024)
+MAX_ENTRY_BYTES = int(float(os.getenv("HTTP_CACHE_MAX_ENTRY_MB", "5")) * 1024 * 1024)
+# 0 = guarda, mas revalida (GET condicional) a cada uso
+DEFAULT_TTL = int(os.getenv("HTTP_CACHE_TTL_DEFAULT", "0"))
+ARTICLE_TTL = int(os.getenv("HTTP_CACHE_TTL_ARTICLE", str(6 * 3600)))
+NO_STORE = None
+
+# (host, prefixo do path, TTL em segundos ou NO_STORE); a primeira que casar vale
+TTL_RULES = [
+    ("news.google.com", "/rss/search", 600),
+    ("news.google.com", "/rss/articles", 3600),
+    ("news.google.com", "", 600),
+    ("www.google.com", "/ping", NO_STORE),
+    ("www.bing.com", "/ping", NO_STORE),
+    # Tendências e buscas mudam a cada execução do cron
+    ("trends.google.com", "", 0),
+    ("api.twitter.com", "", 0),
+    ("www.googleapis.com", "/youtube", 0),
+    ("duckduckgo.com", "", 0),
+    ("www.bing.com", "/search", 0),
+    ("www.reddit.com", "", 600),
+    ("commons.wikimedia.org", "", 24 * 3600),
+    ("api.openverse.org", "", 24 * 3600),
+    ("api.pexels.com", "", 3600),
+    ("api.unsplash.com", "", 3600),
+    ("pixabay.com", "/api", 3600),
+]
+
+# Página de matéria: sem query string e terminando em .html/.ghtml/.shtml/.htm ou
+# num slug de 3+ palavras ("/politica/2025/01/camara-aprova-reforma/"); capas,
+# editorias e buscas não casam
+_ARTICLE_PATH = re.compile(r"\.[gs]?html?$|/[^/]*[^\W_]+-[^\W_]+-[^\W_]+[^/]*/?$")
+
+# Cabeçalhos que não valem para o corpo já descomprimido guardado no cache
+_DROP_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "set-cookie"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    url TEXT PRIMARY KEY,
+    host TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    raw_size INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    stored_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    last_access REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access);
+"""
+
+
+def ttl_for(url: str) -> Optional[int]:
+    """TTL da URL em segundos (0 = sempre revalidar) ou NO_STORE."""
+    parsed = urlparse(url)
+    host = parsed.netloc.lower()
+    for rule_host, prefix, ttl in TTL_RULES:
+        if (host == rule_host or host.endswith("." + rule_host)) and parsed.path.startswith(prefix):
+            return ttl
+    if not parsed.query and _ARTICLE_PATH.search(parsed.path):
+        return ARTICLE_TTL
+    return DEFAULT_TTL
+
+
+class CacheEntry:
+    def __init__(self, row):
+        (self.url, self.host, self.status, headers, body, self.raw_size, self.size,
+         self.etag, self.last_modified, self.stored_at, self.expires_at, self.last_access, self.hits) = row
+        self.headers = json.loads(headers)
+        self._body = body
+
+    @property
+    def body(self) -> bytes:
+        return zlib.decompress(self._body)
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+    def conditional_headers(self) -> dict:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HttpCache:
+    """Armazenamento SQLite (uma conexão por thread, WAL)."""
+
+    def __init__(self, path: str = CACHE_PATH, max_bytes: int = MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._stores = 0
+        self.counters = {"hits": 0, "revalidated": 0, "stored": 0, "evicted": 0}
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def _count(self, key: str, amount: int = 1):
+        with self._lock:
+            self.counters[key] += amount
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        row = self._conn().execute("SELECT * FROM entries WHERE url = ?", (url,)).fetchone()
+        return CacheEntry(row) if row else None
+
+    def hit(self, entry: CacheEntry, revalidated: bool = False, headers: dict = None):
+        """Marca uso (LRU); numa revalidação (304) renova validade e validadores."""
+        now = time.time()
+        if revalidated:
+            headers = {k.lower(): v for k, v in (headers or {}).items()}
+            self._conn().execute(
+                "UPDATE entries SET last_access = ?, hits = hits + 1, expires_at = ?, "
+                "etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified) WHERE url = ?",
+                (now, now + (ttl_for(entry.url) or 0), headers.get("etag"), headers.get("last-modified"), entry.url),
+            )
+            self._count("revalidated")
+        else:
+            self._conn().execute(
+                "UPDATE entries SET last_access = ?, hits = hits + 1 WHERE url = ?", (now, entry.url)
+            )
+            self._count("hits")
+
+    def store(self, url: str, status: int, headers: dict, body: bytes) -> bool:
+        ttl = ttl_for(url)
+        lowered = {k.lower(): v for k, v in headers.items()}
+        if (ttl is NO_STORE or status != 200 or len(body) > MAX_ENTRY_BYTES
+                or "no-store" in lowered.get("cache-control", "").lower()):
+            return False
+        if not ttl and not (lowered.get("etag") or lowered.get("last-modified")):
+            # Sempre revalidada e sem validador: a cópia nunca seria usada
+            return False
+        kept = {k: v for k, v in headers.items() if k.lower() not in _DROP_HEADERS}
+        compressed = zlib.compress(body, 6)
+        now = time.time()
+        self._conn().execute(
+            "INSERT OR REPLACE INTO entries (url, host, status, headers, body, raw_size, size, etag, "
+            "last_modified, stored_at, expires_at, last_access, hits) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0)",
+            (url, urlparse(url).netloc.lower(), status, json.dumps(kept), compressed, len(body), len(compressed),
+             lowered.get("etag"), lowered.get("last-modified"), now, now + ttl, now),
+        )
+        self._count("stored")
+        with self._lock:
+            self._stores += 1
+            check = self._stores % 20 == 0
+        if check:
+            self.evict()
+        return True
+
+    def total_size(self) -> int:
+        return self._conn().execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def evict(self, max_bytes: int = None) -> int:
+        """Remove as entradas menos usadas recentemente até caber em 90% do limite."""
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        total = self.total_size()
+        if total <= max_bytes:
+            return 0
+        target = int(max_bytes * 0.9)
+        removed = 0
+        conn = self._conn()
+        for url, size in conn.execute("SELECT url, size FROM entries ORDER BY last_access").fetchall():
+            if total <= target:
+                break
+            conn.execute("DELETE FROM entries WHERE url = ?", (url,))
+            total -= size
+            removed += 1
+        self._count("evicted", removed)
+        return removed
+
+    def prune(self, stale_after: float = 7 * 24 * 3600) -> int:
+        """Apaga entradas vencidas sem validadores e as vencidas há mais de ``stale_after``."""
+        now = time.time()
+        cursor = self._conn().execute(
+            "DELETE FROM entries WHERE expires_at < ? AND ((etag IS NULL AND last_modified IS NULL) OR expires_at < ?)",
+            (now, now - stale_after),
+        )
+        return cursor.rowcount + self.evict()
+
+    def clear(self) -> int:
+        cursor = self._conn().execute("DELETE FROM entries")
+        self._conn().execute("VACUUM")
+        return cursor.rowcount
+
+    def summary(self) -> dict:
+        conn = self._conn()
+        now = time.time()
+        row = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(raw_size), 0), COALESCE(SUM(hits), 0), "
+            "COALESCE(SUM(expires_at > ?), 0) FROM entries", (now,),
+        ).fetchone()
+        hosts = conn.execute(
+            "SELECT host, COUNT(*), SUM(size), SUM(hits) FROM entries GROUP BY host ORDER BY SUM(size) DESC LIMIT 15"
+        ).fetchall()
+        return {
+            "path": self.path,
+            "entries": row[0],
+            "size_bytes": row[1],
+            "raw_bytes": row[2],
+            "hits": row[3],
+            "fresh": row[4],
+            "max_bytes": self.max_bytes,
+            "hosts": [{"host": h, "entries": n, "size_bytes": s, "hits": hits} for h, n, s, hits in hosts],
+        }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> HttpCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = HttpCache()
+        return _cache
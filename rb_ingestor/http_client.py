@@ -0,0 +1,207 @@
+# rb_ingestor/http_client.py
+"""
+Cliente HTTP compartilhado da ingestão.
+
+Todos os módulos de ingestão usam a mesma ``requests.Session`` do processo:
+
+- pool de conexões keep-alive por host (urllib3), então TLS e TCP são
+  negociados uma vez por host e reaproveitados entre módulos
+- timeouts padrão (HTTP_CONNECT_TIMEOUT / HTTP_READ_TIMEOUT) quando o
+  chamador não informa
+- retries com backoff para erros de conexão e 429/5xx (HTTP_RETRIES),
+  respeitando Retry-After
+- um único User-Agent e cabeçalhos de navegador em português
+- cache condicional em disco para GETs (ETag/Last-Modified, TTL por
+  fonte), ver http_cache.py
+
+``stats()`` e a métrica ``radarbr_ingest_http_requests{connection=...}``
+mostram quantas requisições reaproveitaram uma conexão já aberta.
+
+A coleta assíncrona de RSS (rss_collector.py) usa httpx e negocia HTTP/2
+quando o pacote ``h2`` está instalado (``HTTP2_AVAILABLE``).
+"""
+import importlib.util
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from urllib3.util.retry import Retry
+
+from rb_ingestor import http_cache
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+# APIs públicas (Wikimedia, Openverse, buscadores) pedem um UA identificável
+BOT_USER_AGENT = "RadarBRBot/1.0 (+https://radarbr.com)"
+BOT_HEADERS = {"User-Agent": BOT_USER_AGENT}
+
+DEFAULT_HEADERS = {
+    "User-Agent": USER_AGENT,
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+    "Accept-Language": "pt-BR,pt;q=0.9,en;q=0.8",
+    "Accept-Encoding": "gzip, deflate, br",
+    "Connection": "keep-alive",
+}
+
+CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "15"))
+RETRIES = int(os.getenv("HTTP_RETRIES", "2"))
+POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "10"))
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+class _PooledAdapter(HTTPAdapter):
+    """HTTPAdapter com timeout padrão e contagem de conexões novas x reaproveitadas."""
+
+    def __init__(self, client, **kwargs):
+        self.client = client
+        super().__init__(**kwargs)
+
+    def send(self, request, timeout=None, **kwargs):
+        if timeout is None:
+            timeout = (CONNECT_TIMEOUT, READ_TIMEOUT)
+
+        entry = None
+        cacheable = http_cache.ENABLED and request.method == "GET" and not kwargs.get("stream")
+        if cacheable:
+            try:
+                entry = http_cache.get_cache().get(request.url)
+            except Exception as e:
+                print(f"⚠ Cache HTTP indisponível: {e}")
+                cacheable = False
+            if entry is not None:
+                force = "no-cache" in request.headers.get("Cache-Control", "").lower()
+                if entry.fresh and not force:
+                    http_cache.get_cache().hit(entry)
+                    self.client._count_cache("hits")
+                    return self._from_cache(request, entry, "HIT")
+                request.headers.update(entry.conditional_headers())
+
+        response = self._send_counted(request, timeout=timeout, **kwargs)
+
+        if cacheable:
+            try:
+                if response.status_code == 304 and entry is not None:
+                    response.close()
+                    http_cache.get_cache().hit(entry, revalidated=True, headers=response.headers)
+                    self.client._count_cache("revalidated")
+                    return self._from_cache(request, entry, "REVALIDATED")
+                if response.status_code == 200:
+                    http_cache.get_cache().store(request.url, 200, dict(response.headers), response.content)
+                    self.client._count_cache("misses")
+            except Exception as e:
+                print(f"⚠ Falha ao gravar no cache HTTP: {e}")
+        return response
+
+    def _send_counted(self, request, **kwargs):
+        pool = None
+        opened_before = 0
+        try:
+            pool = self.get_connection_with_tls_context(request, kwargs.get("verify", True), kwargs.get("proxies"), kwargs.get("cert"))
+            opened_before = pool.num_connections
+        except Exception:
+            pass
+        try:
+            return super().send(request, **kwargs)
+        finally:
+            if pool is not None:
+                self.client._count(reused=pool.num_connections == opened_before)
+
+    def _from_cache(self, request, entry, status):
+        response = requests.Response()
+        response.status_code = entry.status
+        response.reason = "OK"
+        response.headers = CaseInsensitiveDict(entry.headers)
+        response.headers["X-Cache"] = status
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = entry.body
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+
+class HttpClient:
+    """Sessão pooled com política única de timeout, retry e User-Agent."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = {
+            "requests": 0, "new_connections": 0, "reused_connections": 0,
+            "cache_hits": 0, "cache_revalidated": 0, "cache_misses": 0,
+        }
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+        retry = Retry(
+            total=RETRIES,
+            connect=RETRIES,
+            read=RETRIES,
+            status=RETRIES,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({"GET", "HEAD", "OPTIONS"}),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = _PooledAdapter(self, pool_connections=32, pool_maxsize=POOL_MAXSIZE, max_retries=retry)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _count(self, reused: bool):
+        with self._lock:
+            self.counters["requests"] += 1
+            self.counters["reused_connections" if reused else "new_connections"] += 1
+        try:
+            from core.metrics import INGEST_HTTP_REQUESTS
+            INGEST_HTTP_REQUESTS.inc(connection="reused" if reused else "new")
+        except Exception:
+            pass
+
+    def _count_cache(self, kind: str):
+        with self._lock:
+            self.counters[f"cache_{kind}"] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            data = dict(self.counters)
+        data["reuse_ratio"] = round(data["reused_connections"] / data["requests"], 3) if data["requests"] else 0.0
+        return data
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> HttpClient:
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
+
+
+def get_session() -> requests.Session:
+    """Sessão compartilhada do processo (não altere os headers dela; passe ``headers=``)."""
+    return get_client().session
+
+
+def get(url, **kwargs):
+    return get_session().get(url, **kwargs)
+
+
+def head(url, **kwargs):
+    return get_session().head(url, **kwargs)
+
+
+def post(url, **kwargs):
+    return get_session().post(url, **kwargs)
+
+
+def stats() -> dict:
+    return get_client().stats()
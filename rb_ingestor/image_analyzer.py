@@ -3,54 +3,42 @@
 Sistema de análise de imagem para busca de imagens similares
 """
 import os
-import requests
 import base64
 from typing import Dict, Optional, List
 from urllib.parse import urljoin, urlparse
-from bs4 import BeautifulSoup
 
-try:
-    from openai import OpenAI
-except Exception:
-    OpenAI = None
+from rb_ingestor import article_document, http_client, llm_client
+from rb_ingestor.html_engine import meta
 
 class ImageAnalyzer:
     """Analisa imagens de notícias para buscar imagens similares"""
     
     def __init__(self):
         self.openai_client = None
-        if OpenAI and os.getenv("OPENAI_API_KEY"):
-            self.openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        if llm_client.available() and os.getenv("OPENAI_API_KEY"):
+            self.openai_client = llm_client.get_client()
     
-    def extract_main_image_from_url(self, url: str) -> Optional[str]:
-        """Extrai a imagem principal de uma URL de notícia"""
+    def extract_main_image_from_url(self, url: str, doc=None) -> Optional[str]:
+        """Extrai a imagem principal de uma URL de notícia (``doc``: ArticleDocument já baixado)"""
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            
-            response = requests.get(url, headers=headers, timeout=10)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
+            doc = doc or article_document.load(url, timeout=10)
+            tree = doc.tree
+            if tree is None:
+                return None
             
             # Buscar imagem principal (várias estratégias)
             image_url = None
             
             # 1. Meta tag og:image
-            og_image = soup.find('meta', property='og:image')
-            if og_image and og_image.get('content'):
-                image_url = og_image['content']
+            image_url = meta(tree, 'property', 'og:image')
             
             # 2. Meta tag twitter:image
             if not image_url:
-                twitter_image = soup.find('meta', name='twitter:image')
-                if twitter_image and twitter_image.get('content'):
-                    image_url = twitter_image['content']
+                image_url = meta(tree, 'name', 'twitter:image')
             
             # 3. Primeira imagem grande no artigo
             if not image_url:
-                images = soup.find_all('img')
+                images = tree.iter('img')
                 for img in images:
                     src = img.get('src') or img.get('data-src')
                     if src:
@@ -64,7 +52,7 @@ class ImageAnalyzer:
             
             # Converter URL relativa para absoluta
             if image_url and not image_url.startswith('http'):
-                image_url = urljoin(url, image_url)
+                image_url = urljoin(doc.url, image_url)
             
             return image_url
             
@@ -80,14 +68,14 @@ class ImageAnalyzer:
         
         try:
             # Baixar a imagem
-            response = requests.get(image_url, timeout=10)
+            response = http_client.get(image_url, timeout=10)
             response.raise_for_status()
             
             # Codificar em base64
             image_base64 = base64.b64encode(response.content).decode('utf-8')
             
-            # Analisar com OpenAI Vision
-            analysis = self.openai_client.chat.completions.create(
+            # Analisar com OpenAI Vision (cache pela imagem em base64: a mesma foto em outra URL acerta)
+            result = llm_client.chat(
                 model="gpt-4o-mini",
                 messages=[
                     {
@@ -116,8 +104,6 @@ Responda em português brasileiro e seja específico."""
                 max_tokens=500
             )
             
-            result = analysis.choices[0].message.content
-            
             return {
                 'description': result,
                 'image_url': image_url,
@@ -168,12 +154,12 @@ Responda em português brasileiro e seja específico."""
         # Limitar a 8 palavras-chave mais relevantes
         return keywords[:8]
     
-    def analyze_news_image(self, news_url: str) -> Optional[Dict]:
+    def analyze_news_image(self, news_url: str, doc=None) -> Optional[Dict]:
         """Processo completo: extrai e analisa imagem de uma notícia"""
         print(f"🔍 Analisando imagem da notícia: {news_url}")
         
         # 1. Extrair imagem principal
-        image_url = self.extract_main_image_from_url(news_url)
+        image_url = self.extract_main_image_from_url(news_url, doc=doc)
         if not image_url:
             print("❌ Nenhuma imagem encontrada na notícia")
             return None
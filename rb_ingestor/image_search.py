@@ -6,7 +6,7 @@ Integra com APIs gratuitas e gera URLs de imagens relevantes.
 
 import os
 import re
-import requests
+from rb_ingestor import http_client
 import time
 from typing import Optional, List, Dict, Tuple
 from urllib.parse import quote
@@ -26,9 +26,7 @@ class ImageSearchEngine:
         self._cache = {}
         
         # Headers para requests
-        self.headers = {
-            'User-Agent': 'RadarBR/1.0 (News Aggregator)'
-        }
+        self.headers = dict(http_client.BOT_HEADERS)
     
     def extract_keywords(self, title: str, content: str = "") -> List[str]:
         """
@@ -108,7 +106,7 @@ class ImageSearchEngine:
                 'Authorization': f'Client-ID {self.unsplash_key}'
             }
             
-            response = requests.get(url, params=params, headers=headers, timeout=10)
+            response = http_client.get(url, params=params, headers=headers, timeout=10)
             response.raise_for_status()
             
             data = response.json()
@@ -141,7 +139,7 @@ class ImageSearchEngine:
                 'Authorization': self.pexels_key
             }
             
-            response = requests.get(url, params=params, headers=headers, timeout=10)
+            response = http_client.get(url, params=params, headers=headers, timeout=10)
             response.raise_for_status()
             
             data = response.json()
@@ -174,7 +172,7 @@ class ImageSearchEngine:
                 'min_height': 600
             }
             
-            response = requests.get(url, params=params, headers=self.headers, timeout=10)
+            response = http_client.get(url, params=params, headers=self.headers, timeout=10)
             response.raise_for_status()
             
             data = response.json()
@@ -190,7 +188,7 @@ class ImageSearchEngine:
     def validate_image_url(self, url: str) -> bool:
         """Valida se a URL da imagem é acessível, válida e atende critérios de qualidade"""
         try:
-            response = requests.head(url, headers=self.headers, timeout=10, allow_redirects=True)
+            response = http_client.head(url, headers=self.headers, timeout=10, allow_redirects=True)
             if response.status_code != 200:
                 return False
             
@@ -6,10 +6,11 @@ e metadados (crédito, licença, etc.).
 """
 from __future__ import annotations
 import re
-import requests
 from typing import Optional, Dict
 
-UA = "RadarBRBot/1.0 (+https://radarbr.com)"
+from rb_ingestor import http_client
+
+UA = http_client.BOT_USER_AGENT
 HTTP_TIMEOUT = 12
 
 # ----------------------- Wikimedia -----------------------
@@ -26,7 +27,7 @@ def _wikimedia_search(term: str) -> Optional[Dict]:
         "iiurlwidth": 1600, "origin": "*",
     }
     try:
-        r = requests.get(API, params=params, headers={"User-Agent": UA}, timeout=HTTP_TIMEOUT)
+        r = http_client.get(API, params=params, headers={"User-Agent": UA}, timeout=HTTP_TIMEOUT)
         r.raise_for_status()
         data = r.json()
     except Exception:
@@ -67,7 +68,7 @@ def _openverse_search(term: str) -> Optional[Dict]:
         "fields": "creator,url,license,license_version,foreign_landing_url",
     }
     try:
-        r = requests.get(API, params=params, headers={"User-Agent": UA}, timeout=HTTP_TIMEOUT)
+        r = http_client.get(API, params=params, headers={"User-Agent": UA}, timeout=HTTP_TIMEOUT)
         r.raise_for_status()
         data = r.json()
     except Exception:
@@ -1,4 +1,4 @@
-import requests
+from rb_ingestor import http_client
 import re
 import logging
 from typing import Dict, List, Optional
@@ -166,7 +166,6 @@ class InstagramImageFinder:
             return None
         
         try:
-            import requests
             from bs4 import BeautifulSoup
             
             url = news_article['url']
@@ -174,7 +173,7 @@ class InstagramImageFinder:
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
             }
             
-            response = requests.get(url, headers=headers, timeout=10)
+            response = http_client.get(url, headers=headers, timeout=10)
             if response.status_code != 200:
                 return None
             
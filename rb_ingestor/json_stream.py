@@ -0,0 +1,150 @@
+# rb_ingestor/json_stream.py
+"""
+Parser incremental do objeto JSON devolvido pela IA em streaming.
+
+A resposta chega em pedaços (``{"title": "Cop``, ``om mantém...``); o
+``JsonFieldStream`` consome cada pedaço uma vez só e devolve eventos dos
+campos de texto do objeto de primeiro nível assim que aparecem:
+
+- ``("chunk", campo, texto)``: trecho novo (já decodificado) de um campo
+- ``("done", campo, valor)``: campo completo
+
+Texto antes do ``{`` (```json, "Aqui está o artigo:") é ignorado; valores
+que não são strings (números, listas, objetos) são pulados, só o
+``done`` sai com o texto bruto do valor. Escapes (``\\n``, ``\\"``,
+``\\u00e7``, pares surrogate) cortados entre dois pedaços são tratados.
+"""
+import json
+from typing import List, Tuple
+
+_SIMPLE_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+
+class JsonFieldStream:
+    def __init__(self):
+        self.state = "before"  # before, key, in_key, colon, value, string, other, after_value, done
+        self.fields = {}
+        self._key = []
+        self._field = None
+        self._value = []  # partes do campo atual (string) ou texto bruto (outros)
+        self._escape = None  # None, "" (depois da barra) ou "uXXXX" parcial
+        self._surrogate = ""
+        self._depth = 0  # valores não-string: profundidade de {}/[]
+        self._other_in_string = False
+        self._other_escape = False
+
+    @property
+    def done(self) -> bool:
+        return self.state == "done"
+
+    def feed(self, chunk: str) -> List[Tuple[str, str, str]]:
+        events = []
+        piece = []  # texto novo do campo string atual neste pedaço
+        for ch in chunk:
+            state = self.state
+            if state == "string":
+                if self._escape is not None:
+                    self._escape += ch
+                    if self._escape[0] == "u":
+                        if len(self._escape) < 5:
+                            continue
+                        decoded = self._decode_unicode(self._escape[1:])
+                    else:
+                        decoded = _SIMPLE_ESCAPES.get(ch, ch)
+                    self._escape = None
+                    if decoded:
+                        piece.append(decoded)
+                    continue
+                if ch == "\\":
+                    self._escape = ""
+                elif ch == '"':
+                    if piece:
+                        self._value.append("".join(piece))
+                        events.append(("chunk", self._field, "".join(piece)))
+                        piece = []
+                    self._finish("".join(self._value), events)
+                else:
+                    piece.append(ch)
+            elif state == "before":
+                if ch == "{":
+                    self.state = "key"
+            elif state == "key":
+                if ch == '"':
+                    self.state = "in_key"
+                    self._key = []
+                elif ch == "}":
+                    self.state = "done"
+            elif state == "in_key":
+                if self._escape is not None:
+                    self._key.append(_SIMPLE_ESCAPES.get(ch, ch))
+                    self._escape = None
+                elif ch == "\\":
+                    self._escape = ""
+                elif ch == '"':
+                    self._field = "".join(self._key)
+                    self.state = "colon"
+                else:
+                    self._key.append(ch)
+            elif state == "colon":
+                if ch == ":":
+                    self.state = "value"
+            elif state == "value":
+                if ch.isspace():
+                    continue
+                self._value = []
+                if ch == '"':
+                    self.state = "string"
+                else:
+                    self.state = "other"
+                    self._depth = 1 if ch in "{[" else 0
+                    self._other_in_string = False
+                    self._value.append(ch)
+            elif state == "other":
+                if self._other_in_string:
+                    self._value.append(ch)
+                    if self._other_escape:
+                        self._other_escape = False
+                    elif ch == "\\":
+                        self._other_escape = True
+                    elif ch == '"':
+                        self._other_in_string = False
+                    continue
+                if self._depth == 0 and ch in ",}":
+                    self._finish("".join(self._value).strip(), events)
+                    self.state = "key" if ch == "," else "done"
+                    continue
+                self._value.append(ch)
+                if ch == '"':
+                    self._other_in_string = True
+                elif ch in "{[":
+                    self._depth += 1
+                elif ch in "}]":
+                    self._depth -= 1
+            elif state == "after_value":
+                if ch == ",":
+                    self.state = "key"
+                elif ch == "}":
+                    self.state = "done"
+            if self.state == "done":
+                break
+        if piece and self.state == "string":
+            self._value.append("".join(piece))
+            events.append(("chunk", self._field, "".join(piece)))
+        return events
+
+    def _decode_unicode(self, digits: str) -> str:
+        code = int(digits, 16)
+        if 0xD800 <= code <= 0xDBFF:
+            self._surrogate = digits
+            return ""
+        if 0xDC00 <= code <= 0xDFFF and self._surrogate:
+            high, self._surrogate = self._surrogate, ""
+            return json.loads(f'"\\u{high}\\u{digits}"')
+        return chr(code)
+
+    def _finish(self, value: str, events):
+        self.fields[self._field] = value
+        events.append(("done", self._field, value))
+        self._value = []
+        if self.state == "string":
+            self.state = "after_value"
@@ -0,0 +1,263 @@
+# rb_ingestor/llm_cache.py
+"""
+Cache em disco das respostas da OpenAI (SQLite, fora do banco do Django).
+
+Retries do pipeline, ``--dry-run`` e reexecuções depois de um crash
+pagavam de novo pelos mesmos prompts. Agora ``llm_client.chat`` e
+``llm_client.generate_image`` consultam o cache antes de chamar a API:
+
+- a chave é o SHA-256 de (tipo, modelo, mensagens, parâmetros), então a
+  mesma imagem em base64 numa chamada de visão acerta mesmo vinda de outra
+  URL
+- TTL por tipo: texto (LLM_CACHE_TTL_TEXT), visão (LLM_CACHE_TTL_VISION) e
+  imagem gerada (LLM_CACHE_TTL_IMAGE, curto: a URL do DALL-E expira)
+- tamanho máximo do arquivo (LLM_CACHE_MAX_MB), com despejo LRU
+- cada entrada guarda o custo estimado da chamada (tokens × PRICES), e cada
+  acerto soma esse custo em "economizado"
+- desligar: LLM_CACHE_ENABLED=False; ignorar o cache numa execução
+  (sem ler nem gravar): LLM_CACHE_BYPASS=True, ``set_bypass(True)`` /
+  ``with bypass():`` ou ``--no-llm-cache`` nos comandos; numa chamada:
+  ``chat(..., cache=False)``
+
+Manutenção: ``manage.py llm_cache``.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from typing import Optional
+
+ENABLED = os.getenv("LLM_CACHE_ENABLED", "True") == "True"
+CACHE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join(tempfile.gettempdir(), "radarbr_llm_cache.sqlite3"))
+MAX_BYTES = int(float(os.getenv("LLM_CACHE_MAX_MB", "100")) * 1024 * 1024)
+TTL = {
+    "text": int(os.getenv("LLM_CACHE_TTL_TEXT", str(24 * 3600))),
+    "vision": int(os.getenv("LLM_CACHE_TTL_VISION", str(30 * 24 * 3600))),
+    "image": int(os.getenv("LLM_CACHE_TTL_IMAGE", "3000")),
+}
+
+# USD por 1M de tokens (entrada, saída); imagens: USD por imagem
+PRICES = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-3.5-turbo": (0.50, 1.50),
+}
+IMAGE_PRICES = {"dall-e-3": 0.04, "dall-e-2": 0.02}
+
+_bypass = os.getenv("LLM_CACHE_BYPASS", "False") == "True"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    model TEXT NOT NULL,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    prompt_tokens INTEGER NOT NULL DEFAULT 0,
+    completion_tokens INTEGER NOT NULL DEFAULT 0,
+    cost_usd REAL NOT NULL DEFAULT 0,
+    stored_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    last_access REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access);
+"""
+
+
+def make_key(kind: str, model: str, payload: dict) -> str:
+    blob = json.dumps({"kind": kind, "model": model, "payload": payload}, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def estimate_cost(model: str, prompt_tokens: int = 0, completion_tokens: int = 0, images: int = 0) -> float:
+    if images:
+        return images * IMAGE_PRICES.get(model, 0.04)
+    # "gpt-4o-mini-2024-07-18" usa o preço de "gpt-4o-mini"
+    base = max((name for name in PRICES if model.startswith(name)), key=len, default=None)
+    price_in, price_out = PRICES.get(base, (0.0, 0.0))
+    return (prompt_tokens * price_in + completion_tokens * price_out) / 1_000_000
+
+
+def set_bypass(enabled: bool = True):
+    """Liga/desliga o bypass para o processo todo (vale para as threads do pool)."""
+    global _bypass
+    _bypass = enabled
+
+
+def bypassed() -> bool:
+    return _bypass or not ENABLED
+
+
+@contextmanager
+def bypass():
+    previous = _bypass
+    set_bypass(True)
+    try:
+        yield
+    finally:
+        set_bypass(previous)
+
+
+def _metric(result: str, saved: float = 0.0):
+    try:
+        from core.metrics import LLM_CACHE, LLM_CACHE_SAVED
+        LLM_CACHE.inc(result=result)
+        if saved:
+            LLM_CACHE_SAVED.inc(saved)
+    except Exception:
+        pass
+
+
+class LlmCache:
+    """Armazenamento SQLite (uma conexão por thread, WAL)."""
+
+    def __init__(self, path: str = CACHE_PATH, max_bytes: int = MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._stores = 0
+        self.counters = {"hits": 0, "misses": 0, "bypassed": 0, "stored": 0, "evicted": 0, "saved_usd": 0.0}
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def _count(self, key: str, amount=1):
+        with self._lock:
+            self.counters[key] += amount
+
+    def get(self, key: str) -> Optional[str]:
+        """Resposta guardada e dentro do TTL (conta hit/miss)."""
+        if bypassed():
+            self._count("bypassed")
+            _metric("bypass")
+            return None
+        now = time.time()
+        row = self._conn().execute(
+            "SELECT body, cost_usd FROM entries WHERE key = ? AND expires_at > ?", (key, now)
+        ).fetchone()
+        if row is None:
+            self._count("misses")
+            _metric("miss")
+            return None
+        self._conn().execute("UPDATE entries SET last_access = ?, hits = hits + 1 WHERE key = ?", (now, key))
+        self._count("hits")
+        self._count("saved_usd", row[1])
+        _metric("hit", row[1])
+        return zlib.decompress(row[0]).decode("utf-8")
+
+    def store(self, key: str, kind: str, model: str, value: str,
+              prompt_tokens: int = 0, completion_tokens: int = 0, cost_usd: float = 0.0) -> bool:
+        if bypassed() or not value or not TTL.get(kind):
+            return False
+        body = zlib.compress(value.encode("utf-8"), 6)
+        now = time.time()
+        self._conn().execute(
+            "INSERT OR REPLACE INTO entries (key, kind, model, body, size, prompt_tokens, completion_tokens, "
+            "cost_usd, stored_at, expires_at, last_access, hits) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0)",
+            (key, kind, model, body, len(body), prompt_tokens, completion_tokens, cost_usd, now, now + TTL[kind], now),
+        )
+        self._count("stored")
+        with self._lock:
+            self._stores += 1
+            check = self._stores % 20 == 0
+        if check:
+            self.evict()
+        return True
+
+    def total_size(self) -> int:
+        return self._conn().execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def evict(self, max_bytes: int = None) -> int:
+        """Remove as entradas menos usadas recentemente até caber em 90% do limite."""
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        total = self.total_size()
+        if total <= max_bytes:
+            return 0
+        target = int(max_bytes * 0.9)
+        removed = 0
+        conn = self._conn()
+        for key, size in conn.execute("SELECT key, size FROM entries ORDER BY last_access").fetchall():
+            if total <= target:
+                break
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            total -= size
+            removed += 1
+        self._count("evicted", removed)
+        return removed
+
+    def prune(self) -> int:
+        """Apaga as entradas vencidas e aplica o limite de tamanho."""
+        cursor = self._conn().execute("DELETE FROM entries WHERE expires_at < ?", (time.time(),))
+        return cursor.rowcount + self.evict()
+
+    def clear(self) -> int:
+        cursor = self._conn().execute("DELETE FROM entries")
+        self._conn().execute("VACUUM")
+        return cursor.rowcount
+
+    def stats(self) -> dict:
+        """Contadores desta execução (processo)."""
+        with self._lock:
+            data = dict(self.counters)
+        lookups = data["hits"] + data["misses"]
+        data["hit_ratio"] = round(data["hits"] / lookups, 3) if lookups else 0.0
+        data["saved_usd"] = round(data["saved_usd"], 4)
+        return data
+
+    def summary(self) -> dict:
+        """Estado do arquivo: entradas, tamanho e acertos/custo economizado acumulados por tipo."""
+        conn = self._conn()
+        now = time.time()
+        kinds = conn.execute(
+            "SELECT kind, COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(hits), 0), "
+            "COALESCE(SUM(hits * cost_usd), 0), COALESCE(SUM(expires_at > ?), 0) FROM entries GROUP BY kind",
+            (now,),
+        ).fetchall()
+        return {
+            "path": self.path,
+            "entries": sum(row[1] for row in kinds),
+            "size_bytes": sum(row[2] for row in kinds),
+            "hits": sum(row[3] for row in kinds),
+            "saved_usd": round(sum(row[4] for row in kinds), 4),
+            "max_bytes": self.max_bytes,
+            "kinds": [
+                {"kind": kind, "entries": n, "size_bytes": size, "hits": hits, "saved_usd": round(saved, 4), "fresh": fresh}
+                for kind, n, size, hits, saved, fresh in kinds
+            ],
+        }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> LlmCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = LlmCache()
+        return _cache
+
+
+def configure(path: str):
+    """Troca o arquivo do cache do processo (benchmarks)."""
+    global _cache
+    with _cache_lock:
+        _cache = LlmCache(path=path)
@@ -0,0 +1,383 @@
+# rb_ingestor/llm_client.py
+"""
+Cliente compartilhado da API de chat (OpenAI) para a geração de artigos.
+
+Cada ``generate_article`` / ``generate_enhanced_article`` bloqueia 20–60 s
+esperando a IA; em sequência, uma execução de 5 matérias ficava minutos
+parada. Agora todas as chamadas passam por ``chat``:
+
+- um único cliente OpenAI por processo (pool httpx keep-alive, thread-safe)
+- limite global de chamadas simultâneas (LLM_CONCURRENCY), valendo para
+  threads do pipeline, ``map_concurrent`` e chamadas avulsas
+- timeout por chamada (LLM_TIMEOUT)
+- retry com backoff exponencial + jitter em 429, timeout, erro de conexão
+  e 5xx (LLM_MAX_RETRIES), respeitando ``retry-after``/``retry-after-ms``.
+  A espera acontece fora do slot, liberando a vaga para outra chamada.
+  429 de cota esgotada (``insufficient_quota``) não é repetido
+- ``map_concurrent`` roda uma função de geração para vários itens num
+  pool limitado, devolvendo os resultados na ordem de entrada
+- respostas de texto, visão e imagens geradas passam pelo cache em disco
+  (llm_cache.py): um acerto não ocupa slot nem chama a API. Só entra no
+  cache resposta completa (``finish_reason == "stop"``) e aceita pelo
+  ``validate`` do chamador (JSON que parseia, tamanho mínimo...), senão a
+  mesma resposta ruim voltaria em todo retry do pipeline
+- ``chat_stream`` entrega a resposta em trechos (LLM_STREAM): o pipeline
+  lê o título do JSON enquanto o corpo ainda está sendo gerado
+  (json_stream.py) e pode interromper a geração no meio
+
+``OPENAI_BASE_URL`` aponta o cliente para outro servidor compatível: o
+``bench_llm`` usa o stub local de llm_stub.py. ``stats()`` e as métricas
+``radarbr_llm_requests{outcome=...}`` / ``radarbr_llm_duration_seconds``
+mostram chamadas, retries, 429 e timeouts; ``stats()`` soma também os
+tokens gastos.
+"""
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from rb_ingestor import llm_cache
+
+try:
+    import openai
+    from openai import OpenAI
+except Exception:
+    openai = None
+    OpenAI = None
+
+MODEL_DEFAULT = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "3"))
+TIMEOUT = float(os.getenv("LLM_TIMEOUT", "90"))
+MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "4"))
+BACKOFF_BASE = float(os.getenv("LLM_BACKOFF_BASE", "2"))
+BACKOFF_MAX = float(os.getenv("LLM_BACKOFF_MAX", "60"))
+# Geração de artigos em streaming (etapas que só dependem do título começam antes do corpo)
+STREAM = os.getenv("LLM_STREAM", "True") == "True"
+
+_client = None
+_client_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(max(1, CONCURRENCY))
+_stats_lock = threading.Lock()
+_stats = {}
+
+
+def reset_stats():
+    with _stats_lock:
+        _stats.clear()
+        _stats.update({
+            "calls": 0, "ok": 0, "errors": 0, "retries": 0, "rate_limited": 0, "timeouts": 0,
+            "in_flight": 0, "peak_in_flight": 0, "seconds": 0.0, "prompt_tokens": 0, "completion_tokens": 0,
+        })
+
+
+reset_stats()
+
+
+def available() -> bool:
+    return OpenAI is not None
+
+
+def get_client():
+    """Cliente OpenAI do processo; os retries ficam por conta de ``chat``."""
+    global _client
+    if OpenAI is None:
+        raise RuntimeError("pacote openai não instalado")
+    with _client_lock:
+        if _client is None:
+            _client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"), timeout=TIMEOUT, max_retries=0)
+        return _client
+
+
+def configure(concurrency: int = None, base_url: str = None, api_key: str = None, timeout: float = None):
+    """Troca limite de concorrência, timeout e/ou servidor (benchmarks e stub local)."""
+    global _client, _slots, CONCURRENCY, TIMEOUT
+    if timeout is not None:
+        TIMEOUT = timeout
+    if concurrency is not None:
+        CONCURRENCY = max(1, concurrency)
+        _slots = threading.BoundedSemaphore(CONCURRENCY)
+    if base_url is not None or api_key is not None:
+        if OpenAI is None:
+            raise RuntimeError("pacote openai não instalado")
+        with _client_lock:
+            _client = OpenAI(
+                api_key=api_key or os.getenv("OPENAI_API_KEY"),
+                base_url=base_url or os.getenv("OPENAI_BASE_URL"),
+                timeout=TIMEOUT,
+                max_retries=0,
+            )
+
+
+def _count(**deltas):
+    with _stats_lock:
+        for key, value in deltas.items():
+            _stats[key] += value
+        _stats["peak_in_flight"] = max(_stats["peak_in_flight"], _stats["in_flight"])
+
+
+def _metric(outcome: str, seconds: float = None):
+    try:
+        from core.metrics import LLM_LATENCY, LLM_REQUESTS
+        LLM_REQUESTS.inc(outcome=outcome)
+        if seconds is not None:
+            LLM_LATENCY.observe(seconds)
+    except Exception:
+        pass
+
+
+def _retry_after(response) -> float:
+    """Espera pedida pelo servidor (retry-after-ms / retry-after), 0 se não houver."""
+    if response is None:
+        return 0.0
+    headers = response.headers
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except ValueError:
+        pass
+    return 0.0
+
+
+def _backoff(attempt: int) -> float:
+    return min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt) * random.uniform(0.5, 1.0)
+
+
+def _retryable(error):
+    """(repetir?, espera mínima pedida pelo servidor, rótulo) para o erro da API."""
+    if isinstance(error, openai.RateLimitError):
+        if getattr(error, "code", None) == "insufficient_quota":
+            return False, 0.0, "rate_limited"
+        return True, _retry_after(error.response), "rate_limited"
+    if isinstance(error, openai.APITimeoutError):
+        return True, 0.0, "timeout"
+    if isinstance(error, openai.APIConnectionError):
+        return True, 0.0, "connection"
+    if isinstance(error, openai.APIStatusError) and error.status_code >= 500:
+        return True, _retry_after(error.response), "server_error"
+    return False, 0.0, "error"
+
+
+def _failed(error, start: float, last_attempt: bool):
+    """Conta o erro de uma tentativa; devolve a espera antes de repetir ou None se não repete."""
+    if openai is None or not isinstance(error, openai.OpenAIError):
+        _count(errors=1)
+        return None
+    retry, wait, outcome = _retryable(error)
+    _count(
+        rate_limited=outcome == "rate_limited",
+        timeouts=outcome == "timeout",
+        seconds=time.perf_counter() - start,
+    )
+    _metric(outcome)
+    if not retry or last_attempt:
+        _count(errors=1)
+        return None
+    return wait
+
+
+def _with_retries(call, retries: int = None):
+    """Executa ``call()`` num slot, com backoff em 429/timeout/5xx."""
+    retries = MAX_RETRIES if retries is None else retries
+    for attempt in range(retries + 1):
+        with _slots:
+            _count(calls=1, in_flight=1)
+            start = time.perf_counter()
+            try:
+                response = call()
+                elapsed = time.perf_counter() - start
+                _count(ok=1, seconds=elapsed)
+                _metric("ok", elapsed)
+                return response
+            except Exception as e:
+                wait = _failed(e, start, attempt == retries)
+                if wait is None:
+                    raise
+            finally:
+                _count(in_flight=-1)
+        # Espera fora do slot: a vaga fica livre para outra matéria
+        _count(retries=1)
+        time.sleep(max(wait, _backoff(attempt)))
+
+
+def _is_vision(messages) -> bool:
+    return any(
+        isinstance(message.get("content"), list)
+        and any(part.get("type") == "image_url" for part in message["content"] if isinstance(part, dict))
+        for message in messages
+    )
+
+
+def _accepted(content: str, validate) -> bool:
+    if validate is None:
+        return True
+    try:
+        return bool(validate(content))
+    except Exception:
+        return False
+
+
+def _cacheable(content: str, finish_reason, validate) -> bool:
+    """Resposta completa (não cortada por max_tokens/filtro) e aceita pelo chamador."""
+    return bool(content) and finish_reason == "stop" and _accepted(content, validate)
+
+
+def chat(messages, *, model: str = None, timeout: float = None, max_retries: int = None,
+         cache: bool = True, validate=None, **params) -> str:
+    """Uma chamada chat.completions (texto da resposta) com cache, limite de concorrência, timeout e backoff.
+
+    ``validate(texto) -> bool``: a resposta só vai para o cache (e um acerto
+    no cache só é usado) se o chamador a aceitar; exceção conta como recusa.
+    """
+    model = model or MODEL_DEFAULT
+    kind = "vision" if _is_vision(messages) else "text"
+    store = llm_cache.get_cache() if cache else None
+    key = llm_cache.make_key(kind, model, {"messages": messages, **params}) if store else None
+    if store:
+        cached = store.get(key)
+        if cached is not None and _accepted(cached, validate):
+            return cached
+
+    client = get_client()
+    response = _with_retries(
+        lambda: client.chat.completions.create(model=model, messages=messages, timeout=timeout or TIMEOUT, **params),
+        max_retries,
+    )
+    content = response.choices[0].message.content or ""
+    usage = getattr(response, "usage", None)
+    prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+    completion_tokens = getattr(usage, "completion_tokens", 0) or 0
+    _count(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+    if store and _cacheable(content, getattr(response.choices[0], "finish_reason", None), validate):
+        store.store(key, kind, model, content, prompt_tokens, completion_tokens,
+                    llm_cache.estimate_cost(model, prompt_tokens, completion_tokens))
+    return content
+
+
+def chat_stream(messages, *, model: str = None, timeout: float = None, max_retries: int = None,
+                cache: bool = True, validate=None, **params):
+    """Como ``chat``, mas gera os trechos de texto conforme a API os envia (``stream=True``).
+
+    O slot fica ocupado enquanto o gerador é consumido. Retry só antes do
+    primeiro trecho; depois disso o erro sobe para quem está consumindo.
+    Fechar o gerador no meio (``close()``/``break``) fecha a conexão e a API
+    para de gerar (tokens economizados). A resposta só vai para o cache se
+    chegar inteira e passar no ``validate``; um acerto no cache sai num
+    trecho só.
+    """
+    model = model or MODEL_DEFAULT
+    kind = "vision" if _is_vision(messages) else "text"
+    store = llm_cache.get_cache() if cache else None
+    key = llm_cache.make_key(kind, model, {"messages": messages, **params}) if store else None
+    if store:
+        cached = store.get(key)
+        if cached is not None and _accepted(cached, validate):
+            yield cached
+            return
+
+    client = get_client()
+    retries = MAX_RETRIES if max_retries is None else max_retries
+    for attempt in range(retries + 1):
+        with _slots:
+            _count(calls=1, in_flight=1)
+            start = time.perf_counter()
+            stream = None
+            parts = []
+            usage = None
+            finish_reason = None
+            try:
+                stream = client.chat.completions.create(
+                    model=model, messages=messages, timeout=timeout or TIMEOUT, stream=True,
+                    stream_options={"include_usage": True}, **params,
+                )
+                for event in stream:
+                    if getattr(event, "usage", None):
+                        usage = event.usage
+                    if not event.choices:
+                        continue
+                    finish_reason = event.choices[0].finish_reason or finish_reason
+                    delta = event.choices[0].delta.content
+                    if delta:
+                        parts.append(delta)
+                        yield delta
+                elapsed = time.perf_counter() - start
+                _count(ok=1, seconds=elapsed)
+                _metric("ok", elapsed)
+                break
+            except GeneratorExit:
+                _count(seconds=time.perf_counter() - start)
+                _metric("aborted")
+                raise
+            except Exception as e:
+                wait = _failed(e, start, attempt == retries or bool(parts))
+                if wait is None:
+                    raise
+            finally:
+                _count(in_flight=-1)
+                if stream is not None:
+                    stream.close()
+        _count(retries=1)
+        time.sleep(max(wait, _backoff(attempt)))
+
+    content = "".join(parts)
+    prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+    completion_tokens = getattr(usage, "completion_tokens", 0) or 0
+    _count(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+    if store and _cacheable(content, finish_reason, validate):
+        store.store(key, kind, model, content, prompt_tokens, completion_tokens,
+                    llm_cache.estimate_cost(model, prompt_tokens, completion_tokens))
+
+
+def generate_image(prompt: str, *, model: str = "dall-e-3", timeout: float = None, max_retries: int = None,
+                   cache: bool = True, **params) -> str:
+    """URL de uma imagem gerada (images.generate), com cache curto: a URL da OpenAI expira."""
+    store = llm_cache.get_cache() if cache else None
+    key = llm_cache.make_key("image", model, {"prompt": prompt, **params}) if store else None
+    if store:
+        cached = store.get(key)
+        if cached is not None:
+            return cached
+
+    client = get_client()
+    response = _with_retries(
+        lambda: client.images.generate(model=model, prompt=prompt, n=1, timeout=timeout or TIMEOUT, **params),
+        max_retries,
+    )
+    url = response.data[0].url
+    if store and url:
+        store.store(key, "image", model, url, cost_usd=llm_cache.estimate_cost(model, images=1))
+    return url
+
+
+def map_concurrent(fn, items, workers: int = None, log=print) -> list:
+    """``[fn(item) for item in items]`` em paralelo (até ``workers``, padrão LLM_CONCURRENCY).
+
+    A ordem dos resultados segue a de ``items``; item cuja função levantou
+    exceção vira ``None`` (o erro é logado).
+    """
+    items = list(items)
+    if not items:
+        return []
+
+    def run(item):
+        try:
+            return fn(item)
+        except Exception as e:
+            log(f"⚠ Geração falhou: {e}")
+            return None
+        finally:
+            # Threads do pool podem ter aberto conexões com o banco
+            from django.db import connections
+            connections.close_all()
+
+    with ThreadPoolExecutor(max_workers=min(workers or CONCURRENCY, len(items)), thread_name_prefix="llm") as pool:
+        return list(pool.map(run, items))
+
+
+def stats() -> dict:
+    with _stats_lock:
+        data = dict(_stats)
+    data["seconds"] = round(data["seconds"], 2)
+    return data
@@ -0,0 +1,196 @@
+# rb_ingestor/llm_stub.py
+"""
+Servidor local que imita ``POST /v1/chat/completions`` da OpenAI.
+
+Usado pelo ``bench_llm`` (e por quem quiser testar a geração sem chave nem
+rede): ``llm_client.configure(base_url=stub.base_url, api_key="stub")``.
+
+- responde depois de ``latency`` segundos com um artigo em JSON
+  (title/dek/html) montado a partir do prompt; com ``response_format``
+  json_schema, com os campos do schema (category = primeiro slug citado no
+  prompt); prompts de reescrita de título e de figura pública recebem a
+  resposta curta que esperam
+- ``max_in_flight``: acima disso responde 429 com ``retry-after-ms``, como
+  o limite de requisições simultâneas da API
+- ``rate_limit_every``: a cada N requisições uma recebe 429
+- ``slow_every``: a cada N requisições uma demora ``slow_latency``
+  (para exercitar o timeout por chamada)
+- ``stream=True``: responde em SSE (``data: {chunk}`` ... ``data: [DONE]``),
+  com a latência distribuída entre os trechos como numa geração real;
+  ``counters["aborted"]`` conta os clientes que fecharam no meio
+"""
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def _article(prompt: str, words: int) -> dict:
+    match = re.search(r"T[ÓO]PICO:\s*(.+)", prompt, re.I)
+    topic = (match.group(1) if match else prompt).strip()[:80] or "Assunto"
+    paragraph = f"{topic} segue em destaque no noticiário, com novos desdobramentos para o leitor brasileiro. "
+    body = "".join(f"<h2>Parte {i + 1}</h2><p>{paragraph * 8}</p>" for i in range(max(1, words // 120)))
+    return {"title": f"{topic}: o que se sabe até agora"[:70], "dek": f"Entenda {topic}"[:150], "html": body}
+
+
+def _content(request: dict, prompt: str, words: int) -> str:
+    """Resposta no formato pedido: schema (structured outputs), título reescrito, figura pública ou artigo."""
+    response_format = request.get("response_format") or {}
+    if response_format.get("type") == "json_schema":
+        article = _article(prompt, words)
+        schema = response_format["json_schema"]["schema"]
+        categories = schema["properties"].get("category", {}).get("enum") or ["brasil"]
+        text = prompt.split("CAMPOS ADICIONAIS")[0].lower()  # sem a lista de slugs do próprio pedido
+        article["category"] = next((slug for slug in categories if slug in text), categories[0])
+        article["figures"] = []
+        return json.dumps({key: article.get(key, "") for key in schema["properties"]}, ensure_ascii=False)
+    if "TÍTULO REESCRITO" in prompt:
+        return _article(prompt, words)["title"]
+    if "figura pública" in prompt:
+        return json.dumps({"name": None})
+    return json.dumps(_article(prompt, words), ensure_ascii=False)
+
+
+class StubChatServer:
+    def __init__(self, latency: float = 1.0, max_in_flight: int = 0, rate_limit_every: int = 0,
+                 slow_every: int = 0, slow_latency: float = 30.0, retry_after_ms: int = 200, words: int = 800):
+        self.latency = latency
+        self.max_in_flight = max_in_flight
+        self.rate_limit_every = rate_limit_every
+        self.slow_every = slow_every
+        self.slow_latency = slow_latency
+        self.retry_after_ms = retry_after_ms
+        self.words = words
+        self._lock = threading.Lock()
+        self.counters = {"requests": 0, "ok": 0, "rate_limited": 0, "slow": 0, "in_flight": 0, "peak_in_flight": 0, "aborted": 0}
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}/v1"
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _admit(self):
+        """Decide a resposta desta requisição: 'ok', 'slow' ou 'rate_limited'."""
+        with self._lock:
+            self.counters["requests"] += 1
+            n = self.counters["requests"]
+            if (self.max_in_flight and self.counters["in_flight"] >= self.max_in_flight) or (
+                self.rate_limit_every and n % self.rate_limit_every == 0
+            ):
+                self.counters["rate_limited"] += 1
+                return "rate_limited"
+            self.counters["in_flight"] += 1
+            self.counters["peak_in_flight"] = max(self.counters["peak_in_flight"], self.counters["in_flight"])
+            if self.slow_every and n % self.slow_every == 0:
+                self.counters["slow"] += 1
+                return "slow"
+            return "ok"
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _json(self, status, payload, headers=None):
+                body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _event(self, payload):
+                data = payload if isinstance(payload, str) else json.dumps(payload, ensure_ascii=False)
+                self.wfile.write(f"data: {data}\n\n".encode("utf-8"))
+                self.wfile.flush()
+
+            def _stream(self, request, prompt, content, latency, pieces=40):
+                """SSE como o da API: 10% da latência até o 1º trecho, o resto espalhado pelos demais."""
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                base = {
+                    "id": f"chatcmpl-stub-{stub.counters['requests']}",
+                    "object": "chat.completion.chunk",
+                    "created": int(time.time()),
+                    "model": request.get("model", "stub"),
+                }
+                size = max(1, len(content) // pieces + 1)
+                time.sleep(latency * 0.1)
+                for start in range(0, len(content), size):
+                    self._event({**base, "choices": [{
+                        "index": 0, "delta": {"content": content[start:start + size]}, "finish_reason": None,
+                    }]})
+                    time.sleep(latency * 0.9 / pieces)
+                self._event({**base, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]})
+                self._event({**base, "choices": [], "usage": {
+                    "prompt_tokens": len(prompt) // 4, "completion_tokens": len(content) // 4,
+                    "total_tokens": (len(prompt) + len(content)) // 4,
+                }})
+                self._event("[DONE]")
+                with stub._lock:
+                    stub.counters["ok"] += 1
+
+            def do_POST(self):
+                if not self.path.rstrip("/").endswith("/chat/completions"):
+                    self._json(404, {"error": {"message": "not found", "type": "invalid_request_error"}})
+                    return
+                request = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+                decision = stub._admit()
+                if decision == "rate_limited":
+                    self._json(429, {"error": {
+                        "message": "Rate limit reached", "type": "requests", "code": "rate_limit_exceeded",
+                    }}, {"retry-after-ms": str(stub.retry_after_ms)})
+                    return
+                try:
+                    latency = stub.slow_latency if decision == "slow" else stub.latency
+                    prompt = (request.get("messages") or [{}])[-1].get("content", "")
+                    if isinstance(prompt, list):  # visão: partes de texto + imagem
+                        prompt = " ".join(part.get("text", "") for part in prompt if isinstance(part, dict))
+                    content = _content(request, prompt, stub.words)
+                    if request.get("stream"):
+                        self._stream(request, prompt, content, latency)
+                        return
+                    time.sleep(latency)
+                    self._json(200, {
+                        "id": f"chatcmpl-stub-{stub.counters['requests']}",
+                        "object": "chat.completion",
+                        "created": int(time.time()),
+                        "model": request.get("model", "stub"),
+                        "choices": [{
+                            "index": 0,
+                            "message": {"role": "assistant", "content": content},
+                            "finish_reason": "stop",
+                        }],
+                        "usage": {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(content) // 4,
+                                  "total_tokens": (len(prompt) + len(content)) // 4},
+                    })
+                    with stub._lock:
+                        stub.counters["ok"] += 1
+                except (BrokenPipeError, ConnectionResetError):
+                    # cliente desistiu (timeout, ou fechou o streaming no meio)
+                    with stub._lock:
+                        stub.counters["aborted"] += 1
+                finally:
+                    with stub._lock:
+                        stub.counters["in_flight"] -= 1
+
+        return Handler
@@ -14,11 +14,15 @@ from slugify import slugify
 from datetime import datetime, timedelta
 import random
 import logging
+from rb_ingestor import minhash, pipeline
 from rb_ingestor.title_styles import title_style_manager
+from core.metrics import ingest_stage
 
 # Configurar logging
 logger = logging.getLogger(__name__)
 
+ORIGEM = __name__.rsplit(".", 1)[-1]
+
 class Command(BaseCommand):
     help = "Automação CORRIGIDA que busca notícias específicas e gera conteúdo baseado nelas"
 
@@ -26,11 +30,9 @@ class Command(BaseCommand):
         parser.add_argument("--limit", type=int, default=3, help="Número de artigos a criar")
         parser.add_argument("--force", action="store_true", help="Força execução")
         parser.add_argument("--debug", action="store_true", help="Modo debug")
+        parser.add_argument("--enqueue-only", action="store_true", help="Só cria os jobs; processe com ingest_pipeline --run")
 
     def handle(self, *args, **options):
-        Noticia = apps.get_model("rb_noticias", "Noticia")
-        Categoria = apps.get_model("rb_noticias", "Categoria")
-        
         self.stdout.write("=== AUTOMACAO RENDER RADARBR CORRIGIDA ===")
         self.stdout.write(f"Executado em: {timezone.now()}")
         
@@ -45,15 +47,38 @@ class Command(BaseCommand):
             self.stdout.write("ERRO: Nenhuma notícia específica encontrada")
             return
         
-        # Executar automação baseada em notícias reais
-        created_count = self._execute_automation_from_news(news_articles, Noticia, Categoria, options["limit"])
-        
+        # Um job por notícia; as etapas (resolve, extração, IA, categoria, imagem, gravação) rodam no pipeline
+        jobs = [
+            pipeline.enqueue(
+                ORIGEM, article, titulo=article.get('title', ''), url=article.get('url', ''),
+                # Mesma notícia de origem (mesmo em outro cron/nó) = mesmo job
+                chave=pipeline.idempotency_key(url=article.get('url')) if article.get('url') else None,
+            )
+            for article in news_articles[:options["limit"]]
+        ]
+        if options.get("enqueue_only"):
+            self.stdout.write(f"📥 {len(jobs)} jobs na fila (processe com: python manage.py ingest_pipeline --run)")
+            return
+
+        result = pipeline.Pipeline({ORIGEM: self}, log=self.stdout.write).run(jobs)
+        created_count = result["concluido"]
+
         # Resultado
         self.stdout.write(self.style.SUCCESS(f"OK: {created_count} notícias criadas"))
-        
-        # Ping sitemap se criou algo
-        if created_count > 0:
-            self._ping_sitemap()
+        if result["falhou"]:
+            self.stdout.write(f"⚠ {result['falhou']} jobs falharam (retome com: python manage.py ingest_pipeline --run)")
+
+        from rb_ingestor import http_client
+        http = http_client.stats()
+        self.stdout.write(f"🔌 HTTP: {http['requests']} requisições, {http['reused_connections']} em conexões reaproveitadas ({http['reuse_ratio']:.0%})")
+        from rb_ingestor import article_document
+        docs = article_document.registry.stats
+        self.stdout.write(f"📄 Páginas: {docs['hits']} leituras reaproveitaram um download/parse já feito, {docs['fetches']} downloads extras")
+        from rb_ingestor import dedup
+        gate = dedup.stats()
+        self.stdout.write(f"🚧 Duplicatas barradas antes da extração/IA: {gate['rejected']} de {gate['checked']}")
+        near = minhash.stats()
+        self.stdout.write(f"🧬 MinHash: {near['matches']} quase-duplicatas em {near['lookups']} consultas ({near['candidates']} candidatos, {near['lookup_ms']}ms)")
 
     def _should_execute(self):
         """Verifica se deve executar baseado em timing"""
@@ -67,42 +92,42 @@ class Command(BaseCommand):
         # Executar se menos de 2 notícias recentes
         return recent_count < 2
 
+    @ingest_stage("rss")
     def _get_specific_news(self):
-        """Busca notícias via RSS feeds do Google News"""
+        """Busca notícias via RSS feeds do Google News (todos os tópicos em paralelo)"""
         try:
-            from rb_ingestor.news_content_extractor import NewsContentExtractor
+            from rb_ingestor.rss_collector import collect_topics
             
-            extractor = NewsContentExtractor()
             topics = [
                 'economia', 'política', 'tecnologia', 'brasil', 'mundo', 'esportes', 'saúde', 'ciência'
             ]
             
+            self.stdout.write(f"🔍 Buscando RSS para: {', '.join(topics)}")
             processed_news = []
-            for topic in topics:
-                self.stdout.write(f"🔍 Buscando RSS para: {topic}")
-                items = extractor.get_rss_items_for_topic(topic, max_items=2)
-                
-                for item in items:
-                    title = item.get('title') or ''
-                    desc = item.get('description') or ''
-                    url = item.get('link') or ''
-                    
-                    if title and url and self._is_valid_news_article({'title': title, 'url': url}):
-                        processed_news.append({
-                            'title': title,
-                            'description': desc,
-                            'url': url,
-                            'published_date': '',
-                            'source': '',
-                            'topic': self._extract_main_topic(title)
-                        })
-                        
-                        if len(processed_news) >= 8:  # Limite de artigos
-                            break
+            for item in collect_topics(topics, max_items=2):
+                title = item.get('title') or ''
+                desc = item.get('description') or ''
+                url = item.get('link') or ''
                 
-                if len(processed_news) >= 8:
-                    break
-            
+                if title and url and self._is_valid_news_article({'title': title, 'description': desc, 'url': url}):
+                    processed_news.append({
+                        'title': title,
+                        'description': desc,
+                        'url': url,
+                        'published_date': item.get('published', ''),
+                        'source': item.get('source', ''),
+                        'source_url': item.get('source_url', ''),
+                        'topic': self._extract_main_topic(title)
+                    })
+
+            # A mesma história em vários feeds/veículos vira um item só (o de download mais rápido);
+            # as outras cópias seguem como fontes alternativas
+            from rb_ingestor.story_clusters import cluster
+            stories = cluster(processed_news)
+            if len(stories) < len(processed_news):
+                self.stdout.write(f"🧩 {len(processed_news)} itens do RSS agrupados em {len(stories)} histórias")
+            processed_news = stories[:8]  # Limite de artigos
+
             self.stdout.write(f"✅ RSS retornou {len(processed_news)} notícias")
             return processed_news
             
@@ -111,32 +136,27 @@ class Command(BaseCommand):
             return []
 
     def _get_specific_news_fallback_rss(self):
-        """Fallback: usa RSS do Google News via NewsContentExtractor para montar artigos específicos."""
+        """Fallback: usa RSS do Google News (coleta paralela) para montar artigos específicos."""
         try:
-            from rb_ingestor.news_content_extractor import NewsContentExtractor
-            extractor = NewsContentExtractor()
+            from rb_ingestor.rss_collector import collect_topics
             topics = [
                 'economia', 'política', 'tecnologia', 'brasil', 'mundo', 'esportes', 'saúde', 'ciência'
             ]
             processed = []
-            for topic in topics:
-                items = extractor.get_rss_items_for_topic(topic, max_items=3) or []
-                for item in items:
-                    title = item.get('title') or ''
-                    desc = item.get('description') or ''
-                    url = item.get('link') or ''
-                    if not title or not url:
-                        continue
-                    processed.append({
-                        'title': title,
-                        'description': desc,
-                        'url': url,
-                        'published_date': '',
-                        'source': '',
-                        'topic': self._extract_main_topic(title)
-                    })
-                    if len(processed) >= 10:
-                        break
+            for item in collect_topics(topics, max_items=3):
+                title = item.get('title') or ''
+                desc = item.get('description') or ''
+                url = item.get('link') or ''
+                if not title or not url:
+                    continue
+                processed.append({
+                    'title': title,
+                    'description': desc,
+                    'url': url,
+                    'published_date': item.get('published', ''),
+                    'source': item.get('source', ''),
+                    'topic': self._extract_main_topic(title)
+                })
                 if len(processed) >= 10:
                     break
             return processed
@@ -190,132 +210,250 @@ class Command(BaseCommand):
         
         return title[:50]  # Fallback para primeiras 50 caracteres
 
-    def _execute_automation_from_news(self, news_articles, Noticia, Categoria, limit):
-        """Executa a automação baseada em notícias específicas"""
-        created_count = 0
-        
-        for i, article in enumerate(news_articles[:limit]):
-            try:
-                # Resolver URL original do Google News (se for link do GN)
-                original_url = self._resolve_original_url(article.get('url', ''))
-                if original_url:
-                    article['url'] = original_url
-                    article['original_url'] = original_url
-                # Gerar conteúdo baseado na notícia específica
-                title, content = self._generate_content_from_news(article)
-                
-                # Categorizar baseado no conteúdo da notícia
-                categoria = self._get_category_from_news(article, Categoria)
-                
-                # Verificar duplicatas
-                if self._check_duplicate(title, Noticia):
-                    self.stdout.write(f"⚠ Pulando duplicata: {title}")
-                    continue
-                
-                # Criar notícia
-                # Garantir unicidade de slug e fonte_url
-                ts = timezone.now().strftime('%Y%m%d%H%M%S')
-                fonte_url_value = article.get('url') or f"render-automation-{ts}-{i}"
-                # Se já existir, anexar sufixo único
-                if Noticia.objects.filter(fonte_url=fonte_url_value).exists():
-                    fonte_url_value = f"{fonte_url_value}?t={ts}{i}"
-
-                noticia = Noticia.objects.create(
-                    titulo=title,
-                    slug=f"{slugify(title)[:120]}-{ts}",
-                    conteudo=content,
-                    publicado_em=timezone.now(),
-                    categoria=categoria,
-                    fonte_url=fonte_url_value,
-                    fonte_nome=article.get('source', 'RadarBR Automation'),
-                    status=1  # PUBLICADO
-                )
-                
-                # Adicionar imagem específica
-                self._add_specific_image(noticia, article)
-                
-                created_count += 1
-                self.stdout.write(f"✓ Criado: {title}")
-                
-            except Exception as e:
-                self.stdout.write(f"❌ Erro ao criar notícia: {e}")
-                continue
-        
-        return created_count
+    # Etapas do pipeline (ver rb_ingestor/pipeline.py): cada uma recebe o job e os
+    # artefatos das etapas anteriores e devolve o que precisa ser gravado
+
+    def _article(self, job, data):
+        """Notícia do RSS com a URL já resolvida para o veículo original."""
+        return {**job.entrada, **(data.get('fetch') or {})}
+
+    def stage_gate(self, job, data):
+        # Antes de resolver o link, abrir o navegador ou chamar a IA: título do RSS e URL
+        # (o link do Google News e, se já conhecido ou decodificável offline, o do veículo)
+        from rb_ingestor import dedup
+        from rb_ingestor.gn_resolver import resolve
+        urls = [job.entrada.get('url', '')] + [alt['url'] for alt in job.entrada.get('alternates', [])]
+        reason = dedup.gate(
+            title=job.entrada.get('title', ''),
+            urls=urls + [resolve(url, allow_network=False) for url in urls if url],
+        )
+        if reason:
+            self.stdout.write(f"⚠ Pulando duplicata ({reason}): {job.entrada.get('title', '')}")
+            raise pipeline.SkipJob(f"duplicata ({reason})")
+        return {}
+
+    def stage_fetch(self, job, data):
+        # Resolver URL original do Google News (se for link do GN)
+        original_url = self._resolve_original_url(job.entrada.get('url', ''))
+        if not original_url:
+            return {}
+        return {'url': original_url, 'original_url': original_url}
+
+    def stage_extract(self, job, data):
+        article = self._article(job, data)
+        enhanced_article, base_words = self._extract_real_content(article)
+        # Mesma história em outro veículo (agrupada no RSS): só quando o representante não rendeu
+        for alternate in job.entrada.get('alternates', []):
+            if base_words is not None:
+                break
+            self.stdout.write(f"🔁 Tentando fonte alternativa: {alternate['source'] or alternate['url']}")
+            url = self._resolve_original_url(alternate['url']) or alternate['url']
+            extracted, words = self._extract_real_content({**article, 'url': url, 'title': alternate['title']})
+            if words is not None:
+                enhanced_article, base_words = extracted, words
+        return {'article': enhanced_article, 'base_words': base_words}
+
+    def stage_generate(self, job, data):
+        from rb_ingestor import llm_client
+        article = self._article(job, data)
+        enhanced_article = data['extract']['article']
+        if not llm_client.STREAM:
+            # Gerar conteúdo baseado na notícia específica
+            title, content = self._generate_content_from_news(article, enhanced_article, data['extract']['base_words'])
+            return {'titulo': title, 'conteudo': content}
+
+        # Em streaming: a categoria (só depende da notícia de origem) começa junto com a IA, e
+        # duplicata + imagem assim que o título chega, enquanto o corpo ainda está sendo gerado
+        from concurrent.futures import ThreadPoolExecutor
+        from rb_ingestor.ai_enhanced import GenerationAborted, clean_text
+        Categoria = apps.get_model("rb_noticias", "Categoria")
+        pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix=f"prefetch-{job.pk}")
+        futures = {'categoria': pool.submit(self._in_thread, self._get_category_pk, article, Categoria)}
+        early = {}
 
+        def on_field(field, value, done):
+            if field != 'title' or not done:
+                return
+            title = strip_tags(clean_text(value))[:200]
+            early['titulo'] = title
+            reason = self._check_duplicate(title)
+            if reason:
+                # Não vale a pena pagar pelo resto do corpo
+                raise GenerationAborted(reason)
+            self.stdout.write(f"⚡ Título pronto, buscando imagem durante a geração: {title}")
+            futures['image'] = pool.submit(
+                self._in_thread, self._prefetch_image, article, title,
+                enhanced_article.get('content') or enhanced_article.get('description', ''), futures['categoria'], Categoria,
+            )
+
+        try:
+            title, content = self._generate_content_from_news(
+                article, enhanced_article, data['extract']['base_words'], on_field=on_field
+            )
+            prefetch = {'titulo': early.get('titulo')}
+            for name, future in futures.items():
+                try:
+                    prefetch[name] = future.result()
+                except Exception as e:
+                    self.stdout.write(f"⚠ Etapa antecipada '{name}' falhou (refeita depois): {e}")
+        except GenerationAborted as e:
+            self.stdout.write(f"⚠ Pulando duplicata (geração interrompida no título, {e})")
+            raise pipeline.SkipJob(f"duplicata ({e})")
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+        return {'titulo': title, 'conteudo': content, 'prefetch': prefetch}
+
+    @staticmethod
+    def _in_thread(fn, *args):
+        try:
+            return fn(*args)
+        finally:
+            from django.db import connections
+            connections.close_all()
+
+    def _get_category_pk(self, article, Categoria):
+        categoria = self._get_category_from_news(article, Categoria)
+        return categoria.pk if categoria else None
+
+    def _prefetch_image(self, article, title, content, categoria_future, Categoria):
+        # A categoria (termo de busca nos bancos gratuitos) começou antes e costuma já estar pronta
+        try:
+            categoria = Categoria.objects.filter(pk=categoria_future.result()).first()
+        except Exception:
+            categoria = None
+        return self._find_specific_image(article, title, content, categoria)
+
+    def stage_categorize(self, job, data):
+        Categoria = apps.get_model("rb_noticias", "Categoria")
+
+        # Categorizar baseado no conteúdo da notícia (já feito durante a geração, se em streaming)
+        prefetch = data['generate'].get('prefetch') or {}
+        if 'categoria' in prefetch:
+            categoria = Categoria.objects.filter(pk=prefetch['categoria']).first()
+        else:
+            categoria = self._get_category_from_news(self._article(job, data), Categoria)
+
+        # Verificar duplicatas
+        title = data['generate']['titulo']
+        reason = self._check_duplicate(title, data['generate']['conteudo'])
+        if reason:
+            self.stdout.write(f"⚠ Pulando duplicata ({reason}): {title}")
+            raise pipeline.SkipJob(f"duplicata ({reason})")
+        return {'categoria': categoria.pk if categoria else None}
+
+    def stage_image(self, job, data):
+        # Buscada durante a geração com o mesmo título
+        prefetch = data['generate'].get('prefetch') or {}
+        if 'image' in prefetch and prefetch.get('titulo') == data['generate']['titulo']:
+            return prefetch['image'] or {}
+        Categoria = apps.get_model("rb_noticias", "Categoria")
+        categoria = Categoria.objects.filter(pk=data['categorize'].get('categoria')).first()
+        return self._find_specific_image(
+            self._article(job, data), data['generate']['titulo'], data['generate']['conteudo'], categoria
+        ) or {}
+
+    def stage_save(self, job, data):
+        Noticia = apps.get_model("rb_noticias", "Noticia")
+        article = self._article(job, data)
+        title = data['generate']['titulo']
+
+        # De novo: jobs em paralelo podem ter passado juntos pela verificação da categorização
+        # (a gravação roda um job por vez)
+        reason = self._check_duplicate(title, data['generate']['conteudo'])
+        if reason:
+            self.stdout.write(f"⚠ Pulando duplicata ({reason}): {title}")
+            raise pipeline.SkipJob(f"duplicata ({reason})")
+
+        ts = timezone.now().strftime('%Y%m%d%H%M%S')
+        fonte_url_value = article.get('url') or f"render-automation-{ts}-{job.pk}"
+        # Notícia de origem já publicada (por outro job/worker): não publicar de novo
+        existing = Noticia.objects.filter(fonte_url=fonte_url_value).first()
+        if existing is not None:
+            job.noticia = existing
+            raise pipeline.SkipJob("já publicada")
+
+        noticia = Noticia.objects.create(
+            titulo=title,
+            slug=f"{slugify(title)[:120]}-{ts}",
+            conteudo=data['generate']['conteudo'],
+            publicado_em=timezone.now(),
+            categoria_id=data['categorize'].get('categoria'),
+            fonte_url=fonte_url_value,
+            fonte_nome=article.get('source', 'RadarBR Automation'),
+            status=1,  # PUBLICADO
+            **(data.get('image') or {}),
+        )
+        job.noticia = noticia
+        self.stdout.write(f"✓ Criado: {title}")
+        return {'noticia': noticia.pk}
+
+    def stage_ping(self, jobs):
+        self._ping_sitemap()
+
+    @ingest_stage("resolve")
     def _resolve_original_url(self, url: str) -> str:
         """Resolve URL do Google News para o link do veículo original."""
         try:
             if not url:
                 return ""
-            if 'news.google.' not in url:
-                return url
-            import requests
-            from urllib.parse import urlparse, parse_qs
-            # 1) Query param "url"
-            try:
-                parsed = urlparse(url)
-                qs = parse_qs(parsed.query)
-                if 'url' in qs and qs['url']:
-                    candidate = qs['url'][0]
-                    if candidate and 'news.google.' not in candidate:
-                        return candidate
-            except Exception:
-                pass
-            # 2) Follow redirects
-            session = requests.Session()
-            session.headers.update({
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-            })
-            resp = session.get(url, timeout=20, allow_redirects=True)
-            resp.raise_for_status()
-            final_url = resp.url
-            if final_url and 'news.google.' not in final_url:
-                return final_url
+            from rb_ingestor.gn_resolver import resolve
+            # Cache ResolvedLink -> decodificação offline -> rede
+            return resolve(url) or ""
         except Exception:
             return ""
-        return ""
 
-    def _generate_content_from_news(self, article):
-        """Gera conteúdo usando RSS + navegador headless para extrair conteúdo real"""
+    @ingest_stage("extract", empty_is_failure=False)
+    def _extract_real_content(self, article):
+        """Extrai o conteúdo real da notícia (HTTP/navegador headless).
+
+        Devolve (artigo enriquecido, palavras do original ou None).
+        """
+        base_words = None
+        enhanced_article = article.copy()
+
         try:
-            # 1) Extrair conteúdo real usando navegador headless
-            base_words = None
-            enhanced_article = article.copy()
-            
-            try:
-                from rb_ingestor.news_content_extractor import NewsContentExtractor
-                extractor = NewsContentExtractor()
-                
-                # Tentar extrair do URL do RSS
-                rss_url = article.get('url', '')
-                if rss_url:
-                    self.stdout.write(f"🔍 Extraindo conteúdo real de: {rss_url}")
-                    data = extractor.extract_content_from_url(rss_url)
-                    
-                    if data and data.get('content'):
-                        base_words = len((data['content'] or '').split())
-                        self.stdout.write(f"✅ Conteúdo completo extraído: {base_words} palavras")
-                        
-                        # Atualizar artigo com dados reais
-                        enhanced_article.update({
-                            'title': data.get('title', article.get('title', '')),
-                            'description': data.get('description', article.get('description', '')),
-                            'content': data.get('content', ''),
-                            'author': data.get('author', ''),
-                            'date': data.get('date', ''),
-                            'real_content': True,
-                            'source_domain': data.get('source_domain', ''),
-                            'original_url': rss_url
-                        })
-                    else:
-                        self.stdout.write("⚠ Falha ao extrair conteúdo real, usando dados RSS")
+            from rb_ingestor.news_content_extractor import NewsContentExtractor
+            extractor = NewsContentExtractor()
+
+            # Tentar extrair do URL do RSS
+            rss_url = article.get('url', '')
+            if rss_url:
+                self.stdout.write(f"🔍 Extraindo conteúdo real de: {rss_url}")
+                data = extractor.extract_content_from_url(rss_url)
+
+                if data and data.get('content'):
+                    base_words = len((data['content'] or '').split())
+                    self.stdout.write(f"✅ Conteúdo completo extraído: {base_words} palavras")
+
+                    # Atualizar artigo com dados reais
+                    enhanced_article.update({
+                        'title': data.get('title', article.get('title', '')),
+                        'description': data.get('description', article.get('description', '')),
+                        'content': data.get('content', ''),
+                        'author': data.get('author', ''),
+                        'date': data.get('date', ''),
+                        'real_content': True,
+                        'source_domain': data.get('source_domain', ''),
+                        'original_url': rss_url
+                    })
                 else:
-                    self.stdout.write("⚠ Sem URL RSS para extrair")
-                    
-            except Exception as e:
-                self.stdout.write(f"⚠ Erro na extração com navegador: {e}")
-            
+                    self.stdout.write("⚠ Falha ao extrair conteúdo real, usando dados RSS")
+            else:
+                self.stdout.write("⚠ Sem URL RSS para extrair")
+
+        except Exception as e:
+            self.stdout.write(f"⚠ Erro na extração com navegador: {e}")
+
+        return enhanced_article, base_words
+
+    @ingest_stage("generate")
+    def _generate_content_from_news(self, article, enhanced_article, base_words, on_field=None):
+        """Gera título e conteúdo com IA a partir da notícia e do conteúdo real extraído
+
+        ``on_field`` liga o streaming (ver ``generate_enhanced_article``).
+        """
+        from rb_ingestor.ai_enhanced import GenerationAborted
+        try:
             # 2) Definir palavras mínimas baseado no conteúdo extraído
             if base_words and base_words >= 100:
                 min_words = max(600, int(base_words * 0.7))  # 70% do conteúdo original
@@ -337,7 +475,8 @@ class Command(BaseCommand):
                 article.get('topic', ''), 
                 enhanced_article, 
                 min_words,
-                random_style
+                random_style,
+                on_field=on_field,
             )
             
             if not ai_content:
@@ -347,7 +486,8 @@ class Command(BaseCommand):
             # 4) Processar resultado
             title = strip_tags(ai_content.get("title", enhanced_article.get('title', '')))[:200]
             html = ai_content.get("html", "<p></p>")
-            content = f'<p class="dek">{strip_tags(ai_content.get("dek", enhanced_article.get('description', '')))[:220]}</p>\n{html}'
+            dek = strip_tags(ai_content.get("dek", enhanced_article.get('description', '')))[:220]
+            content = f'<p class="dek">{dek}</p>\n{html}'
             
             # 5) Contar palavras e validar
             from django.utils.html import strip_tags as dj_strip
@@ -367,6 +507,8 @@ class Command(BaseCommand):
             
             return title, content
             
+        except GenerationAborted:
+            raise
         except Exception as e:
             self.stdout.write(f"❌ Publicação cancelada: {e}")
             # Propagar exceção para que o caller pule este artigo
@@ -513,6 +655,7 @@ class Command(BaseCommand):
 
         return content
 
+    @ingest_stage("categorize")
     def _get_category_from_news(self, article, Categoria):
         """Categoriza baseado no site de origem, notícia encontrada ou sistema inteligente"""
         # 1. PRIORIDADE MÁXIMA: Extrair categoria do site de origem
@@ -522,10 +665,13 @@ class Command(BaseCommand):
             
             # Escolher URL a usar: original se disponível
             url_to_use = article.get('original_url') or article.get('url') or ''
+            # Página do publisher já baixada na extração (também indexada pelo link do Google News)
+            from rb_ingestor import article_document
+            doc = article_document.get(url_to_use) if url_to_use else None
             # Evitar analisar Google News
-            if url_to_use and 'news.google.' not in url_to_use:
+            if doc or (url_to_use and 'news.google.' not in url_to_use):
                 # Tentar extrair categoria do site
-                site_category = site_categorizer.categorize_article({'url': url_to_use})
+                site_category = site_categorizer.categorize_article({'url': url_to_use}, doc=doc)
             else:
                 site_category = None
             
@@ -587,8 +733,7 @@ class Command(BaseCommand):
             categorizer = SmartCategorizer()
             
             # Categorizar baseado no conteúdo completo
-            category_name = categorizer.categorize_content(title, description, topic)
-            confidence = categorizer.get_category_confidence(title, description, topic)
+            category_name, confidence = categorizer.categorize(title, description, topic)
             
             self.stdout.write(f"🧠 Categoria detectada: {category_name} (confiança: {confidence:.2f})")
             
@@ -643,8 +788,9 @@ class Command(BaseCommand):
         )
         return cat
 
-    def _add_specific_image(self, noticia, article):
-        """Adiciona imagem usando Google Lens + bancos gratuitos."""
+    @ingest_stage("image", empty_is_failure=False)
+    def _find_specific_image(self, article, title, content, categoria):
+        """Imagem via Google Lens + bancos gratuitos (campos de imagem da Noticia ou None)."""
         try:
             # NOVO: Busca inteligente com Google Lens
             self.stdout.write("🔍 Buscando imagem com Google Lens...")
@@ -654,19 +800,20 @@ class Command(BaseCommand):
             news_url = article.get('url', '') if article else ''
             
             if news_url:
+                from rb_ingestor import article_document
                 smart_image = smart_image_search.find_smart_image_for_article(
                     news_url, 
-                    noticia.titulo
+                    title,
+                    doc=article_document.get(news_url)
                 )
                 
                 if smart_image:
-                    noticia.imagem = smart_image['url']
-                    noticia.imagem_alt = smart_image['alt']
-                    noticia.imagem_credito = smart_image['credit']
-                    noticia.save()
-                    
                     self.stdout.write(f"✅ Imagem inteligente encontrada: {smart_image['source'].upper()} (similaridade: {smart_image['similarity_score']:.2f})")
-                    return
+                    return {
+                        'imagem': smart_image['url'],
+                        'imagem_alt': smart_image['alt'],
+                        'imagem_credito': smart_image['credit'],
+                    }
             
             # FALLBACK: Busca tradicional em bancos gratuitos
             self.stdout.write("🔄 Google Lens falhou, usando busca tradicional...")
@@ -675,39 +822,37 @@ class Command(BaseCommand):
             search_engine = ImageSearchEngine()
 
             topic = (article.get('topic', '') if article else '')
-            title = (article.get('title', '') if article else '')
+            source_title = (article.get('title', '') if article else '')
 
-            search_term = topic if topic else title[:50]
+            search_term = topic if topic else source_title[:50]
 
             image_url = search_engine.search_image(
                 search_term,
-                noticia.conteudo,
-                (noticia.categoria.nome if noticia.categoria else "geral")
+                content,
+                (categoria.nome if categoria else "geral")
             )
 
             if image_url:
-                noticia.imagem = image_url
-                noticia.imagem_alt = f"Imagem relacionada a {search_term}"
-                noticia.imagem_credito = "Imagem gratuita"
-                noticia.imagem_licenca = "CC"
-                noticia.imagem_fonte_url = image_url
-                noticia.save()
-
                 self.stdout.write(f"✅ Imagem tradicional encontrada: {search_term}")
-                return
+                return {
+                    'imagem': image_url,
+                    'imagem_alt': f"Imagem relacionada a {search_term}",
+                    'imagem_credito': "Imagem gratuita",
+                    'imagem_licenca': "CC",
+                    'imagem_fonte_url': image_url,
+                }
 
             self.stdout.write("⚠️ Nenhuma imagem encontrada nos bancos gratuitos")
 
         except Exception as e:
             self.stdout.write(f"⚠️ Erro ao adicionar imagem: {e}")
+        return None
 
-    def _check_duplicate(self, title, Noticia):
-        """Verifica se já existe notícia similar"""
-        return Noticia.objects.filter(
-            titulo__icontains=title[:20],
-            criado_em__date=timezone.localdate()
-        ).exists()
+    def _check_duplicate(self, title, content=None):
+        """Motivo se já existe notícia quase igual (título ou corpo, índice MinHash) ou None"""
+        return minhash.near_duplicate(title=title, body=content)
 
+    @ingest_stage("ping", empty_is_failure=False)
     def _ping_sitemap(self):
         """Faz ping do sitemap"""
         try:
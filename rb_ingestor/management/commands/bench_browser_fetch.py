@@ -0,0 +1,115 @@
+# rb_ingestor/management/commands/bench_browser_fetch.py
+"""
+Benchmark do carregamento headless: modo antigo (espera fixa, tudo
+carregado) vs modo enxuto (bloqueio de recursos + prontidão por evento).
+
+Serve as páginas de rb_ingestor/fixtures/pages num servidor HTTP local.
+Os assets (/assets/*) são gerados com atraso configurável para simular
+imagens, fontes e CSS de veículos reais; scripts de anúncio/analytics
+apontam para os domínios reais e no modo enxuto nem chegam a sair.
+"""
+import json
+import os
+import statistics
+import threading
+import time
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+from django.core.management.base import BaseCommand, CommandError
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "fixtures", "pages")
+
+ASSET_TYPES = {
+    ".jpg": "image/jpeg",
+    ".woff2": "font/woff2",
+    ".css": "text/css",
+    ".js": "application/javascript",
+}
+
+
+class _FixtureHandler(SimpleHTTPRequestHandler):
+    asset_delay = 0.3
+    asset_size = 200 * 1024
+
+    def do_GET(self):
+        if self.path.startswith("/assets/"):
+            time.sleep(self.asset_delay)
+            ext = os.path.splitext(self.path.split("?")[0])[1]
+            body = b"/* fixture */" if ext in (".css", ".js") else b"\0" * self.asset_size
+            self.send_response(200)
+            self.send_header("Content-Type", ASSET_TYPES.get(ext, "application/octet-stream"))
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        return super().do_GET()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class Command(BaseCommand):
+    help = "Compara latência por página do fetch headless antigo vs enxuto usando fixtures locais"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--fixtures", type=str, default=FIXTURES_DIR, help="Diretório com páginas HTML")
+        parser.add_argument("--rounds", type=int, default=3, help="Repetições por página e modo")
+        parser.add_argument("--asset-delay", type=int, default=300, help="Atraso de cada asset em ms")
+        parser.add_argument("--modes", type=str, default="legacy,lean", help="Modos a medir (legacy,lean)")
+        parser.add_argument("--json", action="store_true", help="Saída em JSON")
+
+    def handle(self, *args, **options):
+        from rb_ingestor.news_content_extractor import NewsContentExtractor
+
+        fixtures = os.path.abspath(options["fixtures"])
+        pages = sorted(f for f in os.listdir(fixtures) if f.endswith(".html")) if os.path.isdir(fixtures) else []
+        if not pages:
+            raise CommandError(f"Nenhuma fixture HTML em {fixtures}")
+
+        _FixtureHandler.asset_delay = options["asset_delay"] / 1000.0
+        server = ThreadingHTTPServer(("127.0.0.1", 0), partial(_FixtureHandler, directory=fixtures))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+
+        extractor = NewsContentExtractor()
+        modes = [m.strip() for m in options["modes"].split(",") if m.strip()]
+        results = {}
+        try:
+            for page in pages:
+                url = f"{base}/{page}"
+                results[page] = {}
+                for mode in modes:
+                    timings, sizes = [], []
+                    for _ in range(options["rounds"]):
+                        t0 = time.perf_counter()
+                        _, html = extractor._get_final_url_and_html_with_browser(url, lean=(mode == "lean"))
+                        timings.append((time.perf_counter() - t0) * 1000)
+                        sizes.append(len(html or ""))
+                    results[page][mode] = {
+                        "median_ms": round(statistics.median(timings), 1),
+                        "min_ms": round(min(timings), 1),
+                        "max_ms": round(max(timings), 1),
+                        "html_chars": int(statistics.median(sizes)),
+                        "failures": sum(1 for size in sizes if not size),
+                    }
+        finally:
+            server.shutdown()
+
+        if options["json"]:
+            self.stdout.write(json.dumps(results, indent=2, ensure_ascii=False))
+            return
+
+        failed = sum(r["failures"] for row in results.values() for r in row.values())
+        if failed:
+            self.stdout.write(self.style.WARNING(f"⚠ {failed} carregamento(s) falharam - tempos não representativos"))
+
+        self.stdout.write("=== BENCHMARK FETCH HEADLESS (mediana por página) ===")
+        header = f"{'página':<28}" + "".join(f"{m + ' ms':>14}" for m in modes) + f"{'ganho':>9}"
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+        for page, row in results.items():
+            line = f"{page[:27]:<28}" + "".join(f"{row[m]['median_ms']:>14.0f}" for m in modes)
+            if "legacy" in row and "lean" in row and row["lean"]["median_ms"]:
+                line += f"{row['legacy']['median_ms'] / row['lean']['median_ms']:>8.1f}x"
+            self.stdout.write(line)
@@ -0,0 +1,267 @@
+# rb_ingestor/management/commands/bench_extraction.py
+"""
+Benchmark da extração de artigos: caminho antigo (BeautifulSoup +
+html.parser, métodos _extract_* do NewsContentExtractor) vs motor lxml
+(html_engine.py).
+
+Usa as páginas salvas em rb_ingestor/fixtures/pages. O domínio de cada
+página sai do ``og:url`` dela, então as regras por veículo valem como em
+produção. Mede páginas/s (parse + extração) e:
+
+- paridade: motor lxml só com os seletores genéricos (os mesmos do código
+  antigo, sem densidade) vs BeautifulSoup, campo a campo
+- regras por veículo: campos que os seletores do domínio e a densidade mudaram
+- qualidade do corpo (``--quality``): F1 por palavras contra o texto esperado
+  em rb_ingestor/fixtures/expected/<página>.txt, por estratégia
+
+As páginas de rb_ingestor/fixtures/pages são sintéticas: escritas à mão
+(40-50 linhas cada) imitando a marcação de cada veículo, sem os scripts,
+anúncios e JSON embutido das páginas reais. Servem para paridade e
+regressão das regras por veículo; páginas/s medidos nelas não valem como
+número de produção. Para isso, salve páginas reais num diretório e passe
+``--fixtures``.
+
+O texto esperado de rb_ingestor/fixtures/expected foi escrito junto com
+essas páginas, pela mesma pessoa: o F1 do ``--quality`` mede se as
+estratégias acham o corpo que o autor das fixtures quis esconder entre o
+ruído, não a qualidade em páginas reais (passe ``--expected`` com o texto
+de capturas reais para isso).
+"""
+import json
+import os
+import re
+import statistics
+import time
+from collections import Counter
+from difflib import SequenceMatcher
+
+from bs4 import BeautifulSoup
+from django.core.management.base import BaseCommand, CommandError
+
+from rb_ingestor import content_density, html_engine
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "fixtures", "pages")
+EXPECTED_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "fixtures", "expected")
+# F1 mínimo para considerar o corpo extraído correto
+QUALITY_OK = 0.9
+FIELDS = ("title", "description", "content", "category", "author", "date", "images")
+
+_OG_URL_RE = re.compile(rb'<meta[^>]+property="og:url"[^>]+content="([^"]+)"', re.I)
+
+
+def _legacy(extractor, html: bytes) -> dict:
+    soup = BeautifulSoup(html, "html.parser")
+    return {
+        "title": extractor._extract_title(soup),
+        "description": extractor._extract_description(soup),
+        "content": extractor._extract_main_content(soup),
+        "category": extractor._extract_category(soup),
+        "author": extractor._extract_author(soup),
+        "date": extractor._extract_date(soup),
+        "images": extractor._extract_images(soup),
+    }
+
+
+def _lxml(html: bytes, url: str, rules=None, density: bool = True) -> dict:
+    return html_engine.extract_article(html_engine.parse_html(html), url, rules=rules, density=density)
+
+
+def _words(value: str) -> Counter:
+    return Counter(re.findall(r"\w+", (value or "").lower()))
+
+
+def _f1(extracted: str, expected: str) -> float:
+    got, want = _words(extracted), _words(expected)
+    common = sum((got & want).values())
+    if not common:
+        return 0.0
+    precision, recall = common / sum(got.values()), common / sum(want.values())
+    return 2 * precision * recall / (precision + recall)
+
+
+def _content_strategies(extractor, url: str):
+    """Estratégias de corpo comparadas no relatório de qualidade (recebem os bytes da página)."""
+    domain_rules = html_engine.selectors_for(re.sub(r"^https?://", "", url).split("/")[0])
+    return {
+        "bs4 (antigo)": lambda html: extractor._extract_main_content(BeautifulSoup(html, "html.parser")),
+        "seletores lxml": lambda html: html_engine.selector_content(html_engine.parse_html(html)),
+        "densidade": lambda html: content_density.extract(html_engine.parse_html(html)),
+        "motor (layout desconhecido)": lambda html: html_engine.extract_main_content(html_engine.parse_html(html)),
+        "motor": lambda html: html_engine.extract_main_content(html_engine.parse_html(html), domain_rules),
+    }
+
+
+def _timed(fn, rounds: int):
+    timings, result = [], None
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - t0)
+    return result, statistics.median(timings)
+
+
+class Command(BaseCommand):
+    help = "Compara velocidade e paridade da extração BeautifulSoup vs lxml nas fixtures locais"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--fixtures", type=str, default=FIXTURES_DIR, help="Diretório com páginas HTML")
+        parser.add_argument("--rounds", type=int, default=30, help="Repetições por página e motor")
+        parser.add_argument("--show-diffs", action="store_true", help="Mostra os valores dos campos divergentes")
+        parser.add_argument("--quality", action="store_true", help="Relatório de qualidade/velocidade do corpo por estratégia")
+        parser.add_argument("--expected", type=str, default=EXPECTED_DIR, help="Diretório com o texto esperado de cada página")
+        parser.add_argument("--json", action="store_true", help="Saída em JSON")
+
+    def handle(self, *args, **options):
+        from rb_ingestor.news_content_extractor import NewsContentExtractor
+
+        fixtures = os.path.abspath(options["fixtures"])
+        synthetic = fixtures == os.path.abspath(FIXTURES_DIR)
+        pages = sorted(f for f in os.listdir(fixtures) if f.endswith(".html")) if os.path.isdir(fixtures) else []
+        if not pages:
+            raise CommandError(f"Nenhuma fixture HTML em {fixtures}")
+
+        extractor = NewsContentExtractor()
+        rounds = max(1, options["rounds"])
+        results = {}
+        for page in pages:
+            with open(os.path.join(fixtures, page), "rb") as fh:
+                html = fh.read()
+            match = _OG_URL_RE.search(html)
+            url = match.group(1).decode() if match else f"https://fixture.local/{page}"
+
+            old, old_s = _timed(lambda: _legacy(extractor, html), rounds)
+            new, new_s = _timed(lambda: _lxml(html, url), rounds)
+            generic = _lxml(html, url, rules=html_engine.GENERIC, density=False)
+            fields = {}
+            for field in FIELDS:
+                a, b = old[field], generic[field]
+                entry = {"equal": a == b}
+                if field == "content" and a != b:
+                    entry["similarity"] = round(SequenceMatcher(None, a, b).ratio(), 3)
+                if a != b:
+                    entry["legacy"], entry["lxml"] = a, b
+                fields[field] = entry
+            results[page] = {
+                "url": url,
+                "legacy_ms": round(old_s * 1000, 2),
+                "lxml_ms": round(new_s * 1000, 2),
+                "content_chars": len(new["content"]),
+                "fields": fields,
+                "domain_rules_changed": [f for f in FIELDS if new[f] != generic[f]],
+            }
+
+        legacy_total = sum(r["legacy_ms"] for r in results.values()) / 1000
+        lxml_total = sum(r["lxml_ms"] for r in results.values()) / 1000
+        summary = {
+            "pages": len(results),
+            "synthetic": synthetic,
+            "legacy_pages_per_s": round(len(results) / legacy_total, 1) if legacy_total else 0,
+            "lxml_pages_per_s": round(len(results) / lxml_total, 1) if lxml_total else 0,
+            "speedup": round(legacy_total / lxml_total, 2) if lxml_total else 0,
+            "parity": {
+                field: round(sum(r["fields"][field]["equal"] for r in results.values()) / len(results), 3)
+                for field in FIELDS
+            },
+        }
+
+        quality = self._quality(extractor, fixtures, pages, options["expected"], rounds) if options["quality"] else None
+
+        if options["json"]:
+            payload = {"summary": summary, "pages": results}
+            if quality is not None:
+                payload["quality"] = quality
+            self.stdout.write(json.dumps(payload, indent=2, ensure_ascii=False))
+            return
+
+        self.stdout.write("=== BENCHMARK EXTRAÇÃO (mediana por página, parse + campos) ===")
+        header = f"{'página':<28}{'bs4 ms':>10}{'lxml ms':>10}{'ganho':>8}  {'divergências':<24}regras do veículo"
+        self.stdout.write(header)
+        self.stdout.write("-" * (len(header) + 20))
+        for page, row in results.items():
+            diffs = [
+                f + (f" ({row['fields'][f]['similarity']:.0%})" if "similarity" in row["fields"][f] else "")
+                for f in FIELDS if not row["fields"][f]["equal"]
+            ]
+            gain = row["legacy_ms"] / row["lxml_ms"] if row["lxml_ms"] else 0
+            self.stdout.write(
+                f"{page[:27]:<28}{row['legacy_ms']:>10.2f}{row['lxml_ms']:>10.2f}{gain:>7.1f}x  "
+                f"{', '.join(diffs) or '-':<24}{', '.join(row['domain_rules_changed']) or '-'}"
+            )
+            if options["show_diffs"]:
+                for field in FIELDS:
+                    entry = row["fields"][field]
+                    if not entry["equal"]:
+                        self.stdout.write(f"    {field}: bs4={str(entry['legacy'])[:80]!r}")
+                        self.stdout.write(f"    {' ' * len(field)}  lxml={str(entry['lxml'])[:80]!r}")
+
+        self.stdout.write("")
+        self.stdout.write(
+            f"📊 {summary['pages']} páginas: bs4 {summary['legacy_pages_per_s']} pág/s, "
+            f"lxml {summary['lxml_pages_per_s']} pág/s ({summary['speedup']}x)"
+        )
+        self.stdout.write("🎯 Paridade com o código antigo (seletores genéricos): " + ", ".join(f"{f} {v:.0%}" for f, v in summary["parity"].items()))
+        if synthetic:
+            self.stdout.write(self.style.WARNING(
+                "⚠ Fixtures sintéticas (escritas à mão imitando cada veículo, sem scripts nem anúncios): "
+                "os números valem para elas, não para páginas reais (use --fixtures com capturas reais)"
+            ))
+        if quality is not None:
+            self._print_quality(quality)
+
+    def _quality(self, extractor, fixtures, pages, expected_dir, rounds):
+        """F1 e tempo (parse + corpo) de cada estratégia nas páginas com texto esperado."""
+        expected_dir = os.path.abspath(expected_dir)
+        per_page, totals = {}, {}
+        for page in pages:
+            expected_path = os.path.join(expected_dir, page[:-5] + ".txt")
+            if not os.path.exists(expected_path):
+                continue
+            with open(expected_path, encoding="utf-8") as fh:
+                expected = fh.read()
+            with open(os.path.join(fixtures, page), "rb") as fh:
+                html = fh.read()
+            match = _OG_URL_RE.search(html)
+            url = match.group(1).decode() if match else ""
+            per_page[page] = {}
+            for name, fn in _content_strategies(extractor, url).items():
+                content, seconds = _timed(lambda: fn(html), rounds)
+                f1 = round(_f1(content, expected), 3)
+                per_page[page][name] = {"f1": f1, "ms": round(seconds * 1000, 2), "chars": len(content)}
+                total = totals.setdefault(name, {"f1": 0.0, "ok": 0, "seconds": 0.0})
+                total["f1"] += f1
+                total["ok"] += f1 >= QUALITY_OK
+                total["seconds"] += seconds
+        count = len(per_page)
+        summary = {
+            name: {
+                "mean_f1": round(total["f1"] / count, 3),
+                "ok": total["ok"],
+                "pages_per_s": round(count / total["seconds"], 1) if total["seconds"] else 0,
+            }
+            for name, total in totals.items()
+        } if count else {}
+        synthetic = os.path.abspath(fixtures) == os.path.abspath(FIXTURES_DIR) or expected_dir == os.path.abspath(EXPECTED_DIR)
+        return {"pages": count, "threshold": QUALITY_OK, "synthetic": synthetic, "summary": summary, "per_page": per_page}
+
+    def _print_quality(self, quality):
+        self.stdout.write("")
+        if not quality["pages"]:
+            self.stdout.write(self.style.WARNING("⚠ Nenhuma página com texto esperado para o relatório de qualidade"))
+            return
+        names = list(quality["summary"])
+        self.stdout.write(f"=== QUALIDADE DO CORPO (F1 por palavras vs texto esperado, ok = F1 >= {quality['threshold']}) ===")
+        header = f"{'página':<28}" + "".join(f"{name[:22]:>24}" for name in names)
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+        for page, row in quality["per_page"].items():
+            self.stdout.write(f"{page[:27]:<28}" + "".join(f"{row[name]['f1']:>24.2f}" for name in names))
+        self.stdout.write("-" * len(header))
+        pages = quality["pages"]
+        self.stdout.write(f"{'F1 médio':<28}" + "".join(f"{quality['summary'][n]['mean_f1']:>24.2f}" for n in names))
+        self.stdout.write(f"{'corretas':<28}" + "".join(f"{str(quality['summary'][n]['ok']) + '/' + str(pages):>24}" for n in names))
+        self.stdout.write(f"{'pág/s':<28}" + "".join(f"{quality['summary'][n]['pages_per_s']:>24.1f}" for n in names))
+        if quality["synthetic"]:
+            self.stdout.write(self.style.WARNING(
+                "⚠ Texto esperado escrito junto com as fixtures sintéticas: o F1 é circular, "
+                "não mede a qualidade em páginas reais (use --fixtures/--expected com capturas reais)"
+            ))
@@ -0,0 +1,238 @@
+# rb_ingestor/management/commands/bench_llm.py
+"""
+Benchmark da geração de artigos: chamadas em sequência (como era) vs pool
+limitado do llm_client, contra o stub local de chat-completions
+(llm_stub.py) ou outro servidor compatível (``--base-url``).
+
+    python manage.py bench_llm --calls 6 --latency 2
+    python manage.py bench_llm --max-in-flight 2 --concurrency 4   # 429 por excesso
+    python manage.py bench_llm --slow-every 4 --timeout 3           # timeouts e retry
+    python manage.py bench_llm --cache                              # + passadas com o cache da IA
+    python manage.py bench_llm --stream                             # + passada em streaming
+    python manage.py bench_llm --structured                         # várias chamadas vs geração estruturada
+
+Cada chamada é um ``generate_enhanced_article`` completo (prompt, chamada,
+parse do JSON). Mostra tempo de parede, artigos gerados, retries, 429 e
+timeouts de cada modo (``seconds`` no JSON é a soma do tempo das chamadas).
+Os modos sequencial/concorrente ignoram o cache da IA; com ``--cache`` o
+concorrente roda de novo duas vezes num cache temporário (frio e quente).
+Com ``--stream`` o concorrente roda também em streaming, medindo quando o
+título fica disponível (``title_seconds``, média) — o ponto em que o
+pipeline já começa duplicata, categoria e imagem.
+
+``--structured`` compara, matéria a matéria, o fluxo antigo do
+publish_topic (reescrita do título + corpo + detector de figuras com IA;
+categoria local) com a chamada única de ai_structured: chamadas, tokens,
+custo estimado e tempo.
+"""
+import json
+import os
+import tempfile
+import time
+from contextlib import nullcontext
+
+from django.core.management.base import BaseCommand
+
+from rb_ingestor import llm_cache, llm_client
+from rb_ingestor.llm_stub import StubChatServer
+
+TOPICS = (
+    "Copom decide taxa Selic", "Reforma tributária no Senado", "Seleção brasileira convocada",
+    "Enchentes no Rio Grande do Sul", "Lançamento de satélite brasileiro", "Inflação de alimentos",
+    "Novo marco do saneamento", "Eleições municipais", "Preço da gasolina", "Vacinação contra a dengue",
+)
+
+
+class Command(BaseCommand):
+    help = "Compara geração sequencial vs concorrente (llm_client) contra um stub local da API de chat"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--calls", type=int, default=6, help="Artigos por modo")
+        parser.add_argument("--concurrency", type=int, default=llm_client.CONCURRENCY, help="Chamadas simultâneas no modo concorrente")
+        parser.add_argument("--latency", type=float, default=1.0, help="Latência do stub por resposta (s)")
+        parser.add_argument("--max-in-flight", type=int, default=0, help="Stub responde 429 acima de N chamadas simultâneas")
+        parser.add_argument("--rate-limit-every", type=int, default=0, help="Stub responde 429 a cada N requisições")
+        parser.add_argument("--slow-every", type=int, default=0, help="Stub demora --slow-latency a cada N requisições")
+        parser.add_argument("--slow-latency", type=float, default=30.0, help="Latência das respostas lentas (s)")
+        parser.add_argument("--timeout", type=float, default=llm_client.TIMEOUT, help="Timeout por chamada (s)")
+        parser.add_argument("--base-url", type=str, help="Servidor compatível já rodando (no lugar do stub)")
+        parser.add_argument("--cache", action="store_true", help="Inclui passadas com o cache da IA (frio e quente)")
+        parser.add_argument("--stream", action="store_true", help="Inclui passada em streaming (tempo até o título)")
+        parser.add_argument("--structured", action="store_true", help="Compara o fluxo de várias chamadas com a geração estruturada")
+        parser.add_argument("--json", action="store_true", help="Saída em JSON")
+
+    def handle(self, *args, **options):
+        from rb_ingestor.ai_enhanced import generate_enhanced_article
+
+        calls = max(1, options["calls"])
+        topics = [TOPICS[i % len(TOPICS)] for i in range(calls)]
+        stub = None if options["base_url"] else StubChatServer(
+            latency=options["latency"],
+            max_in_flight=options["max_in_flight"],
+            rate_limit_every=options["rate_limit_every"],
+            slow_every=options["slow_every"],
+            slow_latency=options["slow_latency"],
+        )
+        # O backoff real (segundos) tornaria o benchmark lento: escala reduzida
+        backoff = llm_client.BACKOFF_BASE
+        llm_client.BACKOFF_BASE = 0.2
+
+        results = {}
+        tmpdir = tempfile.mkdtemp(prefix="bench_llm_")
+        try:
+            with stub or nullcontext():
+                base_url = options["base_url"] or stub.base_url
+                concurrency = max(1, options["concurrency"])
+                modes = [("sequencial", 1, False, False), ("concorrente", concurrency, False, False)]
+                if options["stream"]:
+                    modes.append(("streaming", concurrency, False, True))
+                if options["cache"]:
+                    llm_cache.configure(os.path.join(tmpdir, "llm_cache.sqlite3"))
+                    modes += [("cache frio", concurrency, True, False), ("cache quente", concurrency, True, False)]
+                for mode, workers, cached, streamed in modes:
+                    llm_client.configure(
+                        concurrency=workers, base_url=base_url, api_key="stub" if stub else None,
+                        timeout=options["timeout"],
+                    )
+                    llm_client.reset_stats()
+                    cache = llm_cache.get_cache()
+                    before = cache.stats()
+                    llm_cache.set_bypass(not cached)
+                    start = time.perf_counter()
+                    title_times = []
+
+                    def generate(topic):
+                        began = time.perf_counter()
+
+                        def on_field(field, value, done):
+                            if field == "title" and done:
+                                title_times.append(time.perf_counter() - began)
+
+                        return generate_enhanced_article(
+                            topic, min_words=400, writing_style="jornalistico", on_field=on_field if streamed else None,
+                        )
+
+                    articles = llm_client.map_concurrent(generate, topics, workers=workers, log=self.stdout.write)
+                    after = cache.stats()
+                    results[mode] = {
+                        "workers": workers,
+                        "wall_seconds": round(time.perf_counter() - start, 2),
+                        "articles": sum(1 for a in articles if a),
+                        **llm_client.stats(),
+                        "cache_hits": after["hits"] - before["hits"],
+                        "saved_usd": round(after["saved_usd"] - before["saved_usd"], 6),
+                    }
+                    if title_times:
+                        results[mode]["title_seconds"] = round(sum(title_times) / len(title_times), 2)
+                if options["structured"]:
+                    llm_client.configure(concurrency=1, base_url=base_url, api_key="stub" if stub else None,
+                                         timeout=options["timeout"])
+                    llm_cache.set_bypass(True)
+                    structured = self._compare_structured(topics)
+                    if stub:
+                        results[mode]["stub_peak_in_flight"] = stub.counters["peak_in_flight"]
+                        stub.counters["peak_in_flight"] = 0
+        finally:
+            llm_client.BACKOFF_BASE = backoff
+            llm_cache.set_bypass(False)
+            if options["cache"]:
+                llm_cache.configure(llm_cache.CACHE_PATH)
+
+        seq, conc = results["sequencial"]["wall_seconds"], results["concorrente"]["wall_seconds"]
+        summary = {"calls": calls, "speedup": round(seq / conc, 2) if conc else 0, "modes": results}
+        if options["structured"]:
+            summary["structured"] = structured
+        if options["json"]:
+            self.stdout.write(json.dumps(summary, indent=2, ensure_ascii=False))
+            return
+
+        self.stdout.write(f"=== BENCHMARK GERAÇÃO ({calls} artigos, {'stub local' if stub else base_url}) ===")
+        header = f"{'modo':<14}{'pool':>6}{'tempo':>9}{'artigos':>9}{'chamadas':>10}{'retries':>9}{'429':>6}{'timeouts':>10}{'pico':>6}{'cache':>7}"
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+        for mode, row in results.items():
+            self.stdout.write(
+                f"{mode:<14}{row['workers']:>6}{row['wall_seconds']:>8.2f}s{row['articles']:>9}{row['calls']:>10}"
+                f"{row['retries']:>9}{row['rate_limited']:>6}{row['timeouts']:>10}{row['peak_in_flight']:>6}{row['cache_hits']:>7}"
+            )
+        self.stdout.write("")
+        self.stdout.write(f"📊 Concorrente {summary['speedup']}x mais rápido que sequencial")
+        if "streaming" in results:
+            row = results["streaming"]
+            per_call = row["seconds"] / row["calls"] if row["calls"] else 0
+            self.stdout.write(
+                f"⚡ Streaming: título em {row.get('title_seconds', 0):.2f}s (artigo completo ~{per_call:.2f}s por chamada)"
+            )
+        if "cache quente" in results:
+            self.stdout.write(
+                f"🧠 Cache quente: {results['cache quente']['cache_hits']} acertos, "
+                f"~US$ {results['cache quente']['saved_usd']:.6f} economizados"
+            )
+        if options["structured"]:
+            self.stdout.write("")
+            self.stdout.write(f"=== VÁRIAS CHAMADAS vs GERAÇÃO ESTRUTURADA ({calls} matérias, em sequência) ===")
+            header = f"{'fluxo':<16}{'tempo':>9}{'artigos':>9}{'chamadas':>10}{'tok. entrada':>14}{'tok. saída':>12}{'custo US$':>12}"
+            self.stdout.write(header)
+            self.stdout.write("-" * len(header))
+            for flow, row in structured["flows"].items():
+                self.stdout.write(
+                    f"{flow:<16}{row['wall_seconds']:>8.2f}s{row['articles']:>9}{row['calls']:>10}"
+                    f"{row['prompt_tokens']:>14}{row['completion_tokens']:>12}{row['cost_usd']:>12.6f}"
+                )
+            self.stdout.write("")
+            self.stdout.write(
+                f"📊 Estruturada: {structured['calls_saved']} chamadas a menos, "
+                f"{structured['time_ratio']}x mais rápida, custo {structured['cost_ratio']:.0%} do fluxo antigo"
+            )
+
+    def _compare_structured(self, topics):
+        """Mesmas matérias pelos dois fluxos (cache da IA ignorado)."""
+        from rb_ingestor.ai_enhanced import generate_enhanced_article
+        from rb_ingestor.ai_structured import generate_structured_article
+        from rb_ingestor.smart_categorizer import SmartCategorizer
+        from rb_ingestor.smart_public_figure_detector import SmartPublicFigureDetector
+        from rb_ingestor.title_styles import title_style_manager
+
+        def news(topic):
+            return {"title": f"{topic}: governo e mercado reagem - G1", "source": "G1",
+                    "description": f"Notícia de referência sobre {topic.lower()} para o benchmark de geração."}
+
+        def multi(topic):
+            # publish_topic antes: título reescrito, corpo (título descartado), categoria local, figura via IA
+            title = title_style_manager.generate_smart_title(topic, news(topic)["title"])
+            article = generate_enhanced_article(topic, news(topic), 400, "jornalistico")
+            if not article:
+                return None
+            SmartCategorizer().categorize_content(title, article["html"], topic)
+            SmartPublicFigureDetector().detect_public_figure(f"{title} {article['html']}")
+            return article
+
+        def single(topic):
+            article = generate_structured_article(topic, news(topic), 400, "jornalistico")
+            if article:
+                SmartPublicFigureDetector().detect_public_figure(f"{article['title']} {article['html']}",
+                                                                 figures=article["figures"])
+            return article
+
+        flows = {}
+        for flow, fn in (("várias chamadas", multi), ("estruturada", single)):
+            llm_client.reset_stats()
+            start = time.perf_counter()
+            articles = [fn(topic) for topic in topics]
+            stats = llm_client.stats()
+            flows[flow] = {
+                "wall_seconds": round(time.perf_counter() - start, 2),
+                "articles": sum(1 for a in articles if a),
+                "calls": stats["calls"],
+                "prompt_tokens": stats["prompt_tokens"],
+                "completion_tokens": stats["completion_tokens"],
+                "cost_usd": round(llm_cache.estimate_cost(
+                    llm_client.MODEL_DEFAULT, stats["prompt_tokens"], stats["completion_tokens"]), 6),
+            }
+        old, new = flows["várias chamadas"], flows["estruturada"]
+        return {
+            "flows": flows,
+            "calls_saved": old["calls"] - new["calls"],
+            "time_ratio": round(old["wall_seconds"] / new["wall_seconds"], 2) if new["wall_seconds"] else 0,
+            "cost_ratio": round(new["cost_usd"] / old["cost_usd"], 3) if old["cost_usd"] else 0,
+        }
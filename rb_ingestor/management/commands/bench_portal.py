@@ -0,0 +1,269 @@
+# rb_ingestor/management/commands/bench_portal.py
+"""
+Benchmark do caminho de leitura do portal.
+
+1. Semeia um dataset sintético de ``Noticia`` (10k / 100k / 1M) distribuído
+   entre todas as categorias, via ``bulk_create``
+2. Dispara home, home paginada, categoria, notícia, todas as categorias,
+   sitemap.xml e feed/ pelo test client do Django
+3. Reporta req/s, p50/p95 e número de queries por cenário e falha se
+   houver regressão em relação a um baseline JSON
+
+As notícias sintéticas usam ``fonte_url`` começando com ``bench://``
+e podem ser removidas com ``--cleanup``.
+"""
+import json
+import logging
+import random
+import time
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+from slugify import slugify
+
+from rb_ingestor.management.commands.perf_report import percentile
+
+BENCH_PREFIX = "bench://noticia/"
+SIZES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+
+DEFAULT_CATEGORIES = [
+    "Brasil", "Política", "Economia", "Tecnologia", "Esportes",
+    "Saúde", "Mundo", "Meio Ambiente", "Lazer",
+]
+
+VOCABULARY = (
+    "governo federal anuncia medidas economia mercado inflação juros banco central "
+    "presidente congresso votação projeto lei reforma tributária estados municípios "
+    "saúde pública vacinação hospitais tecnologia inteligência artificial startups "
+    "investimentos exportações agronegócio safra clima chuvas temperatura seleção "
+    "campeonato brasileiro jogadores técnico estádio eleições partidos pesquisa "
+    "educação escolas universidades ciência pesquisa descoberta energia petróleo"
+).split()
+
+
+def parse_size(value: str) -> int:
+    key = value.lower()
+    if key in SIZES:
+        return SIZES[key]
+    try:
+        return int(value)
+    except ValueError:
+        raise CommandError(f"Tamanho inválido: {value} (use 10k, 100k, 1m ou um número)")
+
+
+class Command(BaseCommand):
+    help = "Benchmark do portal com dataset sintético e comparação com baseline"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--size", type=str, default="10k", help="Quantidade de notícias sintéticas: 10k, 100k, 1m ou número")
+        parser.add_argument("--requests", type=int, default=50, help="Requisições medidas por cenário")
+        parser.add_argument("--warmup", type=int, default=3, help="Requisições de aquecimento por cenário")
+        parser.add_argument("--batch-size", type=int, default=2000, help="Tamanho do lote do bulk_create")
+        parser.add_argument("--skip-seed", action="store_true", help="Não semeia, usa os dados existentes")
+        parser.add_argument("--seed-only", action="store_true", help="Apenas semeia o dataset")
+        parser.add_argument("--cleanup", action="store_true", help="Remove as notícias sintéticas e sai")
+        parser.add_argument("--baseline", type=str, help="Baseline JSON para comparação")
+        parser.add_argument("--save-baseline", type=str, help="Grava o resultado como novo baseline")
+        parser.add_argument("--tolerance", type=float, default=0.20, help="Regressão tolerada na p95 (padrão: 20%%)")
+        parser.add_argument("--json", action="store_true", help="Saída em JSON")
+        parser.add_argument("--force", action="store_true", help="Permite semear com DEBUG=False")
+
+    def handle(self, *args, **options):
+        Noticia = apps.get_model("rb_noticias", "Noticia")
+
+        if options["cleanup"]:
+            deleted, _ = Noticia.objects.filter(fonte_url__startswith=BENCH_PREFIX).delete()
+            self.stdout.write(f"🧹 {deleted} notícias sintéticas removidas")
+            return
+
+        if not options["skip_seed"]:
+            if not settings.DEBUG and not options["force"]:
+                raise CommandError("DEBUG=False: use --force para semear dados sintéticos neste banco")
+            self._seed(parse_size(options["size"]), options["batch_size"])
+            if options["seed_only"]:
+                return
+
+        results = self._run_scenarios(options["requests"], options["warmup"])
+
+        if options["json"]:
+            self.stdout.write(json.dumps(results, indent=2, ensure_ascii=False))
+        else:
+            self._print_table(results)
+
+        if options["save_baseline"]:
+            with open(options["save_baseline"], "w", encoding="utf-8") as f:
+                json.dump(results, f, indent=2, ensure_ascii=False)
+            self.stdout.write(f"💾 Baseline salvo em {options['save_baseline']}")
+
+        if options["baseline"]:
+            regressions = self._compare(results, options["baseline"], options["tolerance"])
+            if regressions:
+                for line in regressions:
+                    self.stdout.write(self.style.ERROR(f"❌ {line}"))
+                raise CommandError(f"{len(regressions)} regressão(ões) em relação ao baseline")
+            self.stdout.write(self.style.SUCCESS("✅ Sem regressões em relação ao baseline"))
+
+    # ----------------------- Dataset -----------------------
+
+    def _categories(self):
+        Categoria = apps.get_model("rb_noticias", "Categoria")
+        cats = list(Categoria.objects.all())
+        if not cats:
+            for nome in DEFAULT_CATEGORIES:
+                Categoria.objects.get_or_create(slug=slugify(nome)[:140], defaults={"nome": nome})
+            cats = list(Categoria.objects.all())
+        return cats
+
+    def _bodies(self, rng, count=40):
+        """Corpos HTML de 500-1200 palavras, reaproveitados entre as notícias."""
+        bodies = []
+        for _ in range(count):
+            paragraphs = []
+            words = rng.randint(500, 1200)
+            while words > 0:
+                size = min(words, rng.randint(40, 90))
+                paragraphs.append("<p>" + " ".join(rng.choice(VOCABULARY) for _ in range(size)) + ".</p>")
+                words -= size
+            dek = " ".join(rng.choice(VOCABULARY) for _ in range(25))
+            bodies.append(f'<p class="dek">{dek}</p>\n<h2>Contexto</h2>\n' + "\n".join(paragraphs))
+        return bodies
+
+    def _seed(self, size, batch_size):
+        Noticia = apps.get_model("rb_noticias", "Noticia")
+        existing = Noticia.objects.filter(fonte_url__startswith=BENCH_PREFIX).count()
+        missing = size - existing
+        if missing <= 0:
+            self.stdout.write(f"📦 Dataset já possui {existing} notícias sintéticas")
+            return
+
+        rng = random.Random(42)
+        cats = self._categories()
+        bodies = self._bodies(rng)
+        now = timezone.now()
+        span = int(timedelta(days=730).total_seconds())
+
+        self.stdout.write(f"🌱 Semeando {missing} notícias em {len(cats)} categorias...")
+        started = time.perf_counter()
+        batch = []
+        for i in range(existing, size):
+            titulo = " ".join(rng.choice(VOCABULARY) for _ in range(rng.randint(6, 12))).capitalize()
+            batch.append(Noticia(
+                titulo=titulo[:200],
+                slug=f"bench-{i}-{slugify(titulo)[:100]}",
+                conteudo=rng.choice(bodies),
+                publicado_em=now - timedelta(seconds=rng.randint(60, span)),
+                categoria=cats[i % len(cats)],
+                status=Noticia.Status.PUBLICADO,
+                destaque=(i % 5000 == 0),
+                views=rng.randint(0, 5000),
+                clicks=rng.randint(0, 500),
+                shares=rng.randint(0, 200),
+                trending_score=rng.random() * 100,
+                fonte_url=f"{BENCH_PREFIX}{i}",
+                fonte_nome="bench",
+            ))
+            if len(batch) >= batch_size:
+                Noticia.objects.bulk_create(batch)
+                batch = []
+                done = i + 1 - existing
+                if done % (batch_size * 10) == 0:
+                    self.stdout.write(f"   {done}/{missing}")
+        if batch:
+            Noticia.objects.bulk_create(batch)
+        self.stdout.write(f"✅ Dataset pronto em {time.perf_counter() - started:.1f}s")
+
+    # ----------------------- Cenários -----------------------
+
+    def _scenarios(self):
+        Noticia = apps.get_model("rb_noticias", "Noticia")
+        published = Noticia.objects.filter(status=Noticia.Status.PUBLICADO)
+        slugs = list(published.order_by("-publicado_em").values_list("slug", flat=True)[:200])
+        cat_slugs = list(
+            apps.get_model("rb_noticias", "Categoria").objects.values_list("slug", flat=True)
+        )
+        if not slugs or not cat_slugs:
+            raise CommandError("Sem notícias/categorias publicadas para o benchmark")
+        total = published.count()
+        deep_page = max(1, min(total // 10, 500))
+        return {
+            "home": lambda i: "/",
+            "home_paginada": lambda i: f"/?page={2 + i % deep_page}",
+            "category_list": lambda i: f"/categoria/{cat_slugs[i % len(cat_slugs)]}/",
+            "post_detail": lambda i: f"/noticia/{slugs[i % len(slugs)]}/",
+            "all_categories": lambda i: "/categorias/",
+            "sitemap": lambda i: "/sitemap.xml",
+            "feed": lambda i: "/feed/",
+        }
+
+    def _run_scenarios(self, n_requests, warmup):
+        # O log por request do PerformanceMiddleware só atrapalharia a saída
+        perf_logger = logging.getLogger("radarbr.perf")
+        perf_logger.disabled = True
+        results = {}
+        try:
+            with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+                client = Client()
+                for name, url_for in self._scenarios().items():
+                    for i in range(warmup):
+                        client.get(url_for(i))
+                    latencies, queries = [], []
+                    started = time.perf_counter()
+                    for i in range(n_requests):
+                        url = url_for(i)
+                        with CaptureQueriesContext(connection) as ctx:
+                            t0 = time.perf_counter()
+                            response = client.get(url)
+                            latencies.append((time.perf_counter() - t0) * 1000)
+                        queries.append(len(ctx.captured_queries))
+                        if response.status_code != 200:
+                            raise CommandError(f"{name}: {url} respondeu {response.status_code}")
+                    elapsed = time.perf_counter() - started
+                    results[name] = {
+                        "requests": n_requests,
+                        "req_per_s": round(n_requests / elapsed, 2) if elapsed else 0.0,
+                        "p50_ms": round(percentile(latencies, 50), 2),
+                        "p95_ms": round(percentile(latencies, 95), 2),
+                        "queries_p50": percentile(queries, 50),
+                        "queries_max": max(queries),
+                    }
+        finally:
+            perf_logger.disabled = False
+        return results
+
+    # ----------------------- Relatório / baseline -----------------------
+
+    def _print_table(self, results):
+        self.stdout.write("=== BENCHMARK DO PORTAL ===")
+        header = f"{'cenário':<18}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'q p50':>7}{'q max':>7}"
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+        for name, row in results.items():
+            self.stdout.write(
+                f"{name:<18}{row['req_per_s']:>9.1f}{row['p50_ms']:>10.1f}{row['p95_ms']:>10.1f}"
+                f"{row['queries_p50']:>7}{row['queries_max']:>7}"
+            )
+
+    def _compare(self, results, baseline_path, tolerance):
+        try:
+            with open(baseline_path, "r", encoding="utf-8") as f:
+                baseline = json.load(f)
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Não foi possível ler o baseline {baseline_path}: {e}")
+
+        regressions = []
+        for name, row in results.items():
+            base = baseline.get(name)
+            if not base:
+                continue
+            limit = base["p95_ms"] * (1 + tolerance)
+            if row["p95_ms"] > limit:
+                regressions.append(f"{name}: p95 {row['p95_ms']:.1f}ms > {limit:.1f}ms (baseline {base['p95_ms']:.1f}ms)")
+            if row["queries_max"] > base["queries_max"]:
+                regressions.append(f"{name}: {row['queries_max']} queries > baseline {base['queries_max']}")
+        return regressions
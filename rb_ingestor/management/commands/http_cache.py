@@ -0,0 +1,72 @@
+# rb_ingestor/management/commands/http_cache.py
+"""
+Manutenção do cache HTTP em disco da ingestão (ver rb_ingestor/http_cache.py).
+
+    python manage.py http_cache --stats
+    python manage.py http_cache --prune
+    python manage.py http_cache --clear
+"""
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from rb_ingestor import http_cache
+
+
+def _mb(size: int) -> str:
+    return f"{size / (1024 * 1024):.1f} MB"
+
+
+class Command(BaseCommand):
+    help = "Estatísticas e limpeza do cache HTTP em disco da ingestão"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--stats", action="store_true", help="Mostra tamanho, entradas e hosts do cache")
+        parser.add_argument("--prune", action="store_true", help="Remove entradas vencidas e aplica o limite de tamanho")
+        parser.add_argument("--stale-days", type=float, default=7, help="Dias após o vencimento para apagar entradas com ETag/Last-Modified")
+        parser.add_argument("--clear", action="store_true", help="Apaga todo o cache")
+        parser.add_argument("--json", action="store_true", help="Saída de --stats em JSON")
+
+    def handle(self, *args, **options):
+        if not (options["stats"] or options["prune"] or options["clear"]):
+            raise CommandError("Informe --stats, --prune ou --clear")
+
+        cache = http_cache.get_cache()
+        if not http_cache.ENABLED:
+            self.stdout.write(self.style.WARNING("⚠ HTTP_CACHE_ENABLED=False: a ingestão não está usando o cache"))
+
+        if options["clear"]:
+            removed = cache.clear()
+            self.stdout.write(self.style.SUCCESS(f"🗑 {removed} entradas apagadas de {cache.path}"))
+
+        if options["prune"]:
+            removed = cache.prune(stale_after=options["stale_days"] * 24 * 3600)
+            self.stdout.write(self.style.SUCCESS(
+                f"🧹 {removed} entradas removidas; cache com {_mb(cache.total_size())} de {_mb(cache.max_bytes)}"
+            ))
+
+        if options["stats"]:
+            summary = cache.summary()
+            if options["json"]:
+                self.stdout.write(json.dumps(summary, indent=2, ensure_ascii=False))
+                return
+            self._print_stats(summary)
+
+    def _print_stats(self, summary):
+        self.stdout.write(f"📦 Cache HTTP: {summary['path']}")
+        self.stdout.write(
+            f"   {summary['entries']} entradas ({summary['fresh']} dentro do TTL), "
+            f"{_mb(summary['size_bytes'])} em disco de {_mb(summary['max_bytes'])} "
+            f"({_mb(summary['raw_bytes'])} sem compressão)"
+        )
+        self.stdout.write(f"   {summary['hits']} respostas servidas do cache")
+        if summary["raw_bytes"]:
+            ratio = summary["size_bytes"] / summary["raw_bytes"]
+            self.stdout.write(f"   Compressão: {ratio:.0%} do tamanho original")
+        if summary["hosts"]:
+            self.stdout.write("")
+            self.stdout.write(f"{'host':<40} {'entradas':>9} {'tamanho':>10} {'hits':>7}")
+            for host in summary["hosts"]:
+                self.stdout.write(
+                    f"{host['host'][:40]:<40} {host['entries']:>9} {_mb(host['size_bytes']):>10} {host['hits']:>7}"
+                )
@@ -0,0 +1,119 @@
+# rb_ingestor/management/commands/ingest_pipeline.py
+"""
+Worker e relatório do pipeline de ingestão (ver rb_ingestor/pipeline.py).
+
+    python manage.py ingest_pipeline --run                  # retoma pendentes/falhos
+    python manage.py ingest_pipeline --run --origem publish_topic --limit 5
+    python manage.py ingest_pipeline --run --job 42 --retry # força um job, zerando tentativas
+    python manage.py ingest_pipeline --run --loop           # worker contínuo (vários podem rodar juntos)
+    python manage.py ingest_pipeline --stats
+
+Cada worker reivindica os jobs com lease antes de rodar, então vários
+processos/nós podem rodar --run ao mesmo tempo sem publicar em dobro.
+"""
+import json
+import time
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from rb_ingestor import dedup, llm_cache, pipeline
+
+
+class Command(BaseCommand):
+    help = "Processa/retoma os jobs do pipeline de ingestão e mostra o estado da fila"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--run", action="store_true", help="Processa os jobs pendentes, falhos e travados")
+        parser.add_argument("--origem", type=str, help="Só jobs deste comando produtor")
+        parser.add_argument("--job", type=int, action="append", help="ID do job (pode repetir)")
+        parser.add_argument("--limit", type=int, default=20, help="Máximo de jobs por execução")
+        parser.add_argument("--retry", action="store_true", help="Zera as tentativas dos jobs falhos antes de rodar")
+        parser.add_argument("--workers", type=int, default=pipeline.WORKERS, help="Jobs em andamento ao mesmo tempo")
+        parser.add_argument("--loop", action="store_true", help="Continua buscando jobs até ser interrompido")
+        parser.add_argument("--idle-sleep", type=int, default=30, help="Segundos de espera com a fila vazia (--loop)")
+        parser.add_argument("--no-llm-cache", action="store_true", help="Ignora o cache de respostas da IA (gera de novo)")
+        parser.add_argument("--stats", action="store_true", help="Mostra jobs por status/etapa e tempo médio por etapa")
+        parser.add_argument("--json", action="store_true", help="Saída de --stats em JSON")
+
+    def handle(self, *args, **options):
+        if not (options["run"] or options["stats"]):
+            raise CommandError("Informe --run ou --stats")
+
+        if options["no_llm_cache"]:
+            llm_cache.set_bypass(True)
+
+        if options["run"]:
+            self._run(options)
+
+        if options["stats"]:
+            summary = pipeline.summary(options["origem"])
+            if options["json"]:
+                self.stdout.write(json.dumps(summary, indent=2, ensure_ascii=False))
+                return
+            self._print_stats(summary)
+
+    def _run(self, options):
+        IngestJob = apps.get_model("rb_ingestor", "IngestJob")
+        if options["retry"]:
+            failed = IngestJob.objects.filter(status="falhou")
+            if options["job"]:
+                failed = failed.filter(pk__in=options["job"])
+            if options["origem"]:
+                failed = failed.filter(origem=options["origem"])
+            failed.update(tentativas=0)
+        runner = pipeline.Pipeline(workers=options["workers"], log=self.stdout.write)
+        limit = max(1, options["limit"])
+        self.stdout.write(f"🪪 Worker {runner.worker}")
+        while True:
+            jobs = pipeline.claim(runner.worker, limit, options["origem"], ids=options["job"])
+            if jobs:
+                self.stdout.write(f"🚚 Processando {len(jobs)} job(s)")
+                for job in jobs:
+                    self.stdout.write(f"   #{job.pk} {job.origem} → {job.get_etapa_display()}: {job.titulo[:60]}")
+                result = runner.process(jobs)
+                self.stdout.write(self.style.SUCCESS(
+                    "✅ " + ", ".join(f"{n} {status}" for status, n in sorted(result.items()))
+                ))
+                gate = dedup.stats()
+                if gate["rejected"]:
+                    self.stdout.write(f"🚧 Duplicatas barradas no gate: {gate['rejected']} de {gate['checked']}")
+                cache = llm_cache.get_cache().stats()
+                if cache["hits"] or cache["misses"]:
+                    self.stdout.write(
+                        f"🧠 Cache da IA: {cache['hits']} acertos, {cache['misses']} chamadas, "
+                        f"~US$ {cache['saved_usd']:.4f} economizados"
+                    )
+            elif not options["loop"]:
+                self.stdout.write("Nenhum job livre para processar")
+            if not options["loop"]:
+                return
+            if not jobs:
+                time.sleep(max(1, options["idle_sleep"]))
+
+    def _print_stats(self, summary):
+        self.stdout.write(f"📋 {summary['jobs']} jobs: " + (", ".join(
+            f"{n} {status}" for status, n in sorted(summary["status"].items())
+        ) or "nenhum"))
+        if summary["waiting_by_stage"]:
+            self.stdout.write("   Aguardando por etapa: " + ", ".join(
+                f"{stage} {n}" for stage, n in summary["waiting_by_stage"].items()
+            ))
+        if summary["leased"]:
+            self.stdout.write(f"   Em andamento (lease válido): {summary['leased']}")
+        if summary["stage_ms"]:
+            self.stdout.write("")
+            self.stdout.write(f"{'etapa':<12} {'média':>10} {'limite':>7}")
+            for stage, ms in summary["stage_ms"].items():
+                self.stdout.write(f"{stage:<12} {ms:>8}ms {summary['concurrency'].get(stage, 1):>7}")
+        duplicates = summary["duplicates"]
+        if duplicates["gated"] or duplicates["late"]:
+            self.stdout.write("")
+            self.stdout.write(
+                f"🚧 Duplicatas barradas no gate: {duplicates['gated']} "
+                f"(~{duplicates['avoided_seconds']}s de extração/IA/imagem evitados)"
+            )
+            if duplicates["late"]:
+                self.stdout.write("   Descobertas depois: " + ", ".join(
+                    f"{stage} {n}" for stage, n in duplicates["late_by_stage"].items()
+                ))
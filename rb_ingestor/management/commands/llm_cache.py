@@ -0,0 +1,67 @@
+# rb_ingestor/management/commands/llm_cache.py
+"""
+Manutenção do cache de respostas da IA (ver rb_ingestor/llm_cache.py).
+
+    python manage.py llm_cache --stats
+    python manage.py llm_cache --prune
+    python manage.py llm_cache --clear
+"""
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from rb_ingestor import llm_cache
+
+
+def _mb(size: int) -> str:
+    return f"{size / (1024 * 1024):.1f} MB"
+
+
+class Command(BaseCommand):
+    help = "Estatísticas e limpeza do cache de respostas da IA (texto, visão e imagens)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--stats", action="store_true", help="Mostra entradas, acertos e custo economizado por tipo")
+        parser.add_argument("--prune", action="store_true", help="Remove entradas vencidas e aplica o limite de tamanho")
+        parser.add_argument("--clear", action="store_true", help="Apaga todo o cache")
+        parser.add_argument("--json", action="store_true", help="Saída de --stats em JSON")
+
+    def handle(self, *args, **options):
+        if not (options["stats"] or options["prune"] or options["clear"]):
+            raise CommandError("Informe --stats, --prune ou --clear")
+
+        cache = llm_cache.get_cache()
+        if not llm_cache.ENABLED:
+            self.stdout.write(self.style.WARNING("⚠ LLM_CACHE_ENABLED=False: as chamadas à IA não estão usando o cache"))
+
+        if options["clear"]:
+            removed = cache.clear()
+            self.stdout.write(self.style.SUCCESS(f"🗑 {removed} entradas apagadas de {cache.path}"))
+
+        if options["prune"]:
+            removed = cache.prune()
+            self.stdout.write(self.style.SUCCESS(
+                f"🧹 {removed} entradas removidas; cache com {_mb(cache.total_size())} de {_mb(cache.max_bytes)}"
+            ))
+
+        if options["stats"]:
+            summary = cache.summary()
+            if options["json"]:
+                self.stdout.write(json.dumps(summary, indent=2, ensure_ascii=False))
+                return
+            self._print_stats(summary)
+
+    def _print_stats(self, summary):
+        self.stdout.write(f"🧠 Cache da IA: {summary['path']}")
+        self.stdout.write(
+            f"   {summary['entries']} entradas, {_mb(summary['size_bytes'])} em disco de {_mb(summary['max_bytes'])}"
+        )
+        self.stdout.write(f"   {summary['hits']} respostas servidas do cache, ~US$ {summary['saved_usd']:.4f} economizados")
+        if summary["kinds"]:
+            self.stdout.write("")
+            self.stdout.write(f"{'tipo':<10} {'entradas':>9} {'no TTL':>7} {'tamanho':>10} {'hits':>7} {'economia':>12}")
+            for row in summary["kinds"]:
+                self.stdout.write(
+                    f"{row['kind']:<10} {row['entries']:>9} {row['fresh']:>7} {_mb(row['size_bytes']):>10} "
+                    f"{row['hits']:>7} {'US$ ' + format(row['saved_usd'], '.4f'):>12}"
+                )
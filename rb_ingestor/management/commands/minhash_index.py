@@ -0,0 +1,112 @@
+# rb_ingestor/management/commands/minhash_index.py
+"""
+Manutenção do índice MinHash/LSH de quase-duplicatas (ver rb_ingestor/minhash.py).
+
+    python manage.py minhash_index --build          # notícias ainda sem assinatura
+    python manage.py minhash_index --rebuild        # todas (depois de mudar NUM_PERM/BANDS)
+    python manage.py minhash_index --bench 200      # consulta LSH x varredura da tabela
+"""
+import random
+import time
+from datetime import timedelta
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from rb_ingestor import minhash
+
+ALL_HOURS = 24 * 365 * 20
+
+
+class Command(BaseCommand):
+    help = "Gera as assinaturas MinHash das notícias e compara a consulta LSH com a varredura"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--build", action="store_true", help="Indexa as notícias sem assinatura")
+        parser.add_argument("--rebuild", action="store_true", help="Refaz a assinatura de todas as notícias")
+        parser.add_argument("--bench", type=int, default=0, metavar="N",
+                            help="Consulta N títulos (levemente alterados) pelo LSH e por varredura")
+        parser.add_argument("--hours", type=int, default=0,
+                            help="Janela das consultas do --bench (padrão: todas as notícias)")
+
+    def handle(self, *args, **options):
+        if not (options["build"] or options["rebuild"] or options["bench"]):
+            raise CommandError("Informe --build, --rebuild ou --bench N")
+        if options["build"] or options["rebuild"]:
+            self._build(rebuild=options["rebuild"])
+        if options["bench"]:
+            self._bench(options["bench"], options["hours"])
+
+    def _build(self, rebuild=False):
+        Noticia = apps.get_model("rb_noticias", "Noticia")
+        ArticleSignature = apps.get_model("rb_ingestor", "ArticleSignature")
+        queryset = Noticia.objects.only("pk", "titulo", "conteudo")
+        if not rebuild:
+            queryset = queryset.exclude(pk__in=ArticleSignature.objects.values("noticia_id"))
+        start = time.perf_counter()
+        total = 0
+        for noticia in queryset.iterator(chunk_size=200):
+            minhash.index(noticia)
+            total += 1
+            if total % 500 == 0:
+                self.stdout.write(f"   {total} notícias indexadas...")
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f"🧬 {total} notícias indexadas em {elapsed:.1f}s ({elapsed * 1000 / max(total, 1):.1f}ms cada)"
+        ))
+
+    def _bench(self, count, hours):
+        import numpy as np
+
+        Noticia = apps.get_model("rb_noticias", "Noticia")
+        ArticleSignature = apps.get_model("rb_ingestor", "ArticleSignature")
+        hours = hours or ALL_HOURS
+        titles = list(Noticia.objects.order_by("?").values_list("titulo", flat=True)[:count])
+        if not titles:
+            raise CommandError("Nenhuma notícia no banco")
+        signed = ArticleSignature.objects.count()
+        self.stdout.write(f"🧬 {len(titles)} consultas contra {signed} assinaturas"
+                          + (f" (janela de {hours}h)" if hours != ALL_HOURS else ""))
+
+        rng = random.Random(1)
+        queries = []
+        for title in titles:
+            # Mesma matéria com outra redação: uma palavra a menos e outra trocada de lugar
+            words = title.split()
+            if len(words) > 4:
+                words.pop(rng.randrange(len(words)))
+                words.insert(rng.randrange(len(words)), words.pop(rng.randrange(len(words))))
+            queries.append(" ".join(words))
+
+        before = minhash.stats()
+        start = time.perf_counter()
+        lsh = [minhash.find(title=query, hours=hours) for query in queries]
+        lsh_seconds = time.perf_counter() - start
+        after = minhash.stats()
+
+        # Varredura: cada checagem lê todas as assinaturas da janela e compara com a consulta
+        start = time.perf_counter()
+        since = timezone.now() - timedelta(hours=hours)
+        rows = [(pk, bytes(data)) for pk, data in ArticleSignature.objects.filter(
+            noticia__criado_em__gte=since).values_list("noticia_id", "titulo") if len(data) == minhash.NUM_PERM * 4]
+        matrix = np.frombuffer(b"".join(data for _pk, data in rows), dtype=np.uint32).reshape(len(rows), minhash.NUM_PERM)
+        load_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        scan = []
+        for query in queries:
+            sig = minhash.text_signature(query, "titulo")
+            scores = (matrix == sig).mean(axis=1) if sig is not None and len(rows) else np.zeros(0)
+            best = int(scores.argmax()) if len(scores) else 0
+            scan.append(rows[best][0] if len(scores) and scores[best] >= minhash.THRESHOLDS["titulo"] else None)
+        compare_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+        found = sum(1 for match in scan if match)
+        agree = sum(1 for match, ref in zip(lsh, scan) if ref and match)
+        candidates = after["candidates"] - before["candidates"]
+        self.stdout.write(f"   LSH:       {lsh_seconds * 1000 / len(queries):.2f}ms por consulta, "
+                          f"{candidates / len(queries):.1f} candidatos em média")
+        self.stdout.write(f"   varredura: {load_seconds * 1000 + compare_ms:.2f}ms por consulta "
+                          f"(ler {len(rows)} assinaturas: {load_seconds * 1000:.1f}ms, comparar: {compare_ms:.2f}ms)")
+        self.stdout.write(f"   duplicatas achadas pela varredura: {found}; o LSH achou {agree} delas "
+                          f"({agree / max(found, 1):.0%})")
@@ -0,0 +1,100 @@
+# rb_ingestor/management/commands/perf_report.py
+"""
+Agrega os logs do PerformanceMiddleware (logger radarbr.perf) e exibe
+p50/p95 de latência, SQL e templates por view.
+"""
+import json
+import math
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+def percentile(values, pct):
+    """Percentil por nearest-rank (values não precisa estar ordenado)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def iter_perf_records(paths):
+    """Lê linhas de log e devolve os registros JSON de requisição."""
+    for path in paths:
+        try:
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                for line in f:
+                    start = line.find("{")
+                    if start == -1:
+                        continue
+                    try:
+                        record = json.loads(line[start:])
+                    except ValueError:
+                        continue
+                    if isinstance(record, dict) and record.get("event") == "request":
+                        yield record
+        except OSError as e:
+            raise CommandError(f"Não foi possível ler {path}: {e}")
+
+
+class Command(BaseCommand):
+    help = "Relatório p50/p95 por view a partir dos logs de performance"
+
+    def add_arguments(self, parser):
+        parser.add_argument("files", nargs="*", help="Arquivos de log (padrão: PERF_LOG_FILE)")
+        parser.add_argument("--view", type=str, help="Filtra por nome de view")
+        parser.add_argument("--since", type=float, help="Considera apenas registros após este timestamp (epoch)")
+        parser.add_argument("--json", action="store_true", help="Saída em JSON")
+
+    def handle(self, *args, **options):
+        files = options["files"] or [f for f in [getattr(settings, "PERF_LOG_FILE", "")] if f]
+        if not files:
+            raise CommandError("Informe arquivos de log ou configure PERF_LOG_FILE")
+
+        by_view = defaultdict(lambda: defaultdict(list))
+        for record in iter_perf_records(files):
+            if options["view"] and record.get("view") != options["view"]:
+                continue
+            if options["since"] and record.get("ts", 0) < options["since"]:
+                continue
+            bucket = by_view[record.get("view", "unresolved")]
+            for field in ("total_ms", "db_ms", "db_queries", "tpl_ms", "cache_hits", "cache_misses"):
+                bucket[field].append(record.get(field, 0) or 0)
+
+        report = {}
+        for view, data in by_view.items():
+            hits = sum(data["cache_hits"])
+            lookups = hits + sum(data["cache_misses"])
+            report[view] = {
+                "requests": len(data["total_ms"]),
+                "p50_ms": percentile(data["total_ms"], 50),
+                "p95_ms": percentile(data["total_ms"], 95),
+                "db_p50_ms": percentile(data["db_ms"], 50),
+                "db_p95_ms": percentile(data["db_ms"], 95),
+                "queries_p50": percentile(data["db_queries"], 50),
+                "queries_p95": percentile(data["db_queries"], 95),
+                "tpl_p95_ms": percentile(data["tpl_ms"], 95),
+                "cache_hit_ratio": round(hits / lookups, 3) if lookups else None,
+            }
+
+        if options["json"]:
+            self.stdout.write(json.dumps(report, indent=2, ensure_ascii=False))
+            return
+
+        if not report:
+            self.stdout.write("Nenhum registro de performance encontrado")
+            return
+
+        self.stdout.write("=== RELATÓRIO DE PERFORMANCE POR VIEW ===")
+        header = f"{'view':<28}{'reqs':>7}{'p50 ms':>10}{'p95 ms':>10}{'db p95':>10}{'q p50':>7}{'q p95':>7}{'tpl p95':>10}{'cache':>8}"
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+        for view, row in sorted(report.items(), key=lambda item: item[1]["p95_ms"], reverse=True):
+            ratio = "-" if row["cache_hit_ratio"] is None else f"{row['cache_hit_ratio']:.0%}"
+            self.stdout.write(
+                f"{view[:27]:<28}{row['requests']:>7}{row['p50_ms']:>10.1f}{row['p95_ms']:>10.1f}"
+                f"{row['db_p95_ms']:>10.1f}{row['queries_p50']:>7}{row['queries_p95']:>7}"
+                f"{row['tpl_p95_ms']:>10.1f}{ratio:>8}"
+            )
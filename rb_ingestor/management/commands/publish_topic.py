@@ -10,10 +10,14 @@ from slugify import slugify
 from django.apps import apps
 import logging
 import random
+from rb_ingestor import llm_cache, minhash, pipeline
 from rb_ingestor.title_styles import title_style_manager
+from core.metrics import ingest_stage
 
 logger = logging.getLogger(__name__)
 
+ORIGEM = __name__.rsplit(".", 1)[-1]
+
 class Command(BaseCommand):
     help = "Publica artigo com tópico especificado manualmente seguindo toda a lógica do sistema"
 
@@ -25,11 +29,12 @@ class Command(BaseCommand):
         parser.add_argument("--debug", action="store_true", help="Modo debug")
         parser.add_argument("--dry-run", action="store_true", help="Apenas simula, não publica")
         parser.add_argument("--words", type=int, default=800, help="Número mínimo de palavras (padrão: 800)")
+        parser.add_argument("--enqueue-only", action="store_true", help="Só cria o job; processe com ingest_pipeline --run")
+        parser.add_argument("--no-llm-cache", action="store_true", help="Ignora o cache de respostas da IA (gera de novo)")
 
     def handle(self, *args, **options):
-        Noticia = apps.get_model("rb_noticias", "Noticia")
-        Categoria = apps.get_model("rb_noticias", "Categoria")
-
+        if options["no_llm_cache"]:
+            llm_cache.set_bypass(True)
         self.stdout.write("=== PUBLICAÇÃO MANUAL DE TÓPICO ===")
         self.stdout.write(f"Executado em: {timezone.now()}")
         
@@ -45,14 +50,61 @@ class Command(BaseCommand):
             self.stdout.write(f"Titulo personalizado: {custom_title}")
         self.stdout.write(f"Minimo de palavras: {min_words}")
 
-        # Verificar duplicatas se não forçar
-        if not options["force"] and not options["dry_run"]:
-            if self._check_duplicate(topic, Noticia):
-                self.stdout.write("AVISO: Topico similar ja existe. Use --force para publicar mesmo assim.")
-                return
+        # As etapas rodam no pipeline; a entrada guarda as opções para uma retomada posterior
+        job = pipeline.enqueue(ORIGEM, {
+            "topic": topic,
+            "category": category,
+            "title": custom_title,
+            "words": min_words,
+            "force": options["force"],
+            "dry_run": options["dry_run"],
+        }, titulo=topic, chave=None if options["force"] or options["dry_run"] else pipeline.idempotency_key(
+            content=f"{ORIGEM}|{topic}|{timezone.localdate().isoformat()}"
+        ))
+        if job.status in ("concluido", "descartado"):
+            # Mesma chave (tópico + dia): o job de hoje é devolvido em vez de um novo
+            result = f"publicou a notícia {job.noticia_id}" if job.status == "concluido" else f"foi descartado ({job.erro})"
+            self.stdout.write(
+                f"AVISO: O topico '{topic}' ja rodou hoje as {timezone.localtime(job.atualizado_em):%H:%M} "
+                f"(job {job.pk}) e {result}. Use --force para publicar de novo."
+            )
+            return
+        if options.get("enqueue_only"):
+            self.stdout.write(f"📥 Job {job.pk} na fila (processe com: python manage.py ingest_pipeline --run)")
+            return
+
+        pipeline.Pipeline({ORIGEM: self}, log=self.stdout.write).run([job])
+        if job.status == "falhou":
+            self.stdout.write(f"⚠ Job {job.pk} parou na etapa {job.etapa}; retome com: python manage.py ingest_pipeline --run --job {job.pk}")
+
+    # Etapas do pipeline (ver rb_ingestor/pipeline.py): cada uma recebe o job e os
+    # artefatos das etapas anteriores e devolve o que precisa ser gravado
+
+    def stage_gate(self, job, data):
+        # Verificar duplicatas se não forçar (índice em memória, antes do RSS e do navegador)
+        if not job.entrada.get("force") and not job.entrada.get("dry_run"):
+            self._gate(topic=job.entrada["topic"])
+        return {}
+
+    def stage_fetch(self, job, data):
+        topic = job.entrada["topic"]
 
         # Buscar notícias específicas sobre o tópico
-        news_article = self._search_specific_news(topic)
+        news = self._search_specific_news(topic)
+        # De novo com a notícia encontrada, antes da extração com navegador
+        if news and not job.entrada.get("force") and not job.entrada.get("dry_run"):
+            self._gate(title=news.get("title"), urls=[news.get("url")])
+        return {"news": news}
+
+    def _gate(self, **query):
+        from rb_ingestor import dedup
+        reason = dedup.gate(**query)
+        if reason:
+            self.stdout.write(f"AVISO: Noticia similar ja existe ({reason}). Use --force para publicar mesmo assim.")
+            raise pipeline.SkipJob(f"duplicata ({reason})")
+
+    def stage_extract(self, job, data):
+        news_article = dict(data["fetch"].get("news") or {})
         
         if news_article:
             self.stdout.write(f"Noticia encontrada: {news_article.get('title', '')[:50]}...")
@@ -78,19 +130,26 @@ class Command(BaseCommand):
         else:
             self.stdout.write("AVISO: Nenhuma noticia especifica encontrada para o topico - criando do zero")
 
-        # Detectar categoria
+        return {"news": news_article or {}}
+
+    def _initial_category(self, job, news_article):
+        """Categoria pedida em --category ou detectada na notícia, antes da geração: (Categoria, confiança)."""
+        Categoria = apps.get_model("rb_noticias", "Categoria")
+        category = job.entrada.get("category")
         if category:
             cat = Categoria.objects.filter(nome=category).first()
             if not cat:
                 cat = Categoria.objects.create(nome=category, slug=slugify(category)[:140])
-        else:
-            cat = self._detect_category_from_news(topic.lower(), news_article, Categoria)
+            return cat, 1.0
+        return self._detect_category_from_news(job.entrada["topic"].lower(), news_article, Categoria)
 
-        # Gerar título
-        if custom_title:
-            title = custom_title
-        else:
-            title = self._generate_title_from_news(topic, news_article)
+    def stage_generate(self, job, data):
+        topic = job.entrada["topic"]
+        min_words = job.entrada["words"]
+        news_article = data["extract"]["news"]
+
+        # Detectar categoria (os prompts de geração e de ajuste de tamanho usam o nome dela)
+        cat, confidence = self._initial_category(job, news_article)
 
         # Gerar conteúdo com palavras dinâmicas baseadas no conteúdo real
         if news_article.get('base_word_count'):
@@ -104,8 +163,15 @@ class Command(BaseCommand):
         else:
             dynamic_min_words = min_words
             self.stdout.write(f"📊 Sem conteúdo real → Alvo padrão: {dynamic_min_words}")
-        
-        content = self._generate_content_from_news(topic, news_article, cat, dynamic_min_words)
+
+        # Uma chamada só (título, corpo, categoria e figuras); sem ela, título e corpo em chamadas separadas
+        structured = self._generate_structured(topic, news_article, dynamic_min_words)
+        if structured:
+            title = job.entrada.get("title") or structured["titulo"]
+            content = structured["conteudo"]
+        else:
+            title = job.entrada.get("title") or self._generate_title_from_news(topic, news_article)
+            content = self._generate_content_from_news(topic, news_article, cat, dynamic_min_words)
         
         # Verificar contagem de palavras com margem de 15%
         word_count = len(strip_tags(content).split())
@@ -113,10 +179,6 @@ class Command(BaseCommand):
         
         # Validar se está dentro da margem de 15%
         if news_article.get('base_word_count'):
-            base_word_count = news_article['base_word_count']
-            target_min = int(base_word_count * 0.85)
-            target_max = int(base_word_count * 1.15)
-            
             if target_min <= word_count <= target_max:
                 self.stdout.write(f"✅ Conteudo dentro da margem ideal: {word_count} palavras")
             else:
@@ -129,10 +191,29 @@ class Command(BaseCommand):
                 word_count = len(strip_tags(content).split())
                 self.stdout.write(f"Palavras apos ajuste: {word_count}")
 
+        result = {"titulo": title, "conteudo": content, "palavras": word_count,
+                  "categoria": cat.pk, "confianca": confidence}
+        if structured:
+            result.update(categoria_slug=structured["categoria_slug"], figuras=structured["figuras"])
+        return result
+
+    def stage_categorize(self, job, data):
+        Categoria = apps.get_model("rb_noticias", "Categoria")
+        topic = job.entrada["topic"]
+
+        # Categoria detectada antes da geração (ou a de --category, com confiança 1.0)
+        cat = Categoria.objects.get(pk=data["generate"]["categoria"])
+        confidence = data["generate"]["confianca"]
+        structured_cat = Categoria.objects.filter(slug=data["generate"].get("categoria_slug") or "").first()
+        if not job.entrada.get("category") and structured_cat:
+            # Escolhida pela IA entre as categorias existentes, já com o texto completo em mãos
+            self.stdout.write(f"✅ Categoria da geração estruturada: {structured_cat.nome}")
+            return {"categoria": structured_cat.pk, "confianca": 1.0}
+
         # CATEGORIZAR BASEADO NO CONTEÚDO GERADO (apenas se categoria original não foi detectada com alta confiança)
-        if not hasattr(self, '_original_category_confidence') or self._original_category_confidence < 0.6:
+        if confidence < 0.6:
             self.stdout.write("🔍 Analisando conteúdo gerado para determinar categoria...")
-            final_category = self._categorize_generated_content(content, topic)
+            final_category = self._categorize_generated_content(data["generate"]["conteudo"], topic)
             
             if final_category and final_category != cat:
                 self.stdout.write(f"✅ Categoria ajustada: {cat.nome} → {final_category.nome}")
@@ -140,20 +221,29 @@ class Command(BaseCommand):
         else:
             self.stdout.write(f"✅ Mantendo categoria original detectada: {cat.nome} (confiança alta)")
 
+        return {"categoria": cat.pk, "confianca": confidence}
+
+    def stage_youtube(self, job, data):
+        topic = job.entrada["topic"]
+        min_words = job.entrada["words"]
+        content = data["generate"]["conteudo"]
+        word_count = data["generate"]["palavras"]
+        result = {}
+
         # Integrar vídeos do YouTube automaticamente
         try:
             from rb_ingestor.youtube_integration import YouTubeIntegration
             youtube_integration = YouTubeIntegration()
             
             content_with_video = youtube_integration.integrate_video_into_content(
-                content, topic, title, news_article
+                content, topic, data["generate"]["titulo"], data["extract"]["news"]
             )
             
             if content_with_video != content:
                 self.stdout.write("Video do YouTube integrado automaticamente")
-                content = content_with_video
-                word_count = len(strip_tags(content).split())
+                word_count = len(strip_tags(content_with_video).split())
                 self.stdout.write(f"Palavras apos integracao de video: {word_count}")
+                result = {"conteudo": content_with_video, "palavras": word_count}
             
         except Exception as e:
             self.stdout.write(f"AVISO: Erro na integracao do YouTube: {e}")
@@ -163,13 +253,38 @@ class Command(BaseCommand):
             self.stdout.write(f"Conteudo dentro da margem ideal: {word_count} palavras")
         else:
             self.stdout.write(f"AVISO: Conteudo fora da margem ideal: {word_count} palavras")
+        return result
 
-        if options["dry_run"]:
+    def stage_image(self, job, data):
+        Categoria = apps.get_model("rb_noticias", "Categoria")
+        cat = Categoria.objects.filter(pk=data["categorize"]["categoria"]).first()
+        return self._find_image(
+            data["generate"]["titulo"], job.ultimo("conteudo"), cat, job.entrada["topic"], data["extract"]["news"],
+            figures=data["generate"].get("figuras"),
+        ) or {}
+
+    def stage_save(self, job, data):
+        Noticia = apps.get_model("rb_noticias", "Noticia")
+        Categoria = apps.get_model("rb_noticias", "Categoria")
+        topic = job.entrada["topic"]
+        title = data["generate"]["titulo"]
+        content = job.ultimo("conteudo")
+        word_count = job.ultimo("palavras")
+        cat = Categoria.objects.filter(pk=data["categorize"]["categoria"]).first()
+
+        if job.entrada.get("dry_run"):
             self.stdout.write("MODO DRY-RUN: Artigo nao sera publicado")
             self.stdout.write(f"Titulo: {title}")
             self.stdout.write(f"Categoria: {cat.nome if cat else 'N/A'}")
             self.stdout.write(f"Palavras: {word_count}")
-            return
+            raise pipeline.SkipJob("dry-run")
+
+        # Título reescrito e corpo gerado contra o índice MinHash: a barreira só viu o tópico e o RSS
+        if not job.entrada.get("force"):
+            reason = minhash.near_duplicate(title=title, body=content)
+            if reason:
+                self.stdout.write(f"AVISO: Noticia quase igual ja existe ({reason}). Use --force para publicar mesmo assim.")
+                raise pipeline.SkipJob(f"duplicata ({reason})")
 
         # Criar notícia
         noticia = Noticia.objects.create(
@@ -179,33 +294,23 @@ class Command(BaseCommand):
             slug=f"{slugify(title)[:120]}-{timezone.now().strftime('%Y%m%d%H%M%S')}",
             status=Noticia.Status.PUBLICADO,
             publicado_em=timezone.now(),
-            fonte_url=f"manual-{topic.lower().replace(' ', '-')}-{timezone.now().strftime('%Y%m%d%H%M%S')}"
+            fonte_url=f"manual-{topic.lower().replace(' ', '-')}-{timezone.now().strftime('%Y%m%d%H%M%S')}",
+            **(data.get("image") or {}),
         )
-
-        # Adicionar imagem
-        self._add_image(noticia, topic, news_article)
-
-        # Ping sitemap
-        self._ping_sitemap()
+        job.noticia = noticia
 
         self.stdout.write("Artigo publicado com sucesso!")
         self.stdout.write(f"Titulo: {title}")
-        self.stdout.write(f"Categoria: {cat.nome}")
+        self.stdout.write(f"Categoria: {cat.nome if cat else 'N/A'}")
         self.stdout.write(f"URL: {noticia.get_absolute_url()}")
         self.stdout.write(f"Palavras: {word_count}")
         self.stdout.write(f"Caracteres: {len(strip_tags(content))}")
+        return {"noticia": noticia.pk}
 
-    def _check_duplicate(self, topic, Noticia):
-        """Verifica se já existe artigo similar"""
-        topic_words = topic.lower().split()
-        
-        for word in topic_words:
-            if len(word) > 3:
-                similar = Noticia.objects.filter(titulo__icontains=word).first()
-                if similar:
-                    return True
-        return False
+    def stage_ping(self, jobs):
+        self._ping_sitemap()
 
+    @ingest_stage("rss")
     def _search_specific_news(self, topic):
         """Busca notícias específicas sobre o tópico via RSS"""
         try:
@@ -242,6 +347,7 @@ class Command(BaseCommand):
             self.stdout.write(f"AVISO: Erro ao buscar noticias RSS: {e}")
             return None
 
+    @ingest_stage("extract")
     def _extract_from_original_sites(self, news_article):
         """Extrai conteúdo usando NewsContentExtractor com navegador headless"""
         try:
@@ -309,117 +415,20 @@ class Command(BaseCommand):
     def _extract_original_url_from_google_news(self, google_news_url):
         """Extrai URL do veículo original a partir de um link do Google News.
 
-        Estratégia em camadas:
-        1) Se houver parâmetro "url" na query, retorna esse valor.
-        2) Faz GET com allow_redirects=True e usa response.url (normalmente resolve para o site original).
-        3) Fallback para heurísticas em HTML/JS se o 1 e 2 falharem.
+        Usa o resolver compartilhado (cache ResolvedLink, decodificação offline
+        do ID e, por último, rede) - ver rb_ingestor/gn_resolver.py.
         """
         try:
-            import requests
-            from bs4 import BeautifulSoup
-            import re
-            from urllib.parse import urlparse, parse_qs, urljoin
-            
-            session = requests.Session()
-            session.headers.update({
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-            })
+            from rb_ingestor.gn_resolver import resolve
+
+            original_url = resolve(google_news_url)
+            if original_url:
+                self.stdout.write(f"✅ URL original válido encontrado: {original_url}")
+                return original_url
 
-            # 1) Tentar extrair via querystring "url"
-            try:
-                parsed = urlparse(google_news_url)
-                qs = parse_qs(parsed.query)
-                if 'url' in qs and qs['url']:
-                    candidate = qs['url'][0]
-                    if candidate and not self._is_google_news_url(candidate):
-                        return candidate
-            except Exception:
-                pass
-
-            # 2) Seguir redirecionamentos
-            self.stdout.write(f"🔍 Acessando Google News: {google_news_url}")
-            response = session.get(google_news_url, timeout=20, allow_redirects=True)
-            response.raise_for_status()
-            final_url = response.url
-            if final_url and not self._is_google_news_url(final_url) and self._looks_like_news_url(final_url):
-                self.stdout.write(f"🔗 Resolvido por redirect: {final_url}")
-                return final_url
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # MÉTODO 1: Procurar por links diretos que não sejam do Google News
-            all_links = soup.find_all('a', href=True)
-            original_links = []
-            
-            for link in all_links:
-                href = link.get('href')
-                if href:
-                    # Converter URLs relativos em absolutos
-                    if href.startswith('/'):
-                        href = urljoin(google_news_url, href)
-                    
-                    # Verificar se não é do Google News e parece ser uma notícia
-                    if not self._is_google_news_url(href) and self._looks_like_news_url(href):
-                        original_links.append(href)
-                        self.stdout.write(f"🔗 Link encontrado: {href}")
-            
-            # MÉTODO 2: Procurar por meta tags Open Graph
-            meta_tags = soup.find_all('meta')
-            for meta in meta_tags:
-                if meta.get('property') == 'og:url':
-                    url = meta.get('content')
-                    if url and not self._is_google_news_url(url) and self._looks_like_news_url(url):
-                        original_links.append(url)
-                        self.stdout.write(f"🔗 Meta og:url encontrado: {url}")
-            
-            # MÉTODO 3: Procurar por JavaScript que pode conter URLs
-            scripts = soup.find_all('script')
-            for script in scripts:
-                if script.string:
-                    # Procurar por padrões de URL em JavaScript
-                    url_patterns = [
-                        r'https?://[^\s"\'<>]+\.(com|br|org|net)/[^\s"\'<>]*',
-                        r'url["\']?\s*:\s*["\']([^"\']+)["\']',
-                        r'href["\']?\s*:\s*["\']([^"\']+)["\']'
-                    ]
-                    
-                    for pattern in url_patterns:
-                        matches = re.findall(pattern, script.string)
-                        for match in matches:
-                            if isinstance(match, tuple):
-                                url = match[0] if match[0] else match[1]
-                            else:
-                                url = match
-                            
-                            if url and not self._is_google_news_url(url) and self._looks_like_news_url(url):
-                                original_links.append(url)
-                                self.stdout.write(f"🔗 URL encontrado em JS: {url}")
-            
-            # MÉTODO 4: Procurar por atributos data-* que podem conter URLs
-            try:
-                elements_with_data = soup.find_all(attrs=lambda attrs: attrs and hasattr(attrs, 'keys') and any(k.startswith('data-') for k in attrs.keys()))
-                for element in elements_with_data:
-                    if hasattr(element, 'attrs') and element.attrs:
-                        for attr_name, attr_value in element.attrs.items():
-                            if attr_name.startswith('data-') and isinstance(attr_value, str):
-                                if 'http' in attr_value and not self._is_google_news_url(attr_value):
-                                    if self._looks_like_news_url(attr_value):
-                                        original_links.append(attr_value)
-                                        self.stdout.write(f"🔗 URL encontrado em data-*: {attr_value}")
-            except Exception as e:
-                self.stdout.write(f"⚠ Erro ao processar atributos data-*: {e}")
-            
-            # Remover duplicatas e retornar o primeiro URL válido
-            unique_links = list(dict.fromkeys(original_links))
-            
-            for url in unique_links:
-                if self._is_valid_news_url(url):
-                    self.stdout.write(f"✅ URL original válido encontrado: {url}")
-                    return url
-            
             self.stdout.write("❌ Nenhum URL original válido encontrado")
             return None
-            
+
         except Exception as e:
             self.stdout.write(f"⚠ Erro ao extrair URL original: {e}")
             return None
@@ -464,14 +473,11 @@ class Command(BaseCommand):
     def _find_specific_news_url(self, site_url, search_term):
         """Encontra URL específico da notícia no site"""
         try:
-            import requests
             from bs4 import BeautifulSoup
+            from rb_ingestor import http_client
             import re
             
-            session = requests.Session()
-            session.headers.update({
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-            })
+            session = http_client.get_session()
             
             # Tentar diferentes URLs de busca no site
             search_urls = [
@@ -529,13 +535,10 @@ class Command(BaseCommand):
     def _extract_content_from_url(self, url):
         """Extrai conteúdo de uma URL específica"""
         try:
-            import requests
             from bs4 import BeautifulSoup
+            from rb_ingestor import http_client
             
-            session = requests.Session()
-            session.headers.update({
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-            })
+            session = http_client.get_session()
             
             response = session.get(url, timeout=15)
             response.raise_for_status()
@@ -566,13 +569,10 @@ class Command(BaseCommand):
     def _search_news_on_site(self, site_url, search_term):
         """Busca notícias relacionadas em um site específico"""
         try:
-            import requests
             from bs4 import BeautifulSoup
+            from rb_ingestor import http_client
             
-            session = requests.Session()
-            session.headers.update({
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-            })
+            session = http_client.get_session()
             
             # Tentar diferentes URLs de busca no site
             search_urls = [
@@ -759,6 +759,7 @@ class Command(BaseCommand):
         # Considerar relevante se score >= 2
         return relevance_score >= 2
 
+    @ingest_stage("categorize")
     def _categorize_generated_content(self, content, topic):
         """Categoriza o artigo baseado no conteúdo gerado"""
         try:
@@ -771,9 +772,8 @@ class Command(BaseCommand):
             # Combinar título e conteúdo para análise
             text_to_analyze = f"{topic} {content}"
             
-            # Categorizar usando o conteúdo (retorna apenas o nome)
-            category_name = categorizer.categorize_content("", text_to_analyze, topic)
-            confidence = categorizer.get_category_confidence("", text_to_analyze, topic)
+            # Categoria e confiança numa passada só
+            category_name, confidence = categorizer.categorize("", text_to_analyze, topic)
             self.stdout.write(f"🎯 Categoria detectada pelo conteúdo: {category_name} (confiança: {confidence:.2f})")
             
             # Buscar ou criar a categoria
@@ -795,6 +795,7 @@ class Command(BaseCommand):
             except Categoria.DoesNotExist:
                 return Categoria.objects.first()
     
+    @ingest_stage("title")
     def _generate_title_from_news(self, topic, news_article):
         """Gera título usando sistema de estilos aleatórios mantendo a palavra-chave."""
         if not news_article:
@@ -845,6 +846,7 @@ class Command(BaseCommand):
         
         return True
 
+    @ingest_stage("generate")
     def _generate_content_from_news(self, topic, news_article, category, min_words):
         """Gera conteúdo baseado na notícia específica - SEM FALLBACK"""
         try:
@@ -886,6 +888,40 @@ class Command(BaseCommand):
             self.stdout.write(f"❌ Publicação cancelada: {e}")
             raise
 
+    @ingest_stage("generate", empty_is_failure=False)
+    def _generate_structured(self, topic, news_article, min_words):
+        """Título, conteúdo, categoria e figuras numa chamada (ai_structured); None para cair no fluxo antigo"""
+        from rb_ingestor import ai_structured
+        if not ai_structured.ENABLED:
+            return None
+        from rb_ingestor.writing_styles import writing_style_manager
+        random_style = writing_style_manager.get_random_style()
+        self.stdout.write(f"🎨 Estilo selecionado: {writing_style_manager.get_style_info(random_style)['name']}")
+
+        ai_content = ai_structured.generate_structured_article(topic, news_article, min_words, random_style)
+        if not ai_content:
+            self.stdout.write("⚠ Geração estruturada falhou, usando chamadas separadas")
+            return None
+        quality_score = ai_content["quality_score"]
+        if quality_score < 40:
+            self.stdout.write(f"⚠ Geração estruturada com qualidade insuficiente ({quality_score}%), usando chamadas separadas")
+            return None
+        self.stdout.write(f"✅ IA gerou {ai_content['word_count']} palavras (qualidade: {quality_score}%) numa chamada")
+
+        title = strip_tags(ai_content["title"])[:200]
+        original_title = (news_article or {}).get("title", "")
+        if not self._is_title_different_enough(title, original_title):
+            # Só neste caso vale a chamada extra de reescrita
+            self.stdout.write("⚠ Título muito parecido com o original, reescrevendo")
+            title = self._generate_title_from_news(topic, news_article)
+        dek = strip_tags(ai_content["dek"] or (news_article or {}).get("description", ""))[:220]
+        return {
+            "titulo": title,
+            "conteudo": f'<p class="dek">{dek}</p>\n{ai_content["html"]}',
+            "categoria_slug": ai_content["category"],
+            "figuras": ai_content["figures"],
+        }
+
     def _generate_content_from_news_fallback(self, topic, news_article, category, min_words):
         """Gera conteúdo fallback baseado na notícia específica"""
         if not news_article:
@@ -1117,7 +1153,10 @@ class Command(BaseCommand):
         return content + additional_content
 
     def _detect_category_from_news(self, topic_lower, news_article, Categoria):
-        """Detecta categoria baseada no site de origem, notícia encontrada ou sistema inteligente"""
+        """Detecta categoria baseada no site de origem, notícia encontrada ou sistema inteligente.
+
+        Devolve (categoria, confiança); só o sistema inteligente informa confiança.
+        """
         # 1. PRIORIDADE MÁXIMA: Extrair categoria do site de origem
         if news_article and news_article.get("original_url"):
             # Verificar se não é uma URL do Google News
@@ -1136,8 +1175,11 @@ class Command(BaseCommand):
                         'description': news_article.get('description', '')
                     }
                     
-                    # Tentar extrair categoria do site original
-                    site_category = site_categorizer.categorize_article(original_news)
+                    # Tentar extrair categoria do site original (página já baixada na extração)
+                    from rb_ingestor import article_document
+                    site_category = site_categorizer.categorize_article(
+                        original_news, doc=article_document.get(original_url)
+                    )
                     
                     if site_category:
                         self.stdout.write(f"Categoria do site: {site_category}")
@@ -1146,7 +1188,7 @@ class Command(BaseCommand):
                         cat = Categoria.objects.filter(nome=site_category.title()).first()
                         if cat:
                             self.stdout.write(f"Usando categoria existente: {site_category}")
-                            return cat
+                            return cat, 0.0
                         
                         # Criar nova categoria se não existir
                         cat, created = Categoria.objects.get_or_create(
@@ -1157,7 +1199,7 @@ class Command(BaseCommand):
                             self.stdout.write(f"Nova categoria criada: {site_category}")
                         else:
                             self.stdout.write(f"Categoria encontrada: {site_category}")
-                        return cat
+                        return cat, 0.0
                     
                 except Exception as e:
                     self.stdout.write(f"AVISO: Erro no categorizador de site: {e}")
@@ -1174,7 +1216,7 @@ class Command(BaseCommand):
                 cat = Categoria.objects.filter(nome=clean_category).first()
                 if cat:
                     self.stdout.write(f"Usando categoria existente: {clean_category}")
-                    return cat
+                    return cat, 0.0
                 
                 # Criar nova categoria se não existir
                 cat, created = Categoria.objects.get_or_create(
@@ -1185,7 +1227,7 @@ class Command(BaseCommand):
                     self.stdout.write(f"Nova categoria criada: {clean_category}")
                 else:
                     self.stdout.write(f"Categoria encontrada: {clean_category}")
-                return cat
+                return cat, 0.0
         
         # 3. FALLBACK FINAL: Sistema inteligente de análise de conteúdo
         self.stdout.write("Usando sistema inteligente de categorizacao...")
@@ -1197,30 +1239,26 @@ class Command(BaseCommand):
             categorizer = SmartCategorizer()
             
             # Categorizar baseado no conteúdo completo
-            category_name = categorizer.categorize_content(title, description, topic_lower)
-            confidence = categorizer.get_category_confidence(title, description, topic_lower)
+            category_name, confidence = categorizer.categorize(title, description, topic_lower)
             
             self.stdout.write(f"Categoria detectada: {category_name} (confianca: {confidence:.2f})")
             
-            # Salvar confiança da categoria original para uso posterior
-            self._original_category_confidence = confidence
-            
             # Buscar ou criar categoria
             cat = Categoria.objects.filter(nome=category_name.title()).first()
             if cat:
-                return cat
+                return cat, confidence
             
             # Criar nova categoria se não existir
             cat, created = Categoria.objects.get_or_create(
                 slug=slugify(category_name)[:140],
                 defaults={"nome": category_name.title()}
             )
-            return cat
+            return cat, confidence
             
         except Exception as e:
             self.stdout.write(f"AVISO: Erro no categorizador inteligente: {e}")
             # Fallback final para sistema simples
-            return self._get_category_fallback(topic_lower, Categoria)
+            return self._get_category_fallback(topic_lower, Categoria), 0.0
 
     def _get_category_fallback(self, topic_lower, Categoria):
         """Fallback simples para categorização"""
@@ -1247,8 +1285,12 @@ class Command(BaseCommand):
             return cat
         return Categoria.objects.create(nome="Brasil", slug="brasil")
 
-    def _add_image(self, noticia, topic, news_article=None):
-        """Adiciona imagem à notícia seguindo lógica inteligente"""
+    @ingest_stage("image", empty_is_failure=False)
+    def _find_image(self, title, content, category, topic, news_article=None, figures=None):
+        """Escolhe a imagem seguindo lógica inteligente (campos de imagem da Noticia ou None)
+
+        ``figures``: figuras públicas devolvidas pela geração estruturada (dispensa a chamada de IA do detector).
+        """
         try:
             # LÓGICA INTELIGENTE MELHORADA:
             # 1. Figuras públicas: Detecção inteligente → Rede social do artigo original → Instagram oficial → Bancos gratuitos
@@ -1258,12 +1300,12 @@ class Command(BaseCommand):
             from rb_ingestor.smart_public_figure_detector import SmartPublicFigureDetector
             smart_detector = SmartPublicFigureDetector()
             
-            full_text = f"{noticia.titulo} {noticia.conteudo}"
+            full_text = f"{title} {content}"
             if news_article:
                 full_text += f" {news_article.get('title', '')} {news_article.get('description', '')}"
             
             # Detectar figura pública usando sistema inteligente
-            public_figure = smart_detector.detect_public_figure(full_text)
+            public_figure = smart_detector.detect_public_figure(full_text, figures=figures)
             
             if public_figure:
                 # É figura pública - seguir lógica específica
@@ -1280,19 +1322,20 @@ class Command(BaseCommand):
             news_url = news_article.get('url', '') if news_article else ''
             
             if news_url:
+                from rb_ingestor import article_document
                 smart_image = smart_image_search.find_smart_image_for_article(
                     news_url, 
-                    noticia.titulo
+                    title,
+                    doc=article_document.get(news_url)
                 )
                 
                 if smart_image:
-                    noticia.imagem = smart_image['url']
-                    noticia.imagem_alt = smart_image['alt']
-                    noticia.imagem_credito = smart_image['credit']
-                    noticia.save()
-                    
                     self.stdout.write(f"✅ Imagem inteligente encontrada: {smart_image['source'].upper()} (similaridade: {smart_image['similarity_score']:.2f})")
-                    return
+                    return {
+                        'imagem': smart_image['url'],
+                        'imagem_alt': smart_image['alt'],
+                        'imagem_credito': smart_image['credit'],
+                    }
             
             # FALLBACK: Bancos de imagens gratuitos tradicionais
             self.stdout.write("🔄 Google Lens falhou, usando busca tradicional...")
@@ -1300,27 +1343,28 @@ class Command(BaseCommand):
             search_engine = ImageSearchEngine()
             
             image_url = search_engine.search_image(
-                noticia.titulo,
-                noticia.conteudo,
-                noticia.categoria.nome if noticia.categoria else "geral"
+                title,
+                content,
+                category.nome if category else "geral"
             )
 
             if image_url:
-                noticia.imagem = image_url
-                noticia.imagem_alt = f"Imagem relacionada a {topic}"
-                noticia.imagem_credito = "Imagem gratuita"
-                noticia.imagem_licenca = "CC"
-                noticia.imagem_fonte_url = image_url
-                noticia.save()
-
                 self.stdout.write("✅ Imagem tradicional encontrada")
-                return
+                return {
+                    'imagem': image_url,
+                    'imagem_alt': f"Imagem relacionada a {topic}",
+                    'imagem_credito': "Imagem gratuita",
+                    'imagem_licenca': "CC",
+                    'imagem_fonte_url': image_url,
+                }
             
             self.stdout.write("⚠ Nenhuma imagem encontrada")
 
         except Exception as e:
             self.stdout.write(f"AVISO: Erro ao adicionar imagem: {e}")
+        return None
 
+    @ingest_stage("ping", empty_is_failure=False)
     def _ping_sitemap(self):
         """Faz ping do sitemap"""
         try:
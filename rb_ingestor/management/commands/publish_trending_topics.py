@@ -7,6 +7,7 @@ from django.utils import timezone
 from django.utils.html import strip_tags
 from slugify import slugify
 from datetime import datetime, timedelta
+from rb_ingestor import llm_client
 from rb_ingestor.trending_analyzer_real import RealTrendingAnalyzer
 from django.apps import apps
 import logging
@@ -65,14 +66,24 @@ class Command(BaseCommand):
         """Publica notícias baseadas nos tópicos"""
         created_count = 0
 
-        for i, topic_data in enumerate(topics):
+        # Gerar todos os artigos em paralelo (limite de LLM_CONCURRENCY chamadas à IA);
+        # a gravação continua em sequência
+        generated = llm_client.map_concurrent(
+            lambda topic_data: self._generate_content_from_topic(topic_data["topic"], topic_data["category"]),
+            topics,
+            log=self.stdout.write,
+        )
+
+        for i, (topic_data, result) in enumerate(zip(topics, generated)):
             try:
                 topic = topic_data["topic"]
                 source = topic_data["source"]
                 category = topic_data["category"]
 
-                # Gerar título e conteúdo
-                title, content = self._generate_content_from_topic(topic, category)
+                # Título e conteúdo gerados acima
+                if result is None:
+                    continue
+                title, content = result
                 
                 # Obter categoria
                 cat = self._get_category_for_topic(category, Categoria)
@@ -0,0 +1,158 @@
+# rb_ingestor/management/commands/recategorize.py
+"""
+Recategoriza o acervo com o SmartCategorizer compilado (ver
+``CompiledCategoryScorer`` em rb_ingestor/smart_categorizer.py).
+
+    python manage.py recategorize                       # só relatório do que mudaria
+    python manage.py recategorize --apply --min-confidence 0.4
+    python manage.py recategorize --apply --processes 4 --only-uncategorized
+    python manage.py recategorize --bench 500           # laços originais x autômato
+
+Lê o acervo em lotes (``values_list`` + ``iterator``), pontua cada lote
+(em ``--processes`` processos, se pedido) e grava só as notícias que mudam
+de categoria, com ``bulk_update`` por lote.
+"""
+import multiprocessing
+import time
+from collections import Counter
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from slugify import slugify
+
+from rb_ingestor.smart_categorizer import SmartCategorizer, categorize_many
+
+# Notícias por tarefa enviada aos processos
+CHUNK = 100
+
+
+class Command(BaseCommand):
+    help = "Recategoriza as notícias do acervo em lote (e compara com o categorizador original)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--apply", action="store_true", help="Grava as novas categorias (padrão: só relatório)")
+        parser.add_argument("--min-confidence", type=float, default=0.0,
+                            help="Só troca a categoria com confiança a partir deste valor (0.0 a 1.0)")
+        parser.add_argument("--only-uncategorized", action="store_true", help="Só notícias sem categoria")
+        parser.add_argument("--batch-size", type=int, default=1000, help="Notícias lidas e gravadas por lote")
+        parser.add_argument("--processes", type=int, default=1, help="Processos para pontuar os lotes")
+        parser.add_argument("--limit", type=int, default=0, help="Máximo de notícias (0 = todas)")
+        parser.add_argument("--bench", type=int, default=0, metavar="N",
+                            help="Compara os laços originais com o autômato em N notícias e sai")
+
+    def handle(self, *args, **options):
+        if options["bench"]:
+            self._bench(options["bench"])
+            return
+        if options["processes"] < 1 or options["batch_size"] < 1:
+            raise CommandError("--processes e --batch-size precisam ser >= 1")
+        self._recategorize(options)
+
+    def _queryset(self, options):
+        Noticia = apps.get_model("rb_noticias", "Noticia")
+        queryset = Noticia.objects.order_by("pk")
+        if options["only_uncategorized"]:
+            queryset = queryset.filter(categoria__isnull=True)
+        if options["limit"]:
+            queryset = queryset[:options["limit"]]
+        return queryset.values_list("pk", "titulo", "conteudo", "categoria_id")
+
+    def _batches(self, queryset, size):
+        batch = []
+        for row in queryset.iterator(chunk_size=size):
+            batch.append(row)
+            if len(batch) >= size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _recategorize(self, options):
+        Noticia = apps.get_model("rb_noticias", "Noticia")
+        Categoria = apps.get_model("rb_noticias", "Categoria")
+        by_slug = dict(Categoria.objects.values_list("slug", "pk"))
+        names = dict(Categoria.objects.values_list("pk", "nome"))
+
+        pool = None
+        if options["processes"] > 1:
+            # fork: os filhos já nascem com o Django configurado e não tocam no banco
+            pool = multiprocessing.get_context("fork").Pool(options["processes"])
+
+        total = changed = skipped_low = 0
+        moves = Counter()
+        start = time.perf_counter()
+        try:
+            for batch in self._batches(self._queryset(options), options["batch_size"]):
+                texts = [(titulo, conteudo) for _pk, titulo, conteudo, _cat in batch]
+                if pool:
+                    chunks = [texts[i:i + CHUNK] for i in range(0, len(texts), CHUNK)]
+                    results = [result for chunk in pool.imap(categorize_many, chunks) for result in chunk]
+                else:
+                    results = categorize_many(texts)
+
+                updates = []
+                for (pk, _titulo, _conteudo, current), (name, confidence) in zip(batch, results):
+                    slug = slugify(name)[:140]
+                    target = by_slug.get(slug)
+                    if target is None and options["apply"]:
+                        # Mesma criação dos comandos de publicação
+                        category, _created = Categoria.objects.get_or_create(slug=slug, defaults={"nome": name.title()})
+                        target = by_slug[slug] = category.pk
+                        names[category.pk] = category.nome
+                    if target is not None and target == current:
+                        continue
+                    if confidence < options["min_confidence"]:
+                        skipped_low += 1
+                        continue
+                    changed += 1
+                    moves[(names.get(current, "sem categoria"), names.get(target, name.title()))] += 1
+                    if target is not None:
+                        updates.append(Noticia(pk=pk, categoria_id=target))
+
+                if options["apply"] and updates:
+                    # bulk_update não dispara post_save (assinatura MinHash não precisa mudar)
+                    with transaction.atomic():
+                        Noticia.objects.bulk_update(updates, ["categoria"], batch_size=500)
+                total += len(batch)
+                elapsed = time.perf_counter() - start
+                self.stdout.write(f"   {total} notícias, {total / elapsed:.0f}/s, {changed} mudanças")
+        finally:
+            if pool:
+                pool.close()
+                pool.join()
+
+        elapsed = time.perf_counter() - start
+        verb = "recategorizadas" if options["apply"] else "mudariam de categoria (use --apply para gravar)"
+        self.stdout.write(self.style.SUCCESS(
+            f"🏷 {total} notícias em {elapsed:.1f}s ({total / max(elapsed, 1e-9):.0f}/s); {changed} {verb}"
+        ))
+        if skipped_low:
+            self.stdout.write(f"   {skipped_low} mantidas por confiança abaixo de {options['min_confidence']:.2f}")
+        for (before, after), count in moves.most_common(10):
+            self.stdout.write(f"   {count:>6}  {before} → {after}")
+
+    def _bench(self, count):
+        Noticia = apps.get_model("rb_noticias", "Noticia")
+        rows = list(Noticia.objects.order_by("-pk").values_list("titulo", "conteudo")[:count])
+        if not rows:
+            raise CommandError("Nenhuma notícia no banco")
+        categorizer = SmartCategorizer()
+        categorizer.categorize("", "")  # compila o autômato fora da medição
+
+        start = time.perf_counter()
+        reference = [categorizer.reference_categorize(titulo, conteudo) for titulo, conteudo in rows]
+        reference_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        compiled = [categorizer.categorize(titulo, conteudo) for titulo, conteudo in rows]
+        compiled_seconds = time.perf_counter() - start
+
+        same = sum(1 for (a, ca), (b, cb) in zip(reference, compiled) if a == b and abs(ca - cb) < 1e-9)
+        chars = sum(len(titulo) + len(conteudo) for titulo, conteudo in rows) / len(rows)
+        self.stdout.write(f"🏷 {len(rows)} notícias ({chars:.0f} caracteres em média)")
+        self.stdout.write(f"   laços originais: {reference_seconds * 1000 / len(rows):.2f}ms por notícia "
+                          f"({len(rows) / reference_seconds:.0f}/s)")
+        self.stdout.write(f"   autômato:        {compiled_seconds * 1000 / len(rows):.2f}ms por notícia "
+                          f"({len(rows) / compiled_seconds:.0f}/s), {reference_seconds / compiled_seconds:.1f}x")
+        self.stdout.write(f"   mesma categoria e confiança: {same} de {len(rows)}")
@@ -15,9 +15,13 @@ from datetime import datetime, timedelta
 import random
 import logging
 
+from rb_ingestor import pipeline
+
 # Configurar logging
 logger = logging.getLogger(__name__)
 
+ORIGEM = __name__.rsplit(".", 1)[-1]
+
 class Command(BaseCommand):
     help = "Sistema inteligente de automação otimizado para audiência"
 
@@ -25,11 +29,9 @@ class Command(BaseCommand):
         parser.add_argument("--mode", choices=['auto', 'manual', 'test'], default='auto', 
                           help="Modo de execução")
         parser.add_argument("--force", action="store_true", help="Força execução")
+        parser.add_argument("--enqueue-only", action="store_true", help="Só cria os jobs; processe com ingest_pipeline --run")
 
     def handle(self, *args, **options):
-        Noticia = apps.get_model("rb_noticias", "Noticia")
-        Categoria = apps.get_model("rb_noticias", "Categoria")
-        
         self.stdout.write("=== SISTEMA INTELIGENTE DE AUTOMACAO ===")
         
         # Análise de audiência
@@ -45,8 +47,13 @@ class Command(BaseCommand):
             self.stdout.write("PULANDO execucao - timing nao otimizado")
             return
         
-        # Executar automação
-        created_count = self._execute_automation(strategy, Noticia, Categoria)
+        # Executar automação (um job por notícia, processados pelo pipeline)
+        jobs = self._enqueue_strategy(strategy)
+        if options.get("enqueue_only"):
+            self.stdout.write(f"📥 {len(jobs)} jobs na fila (processe com: python manage.py ingest_pipeline --run)")
+            return
+        result = pipeline.Pipeline({ORIGEM: self}, log=self.stdout.write).run(jobs)
+        created_count = result["concluido"]
         
         # Análise pós-execução
         self._post_execution_analysis(created_count, audience_data)
@@ -146,58 +153,106 @@ class Command(BaseCommand):
         
         return recent_count < 2  # Executar se menos de 2 notícias em 6h
 
-    def _execute_automation(self, strategy, Noticia, Categoria):
-        """Executa a automação com a estratégia determinada"""
-        created_count = 0
-        
-        # Gerar notícias baseadas na estratégia
+    def _enqueue_strategy(self, strategy):
+        """Sorteia os tópicos da estratégia e cria um job para cada notícia"""
+        now = timezone.localtime()
+        # Mesmo tópico na mesma janela de 6 h (crons sobrepostos) = mesmo job
+        window = f"{now.date().isoformat()}:{now.hour // 6}"
+        jobs = []
         for i in range(strategy["limit"]):
             topic = random.choice(strategy["topics"])
-            
-            # Gerar conteúdo com IA otimizada
-            try:
-                from rb_ingestor.ai import generate_article
-                ai_content = generate_article(topic)
-                title = ai_content.get("title", topic.title())
-                content = ai_content.get("html", f"## {topic.title()}\n\nConteúdo sobre {topic.lower()}.")
-            except Exception as e:
-                self.stdout.write(f"⚠ Erro na IA, usando fallback: {e}")
-                title = f"{topic.title()} - Análise Completa"
-                content = self._generate_optimized_content(topic, strategy["name"])
-            
-            # Categorizar baseado no tópico
-            cat = self._get_category_for_topic(topic, Categoria)
-            
-            slug = slugify(title)[:180]
-            
-            # Verificar se já existe (mais rigoroso)
-            if self._check_duplicate_news(title, topic, Noticia):
-                self.stdout.write(f"⚠ Pulando duplicata: {title}")
-                continue
-            
-            # Criar notícia
-            try:
-                noticia = Noticia.objects.create(
-                    titulo=title,
-                    slug=slug,
-                    conteudo=content,
-                    publicado_em=timezone.now(),
-                    categoria=cat,
-                    fonte_url=f"smart-automation-{timezone.now().strftime('%Y%m%d-%H%M')}-{i}",
-                    fonte_nome="RadarBR Smart Automation",
-                    status=1  # PUBLICADO
-                )
-                
-                # Buscar e salvar imagem (sem Cloudinary)
-                self._add_image_to_news(noticia, topic)
-                
-                created_count += 1
-                self.stdout.write(f"OK Criado: {title}")
-                
-            except Exception as e:
-                self.stdout.write(self.style.ERROR(f"ERRO: {e}"))
-        
-        return created_count
+            jobs.append(pipeline.enqueue(
+                ORIGEM, {"topic": topic, "strategy": strategy["name"], "index": i}, titulo=topic,
+                chave=pipeline.idempotency_key(content=f"{ORIGEM}|{topic}|{window}"),
+            ))
+        return jobs
+
+    # Etapas do pipeline (ver rb_ingestor/pipeline.py): cada uma recebe o job e os
+    # artefatos das etapas anteriores e devolve o que precisa ser gravado
+
+    def stage_gate(self, job, data):
+        # Tópico já coberto nas últimas horas: parar antes de gerar o artigo com a IA
+        from rb_ingestor import dedup
+        reason = dedup.gate(topic=job.entrada["topic"])
+        if reason:
+            self.stdout.write(f"⚠ Pulando duplicata ({reason}): {job.entrada['topic']}")
+            raise pipeline.SkipJob(f"duplicata ({reason})")
+        return {}
+
+    def stage_generate(self, job, data):
+        topic = job.entrada["topic"]
+
+        # Gerar conteúdo com IA otimizada
+        try:
+            from rb_ingestor.ai import generate_article
+            ai_content = generate_article(topic)
+            title = ai_content.get("title", topic.title())
+            content = ai_content.get("html", f"## {topic.title()}\n\nConteúdo sobre {topic.lower()}.")
+        except Exception as e:
+            self.stdout.write(f"⚠ Erro na IA, usando fallback: {e}")
+            title = f"{topic.title()} - Análise Completa"
+            content = self._generate_optimized_content(topic, job.entrada["strategy"])
+        return {"titulo": title, "conteudo": content}
+
+    def stage_categorize(self, job, data):
+        Categoria = apps.get_model("rb_noticias", "Categoria")
+        topic = job.entrada["topic"]
+        title = data["generate"]["titulo"]
+
+        # Categorizar baseado no tópico
+        cat = self._get_category_for_topic(topic, Categoria)
+
+        # Verificar se já existe (mais rigoroso)
+        reason = self._check_duplicate_news(title, topic, data["generate"]["conteudo"])
+        if reason:
+            self.stdout.write(f"⚠ Pulando duplicata ({reason}): {title}")
+            raise pipeline.SkipJob(f"duplicata ({reason})")
+        return {"categoria": cat.pk}
+
+    def stage_image(self, job, data):
+        Categoria = apps.get_model("rb_noticias", "Categoria")
+        cat = Categoria.objects.filter(pk=data["categorize"]["categoria"]).first()
+        # Buscar imagem (sem Cloudinary)
+        return self._find_image_for_news(
+            data["generate"]["titulo"], data["generate"]["conteudo"], cat, job.entrada["topic"]
+        ) or {}
+
+    def stage_save(self, job, data):
+        Noticia = apps.get_model("rb_noticias", "Noticia")
+        title = data["generate"]["titulo"]
+
+        # De novo: jobs em paralelo podem ter passado juntos pela verificação da categorização
+        # (a gravação roda um job por vez)
+        reason = self._check_duplicate_news(title, job.entrada["topic"], data["generate"]["conteudo"])
+        if reason:
+            self.stdout.write(f"⚠ Pulando duplicata ({reason}): {title}")
+            raise pipeline.SkipJob(f"duplicata ({reason})")
+
+        # Criar notícia
+        noticia = Noticia.objects.create(
+            titulo=title,
+            slug=slugify(title)[:180],
+            conteudo=data["generate"]["conteudo"],
+            publicado_em=timezone.now(),
+            categoria_id=data["categorize"]["categoria"],
+            fonte_url=f"smart-automation-{timezone.now().strftime('%Y%m%d-%H%M')}-{job.pk}",
+            fonte_nome="RadarBR Smart Automation",
+            status=1,  # PUBLICADO
+            **(data.get("image") or {}),
+        )
+        job.noticia = noticia
+        self.stdout.write(f"OK Criado: {title}")
+        return {"noticia": noticia.pk}
+
+    def stage_ping(self, jobs):
+        try:
+            from core.utils import absolute_sitemap_url
+            from rb_ingestor.ping import ping_search_engines
+            sm_url = absolute_sitemap_url()
+            res = ping_search_engines(sm_url)
+            self.stdout.write(f"Ping sitemap: Google={'OK' if res['google'] else 'NOK'}; Bing={'OK' if res['bing'] else 'NOK'}")
+        except Exception:
+            self.stdout.write("⚠ Erro ao fazer ping do sitemap")
 
     def _generate_optimized_content(self, topic, strategy_name):
         """Gera conteúdo otimizado baseado no tópico e estratégia"""
@@ -432,30 +487,29 @@ Conteúdo sobre {topic.lower()} gerado pelo sistema inteligente de automação.
 {topic.title()} é um tema relevante que merece atenção contínua.
 """)
 
-    def _add_image_to_news(self, noticia, topic):
-        """Busca e adiciona imagem à notícia usando ImageSearchEngine"""
+    def _find_image_for_news(self, title, content, categoria, topic):
+        """Busca imagem usando ImageSearchEngine (campos de imagem da Noticia ou None)"""
         try:
             from rb_ingestor.image_search import ImageSearchEngine
             
             # Usar o ImageSearchEngine que já está funcionando
             search_engine = ImageSearchEngine()
-            image_url = search_engine.search_image(noticia.titulo, noticia.conteudo, noticia.categoria.nome if noticia.categoria else "geral")
+            image_url = search_engine.search_image(title, content, categoria.nome if categoria else "geral")
             
             if image_url:
-                # Salvar URL da imagem
-                noticia.imagem = image_url
-                noticia.imagem_alt = f"Imagem relacionada a {topic}"
-                noticia.imagem_credito = "Imagem gratuita"
-                noticia.imagem_licenca = "CC"
-                noticia.imagem_fonte_url = image_url
-                noticia.save()
-                
                 self.stdout.write(f"✓ Imagem adicionada: {topic}")
-            else:
-                self.stdout.write(f"⚠ Nenhuma imagem encontrada para: {topic}")
+                return {
+                    "imagem": image_url,
+                    "imagem_alt": f"Imagem relacionada a {topic}",
+                    "imagem_credito": "Imagem gratuita",
+                    "imagem_licenca": "CC",
+                    "imagem_fonte_url": image_url,
+                }
+            self.stdout.write(f"⚠ Nenhuma imagem encontrada para: {topic}")
                 
         except Exception as e:
             self.stdout.write(f"⚠ Erro ao buscar imagem para {topic}: {e}")
+        return None
 
     def _get_category_for_topic(self, topic, Categoria):
         """Categoriza o tópico baseado em palavras-chave"""
@@ -551,55 +605,17 @@ Conteúdo sobre {topic.lower()} gerado pelo sistema inteligente de automação.
         )
         return cat_geral
 
-    def _check_duplicate_news(self, title, topic, Noticia):
-        """Verifica se já existe notícia similar (mais rigoroso)"""
-        from django.utils import timezone
-        from datetime import timedelta
-        
-        # Verificar por título similar (últimas 24h)
-        recent_news = Noticia.objects.filter(
-            publicado_em__gte=timezone.now() - timedelta(hours=24)
-        )
-        
-        # Verificar título similar
-        for news in recent_news:
-            if self._titles_similar(title, news.titulo):
-                return True
-        
-        # Verificar por tópico similar (últimas 6h)
-        recent_news_6h = Noticia.objects.filter(
-            publicado_em__gte=timezone.now() - timedelta(hours=6)
-        )
-        
-        for news in recent_news_6h:
-            if self._topics_similar(topic, news.titulo):
-                return True
-        
-        return False
-
-    def _titles_similar(self, title1, title2):
-        """Verifica se dois títulos são similares"""
-        # Remover palavras comuns e comparar
-        common_words = ["o", "que", "está", "no", "brasil", "análise", "completa", "tendências"]
-        words1 = set(title1.lower().split()) - set(common_words)
-        words2 = set(title2.lower().split()) - set(common_words)
-        
-        # Se mais de 50% das palavras são iguais, são similares
-        if len(words1) == 0 or len(words2) == 0:
-            return False
-        
-        common_count = len(words1.intersection(words2))
-        similarity = common_count / min(len(words1), len(words2))
-        
-        return similarity > 0.5
+    def _check_duplicate_news(self, title, topic, content=None):
+        """Motivo se já existe notícia similar (mais rigoroso) ou None"""
+        from rb_ingestor import dedup, minhash
 
-    def _topics_similar(self, topic, title):
-        """Verifica se o tópico é similar ao título"""
-        topic_words = set(topic.lower().split())
-        title_words = set(title.lower().split())
-        
-        # Se o tópico está contido no título, são similares
-        return topic_words.issubset(title_words)
+        # Título ou corpo quase iguais (últimas 24h, índice MinHash)
+        reason = minhash.near_duplicate(title=title, body=content)
+        if reason:
+            return reason
+
+        # Tópico contido no título de uma notícia das últimas 6h
+        return dedup.recent().check(topic=topic)
 
     def _get_real_topics(self, hour):
         """Busca tópicos reais do Google News e Trends"""
@@ -720,17 +736,6 @@ Conteúdo sobre {topic.lower()} gerado pelo sistema inteligente de automação.
         self.stdout.write(f"Total no sistema: {total_news}")
         self.stdout.write(f"Últimas 24h: {recent_news}")
         
-        # Ping sitemap
-        if created_count > 0:
-            try:
-                from core.utils import absolute_sitemap_url
-                from rb_ingestor.ping import ping_search_engines
-                sm_url = absolute_sitemap_url()
-                res = ping_search_engines(sm_url)
-                self.stdout.write(f"Ping sitemap: Google={'OK' if res['google'] else 'NOK'}; Bing={'OK' if res['bing'] else 'NOK'}")
-            except Exception:
-                self.stdout.write("⚠ Erro ao fazer ping do sitemap")
-        
         # Recomendações para próxima execução
         self.stdout.write(f"\nRECOMENDACOES:")
         if audience_data["best_category"] != "Geral":
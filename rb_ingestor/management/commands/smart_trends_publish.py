@@ -2,7 +2,6 @@
 """
 Comando inteligente para publicação de notícias baseado em análise de audiência
 """
-import traceback
 from django.core.management.base import BaseCommand
 from django.apps import apps
 from django.utils import timezone
@@ -20,6 +19,9 @@ from rb_ingestor.image_cache import image_cache
 from rb_ingestor.trending_analyzer import TrendingAnalyzer
 from rb_ingestor.audience_analyzer import AudienceAnalyzer
 from rb_ingestor.enhanced_trending_sources import EnhancedTrendingSources
+from rb_ingestor import pipeline
+
+ORIGEM = __name__.rsplit(".", 1)[-1]
 
 # Funções auxiliares (mesmas do comando original)
 _NO_STATUS_SENTINEL = object()
@@ -50,6 +52,13 @@ def _status_published(Noticia):
     if isinstance(f, (models.IntegerField, models.SmallIntegerField, models.PositiveIntegerField, models.PositiveSmallIntegerField, models.BigIntegerField)): return 1
     return "published"
 
+def _unique_slug(Noticia, base_title: str) -> str:
+    base = (slugify(base_title) or "post")[:180]
+    slug, i = base, 2
+    while Noticia.objects.filter(slug=slug).exists():
+        slug = f"{base[:176]}-{i}"; i += 1
+    return slug
+
 class Command(BaseCommand):
     help = "Gera artigos inteligentes baseados em análise de audiência e trending topics."
 
@@ -60,13 +69,9 @@ class Command(BaseCommand):
         parser.add_argument("--strategy", choices=["trending", "audience", "mixed"], default="mixed", 
                           help="Estratégia de seleção de tópicos.")
         parser.add_argument("--include-seasonal", action="store_true", help="Inclui tópicos sazonais.")
+        parser.add_argument("--enqueue-only", action="store_true", help="Só cria os jobs; processe com ingest_pipeline --run")
 
     def handle(self, *args, **opts):
-        Noticia = apps.get_model("rb_noticias", "Noticia")
-        Categoria = apps.get_model("rb_noticias", "Categoria")
-
-        cat_fallback, _ = Categoria.objects.get_or_create(slug="geral", defaults={"nome": "Geral"})
-
         # Inicializar analisadores
         trending_analyzer = TrendingAnalyzer()
         audience_analyzer = AudienceAnalyzer()
@@ -111,139 +116,170 @@ class Command(BaseCommand):
             self.stdout.write(self.style.ERROR("Nenhum tópico encontrado."))
             return
 
-        # Processar tópicos usando a mesma lógica do publish_topic
-        created = 0
-        
+        # Um job por tópico; as etapas (IA, categoria, imagem, gravação) rodam no pipeline
+        day = timezone.localdate().isoformat()
+        jobs = []
         for topic in terms:
             topic_clean = topic.strip()
-            key = f"smart_trend:{topic_clean.lower()}:{day}"
+            prediction = audience_analyzer.predict_topic_success(topic_clean)
+            jobs.append(pipeline.enqueue(ORIGEM, {
+                "topic": topic_clean,
+                "key": f"smart_trend:{topic_clean.lower()}:{day}",
+                "success_score": prediction["success_score"],
+                "top_category": (audience_insights["top_categories"] or [None])[0],
+                "force": opts["force"],
+                "debug": opts["debug"],
+            }, titulo=topic_clean, chave=None if opts["force"] else pipeline.idempotency_key(
+                content=f"smart_trend:{topic_clean.lower()}:{day}"
+            )))
+        if opts.get("enqueue_only"):
+            self.stdout.write(f"📥 {len(jobs)} jobs na fila (processe com: python manage.py ingest_pipeline --run)")
+            return
 
-            if not opts["force"] and Noticia.objects.filter(fonte_url=key).exists():
-                if opts["debug"]: self.stdout.write(f"– Já existe hoje: {topic_clean}")
-                continue
-            
-            # Verificar se já existe uma notícia com título similar hoje
-            today = timezone.localdate()
-            similar_exists = Noticia.objects.filter(
-                titulo__icontains=topic_clean[:20],  # Primeiros 20 caracteres
-                criado_em__date=today
-            ).exists()
-            
-            if not opts["force"] and similar_exists:
-                if opts["debug"]: self.stdout.write(f"– Tópico similar já existe hoje: {topic_clean}")
-                continue
-            
-            try:
-                # Usar análise de audiência para categorização
-                prediction = audience_analyzer.predict_topic_success(topic_clean)
-                
-                # Escolher categoria baseada na análise
-                if prediction["success_score"] > 6:
-                    # Tópico de alto potencial - usar categoria de melhor performance
-                    if audience_insights["top_categories"]:
-                        cat = Categoria.objects.filter(nome=audience_insights["top_categories"][0]).first() or cat_fallback
-                    else:
-                        cat_slug = route_category_for_topic(topic_clean)
-                        cat = Categoria.objects.filter(slug=cat_slug).first() or cat_fallback
-                else:
-                    # Tópico normal - usar categorização padrão
-                    cat_slug = route_category_for_topic(topic_clean)
-                    cat = Categoria.objects.filter(slug=cat_slug).first() or cat_fallback
-
-                self.stdout.write(f"Gerando artigo para: {topic_clean}...")
-                art = generate_article(topic_clean) or {}
-                
-                title = strip_tags((art.get("title") or topic_clean).strip())[:200]
-                conteudo = f'<p class="dek">{strip_tags((art.get("dek") or "").strip())[:220]}</p>\n{(art.get("html") or "<p></p>").strip()}'
-
-                kwargs = {
-                    "titulo": title, 
-                    "conteudo": conteudo, 
-                    "publicado_em": timezone.now(), 
-                    "fonte_url": key, 
-                    "categoria": cat, 
-                    "fonte_nome": "RadarBR Smart Trends", 
-                    "imagem_alt": title
-                }
-                if published_value is not _NO_STATUS_SENTINEL: 
-                    kwargs["status"] = published_value
-
-                # Usar update_or_create para evitar duplicatas
-                obj, created_obj = Noticia.objects.update_or_create(
-                    fonte_url=key,
-                    defaults=kwargs
-                )
+        pipeline.Pipeline({ORIGEM: self}, log=self.stdout.write).run(jobs)
+        created = sum(1 for job in jobs if job.status == "concluido" and job.artefatos.get("save", {}).get("created"))
+        self.stdout.write(self.style.SUCCESS(f"Pronto. Novos artigos criados: {created}"))
 
-                # Buscar imagem (mesma lógica do comando original)
-                self.stdout.write(f"Buscando imagem para: {topic_clean}...")
-                
-                image_url = None
-                if find_image_for_news and image_cache:
-                    cached_url = image_cache.get(title, cat.slug)
-                    if cached_url:
-                        image_url = cached_url
-                        self.stdout.write(f"✓ Imagem encontrada no cache")
-                    else:
-                        image_url = find_image_for_news(title, conteudo, cat.slug)
-                        if image_url:
-                            image_cache.set(title, image_url, cat.slug, {
-                                'source': 'smart_trends_publish',
-                                'topic': topic_clean,
-                                'category': cat.slug,
-                                'success_score': prediction['success_score']
-                            })
-                            self.stdout.write(f"✓ Imagem encontrada via API")
+    # Etapas do pipeline (ver rb_ingestor/pipeline.py): cada uma recebe o job e os
+    # artefatos das etapas anteriores e devolve o que precisa ser gravado
+
+    def stage_gate(self, job, data):
+        entrada = job.entrada
+        if entrada["force"]:
+            return {}
+        # Mesma chave do dia (fonte_url) ou tópico já coberto: parar antes da IA
+        from rb_ingestor import dedup
+        reason = dedup.gate(urls=[entrada["key"]], topic=entrada["topic"])
+        if reason:
+            if entrada["debug"]: self.stdout.write(f"– Já existe ({reason}): {entrada['topic']}")
+            raise pipeline.SkipJob(f"duplicata ({reason})")
+        return {}
+
+    def stage_generate(self, job, data):
+        entrada = job.entrada
+        topic_clean = entrada["topic"]
+
+        self.stdout.write(f"Gerando artigo para: {topic_clean}...")
+        art = generate_article(topic_clean) or {}
                 
-                if not image_url:
-                    img_info = pick_image(topic_clean)
-                    if img_info and img_info.get("url"):
-                        remote_url = img_info["url"]
-                        secure_url = upload_remote_to_cloudinary(
-                            remote_url,
-                            public_id=None,
-                            folder="radarbr/noticias",
-                            tags=["radarbr", "noticia", "smart"],
-                        )
-                        image_url = secure_url or remote_url
-                        obj.imagem_credito = img_info.get("credito", "")
-                        obj.imagem_licenca = img_info.get("licenca", "")
-                        obj.imagem_fonte_url = img_info.get("fonte_url", remote_url)
-                        self.stdout.write(f"✓ Imagem encontrada via sistema antigo")
+        title = strip_tags((art.get("title") or topic_clean).strip())[:200]
+        conteudo = f'<p class="dek">{strip_tags((art.get("dek") or "").strip())[:220]}</p>\n{(art.get("html") or "<p></p>").strip()}'
+        return {"titulo": title, "conteudo": conteudo}
+
+    def stage_categorize(self, job, data):
+        Categoria = apps.get_model("rb_noticias", "Categoria")
+        entrada = job.entrada
+        topic_clean = entrada["topic"]
+        cat_fallback, _ = Categoria.objects.get_or_create(slug="geral", defaults={"nome": "Geral"})
+
+        # Escolher categoria baseada na análise de audiência
+        if entrada["success_score"] > 6 and entrada["top_category"]:
+            # Tópico de alto potencial - usar categoria de melhor performance
+            cat = Categoria.objects.filter(nome=entrada["top_category"]).first() or cat_fallback
+        else:
+            # Tópico normal - usar categorização padrão
+            cat_slug = route_category_for_topic(topic_clean)
+            cat = Categoria.objects.filter(slug=cat_slug).first() or cat_fallback
+        return {"categoria": cat.pk, "categoria_slug": cat.slug}
+
+    def stage_image(self, job, data):
+        entrada = job.entrada
+        topic_clean = entrada["topic"]
+        title = data["generate"]["titulo"]
+        conteudo = data["generate"]["conteudo"]
+        cat_slug = data["categorize"]["categoria_slug"]
+        fields = {"imagem_alt": title}
+
+        # Buscar imagem (mesma lógica do comando original)
+        self.stdout.write(f"Buscando imagem para: {topic_clean}...")
                 
+        image_url = None
+        if find_image_for_news and image_cache:
+            cached_url = image_cache.get(title, cat_slug)
+            if cached_url:
+                image_url = cached_url
+                self.stdout.write(f"✓ Imagem encontrada no cache")
+            else:
+                image_url = find_image_for_news(title, conteudo, cat_slug)
                 if image_url:
-                    obj.imagem = image_url
-                    self.stdout.write(self.style.SUCCESS(f"✓ Imagem para: {topic_clean}"))
-                else:
-                    self.stdout.write(self.style.WARNING("⚠ Nenhuma imagem encontrada"))
-
-                obj.slug = unique_slug(title)
-                obj.save()
+                    image_cache.set(title, image_url, cat_slug, {
+                        'source': 'smart_trends_publish',
+                        'topic': topic_clean,
+                        'category': cat_slug,
+                        'success_score': entrada['success_score']
+                    })
+                    self.stdout.write(f"✓ Imagem encontrada via API")
                 
-                if created_obj:
-                    created += 1
-                    self.stdout.write(self.style.SUCCESS(f"✓ Novo artigo criado: {topic_clean}"))
-                else:
-                    self.stdout.write(self.style.WARNING(f"⚠ Artigo já existia, atualizado: {topic_clean}"))
+        if not image_url:
+            img_info = pick_image(topic_clean)
+            if img_info and img_info.get("url"):
+                remote_url = img_info["url"]
+                secure_url = upload_remote_to_cloudinary(
+                    remote_url,
+                    public_id=None,
+                    folder="radarbr/noticias",
+                    tags=["radarbr", "noticia", "smart"],
+                )
+                image_url = secure_url or remote_url
+                fields["imagem_credito"] = img_info.get("credito", "")
+                fields["imagem_licenca"] = img_info.get("licenca", "")
+                fields["imagem_fonte_url"] = img_info.get("fonte_url", remote_url)
+                self.stdout.write(f"✓ Imagem encontrada via sistema antigo")
                 
-                # Mostrar predição de sucesso
-                self.stdout.write(self.style.SUCCESS(f"✓ Publicado: {topic_clean} (Score: {prediction['success_score']:.1f})"))
+        if image_url:
+            fields["imagem"] = image_url
+            self.stdout.write(self.style.SUCCESS(f"✓ Imagem para: {topic_clean}"))
+        else:
+            self.stdout.write(self.style.WARNING("⚠ Nenhuma imagem encontrada"))
+        return fields
 
-            except Exception as e:
-                self.stdout.write(self.style.ERROR(f"Erro ao processar o tópico '{topic_clean}': {str(e)}"))
-                if opts["debug"]: traceback.print_exc()
-                continue
+    def stage_save(self, job, data):
+        Noticia = apps.get_model("rb_noticias", "Noticia")
+        entrada = job.entrada
+        topic_clean = entrada["topic"]
+        title = data["generate"]["titulo"]
 
-        self.stdout.write(self.style.SUCCESS(f"Pronto. Novos artigos criados: {created}"))
+        kwargs = {
+            "titulo": title, 
+            "conteudo": data["generate"]["conteudo"], 
+            "publicado_em": timezone.now(), 
+            "fonte_url": entrada["key"], 
+            "categoria_id": data["categorize"]["categoria"], 
+            "fonte_nome": "RadarBR Smart Trends", 
+            "slug": _unique_slug(Noticia, title),
+            **(data.get("image") or {}),
+        }
+        published_value = _status_published(Noticia)
+        if published_value is not _NO_STATUS_SENTINEL: 
+            kwargs["status"] = published_value
 
+        # Usar update_or_create para evitar duplicatas
+        obj, created_obj = Noticia.objects.update_or_create(
+            fonte_url=entrada["key"],
+            defaults=kwargs
+        )
+        job.noticia = obj
+                
+        if created_obj:
+            self.stdout.write(self.style.SUCCESS(f"✓ Novo artigo criado: {topic_clean}"))
+        else:
+            self.stdout.write(self.style.WARNING(f"⚠ Artigo já existia, atualizado: {topic_clean}"))
+                
+        # Mostrar predição de sucesso
+        self.stdout.write(self.style.SUCCESS(f"✓ Publicado: {topic_clean} (Score: {entrada['success_score']:.1f})"))
+        return {"noticia": obj.pk, "created": created_obj}
+
+    def stage_ping(self, jobs):
         # Ping sitemap (mesma lógica do comando original)
-        if created > 0:
-            try:
-                from core.utils import absolute_sitemap_url
-                from rb_ingestor.ping import ping_search_engines
-                sm_url = absolute_sitemap_url()
-                res = ping_search_engines(sm_url)
-                self.stdout.write(self.style.NOTICE(f"Ping sitemap: Google={'OK' if res['google'] else 'NOK'}; Bing={'OK' if res['bing'] else 'NOK'}"))
-            except Exception: pass
+        if not any(job.artefatos.get("save", {}).get("created") for job in jobs):
+            return
+        try:
+            from core.utils import absolute_sitemap_url
+            from rb_ingestor.ping import ping_search_engines
+            sm_url = absolute_sitemap_url()
+            res = ping_search_engines(sm_url)
+            self.stdout.write(self.style.NOTICE(f"Ping sitemap: Google={'OK' if res['google'] else 'NOK'}; Bing={'OK' if res['bing'] else 'NOK'}"))
+        except Exception: pass
 
     def _get_trending_topics(self, analyzer: TrendingAnalyzer, limit: int) -> list:
         """Obtém tópicos baseados em trending topics"""
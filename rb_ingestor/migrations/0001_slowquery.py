@@ -0,0 +1,36 @@
+# Generated by Django 5.2.6 on 2026-10-19 12:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlowQuery',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fingerprint', models.CharField(max_length=32, unique=True)),
+                ('sql_normalizado', models.TextField()),
+                ('sql_exemplo', models.TextField(blank=True, help_text='Última ocorrência com plano capturado')),
+                ('origem', models.CharField(blank=True, help_text='View ou comando da última ocorrência', max_length=200)),
+                ('banco', models.CharField(default='default', max_length=50)),
+                ('plano', models.TextField(blank=True, help_text='Saída do EXPLAIN')),
+                ('ocorrencias', models.PositiveIntegerField(default=0)),
+                ('tempo_total_ms', models.FloatField(default=0)),
+                ('tempo_max_ms', models.FloatField(default=0)),
+                ('primeira_vez', models.DateTimeField(auto_now_add=True)),
+                ('ultima_vez', models.DateTimeField()),
+            ],
+            options={
+                'verbose_name': 'Query lenta',
+                'verbose_name_plural': 'Queries lentas',
+                'ordering': ['-tempo_max_ms'],
+            },
+        ),
+    ]
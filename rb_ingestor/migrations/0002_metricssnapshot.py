@@ -0,0 +1,26 @@
+# Generated by Django 5.2.6 on 2026-10-19 12:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rb_ingestor', '0001_slowquery'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MetricsSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('processo', models.CharField(help_text='host:pid', max_length=120, unique=True)),
+                ('dados', models.JSONField(default=dict)),
+                ('atualizado_em', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Snapshot de métricas',
+                'verbose_name_plural': 'Snapshots de métricas',
+            },
+        ),
+    ]
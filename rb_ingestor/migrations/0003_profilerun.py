@@ -0,0 +1,35 @@
+# Generated by Django 5.2.6 on 2026-10-19 12:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rb_ingestor', '0002_metricssnapshot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProfileRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('path', models.CharField(max_length=500)),
+                ('view', models.CharField(blank=True, max_length=200)),
+                ('usuario', models.CharField(blank=True, max_length=150)),
+                ('status_code', models.PositiveSmallIntegerField(default=200)),
+                ('duracao_ms', models.FloatField(default=0)),
+                ('num_queries', models.PositiveIntegerField(default=0)),
+                ('sql_ms', models.FloatField(default=0)),
+                ('relatorio', models.TextField(blank=True, help_text='Top funções e árvore de chamadas (pstats)')),
+                ('queries', models.JSONField(blank=True, default=list)),
+                ('pstats_data', models.BinaryField(help_text='Dump marshal do pstats (.prof)')),
+                ('criado_em', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Profile de requisição',
+                'verbose_name_plural': 'Profiles de requisições',
+                'ordering': ['-criado_em'],
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.6 on 2026-10-19 12:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rb_ingestor', '0003_profilerun'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DomainFetchStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dominio', models.CharField(max_length=200, unique=True)),
+                ('http_sucessos', models.PositiveIntegerField(default=0)),
+                ('http_falhas', models.PositiveIntegerField(default=0)),
+                ('http_tempo_ms', models.FloatField(default=0, help_text='Soma das latências do HTTP simples')),
+                ('browser_sucessos', models.PositiveIntegerField(default=0)),
+                ('browser_falhas', models.PositiveIntegerField(default=0)),
+                ('browser_tempo_ms', models.FloatField(default=0, help_text='Soma das latências do navegador')),
+                ('tier_preferido', models.CharField(choices=[('http', 'HTTP simples'), ('browser', 'Navegador headless')], default='http', max_length=10)),
+                ('atualizado_em', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Estatística de download por domínio',
+                'verbose_name_plural': 'Estatísticas de download por domínio',
+                'ordering': ['dominio'],
+            },
+        ),
+    ]
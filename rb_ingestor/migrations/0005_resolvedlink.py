@@ -0,0 +1,31 @@
+# Generated by Django 5.2.6 on 2026-10-19 12:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rb_ingestor', '0004_domainfetchstats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResolvedLink',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('gn_id', models.CharField(help_text='ID do artigo no Google News', max_length=512, unique=True)),
+                ('gn_url', models.TextField()),
+                ('url_original', models.TextField(blank=True)),
+                ('metodo', models.CharField(choices=[('query', 'Parâmetro url='), ('offline', 'Decodificação offline'), ('batchexecute', 'API batchexecute'), ('redirect', 'Redirecionamento HTTP'), ('html', 'HTML da página'), ('browser', 'Navegador headless'), ('falha', 'Não resolvido')], max_length=20)),
+                ('usos', models.PositiveIntegerField(default=0, help_text='Leituras do cache pelo banco (outras execuções)')),
+                ('resolvido_em', models.DateTimeField()),
+                ('ultimo_uso', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Link resolvido',
+                'verbose_name_plural': 'Links resolvidos',
+                'ordering': ['-resolvido_em'],
+            },
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.6 on 2026-10-19 12:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rb_ingestor', '0005_resolvedlink'),
+        ('rb_noticias', '0014_noticia_show_youtube_noticia_youtube_urls'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IngestJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('origem', models.CharField(help_text='Comando que produziu o job', max_length=60)),
+                ('titulo', models.CharField(blank=True, help_text='Tópico ou título da notícia de origem', max_length=300)),
+                ('url', models.TextField(blank=True)),
+                ('etapa', models.CharField(choices=[('fetch', 'Busca'), ('extract', 'Extração'), ('generate', 'Geração'), ('categorize', 'Categorização'), ('youtube', 'Vídeo do YouTube'), ('image', 'Imagem'), ('save', 'Gravação'), ('ping', 'Ping do sitemap'), ('fim', 'Fim')], default='fetch', help_text='Próxima etapa a executar', max_length=20)),
+                ('status', models.CharField(choices=[('pendente', 'Pendente'), ('executando', 'Executando'), ('concluido', 'Concluído'), ('falhou', 'Falhou'), ('descartado', 'Descartado')], default='pendente', max_length=20)),
+                ('artefatos', models.JSONField(blank=True, default=dict, help_text='Entrada e resultado de cada etapa concluída')),
+                ('tempos', models.JSONField(blank=True, default=dict, help_text='Duração de cada etapa (ms)')),
+                ('tentativas', models.PositiveSmallIntegerField(default=0)),
+                ('erro', models.TextField(blank=True)),
+                ('criado_em', models.DateTimeField(auto_now_add=True)),
+                ('atualizado_em', models.DateTimeField(auto_now=True)),
+                ('noticia', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='rb_noticias.noticia')),
+            ],
+            options={
+                'verbose_name': 'Job de ingestão',
+                'verbose_name_plural': 'Jobs de ingestão',
+                'ordering': ['-criado_em'],
+                'indexes': [models.Index(fields=['status', 'origem'], name='rb_ingestor_status_bf0dd2_idx')],
+            },
+        ),
+    ]
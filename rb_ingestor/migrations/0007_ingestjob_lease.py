@@ -0,0 +1,33 @@
+# Generated by Django 5.2.6 on 2026-10-19 13:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rb_ingestor', '0006_ingestjob'),
+        ('rb_noticias', '0014_noticia_show_youtube_noticia_youtube_urls'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ingestjob',
+            name='chave',
+            field=models.CharField(blank=True, help_text='Chave de idempotência (URL normalizada ou conteúdo)', max_length=80, null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name='ingestjob',
+            name='lease_dono',
+            field=models.CharField(blank=True, help_text='Worker que está processando o job', max_length=120),
+        ),
+        migrations.AddField(
+            model_name='ingestjob',
+            name='lease_expira',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='ingestjob',
+            index=models.Index(fields=['status', 'lease_expira'], name='rb_ingestor_status_f045eb_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-19 13:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rb_ingestor', '0007_ingestjob_lease'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='ingestjob',
+            name='etapa',
+            field=models.CharField(choices=[('gate', 'Barreira de duplicatas'), ('fetch', 'Busca'), ('extract', 'Extração'), ('generate', 'Geração'), ('categorize', 'Categorização'), ('youtube', 'Vídeo do YouTube'), ('image', 'Imagem'), ('save', 'Gravação'), ('ping', 'Ping do sitemap'), ('fim', 'Fim')], default='gate', help_text='Próxima etapa a executar', max_length=20),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.6 on 2026-10-19 13:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rb_ingestor', '0008_ingestjob_gate'),
+        ('rb_noticias', '0014_noticia_show_youtube_noticia_youtube_urls'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArticleSignature',
+            fields=[
+                ('noticia', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='+', serialize=False, to='rb_noticias.noticia')),
+                ('titulo', models.BinaryField(help_text='MinHash do título (uint32 por permutação)')),
+                ('corpo', models.BinaryField(help_text='MinHash dos trigramas de palavras do corpo')),
+                ('atualizado_em', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Assinatura MinHash',
+                'verbose_name_plural': 'Assinaturas MinHash',
+            },
+        ),
+        migrations.CreateModel(
+            name='LshBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('campo', models.CharField(choices=[('titulo', 'Título'), ('corpo', 'Corpo')], max_length=10)),
+                ('chave', models.BigIntegerField(help_text='Hash da faixa (número da faixa + valores)')),
+                ('noticia', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='rb_noticias.noticia')),
+            ],
+            options={
+                'verbose_name': 'Balde LSH',
+                'verbose_name_plural': 'Baldes LSH',
+                'indexes': [models.Index(fields=['campo', 'chave'], name='rb_ingestor_campo_025ff8_idx')],
+            },
+        ),
+    ]
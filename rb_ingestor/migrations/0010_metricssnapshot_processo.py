@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-19 13:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rb_ingestor', '0009_minhash'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='metricssnapshot',
+            name='processo',
+            field=models.CharField(help_text='host:pid:início do processo', max_length=120, unique=True),
+        ),
+    ]
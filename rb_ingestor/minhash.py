@@ -0,0 +1,201 @@
+# rb_ingestor/minhash.py
+"""
+Índice de quase-duplicatas por MinHash + LSH, gravado no banco.
+
+Cada comando tinha a sua checagem, sempre varrendo a tabela: publish_topic
+com ``titulo__icontains`` por palavra, smart_automation comparando em Python
+cada notícia das últimas 24h, automacao_render com ``titulo__icontains``
+dos 20 primeiros caracteres. Aqui cada notícia ganha, ao ser gravada
+(sinal ``post_save``, ligado em ``RbIngestorConfig.ready``):
+
+- ``ArticleSignature``: MinHash de NUM_PERM permutações do título (palavras
+  significativas de ``dedup.tokens``) e do corpo (trigramas de palavras)
+- ``LshBucket``: uma linha por faixa da assinatura (32 faixas de 2 valores
+  no título, 16 de 4 no corpo), indexada por (campo, chave)
+
+A consulta calcula a assinatura do texto novo, busca só as notícias que
+caem num mesmo balde (``chave__in``, via índice) e estima a similaridade
+de Jaccard delas pela fração de valores iguais na assinatura. O custo
+depende do número de candidatos, não do tamanho da tabela. No título, o
+candidato que troca número ou nome próprio ("vence Botafogo" x "vence
+Palmeiras") não conta, por mais palavras que tenha em comum
+(``dedup.distinct``).
+
+Mudar NUM_PERM, BANDS ou a tokenização invalida as assinaturas gravadas:
+``manage.py minhash_index --rebuild``.
+"""
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from datetime import timedelta
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+from django.utils.html import strip_tags
+
+from rb_ingestor.dedup import HOURS, distinct, tokens
+
+logger = logging.getLogger(__name__)
+
+NUM_PERM = 64
+BANDS = {"titulo": 32, "corpo": 16}
+SHINGLE_SIZE = {"titulo": 1, "corpo": 3}
+THRESHOLDS = {
+    "titulo": float(os.getenv("MINHASH_TITLE_THRESHOLD", "0.7")),
+    "corpo": float(os.getenv("MINHASH_BODY_THRESHOLD", "0.5")),
+}
+LABELS = {"titulo": "título", "corpo": "corpo"}
+
+# Permutações (a*x + b) mod primo de Mersenne; sementes fixas: as assinaturas gravadas dependem delas
+_PRIME = np.uint64((1 << 61) - 1)
+_MASK = np.uint64(0xFFFFFFFF)
+_rng = np.random.RandomState(1)
+_A = _rng.randint(1, (1 << 61) - 1, size=NUM_PERM, dtype=np.uint64)
+_B = _rng.randint(0, (1 << 61) - 1, size=NUM_PERM, dtype=np.uint64)
+
+_stats_lock = threading.Lock()
+_stats = Counter()
+
+
+def shingles(text: str, size: int) -> set:
+    """Conjunto de n-gramas de palavras significativas (texto sem HTML)."""
+    words = tokens(strip_tags(text or ""))
+    if len(words) <= size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def signature(items: Iterable[str]) -> Optional[np.ndarray]:
+    """MinHash (uint32 x NUM_PERM) do conjunto, ou None se vazio."""
+    items = list(items)
+    if not items:
+        return None
+    hashes = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(item.encode(), digest_size=4).digest(), "little") for item in items),
+        dtype=np.uint64, count=len(items),
+    )
+    # O produto estoura 64 bits de propósito (mesma conta do datasketch): continua uma boa mistura
+    permuted = ((hashes[:, None] * _A + _B) % _PRIME) & _MASK
+    return permuted.min(axis=0).astype(np.uint32)
+
+
+def text_signature(text: str, campo: str) -> Optional[np.ndarray]:
+    return signature(shingles(text, SHINGLE_SIZE[campo]))
+
+
+def band_keys(sig: np.ndarray, campo: str) -> list:
+    """Chave de cada faixa: hash de 64 bits (com sinal, cabe no BigIntegerField) do número + valores."""
+    bands = BANDS[campo]
+    rows = NUM_PERM // bands
+    return [
+        int.from_bytes(
+            hashlib.blake2b(band.to_bytes(2, "little") + sig[band * rows:(band + 1) * rows].tobytes(),
+                            digest_size=8).digest(),
+            "little", signed=True,
+        )
+        for band in range(bands)
+    ]
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Jaccard estimado: fração de permutações com o mesmo mínimo."""
+    return float(np.mean(a == b))
+
+
+def index(noticia):
+    """Grava (ou refaz) a assinatura e os baldes da notícia."""
+    from django.apps import apps
+    from django.db import transaction
+
+    ArticleSignature = apps.get_model("rb_ingestor", "ArticleSignature")
+    LshBucket = apps.get_model("rb_ingestor", "LshBucket")
+    sigs = {"titulo": text_signature(noticia.titulo, "titulo"), "corpo": text_signature(noticia.conteudo, "corpo")}
+    with transaction.atomic():
+        ArticleSignature.objects.update_or_create(
+            noticia_id=noticia.pk,
+            defaults={campo: sig.tobytes() if sig is not None else b"" for campo, sig in sigs.items()},
+        )
+        LshBucket.objects.filter(noticia_id=noticia.pk).delete()
+        LshBucket.objects.bulk_create([
+            LshBucket(noticia_id=noticia.pk, campo=campo, chave=chave)
+            for campo, sig in sigs.items() if sig is not None
+            for chave in band_keys(sig, campo)
+        ])
+    with _stats_lock:
+        _stats["indexed"] += 1
+
+
+def on_noticia_saved(sender, instance, created=False, raw=False, update_fields=None, **kwargs):
+    """post_save da Noticia: só refaz quando título ou corpo podem ter mudado (views/clicks não)."""
+    if raw or (update_fields and not {"titulo", "conteudo"} & set(update_fields)):
+        return
+    try:
+        index(instance)
+    except Exception as e:
+        # Índice desatualizado não pode impedir a gravação da notícia
+        logger.warning("MinHash: falha ao indexar notícia %s: %s", instance.pk, e)
+
+
+def find(title: str = None, body: str = None, hours: int = None, exclude: int = None) -> Optional[Dict]:
+    """
+    Notícia recente (últimas ``hours``) quase igual ao título ou ao corpo:
+    ``{"noticia": pk, "campo": "titulo"/"corpo", "similaridade": 0.0-1.0}``
+    ou None. O título é comparado antes (sai mais barato).
+    """
+    from django.apps import apps
+    from django.utils import timezone
+
+    ArticleSignature = apps.get_model("rb_ingestor", "ArticleSignature")
+    LshBucket = apps.get_model("rb_ingestor", "LshBucket")
+    Noticia = apps.get_model("rb_noticias", "Noticia")
+    since = timezone.now() - timedelta(hours=hours or HOURS)
+    start = time.perf_counter()
+    match = None
+    candidates = 0
+    for campo, text in (("titulo", title), ("corpo", body)):
+        sig = text_signature(text, campo) if text else None
+        if sig is None:
+            continue
+        ids = LshBucket.objects.filter(
+            campo=campo, chave__in=band_keys(sig, campo), noticia__criado_em__gte=since
+        ).exclude(noticia_id=exclude).values_list("noticia_id", flat=True).distinct()
+        rows = [(pk, bytes(data)) for pk, data in ArticleSignature.objects.filter(pk__in=ids).values_list("noticia_id", campo)
+                if len(data) == NUM_PERM * 4]
+        candidates += len(rows)
+        if not rows:
+            continue
+        matrix = np.frombuffer(b"".join(data for _pk, data in rows), dtype=np.uint32).reshape(len(rows), NUM_PERM)
+        scores = (matrix == sig).mean(axis=1)
+        hits = [int(i) for i in np.argsort(-scores, kind="stable") if scores[i] >= THRESHOLDS[campo]]
+        if campo == "titulo" and hits:
+            titles = dict(Noticia.objects.filter(pk__in=[rows[i][0] for i in hits]).values_list("pk", "titulo"))
+            hits = [i for i in hits if not distinct(text, titles.get(rows[i][0], ""))]
+        if hits:
+            best = hits[0]
+            match = {"noticia": rows[best][0], "campo": campo, "similaridade": float(scores[best])}
+            break
+    with _stats_lock:
+        _stats["lookups"] += 1
+        _stats["candidates"] += candidates
+        _stats["matches"] += bool(match)
+        _stats["lookup_ms"] += round((time.perf_counter() - start) * 1000)
+    return match
+
+
+def near_duplicate(title: str = None, body: str = None, hours: int = None, exclude: int = None) -> Optional[str]:
+    """Motivo legível ("título 83%: <título existente>") ou None."""
+    match = find(title=title, body=body, hours=hours, exclude=exclude)
+    if not match:
+        return None
+    from django.apps import apps
+    Noticia = apps.get_model("rb_noticias", "Noticia")
+    titulo = Noticia.objects.filter(pk=match["noticia"]).values_list("titulo", flat=True).first() or match["noticia"]
+    return f"{LABELS[match['campo']]} {match['similaridade']:.0%}: {titulo}"
+
+
+def stats() -> dict:
+    with _stats_lock:
+        return {"indexed": 0, "lookups": 0, "candidates": 0, "matches": 0, "lookup_ms": 0, **_stats}
@@ -1,3 +1,246 @@
 from django.db import models
 
-# Create your models here.
+
+class SlowQuery(models.Model):
+    """Query lenta agregada por fingerprint (ver core/slow_queries.py)"""
+
+    fingerprint = models.CharField(max_length=32, unique=True)
+    sql_normalizado = models.TextField()
+    sql_exemplo = models.TextField(blank=True, help_text="Última ocorrência com plano capturado")
+    origem = models.CharField(max_length=200, blank=True, help_text="View ou comando da última ocorrência")
+    banco = models.CharField(max_length=50, default="default")
+    plano = models.TextField(blank=True, help_text="Saída do EXPLAIN")
+    ocorrencias = models.PositiveIntegerField(default=0)
+    tempo_total_ms = models.FloatField(default=0)
+    tempo_max_ms = models.FloatField(default=0)
+    primeira_vez = models.DateTimeField(auto_now_add=True)
+    ultima_vez = models.DateTimeField()
+
+    class Meta:
+        verbose_name = "Query lenta"
+        verbose_name_plural = "Queries lentas"
+        ordering = ["-tempo_max_ms"]
+
+    def __str__(self):
+        return f"{self.fingerprint[:8]} ({self.ocorrencias}x, máx {self.tempo_max_ms:.0f}ms)"
+
+    @property
+    def tempo_medio_ms(self):
+        return self.tempo_total_ms / self.ocorrencias if self.ocorrencias else 0.0
+
+
+class MetricsSnapshot(models.Model):
+    """Snapshot das métricas de um processo (ver core/metrics.py)"""
+
+    processo = models.CharField(max_length=120, unique=True, help_text="host:pid:início do processo")
+    dados = models.JSONField(default=dict)
+    atualizado_em = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Snapshot de métricas"
+        verbose_name_plural = "Snapshots de métricas"
+
+    def __str__(self):
+        return self.processo
+
+
+class ProfileRun(models.Model):
+    """Profile de uma requisição de staff (ver core/profiling.py)"""
+
+    path = models.CharField(max_length=500)
+    view = models.CharField(max_length=200, blank=True)
+    usuario = models.CharField(max_length=150, blank=True)
+    status_code = models.PositiveSmallIntegerField(default=200)
+    duracao_ms = models.FloatField(default=0)
+    num_queries = models.PositiveIntegerField(default=0)
+    sql_ms = models.FloatField(default=0)
+    relatorio = models.TextField(blank=True, help_text="Top funções e árvore de chamadas (pstats)")
+    queries = models.JSONField(default=list, blank=True)
+    pstats_data = models.BinaryField(help_text="Dump marshal do pstats (.prof)")
+    criado_em = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Profile de requisição"
+        verbose_name_plural = "Profiles de requisições"
+        ordering = ["-criado_em"]
+
+    def __str__(self):
+        return f"{self.path} ({self.duracao_ms:.0f}ms)"
+
+
+class DomainFetchStats(models.Model):
+    """Resultado dos downloads por domínio e nível (ver rb_ingestor/fetch_tiers.py)"""
+
+    TIER_CHOICES = [("http", "HTTP simples"), ("browser", "Navegador headless")]
+
+    dominio = models.CharField(max_length=200, unique=True)
+    http_sucessos = models.PositiveIntegerField(default=0)
+    http_falhas = models.PositiveIntegerField(default=0)
+    http_tempo_ms = models.FloatField(default=0, help_text="Soma das latências do HTTP simples")
+    browser_sucessos = models.PositiveIntegerField(default=0)
+    browser_falhas = models.PositiveIntegerField(default=0)
+    browser_tempo_ms = models.FloatField(default=0, help_text="Soma das latências do navegador")
+    tier_preferido = models.CharField(max_length=10, choices=TIER_CHOICES, default="http")
+    atualizado_em = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Estatística de download por domínio"
+        verbose_name_plural = "Estatísticas de download por domínio"
+        ordering = ["dominio"]
+
+    def __str__(self):
+        return f"{self.dominio} ({self.tier_preferido})"
+
+    def _taxa(self, tier):
+        total = getattr(self, f"{tier}_sucessos") + getattr(self, f"{tier}_falhas")
+        return getattr(self, f"{tier}_sucessos") / total if total else None
+
+    def _media_ms(self, tier):
+        total = getattr(self, f"{tier}_sucessos") + getattr(self, f"{tier}_falhas")
+        return getattr(self, f"{tier}_tempo_ms") / total if total else None
+
+    @property
+    def http_taxa(self):
+        return self._taxa("http")
+
+    @property
+    def browser_taxa(self):
+        return self._taxa("browser")
+
+    @property
+    def http_media_ms(self):
+        return self._media_ms("http")
+
+    @property
+    def browser_media_ms(self):
+        return self._media_ms("browser")
+
+
+class ResolvedLink(models.Model):
+    """Link do Google News já resolvido para o veículo (ver rb_ingestor/gn_resolver.py)"""
+
+    METODO_CHOICES = [
+        ("query", "Parâmetro url="),
+        ("offline", "Decodificação offline"),
+        ("batchexecute", "API batchexecute"),
+        ("redirect", "Redirecionamento HTTP"),
+        ("html", "HTML da página"),
+        ("browser", "Navegador headless"),
+        ("falha", "Não resolvido"),
+    ]
+
+    gn_id = models.CharField(max_length=512, unique=True, help_text="ID do artigo no Google News")
+    gn_url = models.TextField()
+    url_original = models.TextField(blank=True)
+    metodo = models.CharField(max_length=20, choices=METODO_CHOICES)
+    usos = models.PositiveIntegerField(default=0, help_text="Leituras do cache pelo banco (outras execuções)")
+    resolvido_em = models.DateTimeField()
+    ultimo_uso = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Link resolvido"
+        verbose_name_plural = "Links resolvidos"
+        ordering = ["-resolvido_em"]
+
+    def __str__(self):
+        return self.url_original or f"{self.gn_id[:30]} (não resolvido)"
+
+
+class IngestJob(models.Model):
+    """Matéria passando pelo pipeline de ingestão (ver rb_ingestor/pipeline.py)"""
+
+    ETAPA_CHOICES = [
+        ("gate", "Barreira de duplicatas"),
+        ("fetch", "Busca"),
+        ("extract", "Extração"),
+        ("generate", "Geração"),
+        ("categorize", "Categorização"),
+        ("youtube", "Vídeo do YouTube"),
+        ("image", "Imagem"),
+        ("save", "Gravação"),
+        ("ping", "Ping do sitemap"),
+        ("fim", "Fim"),
+    ]
+    STATUS_CHOICES = [
+        ("pendente", "Pendente"),
+        ("executando", "Executando"),
+        ("concluido", "Concluído"),
+        ("falhou", "Falhou"),
+        ("descartado", "Descartado"),
+    ]
+
+    origem = models.CharField(max_length=60, help_text="Comando que produziu o job")
+    titulo = models.CharField(max_length=300, blank=True, help_text="Tópico ou título da notícia de origem")
+    url = models.TextField(blank=True)
+    etapa = models.CharField(max_length=20, choices=ETAPA_CHOICES, default="gate", help_text="Próxima etapa a executar")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pendente")
+    artefatos = models.JSONField(default=dict, blank=True, help_text="Entrada e resultado de cada etapa concluída")
+    tempos = models.JSONField(default=dict, blank=True, help_text="Duração de cada etapa (ms)")
+    tentativas = models.PositiveSmallIntegerField(default=0)
+    erro = models.TextField(blank=True)
+    noticia = models.ForeignKey("rb_noticias.Noticia", on_delete=models.SET_NULL, null=True, blank=True, related_name="+")
+    chave = models.CharField(max_length=80, unique=True, null=True, blank=True,
+                             help_text="Chave de idempotência (URL normalizada ou conteúdo)")
+    lease_dono = models.CharField(max_length=120, blank=True, help_text="Worker que está processando o job")
+    lease_expira = models.DateTimeField(null=True, blank=True)
+    criado_em = models.DateTimeField(auto_now_add=True)
+    atualizado_em = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Job de ingestão"
+        verbose_name_plural = "Jobs de ingestão"
+        ordering = ["-criado_em"]
+        indexes = [
+            models.Index(fields=["status", "origem"]),
+            models.Index(fields=["status", "lease_expira"]),
+        ]
+
+    def __str__(self):
+        return f"{self.origem}: {self.titulo[:60] or self.pk} ({self.status}, {self.etapa})"
+
+    @property
+    def entrada(self) -> dict:
+        return self.artefatos.get("entrada") or {}
+
+    def ultimo(self, chave, default=None):
+        """Valor mais recente de ``chave`` entre os artefatos (a última etapa que o produziu vence)."""
+        for etapa, _label in reversed(self.ETAPA_CHOICES):
+            valor = (self.artefatos.get(etapa) or {}).get(chave)
+            if valor is not None:
+                return valor
+        return self.entrada.get(chave, default)
+
+
+class ArticleSignature(models.Model):
+    """Assinatura MinHash do título e do corpo de uma notícia (ver rb_ingestor/minhash.py)"""
+
+    noticia = models.OneToOneField("rb_noticias.Noticia", on_delete=models.CASCADE, primary_key=True,
+                                   related_name="+")
+    titulo = models.BinaryField(help_text="MinHash do título (uint32 por permutação)")
+    corpo = models.BinaryField(help_text="MinHash dos trigramas de palavras do corpo")
+    atualizado_em = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Assinatura MinHash"
+        verbose_name_plural = "Assinaturas MinHash"
+
+    def __str__(self):
+        return f"Assinatura de {self.noticia_id}"
+
+
+class LshBucket(models.Model):
+    """Balde LSH (faixa da assinatura MinHash) que aponta para a notícia"""
+
+    CAMPO_CHOICES = [("titulo", "Título"), ("corpo", "Corpo")]
+
+    noticia = models.ForeignKey("rb_noticias.Noticia", on_delete=models.CASCADE, related_name="+")
+    campo = models.CharField(max_length=10, choices=CAMPO_CHOICES)
+    chave = models.BigIntegerField(help_text="Hash da faixa (número da faixa + valores)")
+
+    class Meta:
+        verbose_name = "Balde LSH"
+        verbose_name_plural = "Baldes LSH"
+        indexes = [models.Index(fields=["campo", "chave"])]
+
+    def __str__(self):
+        return f"{self.campo}:{self.chave} -> {self.noticia_id}"
@@ -2,53 +2,68 @@
 """
 Extrator de conteúdo real de notícias
 """
-import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, CData, NavigableString
 import re
 from urllib.parse import urlparse, urljoin
 from typing import Optional, Dict
+import os
 import time
 from contextlib import contextmanager
 
+from rb_ingestor import article_document, html_engine, http_client
+from rb_ingestor.article_document import NOISE_TAGS, ArticleDocument
+from rb_ingestor.browser_pool import ARTICLE_SELECTOR, CONSENT_SELECTORS, fetch_rendered, get_browser_pool
+from rb_ingestor.fetch_tiers import TIER_BROWSER, TIER_HTTP, domain_stats
+from rb_ingestor.gn_resolver import METHOD_BROWSER, get_resolver, publisher_url_from_html
+
+# Conteúdo mínimo para considerar a extração bem-sucedida (senão escala de nível)
+MIN_ARTICLE_CHARS = 200
+
+
+# Versões BeautifulSoup de html_engine.in_noise/visible_text, só para a API
+# antiga (_extract_main_content e bench_extraction)
+
+def _soup_in_noise(element) -> bool:
+    """True se o elemento (ou um ancestral) é menu, rodapé, script etc."""
+    while element is not None:
+        if element.name in NOISE_TAGS:
+            return True
+        element = element.parent
+    return False
+
+
+def _soup_visible_text(element) -> str:
+    """Texto do elemento ignorando descendentes em ``NOISE_TAGS`` (sem alterar a árvore)."""
+    parts = []
+    for node in element.descendants:
+        if type(node) not in (NavigableString, CData):
+            continue
+        parent, skip = node.parent, False
+        while parent is not None and parent is not element:
+            if parent.name in NOISE_TAGS:
+                skip = True
+                break
+            parent = parent.parent
+        if not skip:
+            parts.append(str(node))
+    return "".join(parts)
+
 class NewsContentExtractor:
     """Extrai conteúdo real de notícias acessando URLs diretamente"""
     
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'pt-BR,pt;q=0.9,en;q=0.8',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-        })
+        # Sessão compartilhada da ingestão: keep-alive por host, retries e UA únicos
+        self.session = http_client.get_session()
     
     # ===== NOVA API SIMPLIFICADA =====
     def get_rss_items_for_topic(self, topic: str, max_items: int = 5) -> list:
         """Busca itens de RSS do Google News para um tópico."""
         try:
-            import urllib.parse
-            import xml.etree.ElementTree as ET
-            q = urllib.parse.quote_plus(topic)
-            rss_url = f"https://news.google.com/rss/search?q={q}&hl=pt-BR&gl=BR&ceid=BR:pt-BR"
-            resp = self.session.get(rss_url, timeout=15)
-            if resp.status_code != 200 or not resp.text.strip():
+            from rb_ingestor.rss_collector import parse_feed, topic_feed_url
+            resp = self.session.get(topic_feed_url(topic), timeout=15)
+            if resp.status_code != 200 or not resp.content.strip():
                 return []
-            root = ET.fromstring(resp.text)
-            channel = root.find('channel')
-            items = []
-            if channel is not None:
-                for item in channel.findall('item')[:max_items]:
-                    title_el = item.find('title')
-                    link_el = item.find('link')
-                    desc_el = item.find('description')
-                    items.append({
-                        'title': title_el.text if title_el is not None else '',
-                        'link': link_el.text if link_el is not None else '',
-                        'description': desc_el.text if desc_el is not None else ''
-                    })
-            return items
+            return parse_feed(resp.content, max_items=max_items, topic=topic)
         except Exception as e:
             print(f"⚠ Falha RSS tópico: {e}")
             return []
@@ -86,23 +101,10 @@ class NewsContentExtractor:
             print("❌ Não foi possível acessar conteúdo do publisher")
             return None
         
-        # Extrair dados da página final
-        soup = BeautifulSoup(html, 'html.parser')
-        extracted_data = {
-            'url': final_url,
-            'title': self._extract_title(soup),
-            'description': self._extract_description(soup),
-            'content': self._extract_main_content(soup),
-            'category': self._extract_category(soup),
-            'inferred_category': self._infer_category_from_url(final_url),
-            'author': self._extract_author(soup),
-            'date': self._extract_date(soup),
-            'images': self._extract_images(soup),
-            'source_domain': self._extract_domain(final_url)
-        }
-        
-        # Validar qualidade do conteúdo extraído
-        if extracted_data['title'] and extracted_data['content'] and len(extracted_data['content']) > 100:
+        # Extrair dados da página final (registrada para os demais extratores)
+        doc = article_document.register(ArticleDocument(final_url, html, tier=TIER_BROWSER), gnews_link)
+        extracted_data = self._build_article(doc, min_chars=100)
+        if extracted_data:
             print(f"✅ Conteúdo (publisher) extraído: {len(extracted_data['content'])} chars")
             print(f"✅ Site original: {extracted_data['source_domain']}")
             return extracted_data
@@ -143,9 +145,9 @@ class NewsContentExtractor:
         for attempt in range(1, max_attempts + 1):
             try:
                 print(f"🔄 Tentativa {attempt}/{max_attempts}")
-                data = self.extract_from_google_news_link(link)
+                data = self.fetch_article(link)
                 
-                if data and data.get('content') and len(data['content']) > 200:
+                if data and data.get('content') and len(data['content']) > MIN_ARTICLE_CHARS:
                     print(f"✅ Conteúdo extraído: {len(data['content'])} chars")
                     return data
                 
@@ -163,46 +165,92 @@ class NewsContentExtractor:
         
         return None
 
-    # ===== API ANTIGA (mantida para compatibilidade interna) =====
-    def extract_content_from_url(self, url: str) -> Optional[Dict]:
-        """Extrai conteúdo real de uma URL de notícia"""
-        try:
-            print(f"🌐 Acessando URL: {url[:100]}...")
-            
-            # Para links do Google News: abrir diretamente no navegador headless e usar a página final
-            if 'news.google.com' in url:
+    # ===== DOWNLOAD EM NÍVEIS (HTTP -> navegador) =====
+    def fetch_article(self, url: str) -> Optional[Dict]:
+        """Baixa e extrai o artigo usando o nível mais barato que funciona para o domínio.
+
+        Tenta GET simples primeiro e só escala para o navegador headless quando
+        o HTML não rende um artigo completo. O resultado de cada tentativa vai
+        para ``DomainFetchStats``, então domínios que exigem JavaScript passam
+        a ir direto para o navegador nas próximas execuções.
+        """
+        target = url
+        if self._is_google_news_url(url):
+            gn_domain = self._extract_domain(url)
+            # Cache e decodificação offline são sempre tentados; a rede só se o HTTP funciona para o GN
+            allow_network = domain_stats.tier_order(gn_domain)[0] == TIER_HTTP
+            t0 = time.perf_counter()
+            resolved = get_resolver().resolve(url, allow_network=allow_network)
+            # Cache e decodificação offline não dizem nada sobre o HTTP do GN: só conta a requisição de verdade
+            if get_resolver().used_network():
+                domain_stats.record(gn_domain, TIER_HTTP, bool(resolved), (time.perf_counter() - t0) * 1000)
+            if resolved:
+                target = resolved
+            else:
+                # Só o navegador consegue seguir o redirecionamento via JS
+                t0 = time.perf_counter()
                 data = self.extract_from_google_news_link(url)
+                elapsed_ms = (time.perf_counter() - t0) * 1000
+                domain_stats.record(gn_domain, TIER_BROWSER, bool(data), elapsed_ms)
+                if data:
+                    get_resolver().remember(url, data['url'], METHOD_BROWSER)
+                    domain_stats.record(data['source_domain'], TIER_BROWSER, True, elapsed_ms)
+                    data['fetch_tier'] = TIER_BROWSER
                 return data
-            
-            # Fazer requisição direta
+
+        domain = self._extract_domain(target)
+        for tier in domain_stats.tier_order(domain):
+            t0 = time.perf_counter()
+            if tier == TIER_HTTP:
+                final_url, html = self._get_final_url_and_html_with_http(target)
+            else:
+                final_url, html = self._get_final_url_and_html_with_browser(target)
+            data = None
+            if html:
+                # Categoria, imagens etc. reaproveitam este download e este parse
+                doc = article_document.register(ArticleDocument(final_url, html, requested_url=target, tier=tier), url)
+                data = self._build_article(doc)
+            domain_stats.record(domain, tier, bool(data), (time.perf_counter() - t0) * 1000)
+            if data:
+                print(f"✅ Conteúdo extraído via {tier}: {len(data['content'])} caracteres")
+                data['fetch_tier'] = tier
+                return data
+            print(f"⚠ Nível {tier} insuficiente para {domain}")
+        return None
+
+    def _get_final_url_and_html_with_http(self, url: str) -> (Optional[str], Optional[str]):
+        """GET simples pela sessão (keep-alive); retorna URL final e HTML."""
+        try:
             response = self.session.get(url, timeout=15, allow_redirects=True)
             response.raise_for_status()
-            
-            # Parse do HTML
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Extrair dados da notícia
-            extracted_data = {
-                'url': url,
-                'title': self._extract_title(soup),
-                'description': self._extract_description(soup),
-                'content': self._extract_main_content(soup),
-                'category': self._extract_category(soup),
-                'inferred_category': self._infer_category_from_url(url),
-                'author': self._extract_author(soup),
-                'date': self._extract_date(soup),
-                'images': self._extract_images(soup),
-                'source_domain': self._extract_domain(url)
-            }
-            
-            # Verificar se conseguiu extrair conteúdo válido
-            if extracted_data['title'] and extracted_data['content']:
-                print(f"✅ Conteúdo extraído: {len(extracted_data['content'])} caracteres")
-                return extracted_data
-            else:
+            # bytes: o ArticleDocument (lxml) detecta o charset pelo <meta> da página
+            return response.url, response.content
+        except Exception as e:
+            print(f"⚠ Falha no GET simples: {e}")
+        return None, None
+
+    def _build_article(self, doc: ArticleDocument, min_chars: int = MIN_ARTICLE_CHARS) -> Optional[Dict]:
+        """Extrai os campos do artigo (motor lxml); None se faltar título ou conteúdo suficiente."""
+        url, tree = doc.url, doc.tree
+        if tree is None:
+            return None
+        extracted_data = {'url': url}
+        extracted_data.update(html_engine.extract_article(tree, url))
+        extracted_data['inferred_category'] = self._infer_category_from_url(url)
+        extracted_data['source_domain'] = self._extract_domain(url)
+        if extracted_data['title'] and extracted_data['content'] and len(extracted_data['content']) > min_chars:
+            return extracted_data
+        return None
+
+    # ===== API ANTIGA (mantida para compatibilidade interna) =====
+    def extract_content_from_url(self, url: str) -> Optional[Dict]:
+        """Extrai conteúdo real de uma URL de notícia (HTTP simples, navegador se preciso)"""
+        try:
+            print(f"🌐 Acessando URL: {url[:100]}...")
+            data = self.fetch_article(url)
+            if not data:
                 print("⚠ Conteúdo insuficiente extraído")
-                return None
-                
+            return data
         except Exception as e:
             print(f"❌ Erro ao acessar URL: {e}")
             return None
@@ -210,150 +258,93 @@ class NewsContentExtractor:
     def _resolve_with_browser(self, url: str) -> Optional[str]:
         """[DEPRECATED] Mantido por compatibilidade: use _get_final_url_and_html_with_browser."""
         try:
-            from playwright.sync_api import sync_playwright
             print("🧭 Abrindo link no navegador headless para resolver destino...")
-            with sync_playwright() as p:
-                browser = p.chromium.launch(headless=True)
-                context = browser.new_context(user_agent=self.session.headers.get('User-Agent'))
-                page = context.new_page()
+            def resolve(page):
                 page.goto(url, timeout=30000, wait_until='load')
                 # Esperar possíveis redirecionamentos dinâmicos
                 page.wait_for_timeout(1500)
-                final_url = page.url
-                context.close()
-                browser.close()
-                if final_url and 'news.google.com' not in final_url:
-                    print(f"➡ URL final via navegador: {final_url}")
-                    return final_url
+                return page.url
+            final_url = get_browser_pool().run(resolve)
+            if final_url and 'news.google.com' not in final_url:
+                print(f"➡ URL final via navegador: {final_url}")
+                return final_url
         except Exception as e:
             print(f"⚠ Falha ao resolver com navegador: {e}")
         return None
 
-    def _get_final_url_and_html_with_browser(self, url: str) -> (Optional[str], Optional[str]):
-        """Abre o link no Chromium headless, retorna URL final e HTML renderizado."""
+    def _get_final_url_and_html_with_browser(self, url: str, lean: Optional[bool] = None) -> (Optional[str], Optional[str]):
+        """Abre o link no Chromium headless (pool persistente), retorna URL final e HTML renderizado.
+
+        No modo enxuto (padrão, BROWSER_LEAN_FETCH) recursos pesados são bloqueados
+        e a página termina quando o corpo do artigo estabiliza; o modo antigo
+        (esperas fixas, tudo carregado) continua disponível com lean=False.
+        """
+        if lean is None:
+            lean = os.getenv("BROWSER_LEAN_FETCH", "True") == "True"
         try:
-            from playwright.sync_api import sync_playwright
             print("🧭 Abrindo link no navegador headless...")
-            with sync_playwright() as p:
-                # Tentar chromium-headless-shell primeiro, fallback para chromium
-                try:
-                    browser = p.chromium.launch(headless=True, channel="chromium-headless-shell")
-                except Exception:
-                    browser = p.chromium.launch(headless=True)
-                context = browser.new_context(user_agent=self.session.headers.get('User-Agent'))
-                page = context.new_page()
-                # Estratégia multi-fase de carregamento
-                for wait_state in ['domcontentloaded', 'load', 'networkidle']:
-                    try:
-                        page.goto(url, timeout=60000, wait_until=wait_state)
-                        break
-                    except Exception as _:
-                        if wait_state == 'networkidle':
-                            raise
-                        continue
-                # Esperar elementos típicos de artigo
-                try:
-                    page.wait_for_selector('article, main, [itemprop="articleBody"], .post-content, .entry-content, .article-body, .news-content', timeout=7000)
-                except Exception:
-                    pass
-                # Scroll para carregar lazy content
-                try:
-                    page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                    page.wait_for_timeout(1500)
-                    page.evaluate("window.scrollTo(0, 0)")
-                except Exception:
-                    pass
-                # Tentar clicar banners de consentimento comuns
-                try:
-                    selectors = [
-                        'text=Aceitar', 'text=Concordo', 'text=Accept', 'text=Accept all', 'text=I agree',
-                        'button[aria-label="Aceitar tudo"]', 'button[aria-label="Accept all"]'
-                    ]
-                    for sel in selectors:
-                        try:
-                            btn = page.locator(sel)
-                            if btn and btn.count() > 0:
-                                btn.first.click(timeout=2000)
-                                page.wait_for_timeout(1000)
-                                break
-                        except Exception:
-                            continue
-                except Exception:
-                    pass
-                page.wait_for_timeout(5000)
-                final_url = page.url
-                html = page.content()
-                context.close()
-                browser.close()
+            if lean:
+                final_url, html = fetch_rendered(url)
                 print(f"➡ URL final: {final_url}")
                 return final_url, html
+            final_url, html = get_browser_pool().run(self._load_legacy, url)
+            print(f"➡ URL final: {final_url}")
+            return final_url, html
         except Exception as e:
             print(f"⚠ Falha ao obter HTML via navegador: {e}")
         return None, None
 
-    def _find_external_links_from_google_html(self, html: str, base_url: str) -> list:
-        """Encontra links externos (publisher) no HTML do cluster do Google News em ordem de exibição."""
-        links = []
+    def _load_legacy(self, page, url: str):
+        """Carregamento antigo: espera tudo carregar, rola a página e aguarda tempos fixos."""
+        # Estratégia multi-fase de carregamento
+        for wait_state in ['domcontentloaded', 'load', 'networkidle']:
+            try:
+                page.goto(url, timeout=60000, wait_until=wait_state)
+                break
+            except Exception as _:
+                if wait_state == 'networkidle':
+                    raise
+                continue
+        # Esperar elementos típicos de artigo
         try:
-            soup = BeautifulSoup(html, 'html.parser')
-            for a in soup.find_all('a', href=True):
-                href = a.get('href')
-                if not href:
-                    continue
-                if href.startswith('./'):
-                    href = urljoin(base_url, href)
-                # Decodificar links do Google que encapsulam url=
+            page.wait_for_selector(ARTICLE_SELECTOR, timeout=7000)
+        except Exception:
+            pass
+        # Scroll para carregar lazy content
+        try:
+            page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+            page.wait_for_timeout(1500)
+            page.evaluate("window.scrollTo(0, 0)")
+        except Exception:
+            pass
+        # Tentar clicar banners de consentimento comuns
+        try:
+            for sel in CONSENT_SELECTORS:
                 try:
-                    parsed = urlparse(href)
-                    if 'google.com' in parsed.netloc and ('url=' in parsed.query or parsed.path.startswith('/url')):
-                        from urllib.parse import parse_qs
-                        qs = parse_qs(parsed.query)
-                        if 'url' in qs and qs['url']:
-                            href = qs['url'][0]
+                    btn = page.locator(sel)
+                    if btn and btn.count() > 0:
+                        btn.first.click(timeout=2000)
+                        page.wait_for_timeout(1000)
+                        break
                 except Exception:
-                    pass
-                # Filtrar links externos reais
-                if href.startswith('http') and 'news.google.com' not in href and 'google.com' not in href:
-                    # Evitar duplicados preservando ordem
-                    if href not in links:
-                        links.append(href)
+                    continue
+        except Exception:
+            pass
+        page.wait_for_timeout(5000)
+        return page.url, page.content()
+
+    def _find_external_links_from_google_html(self, html: str, base_url: str) -> list:
+        """Encontra links externos (publisher) no HTML do cluster do Google News em ordem de exibição."""
+        try:
+            tree = html_engine.parse_html(html)
+            return html_engine.external_links(tree, base_url) if tree is not None else []
         except Exception as e:
             print(f"⚠ Erro ao extrair links externos do cluster: {e}")
-        return links
+        return []
 
     def _extract_publisher_url_from_google_html(self, html: str, base_url: str) -> Optional[str]:
         """Tenta extrair a URL do publisher do HTML de uma página do Google News."""
-        try:
-            soup = BeautifulSoup(html, 'html.parser')
-            # 1) Meta refresh
-            meta_refresh = soup.find('meta', attrs={'http-equiv': re.compile('refresh', re.I)})
-            if meta_refresh and meta_refresh.get('content'):
-                content = meta_refresh.get('content')
-                m = re.search(r'url=([^;]+)$', content, re.I)
-                if m:
-                    href = m.group(1).strip().strip('"').strip("'")
-                    if href.startswith('./'):
-                        href = urljoin(base_url, href)
-                    if href.startswith('http') and 'news.google.com' not in href:
-                        return href
-
-            # 2) Link canonical
-            link_canonical = soup.find('link', rel=lambda x: x and 'canonical' in x)
-            if link_canonical and link_canonical.get('href'):
-                href = link_canonical.get('href')
-                if href.startswith('http') and 'news.google.com' not in href:
-                    return href
-
-            # 3) Primeiro link externo http(s)
-            for a in soup.find_all('a', href=True):
-                href = a.get('href')
-                if href.startswith('./'):
-                    href = urljoin(base_url, href)
-                if href.startswith('http') and 'news.google.com' not in href and 'google.com' not in href:
-                    return href
-        except Exception as e:
-            print(f"⚠ Erro ao extrair publisher URL do HTML: {e}")
-        return None
+        return publisher_url_from_html(html, base_url)
     
     def _extract_from_google_news(self, google_url: str) -> Optional[Dict]:
         """Extrai conteúdo de sites originais mencionados no Google News"""
@@ -787,11 +778,11 @@ class NewsContentExtractor:
         return ''
     
     def _extract_main_content(self, soup: BeautifulSoup) -> str:
-        """Extrai o conteúdo principal da notícia"""
-        # Remover elementos indesejados
-        for element in soup(['script', 'style', 'nav', 'header', 'footer', 'aside', 'advertisement']):
-            element.decompose()
-        
+        """Extrai o conteúdo principal da notícia.
+
+        Não altera a árvore (ela é compartilhada via ArticleDocument): menus,
+        cabeçalho, rodapé e scripts são ignorados em vez de removidos.
+        """
         # Procurar por conteúdo principal
         content_selectors = [
             '.conteudo',
@@ -818,7 +809,7 @@ class NewsContentExtractor:
         ]
         
         for selector in content_selectors:
-            element = soup.select_one(selector)
+            element = next((el for el in soup.select(selector) if not _soup_in_noise(el)), None)
             if element:
                 # Limpar conteúdo
                 content = self._clean_content(element)
@@ -826,11 +817,11 @@ class NewsContentExtractor:
                     return content
         
         # Fallback: procurar por parágrafos
-        paragraphs = soup.find_all('p')
+        paragraphs = [p for p in soup.find_all('p') if not _soup_in_noise(p)]
         if paragraphs:
             content_parts = []
             for p in paragraphs:
-                text = p.get_text().strip()
+                text = _soup_visible_text(p).strip()
                 if text and len(text) > 20:  # Parágrafo deve ter pelo menos 20 caracteres
                     content_parts.append(text)
             
@@ -841,12 +832,8 @@ class NewsContentExtractor:
     
     def _clean_content(self, element) -> str:
         """Limpa o conteúdo extraído"""
-        # Remover elementos indesejados dentro do conteúdo
-        for unwanted in element(['script', 'style', 'nav', 'advertisement', 'ad', '.ad']):
-            unwanted.decompose()
-        
-        # Extrair texto
-        text = element.get_text()
+        # Extrair texto (sem scripts, menus e anúncios de dentro do conteúdo)
+        text = _soup_visible_text(element)
         
         # Limpar texto
         text = re.sub(r'\s+', ' ', text)  # Múltiplos espaços em um
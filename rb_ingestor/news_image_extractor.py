@@ -3,11 +3,12 @@
 Sistema para extrair imagens da notícia original
 """
 import re
-import requests
-from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
 import logging
 
+from rb_ingestor import article_document
+from rb_ingestor.html_engine import css, text
+
 logger = logging.getLogger(__name__)
 
 class NewsImageExtractor:
@@ -38,11 +39,15 @@ class NewsImageExtractor:
             }
         }
     
-    def extract_images_from_news(self, news_url: str, news_title: str = "") -> dict:
+    def extract_images_from_news(self, news_url: str, news_title: str = "", doc=None) -> dict:
         """
-        Extrai imagens da notícia original
+        Extrai imagens da notícia original (``doc``: ArticleDocument já baixado)
         """
         try:
+            # Página já parseada (ou GET pela sessão compartilhada)
+            doc = doc or article_document.load(news_url, timeout=10)
+            news_url = doc.url
+
             # Parse da URL para identificar o site
             parsed_url = urlparse(news_url)
             domain = parsed_url.netloc.lower()
@@ -53,22 +58,8 @@ class NewsImageExtractor:
             
             logger.info(f"🔍 Extraindo imagens de: {domain}")
             
-            # Headers para simular navegador
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Accept-Language': 'pt-BR,pt;q=0.9,en;q=0.8',
-            }
-            
-            # Fazer requisição
-            response = requests.get(news_url, headers=headers, timeout=10)
-            response.raise_for_status()
-            
-            # Parse do HTML
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
             # Extrair imagens usando seletores específicos do site
-            images = self._extract_images_with_selectors(soup, domain, news_url)
+            images = self._extract_images_with_selectors(doc.tree, domain, news_url) if doc.tree is not None else []
             
             if images:
                 logger.info(f"✅ {len(images)} imagens encontradas")
@@ -86,7 +77,7 @@ class NewsImageExtractor:
             logger.error(f"❌ Erro ao extrair imagens: {e}")
             return {'success': False, 'images': [], 'error': str(e)}
     
-    def _extract_images_with_selectors(self, soup, domain, base_url):
+    def _extract_images_with_selectors(self, tree, domain, base_url):
         """Extrai imagens usando seletores específicos do site"""
         images = []
         
@@ -97,7 +88,7 @@ class NewsImageExtractor:
         for selector_type in ['main_image', 'gallery_images', 'fallback']:
             if selector_type in selectors:
                 for selector in selectors[selector_type]:
-                    elements = soup.select(selector)
+                    elements = css(selector)(tree)
                     for element in elements:
                         img_data = self._process_image_element(element, base_url)
                         if img_data and img_data not in images:
@@ -125,11 +116,11 @@ class NewsImageExtractor:
             
             # Obter caption se disponível
             caption = ""
-            parent = element.parent
-            if parent:
-                caption_elem = parent.find(['figcaption', '.caption', '.image-caption'])
-                if caption_elem:
-                    caption = caption_elem.get_text().strip()
+            parent = element.getparent()
+            if parent is not None:
+                caption_elem = parent.find('.//figcaption')
+                if caption_elem is not None:
+                    caption = text(caption_elem).strip()
             
             return {
                 'url': img_url,
@@ -1,11 +1,11 @@
 # rb_ingestor/ping.py
-import requests
+from rb_ingestor import http_client
 
-UA = "RadarBRBot/1.0 (+https://radarbr.com)"
+UA = http_client.BOT_USER_AGENT
 
 def _try_get(url: str, params: dict) -> bool:
     try:
-        r = requests.get(
+        r = http_client.get(
             url,
             params=params,
             headers={"User-Agent": UA, "Accept": "text/html,application/xhtml+xml"},
@@ -0,0 +1,384 @@
+# rb_ingestor/pipeline.py
+"""
+Pipeline de ingestão em etapas, com estado persistido e retomada.
+
+Antes cada comando (publish_topic, automacao_render, smart_automation,
+smart_trends_publish) fazia busca → extração → geração → categoria →
+YouTube → imagem → gravação → ping numa função só: um erro na imagem
+jogava fora o artigo que a IA já tinha gerado e nada rodava em paralelo.
+
+Agora cada matéria é um ``IngestJob``:
+
+- o comando produtor só monta a entrada (``enqueue``) e chama ``Pipeline.run``
+  (ou deixa para ``python manage.py ingest_pipeline --run``)
+- as etapas são métodos ``stage_<etapa>(job, artefatos)`` do próprio comando
+  (o "fluxo"); o dict devolvido vira ``job.artefatos[<etapa>]`` e é gravado
+  no banco antes da próxima etapa. Etapa sem método é pulada
+- em erro o job fica ``falhou`` parado na etapa que quebrou; a retomada
+  continua dali, sem refazer download nem geração
+- ``SkipJob`` descarta o job (duplicata, dry-run...) sem contar como falha
+- a primeira etapa, ``gate``, barra duplicatas pelo título/URL/tópico de
+  entrada num índice em memória (dedup.py), antes de qualquer navegador,
+  IA ou busca de imagem; cada notícia gravada entra nesse índice
+- cada etapa tem um limite de concorrência (PIPELINE_<ETAPA>_CONCURRENCY):
+  vários jobs andam ao mesmo tempo, mas só N chamam a IA, 1 grava etc.
+- ``ping`` roda uma vez por execução para todos os jobs gravados
+  (``stage_ping(jobs)``)
+
+Vários processos (cron de 4 em 4 h, cron de backup, run_scheduler, webhook)
+e vários nós podem rodar o pipeline ao mesmo tempo:
+
+- o job é reivindicado antes de rodar: ``lease_dono``/``lease_expira``.
+  No Postgres com ``SELECT ... FOR UPDATE SKIP LOCKED``; no SQLite (sem
+  lock de linha) com um UPDATE condicional por job, que o SQLite serializa
+- cada etapa concluída renova o lease; toda gravação do job é condicionada
+  ao dono, então quem perdeu o lease (processo travado) para sem
+  sobrescrever nada. A etapa ``save`` grava a notícia e o job na mesma
+  transação
+- lease vencido (processo morreu) libera o job para outro worker
+- ``chave`` de idempotência: hash da URL normalizada da notícia de origem
+  ou do conteúdo (tópico + janela de tempo). Enfileirar de novo a mesma
+  chave devolve o job existente em vez de criar outro
+"""
+import hashlib
+import itertools
+import os
+import re
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from datetime import timedelta
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from django.apps import apps
+from django.db import IntegrityError, connection, connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from core.metrics import process_id
+from rb_ingestor import dedup
+
+STAGES = ("gate", "fetch", "extract", "generate", "categorize", "youtube", "image", "save", "ping")
+# Etapas executadas uma vez por execução, para todos os jobs que chegaram nelas
+BATCH_STAGES = ("ping",)
+# Etapas cujo efeito colateral (notícia no banco) é gravado junto com o job, numa transação
+ATOMIC_STAGES = ("save",)
+DONE = "fim"
+
+DEFAULT_CONCURRENCY = {
+    # Consulta ao índice de duplicatas em memória (dedup.py)
+    "gate": 16,
+    "fetch": 8,
+    "extract": 4,
+    # Chamadas à IA: o llm_client também limita o processo todo (LLM_CONCURRENCY)
+    "generate": int(os.getenv("LLM_CONCURRENCY", "3")),
+    "categorize": 4,
+    "youtube": 2,
+    "image": 3,
+    "save": 1,
+    "ping": 1,
+}
+CONCURRENCY = {
+    stage: int(os.getenv(f"PIPELINE_{stage.upper()}_CONCURRENCY", str(default)))
+    for stage, default in DEFAULT_CONCURRENCY.items()
+}
+WORKERS = int(os.getenv("PIPELINE_WORKERS", "4"))
+MAX_ATTEMPTS = int(os.getenv("PIPELINE_MAX_ATTEMPTS", "3"))
+# Cada etapa concluída renova o lease; sem renovação nesse tempo o job volta para a fila
+LEASE_SECONDS = int(os.getenv("PIPELINE_LEASE_SECONDS", "600"))
+
+_STATE_FIELDS = ("etapa", "status", "artefatos", "tempos", "tentativas", "erro", "noticia_id")
+
+# Parâmetros de rastreamento que não mudam a notícia
+_TRACKING_PARAMS = re.compile(r"^(utm_\w+|fbclid|gclid|ocid|cmpid|mc_cid|mc_eid|ref|xtor)$", re.I)
+
+
+class SkipJob(Exception):
+    """Descarta o job sem contar como falha (duplicata, notícia inválida, dry-run)."""
+
+
+class LeaseLost(Exception):
+    """Outro worker assumiu o job (lease vencido): parar sem gravar nada."""
+
+
+def _model():
+    return apps.get_model("rb_ingestor", "IngestJob")
+
+
+def normalize_url(url: str) -> str:
+    """URL canônica para comparar notícias: sem fragmento, www, barra final e parâmetros de rastreamento."""
+    parts = urlsplit((url or "").strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = urlencode(sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                             if not _TRACKING_PARAMS.match(k)))
+    path = re.sub(r"/+$", "", parts.path) or "/"
+    return urlunsplit(("https" if parts.scheme in ("http", "https") else parts.scheme, host, path, query, ""))
+
+
+def idempotency_key(url: str = None, content: str = None) -> str:
+    """Chave do job: hash da URL normalizada ou, sem URL, do conteúdo normalizado."""
+    if url:
+        return "url:" + hashlib.sha1(normalize_url(url).encode("utf-8")).hexdigest()
+    normalized = re.sub(r"\s+", " ", (content or "").strip().lower())
+    return "conteudo:" + hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+
+def enqueue(origem: str, entrada: dict, titulo: str = "", url: str = "", chave: str = None):
+    """Cria o job com a entrada do produtor (precisa ser serializável em JSON).
+
+    Com ``chave``, se já existe job com a mesma chave ele é devolvido no
+    lugar de um novo (outro cron/worker já pegou essa notícia).
+    """
+    IngestJob = _model()
+    if chave:
+        existing = IngestJob.objects.filter(chave=chave).first()
+        if existing is not None:
+            return existing
+    try:
+        with transaction.atomic():
+            return IngestJob.objects.create(
+                origem=origem,
+                titulo=(titulo or "")[:300],
+                url=url or "",
+                chave=chave or None,
+                artefatos={"entrada": entrada},
+            )
+    except IntegrityError:
+        # Outro processo criou a mesma chave entre a consulta e o INSERT
+        if not chave:
+            raise
+        return IngestJob.objects.get(chave=chave)
+
+
+def _claimable(now):
+    """Jobs a (re)processar sem dono: pendentes, falhos com tentativas sobrando e com lease vencido."""
+    return (
+        Q(status="pendente") | Q(status="falhou", tentativas__lt=MAX_ATTEMPTS) | Q(status="executando")
+    ) & (Q(lease_expira__isnull=True) | Q(lease_expira__lt=now))
+
+
+def resumable(origem: str = None):
+    """Jobs que um worker pode reivindicar agora."""
+    qs = _model().objects.filter(_claimable(timezone.now()))
+    if origem:
+        qs = qs.filter(origem=origem)
+    return qs.order_by("criado_em")
+
+
+def claim(worker: str, limit: int = 20, origem: str = None, ids=None) -> list:
+    """Reivindica até ``limit`` jobs livres para ``worker`` e devolve os que conseguiu.
+
+    Postgres (e bancos com SKIP LOCKED): as linhas travadas por outro worker
+    são puladas na própria consulta. SQLite: UPDATE condicional job a job
+    (compare-and-set); o SQLite serializa as escritas, então só um vence.
+    """
+    IngestJob = _model()
+    now = timezone.now()
+    lease = {"lease_dono": worker, "lease_expira": now + timedelta(seconds=LEASE_SECONDS)}
+    qs = resumable(origem)
+    if ids is not None:
+        qs = qs.filter(pk__in=list(ids))
+
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            pks = list(qs.select_for_update(skip_locked=True).values_list("pk", flat=True)[:limit])
+            IngestJob.objects.filter(pk__in=pks).update(**lease)
+    else:
+        pks = []
+        for pk in qs.values_list("pk", flat=True)[:limit * 2]:
+            if IngestJob.objects.filter(_claimable(now), pk=pk).update(**lease):
+                pks.append(pk)
+                if len(pks) >= limit:
+                    break
+    return list(IngestJob.objects.filter(pk__in=pks, lease_dono=worker).order_by("criado_em"))
+
+
+def load_flow(origem: str):
+    """Instância do comando produtor, que implementa as etapas do seu fluxo."""
+    from django.core.management import load_command_class
+    return load_command_class("rb_ingestor", origem)
+
+
+class Pipeline:
+    _ids = itertools.count(1)
+
+    def __init__(self, flows: dict = None, workers: int = WORKERS, concurrency: dict = None, log=print):
+        # origem -> objeto com os métodos stage_<etapa>; carregado sob demanda se faltar
+        self.flows = dict(flows or {})
+        self.workers = max(1, workers)
+        limits = {**CONCURRENCY, **(concurrency or {})}
+        self._slots = {stage: threading.BoundedSemaphore(max(1, limits.get(stage, 1))) for stage in STAGES}
+        self._flows_lock = threading.Lock()
+        self.log = log
+        # Dono dos leases: host:pid:instância
+        self.worker = f"{process_id()}:{next(self._ids)}"
+
+    def _flow(self, origem: str):
+        with self._flows_lock:
+            if origem not in self.flows:
+                self.flows[origem] = load_flow(origem)
+            return self.flows[origem]
+
+    def run(self, jobs) -> Counter:
+        """Reivindica e processa os jobs dados; devolve a contagem por status final dos que rodaram aqui.
+
+        Jobs já concluídos ou com lease de outro worker são pulados.
+        """
+        jobs = list({job.pk: job for job in jobs}.values())
+        claimed = {job.pk for job in claim(self.worker, limit=len(jobs), ids=[job.pk for job in jobs])} if jobs else set()
+        mine = []
+        for job in jobs:
+            if job.pk in claimed:
+                job.refresh_from_db()
+                mine.append(job)
+        if len(mine) < len(jobs):
+            self.log(f"⏭ {len(jobs) - len(mine)} job(s) já concluído(s) ou com outro worker")
+        return self.process(mine)
+
+    def run_next(self, limit: int = 20, origem: str = None) -> Counter:
+        """Modo worker: reivindica os próximos jobs livres da fila e processa."""
+        return self.process(claim(self.worker, limit, origem))
+
+    def process(self, jobs) -> Counter:
+        """Processa jobs já reivindicados por este worker (``claim``)."""
+        if not jobs:
+            return Counter()
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(jobs)), thread_name_prefix="pipeline") as pool:
+            list(pool.map(self._run_job, jobs))
+        self._run_batch_stages(jobs)
+        return Counter(job.status for job in jobs)
+
+    def _persist(self, job, release: bool = False):
+        """Grava o estado do job só se este worker ainda é o dono (e renova ou libera o lease)."""
+        fields = {name: getattr(job, name) for name in _STATE_FIELDS}
+        fields["atualizado_em"] = timezone.now()
+        fields["lease_expira"] = None if release else fields["atualizado_em"] + timedelta(seconds=LEASE_SECONDS)
+        if release:
+            fields["lease_dono"] = ""
+        if not _model().objects.filter(pk=job.pk, lease_dono=self.worker).update(**fields):
+            raise LeaseLost(f"job {job.pk} foi assumido por outro worker")
+        job.lease_expira = fields["lease_expira"]
+        if release:
+            job.lease_dono = ""
+
+    def _run_job(self, job):
+        stage = job.etapa
+        try:
+            flow = self._flow(job.origem)
+            job.status = "executando"
+            self._persist(job)
+            for stage in STAGES[STAGES.index(job.etapa):]:
+                if stage in BATCH_STAGES:
+                    break
+                handler = getattr(flow, f"stage_{stage}", None)
+                atomic = transaction.atomic() if stage in ATOMIC_STAGES else nullcontext()
+                with self._slots[stage], atomic:
+                    if stage in ATOMIC_STAGES:
+                        # Confirma a posse antes do efeito colateral; no SQLite a escrita
+                        # logo no início da transação também evita o "database is locked"
+                        self._persist(job)
+                    if handler is not None:
+                        start = time.perf_counter()
+                        job.artefatos[stage] = handler(job, job.artefatos) or {}
+                        job.tempos[stage] = round((time.perf_counter() - start) * 1000)
+                    job.etapa = STAGES[STAGES.index(stage) + 1]
+                    job.erro = ""
+                    # Na etapa save, ainda dentro da transação: sem lease, a notícia também é desfeita
+                    self._persist(job)
+                if stage == "save" and job.noticia_id:
+                    # Próximos jobs (desta execução inclusive) já barram a mesma matéria no gate
+                    dedup.remember(job.noticia.titulo, [job.noticia.fonte_url, job.url])
+        except LeaseLost as e:
+            self.log(f"⚠ Job {job.pk} abandonado em {stage}: {e}")
+            job.status = "perdido"
+        except SkipJob as e:
+            job.status = "descartado"
+            job.erro = str(e)
+            self._finish(job)
+            self.log(f"⏭ Job {job.pk} descartado em {stage}: {e}")
+        except Exception as e:
+            job.status = "falhou"
+            job.tentativas += 1
+            job.erro = f"{stage}: {type(e).__name__}: {e}"[:2000]
+            self._finish(job)
+            self.log(f"❌ Job {job.pk} falhou em {stage} (tentativa {job.tentativas}/{MAX_ATTEMPTS}): {e}")
+        finally:
+            # Cada thread do pool abre a própria conexão
+            connections.close_all()
+
+    def _finish(self, job):
+        try:
+            self._persist(job, release=True)
+        except LeaseLost as e:
+            self.log(f"⚠ Job {job.pk}: {e}")
+
+    def _run_batch_stages(self, jobs):
+        for stage in BATCH_STAGES:
+            ready = [job for job in jobs if job.status == "executando" and job.etapa == stage]
+            by_origin = {}
+            for job in ready:
+                by_origin.setdefault(job.origem, []).append(job)
+            for origem, group in by_origin.items():
+                handler = getattr(self._flow(origem), f"stage_{stage}", None)
+                if handler is not None:
+                    start = time.perf_counter()
+                    try:
+                        handler(group)
+                    except Exception as e:
+                        self.log(f"⚠ Etapa {stage} ({origem}) falhou: {e}")
+                    elapsed = round((time.perf_counter() - start) * 1000)
+                    for job in group:
+                        job.tempos[stage] = elapsed
+            for job in ready:
+                job.etapa = STAGES[STAGES.index(stage) + 1] if stage != STAGES[-1] else DONE
+        for job in jobs:
+            if job.status == "executando" and job.etapa == DONE:
+                job.status = "concluido"
+                self._finish(job)
+
+
+def summary(origem: str = None) -> dict:
+    """Contagem por status/etapa e tempo médio de cada etapa (para ingest_pipeline --stats)."""
+    from django.db.models import Count
+
+    qs = _model().objects.all()
+    if origem:
+        qs = qs.filter(origem=origem)
+    by_status = {row["status"]: row["n"] for row in qs.values("status").annotate(n=Count("id"))}
+    stuck = {
+        row["etapa"]: row["n"]
+        for row in qs.filter(status__in=["pendente", "falhou", "executando"]).values("etapa").annotate(n=Count("id"))
+    }
+    leased = qs.filter(status="executando", lease_expira__gte=timezone.now()).count()
+    totals, counts = Counter(), Counter()
+    for tempos in qs.values_list("tempos", flat=True).iterator():
+        for stage, ms in (tempos or {}).items():
+            totals[stage] += ms
+            counts[stage] += 1
+    stage_ms = {stage: round(totals[stage] / counts[stage]) for stage in STAGES if counts[stage]}
+    # Duplicatas barradas no gate x descobertas depois (com etapas caras já gastas)
+    discarded = {
+        row["etapa"]: row["n"]
+        for row in qs.filter(status="descartado", erro__startswith="duplicata").values("etapa").annotate(n=Count("id"))
+    }
+    gated = discarded.pop("gate", 0)
+    per_job = sum(ms for stage, ms in stage_ms.items() if stage not in ("gate",) + BATCH_STAGES)
+    return {
+        "jobs": sum(by_status.values()),
+        "status": by_status,
+        "waiting_by_stage": stuck,
+        "leased": leased,
+        "stage_ms": stage_ms,
+        "duplicates": {
+            "gated": gated,
+            "late": sum(discarded.values()),
+            "late_by_stage": discarded,
+            # Estimativa: média das etapas que o job barrado deixou de rodar
+            "avoided_seconds": round(gated * per_job / 1000, 1),
+        },
+        "concurrency": CONCURRENCY,
+    }
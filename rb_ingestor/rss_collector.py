@@ -0,0 +1,182 @@
+# rb_ingestor/rss_collector.py
+"""
+Coleta concorrente dos feeds RSS do Google News (asyncio + httpx).
+
+Em vez de buscar um tópico por vez com ``requests`` (até 15s cada), todos
+os feeds são pedidos ao mesmo tempo:
+
+- limite de conexões simultâneas por host (RSS_PER_HOST_LIMIT)
+- prazo total compartilhado (RSS_DEADLINE): o que não chegou até lá é
+  cancelado e a coleta segue com os feeds que responderam
+- parse com lxml (XML parser em C, sem resolver entidades externas)
+- itens mesclados na ordem dos tópicos e sem duplicatas (link ou título)
+- feeds passam pelo cache HTTP em disco (http_cache.py): dentro do TTL não
+  vão à rede e, depois dele, são revalidados com ETag/Last-Modified
+
+Os comandos síncronos usam ``collect_topics``.
+"""
+import asyncio
+import os
+import re
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import httpx
+from lxml import etree
+
+from rb_ingestor import http_cache
+from rb_ingestor.http_client import HTTP2_AVAILABLE, USER_AGENT
+
+GOOGLE_NEWS_RSS = "https://news.google.com/rss/search?q={q}&hl=pt-BR&gl=BR&ceid=BR:pt-BR"
+
+DEADLINE = float(os.getenv("RSS_DEADLINE", "12"))
+PER_HOST_LIMIT = int(os.getenv("RSS_PER_HOST_LIMIT", "6"))
+REQUEST_TIMEOUT = float(os.getenv("RSS_REQUEST_TIMEOUT", "10"))
+
+_PARSER = etree.XMLParser(resolve_entities=False, no_network=True, recover=True, huge_tree=False)
+
+
+def topic_feed_url(topic: str) -> str:
+    return GOOGLE_NEWS_RSS.format(q=urllib.parse.quote_plus(topic))
+
+
+def _text(item, tag: str) -> str:
+    value = item.findtext(tag)
+    return value.strip() if value else ""
+
+
+def parse_feed(content: bytes, max_items: Optional[int] = None, topic: str = "") -> List[Dict]:
+    """Itens de um feed RSS 2.0 (title, link, description, source, source_url, published)."""
+    if not content or not content.strip():
+        return []
+    root = etree.fromstring(content, parser=_PARSER)
+    if root is None:
+        return []
+    items = []
+    for item in root.iterfind("channel/item"):
+        source = item.find("source")
+        items.append({
+            "title": _text(item, "title"),
+            "link": _text(item, "link"),
+            "description": _text(item, "description"),
+            "source": _text(item, "source"),
+            # Site do veículo (<source url="https://g1.globo.com">): o link do item é do Google News
+            "source_url": (source.get("url") or "").strip() if source is not None else "",
+            "published": _text(item, "pubDate"),
+            "topic": topic,
+        })
+        if max_items and len(items) >= max_items:
+            break
+    return items
+
+
+def _title_key(title: str) -> str:
+    # O Google News acrescenta " - Veículo" ao título
+    title = re.sub(r"\s+-\s+[^-]{2,60}$", "", title or "")
+    return re.sub(r"\W+", " ", title.lower()).strip()
+
+
+def merge_items(feeds: List[List[Dict]]) -> List[Dict]:
+    """Mescla os feeds na ordem recebida, descartando links/títulos repetidos."""
+    seen_links, seen_titles, merged = set(), set(), []
+    for items in feeds:
+        for item in items:
+            link, title = item.get("link"), _title_key(item.get("title"))
+            if (link and link in seen_links) or (title and title in seen_titles):
+                continue
+            seen_links.add(link)
+            seen_titles.add(title)
+            merged.append(item)
+    return merged
+
+
+def _cached(url: str):
+    if not http_cache.ENABLED:
+        return None
+    try:
+        return http_cache.get_cache().get(url)
+    except Exception as e:
+        print(f"⚠ Cache HTTP indisponível: {e}")
+        return None
+
+
+async def _fetch_feed(client, semaphores, url: str, topic: str, max_items: int) -> List[Dict]:
+    entry = _cached(url)
+    if entry is not None and entry.fresh:
+        http_cache.get_cache().hit(entry)
+        return parse_feed(entry.body, max_items=max_items, topic=topic)
+
+    host = urllib.parse.urlparse(url).netloc
+    semaphore = semaphores.setdefault(host, asyncio.Semaphore(PER_HOST_LIMIT))
+    async with semaphore:
+        response = await client.get(url, headers=entry.conditional_headers() if entry else None)
+    if response.status_code == 304 and entry is not None:
+        http_cache.get_cache().hit(entry, revalidated=True, headers=dict(response.headers))
+        return parse_feed(entry.body, max_items=max_items, topic=topic)
+    if response.status_code != 200:
+        raise httpx.HTTPStatusError(f"HTTP {response.status_code}", request=response.request, response=response)
+    if http_cache.ENABLED:
+        try:
+            http_cache.get_cache().store(url, 200, dict(response.headers), response.content)
+        except Exception as e:
+            print(f"⚠ Falha ao gravar no cache HTTP: {e}")
+    return parse_feed(response.content, max_items=max_items, topic=topic)
+
+
+async def collect_async(feeds: List[tuple], max_items: int = 5, deadline: float = None) -> Dict:
+    """Busca ``[(tópico, url), ...]`` em paralelo; devolve itens por tópico e estatísticas."""
+    deadline = DEADLINE if deadline is None else deadline
+    started = time.perf_counter()
+    semaphores = {}
+    results, errors = {}, {}
+    async with httpx.AsyncClient(
+        headers={"User-Agent": USER_AGENT, "Accept-Language": "pt-BR,pt;q=0.9"},
+        timeout=httpx.Timeout(REQUEST_TIMEOUT, connect=5.0),
+        limits=httpx.Limits(max_connections=PER_HOST_LIMIT * 4, max_keepalive_connections=PER_HOST_LIMIT),
+        follow_redirects=True,
+        http2=HTTP2_AVAILABLE,
+    ) as client:
+        tasks = {
+            asyncio.ensure_future(_fetch_feed(client, semaphores, url, topic, max_items)): topic
+            for topic, url in feeds
+        }
+        done, pending = await asyncio.wait(tasks, timeout=deadline)
+        for task in pending:
+            task.cancel()
+            errors[tasks[task]] = "prazo esgotado"
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        for task in done:
+            try:
+                results[tasks[task]] = task.result()
+            except Exception as e:
+                errors[tasks[task]] = str(e) or type(e).__name__
+    return {
+        "items": {topic: results.get(topic, []) for topic, _ in feeds},
+        "errors": errors,
+        "elapsed": time.perf_counter() - started,
+    }
+
+
+def _run(coro):
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    # Já existe um loop nesta thread: roda a coleta numa thread própria
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+
+def collect_topics(topics: List[str], max_items: int = 5, deadline: float = None) -> List[Dict]:
+    """Wrapper síncrono: feeds de todos os tópicos em paralelo, mesclados e sem duplicatas."""
+    feeds = [(topic, topic_feed_url(topic)) for topic in topics]
+    result = _run(collect_async(feeds, max_items=max_items, deadline=deadline))
+    merged = merge_items([result["items"][topic] for topic in topics])
+    failed = f", {len(result['errors'])} falha(s)" if result["errors"] else ""
+    print(f"📡 RSS: {len(topics)} feeds em {result['elapsed']:.1f}s, {len(merged)} itens únicos{failed}")
+    for topic, error in result["errors"].items():
+        print(f"⚠ Falha RSS tópico {topic}: {error}")
+    return merged
@@ -3,12 +3,14 @@
 Sistema para extrair categorias dos sites de origem das notícias
 """
 import requests
-from bs4 import BeautifulSoup
 import re
 from urllib.parse import urlparse
 import time
 from django.conf import settings
 
+from rb_ingestor import article_document
+from rb_ingestor.html_engine import css, text
+
 class SiteCategorizer:
     """Extrai categorias dos sites de origem das notícias"""
     
@@ -136,13 +138,16 @@ class SiteCategorizer:
             'educacao': 'brasil'
         }
     
-    def extract_category_from_url(self, url, timeout=10):
+    def extract_category_from_url(self, url, timeout=10, doc=None):
         """
         Extrai categoria do site de origem da notícia
+
+        ``doc`` (ArticleDocument) evita baixar e parsear a página de novo; sem
+        ele, usa o documento já baixado nesta execução ou faz o GET.
         """
         try:
             # Parse da URL para identificar o domínio
-            parsed_url = urlparse(url)
+            parsed_url = urlparse(doc.url if doc else url)
             domain = parsed_url.netloc.lower()
             
             # Remover www. se presente
@@ -151,37 +156,25 @@ class SiteCategorizer:
             
             print(f"🔍 Analisando site: {domain}")
             
-            # Headers para simular navegador
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Accept-Language': 'pt-BR,pt;q=0.9,en;q=0.8',
-                'Accept-Encoding': 'gzip, deflate',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1',
-            }
-            
-            # Fazer requisição
-            response = requests.get(url, headers=headers, timeout=timeout)
-            response.raise_for_status()
-            
-            # Parse do HTML
-            soup = BeautifulSoup(response.content, 'html.parser')
+            # Página já parseada (ou GET pela sessão compartilhada)
+            tree = (doc or article_document.load(url, timeout=timeout)).tree
+            if tree is None:
+                return None
             
             # Tentar extrair categoria usando seletores específicos do site
-            category = self._extract_with_selectors(soup, domain)
+            category = self._extract_with_selectors(tree, domain)
             
             if category:
                 return self._normalize_category(category)
             
             # Fallback: tentar extrair de breadcrumbs genéricos
-            category = self._extract_from_breadcrumbs(soup)
+            category = self._extract_from_breadcrumbs(tree)
             
             if category:
                 return self._normalize_category(category)
             
             # Fallback: tentar extrair de meta tags
-            category = self._extract_from_meta_tags(soup)
+            category = self._extract_from_meta_tags(tree)
             
             if category:
                 return self._normalize_category(category)
@@ -189,27 +182,27 @@ class SiteCategorizer:
             return None
             
         except requests.exceptions.RequestException as e:
-            self.stdout.write(f"⚠ Erro ao acessar {url}: {e}")
+            print(f"⚠ Erro ao acessar {url}: {e}")
             return None
         except Exception as e:
-            self.stdout.write(f"⚠ Erro ao processar {url}: {e}")
+            print(f"⚠ Erro ao processar {url}: {e}")
             return None
     
-    def _extract_with_selectors(self, soup, domain):
+    def _extract_with_selectors(self, tree, domain):
         """Extrai categoria usando seletores específicos do site"""
         if domain in self.site_selectors:
             selectors = self.site_selectors[domain]['category_selectors']
             
             for selector in selectors:
-                elements = soup.select(selector)
+                elements = css(selector)(tree)
                 for element in elements:
-                    text = element.get_text().strip().lower()
-                    if text and len(text) > 2 and len(text) < 50:
-                        return text
+                    value = text(element).strip().lower()
+                    if value and len(value) > 2 and len(value) < 50:
+                        return value
         
         return None
     
-    def _extract_from_breadcrumbs(self, soup):
+    def _extract_from_breadcrumbs(self, tree):
         """Extrai categoria de breadcrumbs genéricos"""
         # Seletores comuns para breadcrumbs
         breadcrumb_selectors = [
@@ -222,17 +215,17 @@ class SiteCategorizer:
         ]
         
         for selector in breadcrumb_selectors:
-            elements = soup.select(selector)
+            elements = css(selector)(tree)
             for element in elements:
-                text = element.get_text().strip().lower()
-                if text and len(text) > 2 and len(text) < 50:
+                value = text(element).strip().lower()
+                if value and len(value) > 2 and len(value) < 50:
                     # Pular elementos muito genéricos
-                    if text not in ['home', 'início', 'inicio', 'notícias', 'noticias']:
-                        return text
+                    if value not in ['home', 'início', 'inicio', 'notícias', 'noticias']:
+                        return value
         
         return None
     
-    def _extract_from_meta_tags(self, soup):
+    def _extract_from_meta_tags(self, tree):
         """Extrai categoria de meta tags"""
         # Meta tags comuns para categorias
         meta_selectors = [
@@ -243,8 +236,9 @@ class SiteCategorizer:
         ]
         
         for selector in meta_selectors:
-            element = soup.select_one(selector)
-            if element:
+            elements = css(selector)(tree)
+            if elements:
+                element = elements[0]
                 content = element.get('content', '').strip().lower()
                 if content and len(content) > 2 and len(content) < 50:
                     return content
@@ -275,7 +269,7 @@ class SiteCategorizer:
         # Se não encontrar, retornar a categoria original capitalizada
         return category.title()
     
-    def categorize_article(self, article):
+    def categorize_article(self, article, doc=None):
         """
         Categoriza artigo baseado no site de origem
         """
@@ -285,7 +279,7 @@ class SiteCategorizer:
         
         print(f"🌐 Extraindo categoria de: {url}")
         
-        category = self.extract_category_from_url(url)
+        category = self.extract_category_from_url(url, doc=doc)
         
         if category:
             print(f"✅ Categoria extraída: {category}")
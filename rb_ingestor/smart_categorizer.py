@@ -3,9 +3,15 @@
 Sistema inteligente de categorização baseado no conteúdo gerado
 """
 import re
+import threading
 from collections import defaultdict
 from django.conf import settings
 
+_TAG_RE = re.compile(r'<[^>]+>')
+# Regra: se mencionar países estrangeiros e não mencionar Brasil, favorecer "mundo"
+FOREIGN_MARKERS = ("israel", "gaza", "palestina", "ucrânia", "rússia", "china", "eua", "estados unidos", "europa")
+BRAZIL_MARKERS = ("brasil", "brasileir")
+
 class SmartCategorizer:
     """Sistema inteligente de categorização baseado no conteúdo"""
     
@@ -174,100 +180,219 @@ class SmartCategorizer:
             }
         }
     
+    def categorize(self, title, content, topic=""):
+        """
+        Categoria e confiança (0.0 a 1.0) numa passada só pelo texto
+        (autômato compilado, ver ``CompiledCategoryScorer``)
+        """
+        return get_scorer(self.category_patterns).score(title, content, topic)
+
     def categorize_content(self, title, content, topic=""):
         """
         Categoriza conteúdo baseado em análise inteligente do texto completo
         """
-        # Combinar todo o texto para análise
-        full_text = f"{title} {content} {topic}".lower()
-        
-        # Remover tags HTML para análise de texto limpo
-        clean_text = re.sub(r'<[^>]+>', ' ', full_text)
-        
-        category_scores = defaultdict(float)
-        
-        # Analisar cada categoria
-        for category, patterns in self.category_patterns.items():
-            score = 0
-            
-            # 1. Pontuação por palavras-chave (peso 1.0)
-            keyword_matches = 0
-            for keyword in patterns["keywords"]:
-                if keyword in clean_text:
-                    keyword_matches += 1
-                    # Dar mais peso para palavras mais específicas
-                    if len(keyword.split()) > 1:  # Frases têm mais peso
-                        score += 2.0
-                    else:
-                        score += 1.0
-            
-            # 2. Pontuação por padrões contextuais (peso 2.0)
-            context_matches = 0
-            for pattern in patterns["context_patterns"]:
-                if re.search(pattern, clean_text, re.IGNORECASE):
-                    context_matches += 1
-                    score += 3.0  # Padrões contextuais têm muito mais peso
-            
-            # 3. Pontuação por densidade de palavras-chave
-            if keyword_matches > 0:
-                density_score = keyword_matches / len(patterns["keywords"])
-                score += density_score * 5.0
-            
-            # 4. Aplicar peso da categoria
-            score *= patterns["weight"]
-            
-            category_scores[category] = score
-        
-        # Encontrar categoria com maior pontuação
-        if category_scores:
-            # Regra: se mencionar países estrangeiros e não mencionar Brasil, favorecer "mundo"
-            foreign_markers = ["israel", "gaza", "palestina", "ucrânia", "rússia", "china", "eua", "estados unidos", "europa"]
-            mentions_foreign = any(m in clean_text for m in foreign_markers)
-            mentions_brazil = ("brasil" in clean_text or "brasileir" in clean_text)
-
-            if mentions_foreign and not mentions_brazil:
-                category_scores["mundo"] *= 1.5
-
-            best_category = max(category_scores.items(), key=lambda x: x[1])
-            
-            # Só retornar se a pontuação for significativa (> 2.0)
-            if best_category[1] > 2.0:
-                return best_category[0]
-        
-        # Fallback para "brasil" se nenhuma categoria tiver pontuação suficiente
-        return "brasil"
-    
+        return self.categorize(title, content, topic)[0]
+
     def get_category_confidence(self, title, content, topic=""):
         """
         Retorna a confiança da categorização (0.0 a 1.0)
         """
-        full_text = f"{title} {content} {topic}".lower()
-        clean_text = re.sub(r'<[^>]+>', ' ', full_text)
-        
+        return self.categorize(title, content, topic)[1]
+
+    def reference_categorize(self, title, content, topic=""):
+        """
+        Implementação original (um laço de ``in`` e ``re.search`` por categoria,
+        duas vezes). Mantida só para o ``recategorize --bench`` conferir que o
+        autômato dá o mesmo resultado.
+        """
+        clean_text = _TAG_RE.sub(' ', f"{title} {content} {topic}".lower())
         category_scores = defaultdict(float)
-        
+        confidence_scores = defaultdict(float)
+
         for category, patterns in self.category_patterns.items():
             score = 0
-            
+            keyword_matches = 0
             for keyword in patterns["keywords"]:
                 if keyword in clean_text:
-                    if len(keyword.split()) > 1:
-                        score += 2.0
-                    else:
-                        score += 1.0
-            
+                    keyword_matches += 1
+                    score += 2.0 if len(keyword.split()) > 1 else 1.0
             for pattern in patterns["context_patterns"]:
                 if re.search(pattern, clean_text, re.IGNORECASE):
                     score += 3.0
-            
-            score *= patterns["weight"]
-            category_scores[category] = score
-        
-        if category_scores:
-            best_score = max(category_scores.values())
-            total_score = sum(category_scores.values())
-            
-            if total_score > 0:
-                return best_score / total_score
-        
-        return 0.0
+            confidence_scores[category] = score * patterns["weight"]
+            if keyword_matches > 0:
+                score += keyword_matches / len(patterns["keywords"]) * 5.0
+            category_scores[category] = score * patterns["weight"]
+
+        mentions_foreign = any(m in clean_text for m in FOREIGN_MARKERS)
+        mentions_brazil = any(m in clean_text for m in BRAZIL_MARKERS)
+        if mentions_foreign and not mentions_brazil:
+            category_scores["mundo"] *= 1.5
+
+        best_category = max(category_scores.items(), key=lambda x: x[1])
+        total = sum(confidence_scores.values())
+        confidence = max(confidence_scores.values()) / total if total > 0 else 0.0
+        return (best_category[0] if best_category[1] > 2.0 else "brasil"), confidence
+
+
+class CompiledCategoryScorer:
+    """
+    Todas as categorias numa passada pelo texto.
+
+    As palavras-chave de todas as categorias (e os marcadores de país) viram
+    um autômato Aho-Corasick com as transições de falha já resolvidas: cada
+    caractere do texto é um acesso a dicionário, e a saída do estado diz
+    quais palavras terminam ali. Casa substrings como o ``keyword in texto``
+    original, com as mesmas pontuações. Os padrões de contexto são
+    compilados uma vez e só tentados onde o autômato viu uma das palavras
+    do grupo inicial. Categoria e confiança saem da mesma contagem.
+    """
+
+    def __init__(self, category_patterns):
+        self.categories = list(category_patterns)
+        self.weights = [category_patterns[c]["weight"] for c in self.categories]
+        self.keyword_totals = [len(category_patterns[c]["keywords"]) for c in self.categories]
+        self.patterns = [
+            [(re.compile(p, re.IGNORECASE), _leading_literals(p)) for p in category_patterns[c]["context_patterns"]]
+            for c in self.categories
+        ]
+
+        # Termo -> id; cada id aponta as (categoria, pontos) em que aparece (com repetição, como na lista)
+        self.terms = {}
+        self.hits = []
+        for index, category in enumerate(self.categories):
+            for keyword in category_patterns[category]["keywords"]:
+                term = self._term(keyword)
+                self.hits[term].append((index, 2.0 if len(keyword.split()) > 1 else 1.0))
+        for patterns in self.patterns:
+            for _pattern, literals in patterns:
+                for literal in literals or ():
+                    self._term(literal)
+        self.foreign = {self._term(m) for m in FOREIGN_MARKERS}
+        self.brazil = {self._term(m) for m in BRAZIL_MARKERS}
+        self._build()
+
+    def _term(self, text):
+        if text not in self.terms:
+            self.terms[text] = len(self.hits)
+            self.hits.append([])
+        return self.terms[text]
+
+    def _build(self):
+        goto, fail, out = [{}], [0], [set()]
+        for term, term_id in self.terms.items():
+            state = 0
+            for ch in term:
+                if ch not in goto[state]:
+                    goto.append({})
+                    fail.append(0)
+                    out.append(set())
+                    goto[state][ch] = len(goto) - 1
+                state = goto[state][ch]
+            out[state].add(term_id)
+
+        # BFS: falhas e, de quebra, a tabela de transições completa (sem seguir falhas na busca)
+        delta = [dict(goto[0])] + [None] * (len(goto) - 1)
+        queue = list(goto[0].values())
+        for state in queue:
+            # fail[state] é mais raso: transições e saídas dele já estão prontas
+            out[state] |= out[fail[state]]
+            delta[state] = dict(delta[fail[state]])
+            for ch, target in goto[state].items():
+                fail[target] = delta[fail[state]].get(ch, 0)
+                delta[state][ch] = target
+                queue.append(target)
+        self._delta = delta
+        self._out = [tuple(terms) for terms in out]
+
+    def find(self, text):
+        """Ids dos termos que aparecem em ``text`` (como substring)."""
+        delta, out = self._delta, self._out
+        found = set()
+        state = 0
+        for ch in text:
+            state = delta[state].get(ch, 0)
+            if out[state]:
+                found.update(out[state])
+        return found
+
+    def _search(self, pattern, literals, text, found):
+        """``pattern.search``, tentando só onde começa um dos literais iniciais que o autômato achou."""
+        if literals is None:
+            return pattern.search(text) is not None
+        for literal in literals:
+            if self.terms[literal] not in found:
+                continue
+            pos = text.find(literal)
+            while pos != -1:
+                if pattern.match(text, pos):
+                    return True
+                pos = text.find(literal, pos + 1)
+        return False
+
+    def score(self, title, content, topic=""):
+        clean_text = _TAG_RE.sub(' ', f"{title} {content} {topic}".lower())
+        found = self.find(clean_text)
+
+        base = [0.0] * len(self.categories)
+        matches = [0] * len(self.categories)
+        for term_id in found:
+            for index, points in self.hits[term_id]:
+                base[index] += points
+                matches[index] += 1
+        for index, patterns in enumerate(self.patterns):
+            for pattern, literals in patterns:
+                if self._search(pattern, literals, clean_text, found):
+                    base[index] += 3.0
+
+        confidence_scores = [score * weight for score, weight in zip(base, self.weights)]
+        category_scores = [
+            (score + (count / total * 5.0 if count else 0.0)) * weight
+            for score, count, total, weight in zip(base, matches, self.keyword_totals, self.weights)
+        ]
+        if "mundo" in self.categories and found & self.foreign and not found & self.brazil:
+            category_scores[self.categories.index("mundo")] *= 1.5
+
+        best = max(range(len(self.categories)), key=category_scores.__getitem__)
+        total = sum(confidence_scores)
+        confidence = max(confidence_scores) / total if total > 0 else 0.0
+        return (self.categories[best] if category_scores[best] > 2.0 else "brasil"), confidence
+
+
+# Grupo opcional ("(a|b)?...") não serve: o casamento pode começar depois dele
+_LEADING_GROUP_RE = re.compile(r"\(([^()\[\]\\.*+?{}^$]+)\)(?![?*{])")
+_LEADING_WORD_RE = re.compile(r"([^()\[\]\\.*+?{}^$|]+)(?=\\|\(|$)")
+
+
+def _leading_literals(pattern):
+    """Alternativas literais do início ("(pib|produto interno bruto)...", "governo\\s+...") ou None.
+
+    Todo casamento do padrão começa numa delas, então ``search`` só precisa
+    ser tentado nessas posições (o re do Python testaria todas).
+    """
+    match = _LEADING_GROUP_RE.match(pattern) or _LEADING_WORD_RE.match(pattern)
+    if not match:
+        return None
+    literals = tuple(match.group(1).split("|"))
+    if any(not literal or literal != literal.lower() for literal in literals):
+        return None
+    return literals
+
+
+_scorers = {}
+_scorers_lock = threading.Lock()
+
+
+def get_scorer(category_patterns) -> CompiledCategoryScorer:
+    """Autômato compilado uma vez por processo (os comandos criam um SmartCategorizer por notícia)."""
+    key = repr(category_patterns)
+    with _scorers_lock:
+        if key not in _scorers:
+            _scorers[key] = CompiledCategoryScorer(category_patterns)
+        return _scorers[key]
+
+
+def categorize_many(rows):
+    """(título, conteúdo) -> [(categoria, confiança)]; usado pelos processos do recategorize."""
+    categorizer = SmartCategorizer()
+    return [categorizer.categorize(title, content) for title, content in rows]
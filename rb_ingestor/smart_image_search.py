@@ -13,13 +13,13 @@ class SmartImageSearch:
         self.google_lens = google_lens_analyzer
         self.image_extractor = image_analyzer
     
-    def find_smart_image_for_article(self, news_url: str, article_title: str = "") -> Optional[Dict]:
+    def find_smart_image_for_article(self, news_url: str, article_title: str = "", doc=None) -> Optional[Dict]:
         """Busca imagem inteligente para artigo usando Google Lens"""
         try:
             print(f"🔍 Buscando imagem inteligente para: {article_title[:50]}...")
             
             # 1. Extrair imagem da notícia original
-            original_image_url = self.image_extractor.extract_main_image_from_url(news_url)
+            original_image_url = self.image_extractor.extract_main_image_from_url(news_url, doc=doc)
             
             if not original_image_url:
                 print("❌ Nenhuma imagem encontrada na notícia original")
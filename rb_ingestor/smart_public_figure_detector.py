@@ -2,10 +2,10 @@
 """
 Sistema inteligente para identificação de figuras públicas usando NLP/IA
 """
+import json
 import re
 import logging
 from typing import Dict, List, Optional, Tuple
-import os
 
 logger = logging.getLogger(__name__)
 
@@ -184,9 +184,12 @@ class SmartPublicFigureDetector:
             r'(modelo|top model|supermodelo)'
         ]
     
-    def detect_public_figure(self, text: str) -> Optional[Dict]:
+    def detect_public_figure(self, text: str, figures: Optional[List[Dict]] = None) -> Optional[Dict]:
         """
         Detecta figura pública no texto usando análise inteligente
+
+        ``figures``: figuras já apontadas pela geração estruturada
+        (ai_structured); com elas a etapa de IA não faz outra chamada.
         """
         text_lower = text.lower()
         
@@ -205,7 +208,13 @@ class SmartPublicFigureDetector:
         if variation_match:
             return variation_match
         
-        # 4. Usar IA para análise mais sofisticada (se disponível)
+        # 4. Figuras vindas da geração estruturada, ou IA para análise mais sofisticada (se disponível)
+        if figures is not None:
+            for figure in figures:
+                match = self._match_known_figure(figure.get("name", ""), figure.get("confidence", "medium"), "structured")
+                if match:
+                    return match
+            return None
         ai_match = self._ai_analysis(text)
         if ai_match:
             return ai_match
@@ -290,12 +299,30 @@ class SmartPublicFigureDetector:
                         }
         return None
     
+    def _match_known_figure(self, detected_name: str, confidence: str, match_type: str) -> Optional[Dict]:
+        """Figura da base local cujo nome aparece no nome apontado pela IA"""
+        detected_name = (detected_name or "").lower()
+        if not detected_name:
+            return None
+        for figure_key, figure_data in self.public_figures_database.items():
+            for name in figure_data['names']:
+                if name.lower() in detected_name:
+                    return {
+                        'figure': figure_data['names'][0].title(),
+                        'figure_key': figure_key,
+                        'instagram_handle': figure_data['instagram'][0],
+                        'instagram_url': f"https://www.instagram.com/{figure_data['instagram'][0].replace('@', '')}/",
+                        'category': figure_data['category'],
+                        'country': figure_data['country'],
+                        'confidence': confidence,
+                        'match_type': match_type
+                    }
+        return None
+
     def _ai_analysis(self, text: str) -> Optional[Dict]:
         """Análise usando IA (OpenAI) para detectar figuras públicas"""
         try:
-            from openai import OpenAI
-            
-            client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+            from rb_ingestor import llm_client
             
             prompt = f"""
             Analise o seguinte texto e identifique se menciona alguma figura pública conhecida (político, celebridade, atleta, empresário, jornalista, etc.).
@@ -310,37 +337,25 @@ class SmartPublicFigureDetector:
             Categorias possíveis: politician, celebrity, athlete, businessman, journalist, presenter
             """
             
-            response = client.chat.completions.create(
+            result = llm_client.chat(
                 model="gpt-4o-mini",
                 messages=[
                     {"role": "system", "content": "Você é um especialista em identificar figuras públicas em textos jornalísticos."},
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.3,
-                max_tokens=100
-            )
-            
-            result = response.choices[0].message.content.strip()
+                max_tokens=100,
+                validate=lambda text: isinstance(json.loads(text.strip()), dict),
+            ).strip()
             
             # Tentar extrair JSON da resposta
-            import json
             try:
                 data = json.loads(result)
                 if data.get("name"):
                     # Buscar na base de dados local
-                    for figure_key, figure_data in self.public_figures_database.items():
-                        for name in figure_data['names']:
-                            if name.lower() in data["name"].lower():
-                                return {
-                                    'figure': figure_data['names'][0].title(),
-                                    'figure_key': figure_key,
-                                    'instagram_handle': figure_data['instagram'][0],
-                                    'instagram_url': f"https://www.instagram.com/{figure_data['instagram'][0].replace('@', '')}/",
-                                    'category': figure_data['category'],
-                                    'country': figure_data['country'],
-                                    'confidence': data.get('confidence', 'medium'),
-                                    'match_type': 'ai_analysis'
-                                }
+                    match = self._match_known_figure(data["name"], data.get('confidence', 'medium'), 'ai_analysis')
+                    if match:
+                        return match
             except json.JSONDecodeError:
                 pass
                 
@@ -0,0 +1,158 @@
+# rb_ingestor/story_clusters.py
+"""
+Agrupamento da mesma história vinda de feeds e veículos diferentes.
+
+A mesma matéria aparece nos feeds de vários tópicos ('brasil', 'política',
+'economia') e em vários veículos, com títulos parecidos mas não iguais
+(``merge_items`` só descarta link ou título idênticos). Sem agrupar, o
+pipeline resolvia, abria no navegador e extraía várias cópias antes de a
+barreira de duplicatas perceber.
+
+``cluster`` recebe o lote de itens coletados e:
+
+- monta os shingles de cada item: radicais das palavras significativas e
+  números do título e da descrição (sem o " - Veículo" do Google News e
+  sem o nome do veículo)
+- calcula a similaridade de Jaccard de todos os pares de uma vez (matriz
+  binária item x shingle; interseções = M @ M.T)
+- liga os pares a partir de STORY_CLUSTER_THRESHOLD (componentes conexas),
+  exceto os que trocam número ou nome próprio no título ("vence
+  Botafogo" x "vence Palmeiras", ``dedup.distinct``): são outra história
+- fica com um representante por grupo: o veículo cujo download é
+  conhecidamente rápido (HTTP simples em ``DomainFetchStats``, ver
+  fetch_tiers.py), depois o sem histórico, por último o que exige
+  navegador; os demais vão em ``alternates`` (título, URL, veículo) e só
+  são usados se a extração do representante falhar
+"""
+import html
+import os
+import re
+import unicodedata
+from typing import Dict, List
+from urllib.parse import urlparse
+
+import numpy as np
+from django.utils.html import strip_tags
+
+from rb_ingestor.dedup import STOPWORDS, distinct
+
+THRESHOLD = float(os.getenv("STORY_CLUSTER_THRESHOLD", "0.3"))
+# "mantém"/"manter", "aprova"/"aprovada" caem no mesmo radical
+SHINGLE = 5
+
+# Preferência do representante (maior primeiro)
+RANK_FAST, RANK_UNKNOWN, RANK_BROWSER = 2, 1, 0
+RANK_LABELS = {RANK_FAST: "rápido", RANK_UNKNOWN: "sem histórico", RANK_BROWSER: "navegador"}
+
+
+def _text(item: Dict) -> str:
+    title = item.get("title") or ""
+    source = (item.get("source") or "").strip()
+    if source and title.endswith(f" - {source}"):
+        title = title[: -len(source) - 3]
+    # Entidades (&nbsp;, &quot;) viram texto; senão "nbsp" entra como shingle
+    text = html.unescape(f"{title} {strip_tags(item.get('description') or '')}")
+    if source:
+        text = text.replace(source, " ")
+    return text
+
+
+def shingles(item: Dict) -> set:
+    """Radicais (SHINGLE primeiras letras) das palavras significativas e os números inteiros ("10,5")."""
+    text = unicodedata.normalize("NFKD", _text(item).lower())
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return {
+        word if word[0].isdigit() else word[:SHINGLE]
+        for word in re.findall(r"\d+(?:[.,]\d+)*|[^\W\d_]+", text)
+        if word[0].isdigit() or (len(word) > 2 and word not in STOPWORDS)
+    }
+
+
+def similarity_matrix(items: List[Dict]) -> np.ndarray:
+    """Jaccard de todos os pares (n x n) a partir da matriz binária item x shingle."""
+    sets = [shingles(item) for item in items]
+    vocab = {}
+    rows, cols = [], []
+    for row, item_shingles in enumerate(sets):
+        for shingle in item_shingles:
+            rows.append(row)
+            cols.append(vocab.setdefault(shingle, len(vocab)))
+    matrix = np.zeros((len(items), max(len(vocab), 1)), dtype=np.float32)
+    matrix[rows, cols] = 1.0
+    inter = matrix @ matrix.T
+    sizes = matrix.sum(axis=1)
+    union = sizes[:, None] + sizes[None, :] - inter
+    return np.divide(inter, union, out=np.zeros_like(inter), where=union > 0)
+
+
+def domain(item: Dict) -> str:
+    """Domínio do veículo: link já decodificável offline ou o site do <source> do feed."""
+    url = item.get("url") or item.get("link") or ""
+    try:
+        from rb_ingestor.gn_resolver import is_google_news_url, resolve
+        if is_google_news_url(url):
+            url = resolve(url, allow_network=False) or item.get("source_url") or ""
+    except Exception:
+        url = item.get("source_url") or ""
+    return urlparse(url).netloc.lower()
+
+
+def fetch_rank(host: str):
+    """(preferência, ms médio do HTTP) do domínio segundo o histórico de downloads."""
+    from rb_ingestor.fetch_tiers import MIN_SAMPLES, TIER_HTTP, domain_stats
+    if not host:
+        return RANK_UNKNOWN, float("inf")
+    stats = domain_stats.get(host)[TIER_HTTP]
+    attempts = stats["ok"] + stats["fail"]
+    if attempts < MIN_SAMPLES:
+        return RANK_UNKNOWN, float("inf")
+    if domain_stats.tier_order(host)[0] != TIER_HTTP:
+        return RANK_BROWSER, float("inf")
+    return RANK_FAST, stats["ms"] / attempts
+
+
+def cluster(items: List[Dict], threshold: float = None) -> List[Dict]:
+    """Um item por história, na ordem da primeira aparição, com ``alternates`` e ``cluster_size``."""
+    threshold = THRESHOLD if threshold is None else threshold
+    if len(items) < 2:
+        return [dict(item, alternates=[], cluster_size=1) for item in items]
+
+    similar = similarity_matrix(items) >= threshold
+    # Componentes conexas (union-find) dos pares acima do limiar
+    parent = list(range(len(items)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, j in np.argwhere(np.triu(similar, k=1)):
+        if distinct(items[i].get("title") or "", items[j].get("title") or ""):
+            continue
+        a, b = find(int(i)), find(int(j))
+        if a != b:
+            parent[max(a, b)] = min(a, b)
+    groups = {}
+    for i in range(len(items)):
+        groups.setdefault(find(i), []).append(i)
+
+    result = []
+    for members in groups.values():
+        hosts = {i: domain(items[i]) for i in members}
+        ranks = {i: fetch_rank(hosts[i]) for i in members}
+        best = min(members, key=lambda i: (-ranks[i][0], ranks[i][1], i))
+        representative = dict(items[best], source_domain=hosts[best], fetch_rank=RANK_LABELS[ranks[best][0]])
+        representative["alternates"] = [
+            {
+                "title": items[i].get("title", ""),
+                "url": items[i].get("url") or items[i].get("link", ""),
+                "source": items[i].get("source", ""),
+                "source_domain": hosts[i],
+            }
+            for i in members if i != best
+        ]
+        representative["cluster_size"] = len(members)
+        # A raiz de cada grupo é o menor índice: os grupos já saem na ordem da primeira aparição
+        result.append(representative)
+    return result
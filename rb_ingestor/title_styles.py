@@ -212,17 +212,15 @@ Reescrito: "Tesla solicita que Corte Suprema restaure remuneração de US$ 56 bi
 TÍTULO REESCRITO:"""
 
         try:
-            # Usar cliente v1 da OpenAI
+            # Cliente compartilhado (cache de respostas, limite de concorrência, backoff)
             try:
-                from openai import OpenAI as OpenAIClient
-                client = OpenAIClient(api_key=settings.OPENAI_API_KEY)
-                chat = client.chat.completions.create(
+                from rb_ingestor import llm_client
+                rewritten = llm_client.chat(
                     model="gpt-4o-mini",
                     messages=[{"role": "user", "content": prompt}],
                     max_tokens=120,
                     temperature=0.7
-                )
-                rewritten = chat.choices[0].message.content.strip()
+                ).strip()
             except Exception:
                 # Fallback para pacote antigo, se presente
                 rewritten = openai.ChatCompletion.create(
@@ -2,7 +2,7 @@
 """
 Sistema inteligente de análise de tendências para aumentar audiência
 """
-import requests
+from rb_ingestor import http_client
 import json
 from datetime import datetime, timedelta
 from typing import List, Dict, Tuple
@@ -34,7 +34,7 @@ class TrendingAnalyzer:
         """Busca posts populares do Reddit Brasil"""
         try:
             headers = {'User-Agent': 'RadarBR/1.0'}
-            response = requests.get(self.reddit_api, headers=headers, timeout=10)
+            response = http_client.get(self.reddit_api, headers=headers, timeout=10)
             if response.status_code == 200:
                 data = response.json()
                 posts = []
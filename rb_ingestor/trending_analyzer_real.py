@@ -2,7 +2,7 @@
 """
 Sistema de análise de tendências REAIS com atualização automática
 """
-import requests
+from rb_ingestor import http_client
 import json
 from datetime import datetime, timedelta
 from typing import List, Dict, Tuple
@@ -66,7 +66,7 @@ class RealTrendingAnalyzer:
                 'ns': '15'
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = http_client.get(url, params=params, timeout=10)
             if response.status_code == 200:
                 # Parse do JSON (remove prefixo do Google)
                 data = response.text[5:]  # Remove ")]}',"
@@ -152,7 +152,7 @@ class RealTrendingAnalyzer:
         """Busca posts populares do Reddit Brasil"""
         try:
             headers = {'User-Agent': 'RadarBR/1.0'}
-            response = requests.get(self.reddit_api, headers=headers, timeout=10)
+            response = http_client.get(self.reddit_api, headers=headers, timeout=10)
             
             if response.status_code == 200:
                 data = response.json()
@@ -3,7 +3,7 @@
 Sistema para integração automática de vídeos do YouTube
 """
 import re
-import requests
+from rb_ingestor import http_client
 from urllib.parse import urlparse, parse_qs
 from django.conf import settings
 import logging
@@ -90,7 +90,7 @@ class YouTubeIntegration:
                 'key': api_key
             }
             
-            response = requests.get(search_url, params=params, timeout=10)
+            response = http_client.get(search_url, params=params, timeout=10)
             response.raise_for_status()
             
             data = response.json()
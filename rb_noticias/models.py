@@ -3,6 +3,8 @@ from django.db import models
 from django.urls import reverse
 from slugify import slugify
 
+from core.metrics import ENGAGEMENT_UPDATES
+
 class Categoria(models.Model):
     nome = models.CharField(max_length=120)
     slug = models.SlugField(max_length=140, unique=True)
@@ -182,15 +184,18 @@ class Noticia(models.Model):
         self.views += 1
         self.calculate_trending_score()
         self.save(update_fields=['views', 'trending_score'])
+        ENGAGEMENT_UPDATES.inc(kind="views")
     
     def increment_clicks(self):
         """Incrementa o contador de cliques"""
         self.clicks += 1
         self.calculate_trending_score()
         self.save(update_fields=['clicks', 'trending_score'])
+        ENGAGEMENT_UPDATES.inc(kind="clicks")
     
     def increment_shares(self):
         """Incrementa o contador de compartilhamentos"""
         self.shares += 1
         self.calculate_trending_score()
-        self.save(update_fields=['shares', 'trending_score'])
\ No newline at end of file
+        self.save(update_fields=['shares', 'trending_score'])
+        ENGAGEMENT_UPDATES.inc(kind="shares")
\ No newline at end of file